@@ -0,0 +1,39 @@
+"""
+App settings
+"""
+
+# Django
+from django.conf import settings
+
+# Celery priority of background jobs (0 is the highest, 9 the lowest priority)
+AA_PERMISSION_MANAGEMENT_JOB_PRIORITY = getattr(
+    settings, "AA_PERMISSION_MANAGEMENT_JOB_PRIORITY", 6
+)
+
+# Number of items a background job processes per Celery task
+AA_PERMISSION_MANAGEMENT_JOB_CHUNK_SIZE = getattr(
+    settings, "AA_PERMISSION_MANAGEMENT_JOB_CHUNK_SIZE", 100
+)
+
+# Number of changes of an import, or of groups and states of a snapshot, above
+# which importing or restoring it runs as a background job
+AA_PERMISSION_MANAGEMENT_JOB_THRESHOLD = getattr(
+    settings, "AA_PERMISSION_MANAGEMENT_JOB_THRESHOLD", 5000
+)
+
+# Number of days audit log entries are kept by the prune command
+AA_PERMISSION_MANAGEMENT_AUDIT_LOG_RETENTION_DAYS = getattr(
+    settings, "AA_PERMISSION_MANAGEMENT_AUDIT_LOG_RETENTION_DAYS", 365
+)
+
+# Database alias of a read replica for the read-only views, requires the
+# `aa_permission_management.routers.ReadReplicaRouter` in `DATABASE_ROUTERS`
+AA_PERMISSION_MANAGEMENT_READ_REPLICA = getattr(
+    settings, "AA_PERMISSION_MANAGEMENT_READ_REPLICA", None
+)
+
+# Number of seconds a session reads from the primary after it has written,
+# which should cover the lag of the read replica
+AA_PERMISSION_MANAGEMENT_READ_YOUR_WRITES_SECONDS = getattr(
+    settings, "AA_PERMISSION_MANAGEMENT_READ_YOUR_WRITES_SECONDS", 10
+)
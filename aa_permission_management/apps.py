@@ -20,3 +20,16 @@ class PermissionManagementConfig(AppConfig):
     verbose_name = format_lazy(
         "{app_title} v{version}", app_title=__title_translated__, version=__version__
     )
+
+    def ready(self) -> None:
+        """
+        Connect the app's signals
+
+        :return:
+        :rtype:
+        """
+
+        # AA Permission Management
+        from aa_permission_management import (  # noqa: F401 pylint: disable=import-outside-toplevel,unused-import
+            signals,
+        )
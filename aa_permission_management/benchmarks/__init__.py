@@ -0,0 +1,44 @@
+"""
+Benchmarks for the AA Permission Management app.
+
+The benchmarks run on a synthetic dataset (see
+:mod:`aa_permission_management.benchmarks.data`) and report wall time, query count
+and peak memory as JSON lines (see :mod:`aa_permission_management.benchmarks.runner`).
+
+They are not part of the test suite. Run them with:
+
+    .. code-block:: shell
+
+        python runtests.py aa_permission_management.benchmarks --pattern "bench_*.py" --debug-mode
+
+or with `tox -e benchmarks`.
+"""
+
+# AA Permission Management
+from aa_permission_management.benchmarks.data import generate_dataset, get_dataset_size
+from aa_permission_management.tests import BaseTestCase
+
+
+class BenchmarkTestCase(BaseTestCase):
+    """
+    Test case running on the synthetic benchmark dataset.
+
+    The dataset is generated once per class, the size is taken from the environment.
+    """
+
+    dataset_size: dict
+    dataset: dict
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Generate the benchmark dataset.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUpTestData()
+
+        cls.dataset_size = get_dataset_size()
+        cls.dataset = generate_dataset(**cls.dataset_size)
@@ -0,0 +1,240 @@
+"""
+Benchmarks for the helpers in aa_permission_management.helper
+"""
+
+# Standard Library
+import io
+from itertools import cycle
+
+# Django
+from django.core.cache import cache
+
+# AA Permission Management
+from aa_permission_management.benchmarks import BenchmarkTestCase
+from aa_permission_management.benchmarks.runner import measure
+from aa_permission_management.constants import (
+    MATRIX_MAX_COLUMNS,
+    MATRIX_MAX_ROWS,
+    PERMISSION_IMPACT_CACHE_KEY,
+)
+from aa_permission_management.helper.effective_permissions import (
+    bump_user_permission_versions,
+    get_effective_permissions,
+)
+from aa_permission_management.helper.export import stream_permission_assignments
+from aa_permission_management.helper.impact import get_permission_change_impact
+from aa_permission_management.helper.importer import iter_import_rows, plan_import
+from aa_permission_management.helper.matrix import get_permission_matrix
+from aa_permission_management.helper.snapshots import get_snapshot_diff, take_snapshot
+from aa_permission_management.helper.views import (
+    apply_permissions,
+    get_group_permission_ids,
+    get_group_permissions,
+    get_state_permission_ids,
+    get_state_permissions,
+    set_group_permissions,
+    set_state_permissions,
+)
+
+
+class BenchmarkHelpers(BenchmarkTestCase):
+    """
+    Benchmarks for the view helpers.
+    """
+
+    def test_getters(self):
+        """
+        Benchmark reading the permissions of a group and a state.
+
+        :return:
+        :rtype:
+        """
+
+        group_id = self.dataset["group_ids"][0]
+        state_id = self.dataset["state_ids"][0]
+
+        for name, func in (
+            ("get_group_permissions", lambda: get_group_permissions(group_id)),
+            ("get_group_permission_ids", lambda: get_group_permission_ids(group_id)),
+            ("get_state_permissions", lambda: get_state_permissions(state_id)),
+            ("get_state_permission_ids", lambda: get_state_permission_ids(state_id)),
+        ):
+            measure(name, func, dataset=self.dataset_size)
+
+    def test_setters(self):
+        """
+        Benchmark setting the permissions of a group and a state.
+
+        Every run switches between two permission sets, so every run changes
+        something.
+
+        :return:
+        :rtype:
+        """
+
+        permission_ids = self.dataset["permission_ids"]
+
+        for name, setter, target_id, size in (
+            (
+                "set_group_permissions",
+                set_group_permissions,
+                self.dataset["group_ids"][0],
+                self.dataset_size["permissions_per_group"],
+            ),
+            (
+                "set_state_permissions",
+                set_state_permissions,
+                self.dataset["state_ids"][0],
+                self.dataset_size["permissions_per_state"],
+            ),
+        ):
+            permission_sets = cycle((permission_ids[:size], permission_ids[-size:]))
+
+            measure(
+                name,
+                lambda setter=setter, target_id=target_id, permission_sets=permission_sets: setter(
+                    target_id, next(permission_sets)
+                ),
+                dataset=self.dataset_size,
+            )
+
+    def test_apply_permissions(self):
+        """
+        Benchmark applying permissions to all groups at once.
+
+        Every run switches between adding and removing the same permissions, so
+        every run changes something.
+
+        :return:
+        :rtype:
+        """
+
+        group_ids = self.dataset["group_ids"]
+        permission_ids = self.dataset["permission_ids"][-20:]
+        deltas = cycle(({"add": permission_ids}, {"remove": permission_ids}))
+
+        measure(
+            "apply_permissions",
+            lambda: apply_permissions(group_ids=group_ids, **next(deltas)),
+            dataset=self.dataset_size,
+        )
+
+    def test_get_effective_permissions(self):
+        """
+        Benchmark resolving the effective permissions of a user, once from the
+        database and once from the cache.
+
+        :return:
+        :rtype:
+        """
+
+        user_id = self.dataset["user_ids"][0]
+
+        def resolve():
+            bump_user_permission_versions(user_ids=[user_id])
+
+            return get_effective_permissions(user_id)
+
+        measure(
+            "get_effective_permissions_uncached", resolve, dataset=self.dataset_size
+        )
+        measure(
+            "get_effective_permissions_cached",
+            lambda: get_effective_permissions(user_id),
+            dataset=self.dataset_size,
+        )
+
+    def test_get_permission_matrix(self):
+        """
+        Benchmark the first and the last page of the group matrix, with the most
+        rows and columns a page may have.
+
+        :return:
+        :rtype:
+        """
+
+        total_columns = len(self.dataset["permission_ids"])
+
+        for name, column_offset in (
+            ("get_permission_matrix_first_page", 0),
+            (
+                "get_permission_matrix_last_page",
+                max(total_columns - MATRIX_MAX_COLUMNS, 0),
+            ),
+        ):
+            measure(
+                name,
+                lambda column_offset=column_offset: get_permission_matrix(
+                    target_type="group",
+                    row_offset=0,
+                    row_limit=MATRIX_MAX_ROWS,
+                    column_offset=column_offset,
+                    column_limit=MATRIX_MAX_COLUMNS,
+                ),
+                dataset=self.dataset_size,
+            )
+
+    def test_plan_import(self):
+        """
+        Benchmark planning a replace import of the complete export, whose
+        queries must not grow with the number of rows.
+
+        :return:
+        :rtype:
+        """
+
+        content = "".join(stream_permission_assignments(export_format="csv")).encode()
+
+        measure(
+            "plan_import_replace",
+            lambda: plan_import(
+                rows=iter_import_rows(file=io.BytesIO(content), import_format="csv"),
+                mode="replace",
+            ),
+            dataset=self.dataset_size,
+        )
+
+    def test_snapshots(self):
+        """
+        Benchmark taking a snapshot of all groups and states, and computing the
+        diff to restore it.
+
+        :return:
+        :rtype:
+        """
+
+        snapshot = take_snapshot(name="Benchmark")
+
+        measure("take_snapshot", take_snapshot, dataset=self.dataset_size)
+        measure(
+            "get_snapshot_diff",
+            lambda: get_snapshot_diff(snapshot=snapshot),
+            dataset=self.dataset_size,
+        )
+
+    def test_get_permission_change_impact(self):
+        """
+        Benchmark previewing a change of many permissions of a state, once
+        counted and once from the cache.
+
+        :return:
+        :rtype:
+        """
+
+        state_id = self.dataset["state_ids"][0]
+        permission_ids = self.dataset["permission_ids"]
+        change = {"add": permission_ids[:20], "remove": permission_ids[-20:]}
+
+        def count():
+            cache.delete_pattern(f"{PERMISSION_IMPACT_CACHE_KEY}:*")
+
+            return get_permission_change_impact("state", state_id, **change)
+
+        measure(
+            "get_permission_change_impact_uncached", count, dataset=self.dataset_size
+        )
+        measure(
+            "get_permission_change_impact_cached",
+            lambda: get_permission_change_impact("state", state_id, **change),
+            dataset=self.dataset_size,
+        )
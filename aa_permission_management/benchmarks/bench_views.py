@@ -0,0 +1,530 @@
+"""
+Benchmarks for the views in the aa_permission_management app.
+"""
+
+# Standard Library
+import json
+from collections import deque
+from functools import partial
+from itertools import cycle
+
+# Django
+from django.test import RequestFactory
+from django.urls import reverse
+
+# Alliance Auth
+from allianceauth.framework.datatables import DataTablesView
+
+# AA Permission Management
+from aa_permission_management.benchmarks import BenchmarkTestCase
+from aa_permission_management.benchmarks.runner import measure
+from aa_permission_management.helper.versions import bump_permission_set_versions
+from aa_permission_management.models import PermissionAuditLog
+from aa_permission_management.views import (
+    GroupsTableView,
+    PermissionGroupsTableView,
+    PermissionStatesTableView,
+    PermissionUsersTableView,
+    StatesTableView,
+    ajax_get_audit_log,
+    ajax_get_permission_catalog,
+    ajax_get_permissions,
+    ajax_get_permissions_json,
+    ajax_update_permissions,
+    export_permissions,
+)
+
+
+def _datatables_params(
+    columns: int, length: int = 50, order_column: int = 0, order_dir: str = "asc"
+) -> dict:
+    """
+    Get the parameters DataTables sends for the first page.
+
+    :param columns: Number of columns
+    :type columns: int
+    :param length: Page length
+    :type length: int
+    :param order_column: Index of the column to order by
+    :type order_column: int
+    :param order_dir: Order direction ("asc" or "desc")
+    :type order_dir: str
+    :return: Request parameters
+    :rtype: dict
+    """
+
+    params = {
+        "draw": 1,
+        "start": 0,
+        "length": length,
+        "search[value]": "",
+        "search[regex]": "false",
+        "order[0][column]": order_column,
+        "order[0][dir]": order_dir,
+    }
+
+    for column in range(columns):
+        params.update(
+            {
+                f"columns[{column}][data]": column,
+                f"columns[{column}][searchable]": "true" if column == 0 else "false",
+                f"columns[{column}][orderable]": (
+                    "true" if column in (0, order_column) else "false"
+                ),
+                f"columns[{column}][search][value]": "",
+                f"columns[{column}][search][regex]": "false",
+            }
+        )
+
+    return params
+
+
+class BenchmarkViews(BenchmarkTestCase):
+    """
+    Benchmarks for the views.
+    """
+
+    def setUp(self):
+        """
+        Set up the request factory and the benchmark targets.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.factory = RequestFactory()
+        self.group_id = self.dataset["group_ids"][0]
+        self.state_id = self.dataset["state_ids"][0]
+
+    def _get(self, view, url: str, **kwargs):
+        """
+        Call a view with a GET request as the user with permission.
+
+        :param view:
+        :type view:
+        :param url:
+        :type url:
+        :param kwargs:
+        :type kwargs:
+        :return:
+        :rtype:
+        """
+
+        params = kwargs.pop("params", None)
+        headers = kwargs.pop("headers", {})
+        request = self.factory.get(url, data=params, headers=headers)
+        request.user = self.user_with_permission
+
+        return view(request, **kwargs)
+
+    def _measure(self, name: str, func, **kwargs) -> dict:
+        """
+        Measure a benchmark with the dataset size as label.
+
+        :param name:
+        :type name:
+        :param func:
+        :type func:
+        :param kwargs:
+        :type kwargs:
+        :return:
+        :rtype:
+        """
+
+        return measure(name, func, dataset=self.dataset_size, **kwargs)
+
+    def test_dashboard(self):
+        """
+        Benchmark rendering the dashboard with the first page of states.
+
+        :return:
+        :rtype:
+        """
+
+        url = reverse("aa_permission_management:dashboard")
+
+        self.client.force_login(self.user_with_permission)
+
+        self._measure("dashboard", lambda: self.client.get(url))
+
+    def test_groups_table_view(self):
+        """
+        Benchmark the first page of the groups table.
+
+        :return:
+        :rtype:
+        """
+
+        view = GroupsTableView.as_view()
+        url = reverse("aa_permission_management:get_groups")
+        params = _datatables_params(columns=len(GroupsTableView.columns))
+
+        self._measure("groups_table_view", lambda: self._get(view, url, params=params))
+
+    def test_groups_table_view_by_permission_count(self):
+        """
+        Benchmark the groups with the most permissions.
+
+        :return:
+        :rtype:
+        """
+
+        view = GroupsTableView.as_view()
+        url = reverse("aa_permission_management:get_groups")
+        params = _datatables_params(
+            columns=len(GroupsTableView.columns), order_column=2, order_dir="desc"
+        )
+
+        self._measure(
+            "groups_table_view_by_permission_count",
+            lambda: self._get(view, url, params=params),
+        )
+
+    def test_groups_table_view_deep_page(self):
+        """
+        Benchmark a page in the middle of the groups table, by offset and by
+        keyset, which must cost the same as the first page.
+
+        :return:
+        :rtype:
+        """
+
+        view = GroupsTableView.as_view()
+        url = reverse("aa_permission_management:get_groups")
+        length = 50
+        # Small datasets still get a page after the first one
+        start = (
+            max(len(self.dataset["group_ids"]), 2 * length) // 2 // length
+        ) * length
+        params = {
+            **_datatables_params(columns=len(GroupsTableView.columns), length=length),
+            "start": start,
+        }
+        previous = json.loads(
+            self._get(
+                view,
+                url,
+                params={**params, "start": max(start - length, 0), "keyset": "true"},
+            ).content
+        )
+
+        self._measure(
+            "groups_table_view_deep_page_offset",
+            lambda: self._get(view, url, params=params),
+        )
+        self._measure(
+            "groups_table_view_deep_page_keyset",
+            lambda: self._get(
+                view,
+                url,
+                params={
+                    **params,
+                    "keyset": "true",
+                    "cursor": previous["keyset"]["last"],
+                    "direction": "next",
+                },
+            ),
+        )
+
+    def test_table_row_rendering(self):
+        """
+        Benchmark rendering 100 rows of the groups table, through the template
+        engine as DataTablesView does, and from the precompiled columns.
+
+        :return:
+        :rtype:
+        """
+
+        request = self.factory.get(reverse("aa_permission_management:get_groups"))
+        request.user = self.user_with_permission
+        view = GroupsTableView()
+        rows = list(view.get_model_qs(request).order_by("pk")[:100])
+
+        for name, render_template in (
+            (
+                "render_rows_template_engine",
+                partial(DataTablesView.render_template, view),
+            ),
+            ("render_rows_compiled", view.render_template),
+        ):
+            self._measure(
+                name,
+                lambda render_template=render_template: [
+                    [
+                        render_template(request, column[1], {"row": row})
+                        for column in view.columns
+                    ]
+                    for row in rows
+                ],
+                rows=len(rows),
+            )
+
+    def test_states_table_view(self):
+        """
+        Benchmark the first page of the states table.
+
+        :return:
+        :rtype:
+        """
+
+        view = StatesTableView.as_view()
+        url = reverse("aa_permission_management:get_states")
+        params = _datatables_params(columns=len(StatesTableView.columns))
+
+        self._measure("states_table_view", lambda: self._get(view, url, params=params))
+
+    def test_groups_table_view_by_has_permission(self):
+        """
+        Benchmark the groups having a permission.
+
+        :return:
+        :rtype:
+        """
+
+        view = GroupsTableView.as_view()
+        url = reverse("aa_permission_management:get_groups")
+        params = {
+            **_datatables_params(columns=len(GroupsTableView.columns)),
+            "permission": self.dataset["permission_ids"][0],
+        }
+
+        self._measure(
+            "groups_table_view_by_has_permission",
+            lambda: self._get(view, url, params=params),
+        )
+
+    def test_permission_holders_table_views(self):
+        """
+        Benchmark the first pages of the groups, states and users holding a
+        permission.
+
+        :return:
+        :rtype:
+        """
+
+        permission_id = self.dataset["permission_ids"][0]
+
+        for name, view_class, url_name in (
+            ("permission_groups_table_view", PermissionGroupsTableView, "groups"),
+            ("permission_states_table_view", PermissionStatesTableView, "states"),
+            ("permission_users_table_view", PermissionUsersTableView, "users"),
+        ):
+            view = view_class.as_view()
+            url = reverse(
+                f"aa_permission_management:get_permission_{url_name}",
+                kwargs={"permission_id": permission_id},
+            )
+            params = _datatables_params(columns=len(view_class.columns))
+
+            self._measure(
+                name,
+                lambda view=view, url=url, params=params: self._get(
+                    view, url, params=params, permission_id=permission_id
+                ),
+            )
+
+    def test_export_permissions(self):
+        """
+        Benchmark streaming the complete export, whose peak memory must not grow
+        with the number of assignments.
+
+        :return:
+        :rtype:
+        """
+
+        url = reverse("aa_permission_management:export_permissions")
+
+        for export_format in ("csv", "jsonl"):
+            self._measure(
+                f"export_permissions_{export_format}",
+                # Consume the stream without keeping it
+                lambda export_format=export_format: deque(
+                    self._get(
+                        export_permissions, url, params={"format": export_format}
+                    ).streaming_content,
+                    maxlen=0,
+                ),
+            )
+
+    def test_ajax_get_audit_log(self):
+        """
+        Benchmark the first and a deep page of the audit log.
+
+        :return:
+        :rtype:
+        """
+
+        url = reverse("aa_permission_management:get_audit_log")
+        # Cursor of the page right before the oldest entries
+        deep_cursor = next(
+            iter(
+                PermissionAuditLog.objects.order_by("id").values_list("id", flat=True)[
+                    50:51
+                ]
+            ),
+            "",
+        )
+
+        for name, after in (
+            ("ajax_get_audit_log_first_page", ""),
+            ("ajax_get_audit_log_deep_page", deep_cursor),
+        ):
+            params = {"draw": 1, "start": 0, "length": 50, "after": after}
+
+            self._measure(
+                name,
+                lambda params=params: self._get(ajax_get_audit_log, url, params=params),
+            )
+
+    def test_ajax_get_permissions(self):
+        """
+        Benchmark the permission panel of a group and a state.
+
+        :return:
+        :rtype:
+        """
+
+        for permission_type, element_id in (
+            ("group", self.group_id),
+            ("state", self.state_id),
+        ):
+            kwargs = {"permission_type": permission_type, "element_id": element_id}
+            url = reverse("aa_permission_management:get_permissions", kwargs=kwargs)
+
+            self._measure(
+                f"ajax_get_permissions_{permission_type}",
+                lambda url=url, kwargs=kwargs: self._get(
+                    ajax_get_permissions, url, **kwargs
+                ),
+            )
+
+    def test_ajax_get_permissions_json(self):
+        """
+        Benchmark the JSON permission panel of a group, uncached, cached and conditional.
+
+        :return:
+        :rtype:
+        """
+
+        kwargs = {"permission_type": "group", "element_id": self.group_id}
+        url = reverse("aa_permission_management:get_permissions_json", kwargs=kwargs)
+
+        self._measure(
+            "ajax_get_permissions_json_uncached",
+            lambda: self._get(ajax_get_permissions_json, url, **kwargs),
+            setup=lambda: bump_permission_set_versions(
+                target_type="group", target_ids=[self.group_id]
+            ),
+        )
+        self._measure(
+            "ajax_get_permissions_json_cached",
+            lambda: self._get(ajax_get_permissions_json, url, **kwargs),
+        )
+
+        etag = self._get(ajax_get_permissions_json, url, **kwargs)["ETag"]
+
+        self._measure(
+            "ajax_get_permissions_json_not_modified",
+            lambda: self._get(
+                ajax_get_permissions_json,
+                url,
+                headers={"If-None-Match": etag},
+                **kwargs,
+            ),
+        )
+
+    def test_ajax_get_permission_catalog(self):
+        """
+        Benchmark the columnar permission catalog.
+
+        :return:
+        :rtype:
+        """
+
+        url = reverse("aa_permission_management:get_permission_catalog")
+
+        self._measure(
+            "ajax_get_permission_catalog",
+            lambda: self._get(ajax_get_permission_catalog, url),
+        )
+
+    def test_ajax_update_permissions(self):
+        """
+        Benchmark saving the permissions of a group and a state.
+
+        Every run switches between two permission sets, so every run changes
+        something.
+
+        :return:
+        :rtype:
+        """
+
+        url = reverse("aa_permission_management:update_permissions")
+        permission_ids = self.dataset["permission_ids"]
+        size = self.dataset_size["permissions_per_group"]
+
+        for permission_type, element_id in (
+            ("group", self.group_id),
+            ("state", self.state_id),
+        ):
+            bodies = cycle(
+                json.dumps(
+                    {
+                        "permission_type": permission_type,
+                        "element_id": element_id,
+                        "permissions": permissions,
+                    }
+                )
+                for permissions in (permission_ids[:size], permission_ids[-size:])
+            )
+
+            def update(bodies=bodies):
+                request = self.factory.post(
+                    url, data=next(bodies), content_type="application/json"
+                )
+                request.user = self.user_with_permission
+
+                return ajax_update_permissions(request)
+
+            self._measure(f"ajax_update_permissions_{permission_type}", update)
+
+    def test_ajax_update_permissions_delta(self):
+        """
+        Benchmark saving a small change to the permissions of a group and a state.
+
+        Every run switches between adding and removing the same permissions, so
+        every run changes something.
+
+        :return:
+        :rtype:
+        """
+
+        url = reverse("aa_permission_management:update_permissions")
+        permission_ids = self.dataset["permission_ids"][-5:]
+
+        for permission_type, element_id in (
+            ("group", self.group_id),
+            ("state", self.state_id),
+        ):
+            bodies = cycle(
+                json.dumps(
+                    {
+                        "permission_type": permission_type,
+                        "element_id": element_id,
+                        key: permission_ids,
+                    }
+                )
+                for key in ("add", "remove")
+            )
+
+            def update(bodies=bodies):
+                request = self.factory.post(
+                    url, data=next(bodies), content_type="application/json"
+                )
+                request.user = self.user_with_permission
+
+                return ajax_update_permissions(request)
+
+            self._measure(f"ajax_update_permissions_delta_{permission_type}", update)
@@ -0,0 +1,304 @@
+"""
+Synthetic Alliance Auth data for the benchmarks.
+
+Everything is written with bulk inserts, so no signals are sent. The catalog
+version is bumped and the member counters are recounted at the end instead.
+"""
+
+# Standard Library
+import os
+import random
+from itertools import islice
+
+# Django
+from django.contrib.auth.models import Group, User
+from django.contrib.contenttypes.models import ContentType
+
+# Alliance Auth
+from allianceauth.authentication.models import (
+    Permission,
+    State,
+    UserProfile,
+    get_guest_state_pk,
+)
+from allianceauth.groupmanagement.models import AuthGroup
+
+# AA Permission Management
+from aa_permission_management.helper.catalog import bump_catalog_version
+from aa_permission_management.helper.member_counts import (
+    recount_group_member_counts,
+    recount_state_member_counts,
+)
+from aa_permission_management.models import PermissionAuditLog, PermissionSetVersion
+
+ENV_PREFIX = "AA_PERMISSION_MANAGEMENT_BENCHMARK_"
+NAME_PREFIX = "benchmark"
+BATCH_SIZE = 5000
+
+# Dataset sizes per scale
+SCALES = {
+    "small": {
+        "users": 2000,
+        "states": 5,
+        "groups": 100,
+        "memberships_per_user": 5,
+        "permissions": 800,
+        "permissions_per_group": 20,
+        "permissions_per_state": 100,
+        "audit_log_entries": 50_000,
+    },
+    "large": {
+        "users": 100_000,
+        "states": 20,
+        "groups": 2000,
+        "memberships_per_user": 10,
+        "permissions": 8000,
+        "permissions_per_group": 50,
+        "permissions_per_state": 500,
+        "audit_log_entries": 2_000_000,
+    },
+}
+
+# Permissions per synthetic content type
+PERMISSIONS_PER_CONTENT_TYPE = 4
+
+
+def get_dataset_size() -> dict:
+    """
+    Get the dataset size from the environment.
+
+    `AA_PERMISSION_MANAGEMENT_BENCHMARK_SCALE` selects one of the scales in
+    `SCALES` (default: "small"), and every single size can be overridden, e.g.
+    with `AA_PERMISSION_MANAGEMENT_BENCHMARK_USERS=50000`.
+
+    :return: Dataset size
+    :rtype: dict
+    """
+
+    scale = os.environ.get(f"{ENV_PREFIX}SCALE", "small")
+
+    try:
+        size = dict(SCALES[scale])
+    except KeyError as exc:
+        raise ValueError(f"Unknown benchmark scale: {scale}") from exc
+
+    for key, value in size.items():
+        size[key] = int(os.environ.get(f"{ENV_PREFIX}{key.upper()}", value))
+
+    return size
+
+
+def _batched(iterable, size: int):
+    """
+    Split an iterable into lists of the given size.
+
+    :param iterable:
+    :type iterable:
+    :param size:
+    :type size:
+    :return:
+    :rtype:
+    """
+
+    iterator = iter(iterable)
+
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _bulk_create(model, objects) -> None:
+    """
+    Bulk create objects in batches.
+
+    :param model:
+    :type model:
+    :param objects:
+    :type objects:
+    :return:
+    :rtype:
+    """
+
+    for batch in _batched(objects, BATCH_SIZE):
+        model.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+
+
+def generate_dataset(  # pylint: disable=too-many-arguments,too-many-locals
+    *,
+    users: int,
+    states: int,
+    groups: int,
+    memberships_per_user: int,
+    permissions: int,
+    permissions_per_group: int,
+    permissions_per_state: int,
+    audit_log_entries: int = 0,
+    seed: int = 42,
+) -> dict:
+    """
+    Generate a synthetic Alliance Auth dataset.
+
+    The same arguments always generate the same dataset.
+
+    :param users: Number of users
+    :type users: int
+    :param states: Number of states (besides the ones Alliance Auth creates)
+    :type states: int
+    :param groups: Number of groups
+    :type groups: int
+    :param memberships_per_user: Number of groups per user
+    :type memberships_per_user: int
+    :param permissions: Number of permissions
+    :type permissions: int
+    :param permissions_per_group: Number of permissions per group
+    :type permissions_per_group: int
+    :param permissions_per_state: Number of permissions per state
+    :type permissions_per_state: int
+    :param audit_log_entries: Number of audit log entries
+    :type audit_log_entries: int
+    :param seed: Random seed
+    :type seed: int
+    :return: IDs of the generated states, groups, users and permissions
+    :rtype: dict
+    """
+
+    rng = random.Random(seed)
+
+    # Permissions, spread over synthetic content types
+    content_type_count = -(-permissions // PERMISSIONS_PER_CONTENT_TYPE)
+
+    _bulk_create(
+        ContentType,
+        (
+            ContentType(app_label=NAME_PREFIX, model=f"model{i}")
+            for i in range(content_type_count)
+        ),
+    )
+
+    content_type_ids = list(
+        ContentType.objects.filter(app_label=NAME_PREFIX)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    _bulk_create(
+        Permission,
+        (
+            Permission(
+                content_type_id=content_type_ids[i // PERMISSIONS_PER_CONTENT_TYPE],
+                codename=f"{NAME_PREFIX}_permission_{i}",
+                name=f"Benchmark permission {i}",
+            )
+            for i in range(permissions)
+        ),
+    )
+
+    permission_ids = list(
+        Permission.objects.filter(content_type__app_label=NAME_PREFIX)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    # States, with priorities above the ones Alliance Auth creates
+    _bulk_create(
+        State,
+        (
+            State(name=f"{NAME_PREFIX} state {i}", priority=10_000 + i)
+            for i in range(states)
+        ),
+    )
+
+    state_ids = list(
+        State.objects.filter(name__startswith=f"{NAME_PREFIX} state")
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    _bulk_create(
+        State.permissions.through,
+        (
+            State.permissions.through(state_id=state_id, permission_id=permission_id)
+            for state_id in state_ids
+            for permission_id in rng.sample(
+                permission_ids, min(permissions_per_state, len(permission_ids))
+            )
+        ),
+    )
+
+    # Groups
+    _bulk_create(Group, (Group(name=f"{NAME_PREFIX} group {i}") for i in range(groups)))
+
+    group_ids = list(
+        Group.objects.filter(name__startswith=f"{NAME_PREFIX} group")
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    _bulk_create(AuthGroup, (AuthGroup(group_id=group_id) for group_id in group_ids))
+    _bulk_create(
+        Group.permissions.through,
+        (
+            Group.permissions.through(group_id=group_id, permission_id=permission_id)
+            for group_id in group_ids
+            for permission_id in rng.sample(
+                permission_ids, min(permissions_per_group, len(permission_ids))
+            )
+        ),
+    )
+
+    # Users, with their profiles and group memberships
+    _bulk_create(
+        User,
+        (User(username=f"{NAME_PREFIX}_user_{i}", password="!") for i in range(users)),
+    )
+
+    user_ids = list(
+        User.objects.filter(username__startswith=f"{NAME_PREFIX}_user_")
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    profile_state_ids = state_ids or [get_guest_state_pk()]
+
+    _bulk_create(
+        UserProfile,
+        (
+            UserProfile(user_id=user_id, state_id=rng.choice(profile_state_ids))
+            for user_id in user_ids
+        ),
+    )
+    _bulk_create(
+        User.groups.through,
+        (
+            User.groups.through(user_id=user_id, group_id=group_id)
+            for user_id in user_ids
+            for group_id in rng.sample(
+                group_ids, min(memberships_per_user, len(group_ids))
+            )
+        ),
+    )
+
+    # Audit log entries of random changes by random users
+    _bulk_create(
+        PermissionAuditLog,
+        (
+            PermissionAuditLog(
+                actor_id=rng.choice(user_ids),
+                target_type=PermissionSetVersion.TargetType.GROUP,
+                target_id=rng.choice(group_ids),
+                permission_id=rng.choice(permission_ids),
+                action=rng.choice(PermissionAuditLog.Action.values),
+            )
+            for _ in range(audit_log_entries if group_ids and user_ids else 0)
+        ),
+    )
+
+    bump_catalog_version()
+    recount_group_member_counts(group_ids=group_ids)
+    recount_state_member_counts(state_ids=State.objects.values_list("pk", flat=True))
+
+    return {
+        "state_ids": state_ids,
+        "group_ids": group_ids,
+        "user_ids": user_ids,
+        "permission_ids": permission_ids,
+    }
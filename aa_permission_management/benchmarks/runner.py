@@ -0,0 +1,129 @@
+"""
+Measuring and reporting benchmarks.
+
+Every measurement is reported as one JSON object per line, either appended to the
+file set in `AA_PERMISSION_MANAGEMENT_BENCHMARK_OUTPUT` or written to stdout.
+"""
+
+# Standard Library
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+
+# Django
+import django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# AA Permission Management
+from aa_permission_management import __version__
+from aa_permission_management.benchmarks.data import ENV_PREFIX
+
+
+def measure(  # pylint: disable=too-many-arguments
+    name: str,
+    func: Callable,
+    setup: Callable | None = None,
+    repeat: int = 5,
+    warmup: int = 1,
+    **labels,
+) -> dict:
+    """
+    Measure the wall time, query count and peak memory of a callable.
+
+    Wall time is measured over `repeat` runs after `warmup` runs. Query count and
+    peak memory are measured in one extra run, so tracing doesn't distort the
+    timings. `setup` runs before every run and isn't measured.
+
+    :param name: Benchmark name
+    :type name: str
+    :param func: Callable to measure
+    :type func: Callable
+    :param setup: Callable to run before every run
+    :type setup: Callable | None
+    :param repeat: Number of timed runs
+    :type repeat: int
+    :param warmup: Number of runs before the timed runs
+    :type warmup: int
+    :param labels: Additional labels for the result, e.g. the dataset size
+    :type labels: Any
+    :return: Benchmark result
+    :rtype: dict
+    """
+
+    def run() -> None:
+        if setup is not None:
+            setup()
+
+        func()
+
+    for _ in range(warmup):
+        run()
+
+    timings = []
+
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    if setup is not None:
+        setup()
+
+    with CaptureQueriesContext(connection) as queries:
+        tracemalloc.start()
+
+        try:
+            func()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    result = {
+        "benchmark": name,
+        "app_version": __version__,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "repeat": repeat,
+        "wall_time_ms": {
+            "min": round(min(timings), 3),
+            "median": round(statistics.median(timings), 3),
+            "max": round(max(timings), 3),
+        },
+        "queries": len(queries),
+        "peak_memory_kib": round(peak_memory / 1024, 1),
+        **labels,
+    }
+
+    report(result)
+
+    return result
+
+
+def report(result: dict) -> None:
+    """
+    Report a benchmark result as a JSON line.
+
+    :param result: Benchmark result
+    :type result: dict
+    :return:
+    :rtype:
+    """
+
+    line = json.dumps(result, sort_keys=True)
+    output = os.environ.get(f"{ENV_PREFIX}OUTPUT")
+
+    if output:
+        with open(output, "a", encoding="utf-8") as file:
+            file.write(f"{line}\n")
+    else:
+        sys.stdout.write(f"{line}\n")
@@ -3,3 +3,72 @@ Constants for the AA Permission Management module.
 """
 
 INTERNAL_URL_PREFIX = "-"
+
+# Cache keys
+CACHE_KEY_PREFIX = "aa_permission_management"
+CATALOG_VERSION_CACHE_KEY = f"{CACHE_KEY_PREFIX}:permission_catalog:version"
+CATALOG_DATA_CACHE_KEY = f"{CACHE_KEY_PREFIX}:permission_catalog:data"
+CATALOG_LOCK_CACHE_KEY = f"{CACHE_KEY_PREFIX}:permission_catalog:lock"
+PERMISSION_SET_CACHE_KEY = f"{CACHE_KEY_PREFIX}:permission_set:data"
+EFFECTIVE_PERMISSIONS_CACHE_KEY = f"{CACHE_KEY_PREFIX}:effective_permissions:data"
+EFFECTIVE_PERMISSIONS_VERSION_CACHE_KEY = (
+    f"{CACHE_KEY_PREFIX}:effective_permissions:version"
+)
+PERMISSION_IMPACT_CACHE_KEY = f"{CACHE_KEY_PREFIX}:permission_impact:data"
+
+# Permission catalog cache timings (in seconds)
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+CATALOG_LOCK_TIMEOUT = 30
+CATALOG_LOCK_WAIT = 5
+CATALOG_LOCK_POLL_INTERVAL = 0.1
+
+# Permission set payload cache timings (in seconds)
+PERMISSION_SET_CACHE_TIMEOUT = 60 * 60
+
+# Effective permissions payload cache timings (in seconds)
+EFFECTIVE_PERMISSIONS_CACHE_TIMEOUT = 60 * 60
+
+# Permission change impact cache timings (in seconds), long enough for a preview
+PERMISSION_IMPACT_CACHE_TIMEOUT = 60 * 5
+
+# Maximum number of permissions in one impact preview
+PERMISSION_IMPACT_MAX_PERMISSIONS = 100
+
+# Number of rows per page of the groups and states tables on the dashboard
+DASHBOARD_TABLE_PAGE_LENGTH = 10
+
+# Maximum number of audit log entries per page
+AUDIT_LOG_MAX_LENGTH = 100
+
+# Maximum number of users returned by the user search
+USER_SEARCH_MAX_RESULTS = 20
+
+# Maximum numbers of rows and columns per page of the permission matrix, together
+# below the 999 query parameters SQLite allows
+MATRIX_MAX_ROWS = 200
+MATRIX_MAX_COLUMNS = 500
+
+# Number of permission assignments fetched and written at once by the export
+EXPORT_CHUNK_SIZE = 2000
+
+# Number of targets read and changes written at once by the import, below the 999
+# query parameters SQLite allows
+IMPORT_CHUNK_SIZE = 400
+
+# Maximum numbers of row errors and changed targets listed in an import report
+IMPORT_MAX_ERRORS = 100
+IMPORT_REPORT_MAX_TARGETS = 500
+
+# Number of groups and states written or compared at once by snapshots, below the
+# 999 query parameters SQLite allows
+SNAPSHOT_CHUNK_SIZE = 400
+
+# Number of stored chunks of a background job written at once, each holding the
+# payload of a whole Celery task
+JOB_CHUNK_BATCH_SIZE = 100
+
+# Maximum number of snapshots listed, newest first
+SNAPSHOTS_MAX_LISTED = 100
+
+# Session key of the time of the last write, for reading your writes from the primary
+LAST_WRITE_SESSION_KEY = "aa_permission_management_last_write"
@@ -0,0 +1,218 @@
+"""
+Audit log of permission changes.
+
+Entries are written in bulk, in the transaction of the change they record, and
+read with keyset pagination, so reading a page costs the same no matter how many
+entries there are.
+"""
+
+# Standard Library
+from collections.abc import Iterable
+from datetime import datetime
+
+# Django
+from django.contrib.auth.models import Group, User
+
+# Alliance Auth
+from allianceauth.authentication.models import State
+
+# AA Permission Management
+from aa_permission_management.helper.catalog import get_permission_catalog
+from aa_permission_management.models import PermissionAuditLog, PermissionSetVersion
+
+
+def log_permission_changes(
+    target_type: str,
+    added: Iterable[tuple[int, int]] = (),
+    removed: Iterable[tuple[int, int]] = (),
+    actor: User | None = None,
+) -> int:
+    """
+    Write audit log entries for permissions added to and removed from groups or states.
+
+    :param target_type: Target type ("group" or "state")
+    :type target_type: str
+    :param added: Added permissions as (target ID, permission ID) pairs
+    :type added: Iterable[tuple[int, int]]
+    :param removed: Removed permissions as (target ID, permission ID) pairs
+    :type removed: Iterable[tuple[int, int]]
+    :param actor: User who made the change
+    :type actor: User | None
+    :return: Number of written entries
+    :rtype: int
+    """
+
+    actor_id = getattr(actor, "pk", None)
+    entries = [
+        PermissionAuditLog(
+            actor_id=actor_id,
+            target_type=target_type,
+            target_id=target_id,
+            permission_id=permission_id,
+            action=action,
+        )
+        for action, changes in (
+            (PermissionAuditLog.Action.REMOVE, removed),
+            (PermissionAuditLog.Action.ADD, added),
+        )
+        for target_id, permission_id in changes
+    ]
+
+    if entries:
+        PermissionAuditLog.objects.bulk_create(entries)
+
+    return len(entries)
+
+
+def get_audit_log_page(
+    limit: int,
+    after: int | None = None,
+    target_type: str | None = None,
+    target_id: int | None = None,
+) -> dict:
+    """
+    Get a page of audit log entries, newest first.
+
+    Pages are addressed by the ID of the last entry of the previous page instead of
+    an offset, and nothing is counted, so every page is an index range scan.
+
+    :param limit: Maximum number of entries
+    :type limit: int
+    :param after: ID of the last entry of the previous page
+    :type after: int | None
+    :param target_type: Only entries of this target type ("group" or "state")
+    :type target_type: str | None
+    :param target_id: Only entries of this group or state, requires `target_type`
+    :type target_id: int | None
+    :return: Entries of the page and the cursor of the next page, if any
+    :rtype: dict
+    """
+
+    entries = PermissionAuditLog.objects.order_by("-id")
+
+    if target_type:
+        entries = entries.filter(target_type=target_type)
+
+        if target_id is not None:
+            entries = entries.filter(target_id=target_id)
+
+    if after is not None:
+        entries = entries.filter(id__lt=after)
+
+    rows = list(
+        entries.values(
+            "id",
+            "timestamp",
+            "actor__username",
+            "target_type",
+            "target_id",
+            "permission_id",
+            "action",
+        )[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    target_ids = {
+        PermissionSetVersion.TargetType.GROUP: set(),
+        PermissionSetVersion.TargetType.STATE: set(),
+    }
+
+    for row in rows:
+        target_ids[row["target_type"]].add(row["target_id"])
+
+    names = {
+        (target_type_, pk): name
+        for target_type_, model in (
+            (PermissionSetVersion.TargetType.GROUP, Group),
+            (PermissionSetVersion.TargetType.STATE, State),
+        )
+        if target_ids[target_type_]
+        for pk, name in model.objects.filter(
+            pk__in=target_ids[target_type_]
+        ).values_list("pk", "name")
+    }
+    permission_ids = {row["permission_id"] for row in rows}
+    permissions = {
+        permission.pk: permission
+        for permission in get_permission_catalog()
+        if permission.pk in permission_ids
+    }
+    actions = dict(PermissionAuditLog.Action.choices)
+    target_types = dict(PermissionSetVersion.TargetType.choices)
+    result = []
+
+    for row in rows:
+        permission = permissions.get(row["permission_id"])
+
+        result.append(
+            {
+                "id": row["id"],
+                "timestamp": row["timestamp"].isoformat(),
+                "actor": row["actor__username"] or "",
+                "target_type": row["target_type"],
+                "target_type_display": str(target_types[row["target_type"]]),
+                "target_id": row["target_id"],
+                "target": names.get((row["target_type"], row["target_id"]), ""),
+                "permission_id": row["permission_id"],
+                "permission": (
+                    f"{permission.content_type.app_label}.{permission.codename}"
+                    if permission
+                    else ""
+                ),
+                "permission_name": permission.name if permission else "",
+                "action": row["action"],
+                "action_display": str(actions[row["action"]]),
+            }
+        )
+
+    return {"entries": result, "next": rows[-1]["id"] if has_more else None}
+
+
+def prune_audit_log_batch(before: datetime, batch_size: int = 5000) -> int:
+    """
+    Delete the oldest batch of audit log entries older than the given time.
+
+    :param before: Delete entries older than this
+    :type before: datetime
+    :param batch_size: Number of entries to delete
+    :type batch_size: int
+    :return: Number of deleted entries
+    :rtype: int
+    """
+
+    pks = list(
+        PermissionAuditLog.objects.filter(timestamp__lt=before)
+        .order_by("timestamp")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+
+    if not pks:
+        return 0
+
+    return PermissionAuditLog.objects.filter(pk__in=pks).delete()[0]
+
+
+def prune_audit_log(before: datetime, batch_size: int = 5000) -> int:
+    """
+    Delete audit log entries older than the given time, in chunks.
+
+    Every chunk is a separate DELETE by primary key, so the table is never locked
+    for long and the database doesn't have to hold one huge transaction.
+
+    :param before: Delete entries older than this
+    :type before: datetime
+    :param batch_size: Number of entries per chunk
+    :type batch_size: int
+    :return: Number of deleted entries
+    :rtype: int
+    """
+
+    deleted = 0
+
+    while True:
+        batch = prune_audit_log_batch(before=before, batch_size=batch_size)
+        deleted += batch
+
+        if batch < batch_size:
+            return deleted
@@ -0,0 +1,221 @@
+"""
+Permission catalog cache.
+
+The catalog of all Django permissions is cached in two tiers:
+
+1. A per-process copy, which is used as long as its version matches the current
+   catalog version.
+2. A shared copy in Django's cache, keyed by the catalog version.
+
+The catalog version is a random token stored in Django's cache. It is bumped
+whenever permissions or content types change (see :mod:`aa_permission_management.signals`),
+which makes both tiers stale at once.
+"""
+
+# Standard Library
+import time
+from uuid import uuid4
+
+# Django
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.utils.translation import get_language
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission
+from allianceauth.services.hooks import get_extension_logger
+
+# AA Permission Management
+from aa_permission_management.constants import (
+    CATALOG_CACHE_TIMEOUT,
+    CATALOG_DATA_CACHE_KEY,
+    CATALOG_LOCK_CACHE_KEY,
+    CATALOG_LOCK_POLL_INTERVAL,
+    CATALOG_LOCK_TIMEOUT,
+    CATALOG_LOCK_WAIT,
+    CATALOG_VERSION_CACHE_KEY,
+)
+from aa_permission_management.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(name=__name__))
+
+# Per-process copy of the catalog
+_local_catalog: dict = {"version": None, "permissions": None, "columns": {}}
+
+
+def get_catalog_version() -> str:
+    """
+    Get the current catalog version, initializing it if needed.
+
+    :return: Catalog version
+    :rtype: str
+    """
+
+    version = cache.get(key=CATALOG_VERSION_CACHE_KEY)
+
+    if version is None:
+        # Only one process wins, everyone else reads the winner's token
+        cache.add(key=CATALOG_VERSION_CACHE_KEY, value=uuid4().hex, timeout=None)
+        version = cache.get(key=CATALOG_VERSION_CACHE_KEY)
+
+    return version
+
+
+def bump_catalog_version() -> str:
+    """
+    Bump the catalog version, invalidating all cached catalog copies.
+
+    :return: New catalog version
+    :rtype: str
+    """
+
+    version = uuid4().hex
+
+    cache.set(key=CATALOG_VERSION_CACHE_KEY, value=version, timeout=None)
+
+    _local_catalog.update(version=None, permissions=None, columns={})
+
+    logger.debug("Permission catalog version bumped to %s", version)
+
+    return version
+
+
+def hydrate_permissions(queryset: QuerySet) -> QuerySet:
+    """
+    Hydrate a permission queryset with its content types and order it
+    deterministically, so rendering a permission doesn't cost a query.
+
+    :param queryset: Permission queryset
+    :type queryset: QuerySet
+    :return: Hydrated and ordered permission queryset
+    :rtype: QuerySet
+    """
+
+    return queryset.select_related("content_type").order_by(
+        "content_type__app_label", "content_type__model", "codename"
+    )
+
+
+def _build_catalog() -> list:
+    """
+    Build the catalog from the database.
+
+    :return: List of all permissions
+    :rtype: list
+    """
+
+    return list(hydrate_permissions(Permission.objects.all()))
+
+
+def _rebuild_catalog(version: str) -> list:
+    """
+    Rebuild the shared catalog copy for the given version.
+
+    Only the process holding the lock rebuilds the catalog, everyone else waits
+    for it to show up in the cache. If it doesn't show up in time, the catalog is
+    built from the database without storing it.
+
+    :param version: Catalog version
+    :type version: str
+    :return: List of all permissions
+    :rtype: list
+    """
+
+    data_key = f"{CATALOG_DATA_CACHE_KEY}:{version}"
+    lock_key = f"{CATALOG_LOCK_CACHE_KEY}:{version}"
+
+    if cache.add(key=lock_key, value=True, timeout=CATALOG_LOCK_TIMEOUT):
+        try:
+            permissions = _build_catalog()
+            cache.set(key=data_key, value=permissions, timeout=CATALOG_CACHE_TIMEOUT)
+
+            logger.debug(
+                "Permission catalog %s rebuilt with %d permissions",
+                version,
+                len(permissions),
+            )
+        finally:
+            cache.delete(key=lock_key)
+
+        return permissions
+
+    deadline = time.monotonic() + CATALOG_LOCK_WAIT
+
+    while time.monotonic() < deadline:
+        time.sleep(CATALOG_LOCK_POLL_INTERVAL)
+
+        permissions = cache.get(key=data_key)
+
+        if permissions is not None:
+            return permissions
+
+    logger.debug("Timed out waiting for permission catalog %s", version)
+
+    return _build_catalog()
+
+
+def get_permission_catalog() -> list:
+    """
+    Get the catalog of all permissions.
+
+    :return: List of all permissions
+    :rtype: list
+    """
+
+    version = get_catalog_version()
+
+    if _local_catalog["version"] == version:
+        return _local_catalog["permissions"]
+
+    permissions = cache.get(key=f"{CATALOG_DATA_CACHE_KEY}:{version}")
+
+    if permissions is None:
+        permissions = _rebuild_catalog(version=version)
+
+    _local_catalog.update(version=version, permissions=permissions, columns={})
+
+    return permissions
+
+
+def get_permission_catalog_columns() -> dict:
+    """
+    Get the catalog of all permissions as compact columnar arrays.
+
+    Content type labels are translated, so the columns are memoized per catalog
+    version and language.
+
+    :return: Columnar permission catalog
+    :rtype: dict
+    """
+
+    permissions = get_permission_catalog()
+    version = _local_catalog["version"]
+    language = get_language()
+
+    if language in _local_catalog["columns"]:
+        return _local_catalog["columns"][language]
+
+    content_types = {}
+    columns = {
+        "version": version,
+        "language": language,
+        "content_types": [],
+        "ids": [],
+        "codenames": [],
+        "names": [],
+        "content_type_index": [],
+    }
+
+    for permission in permissions:
+        if permission.content_type_id not in content_types:
+            content_types[permission.content_type_id] = len(content_types)
+            columns["content_types"].append(str(permission.content_type))
+
+        columns["ids"].append(permission.pk)
+        columns["codenames"].append(permission.codename)
+        columns["names"].append(permission.name)
+        columns["content_type_index"].append(content_types[permission.content_type_id])
+
+    _local_catalog["columns"][language] = columns
+
+    return columns
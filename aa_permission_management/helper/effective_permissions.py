@@ -0,0 +1,323 @@
+"""
+Effective permissions of users.
+
+A user's effective permissions are the union of the permissions assigned to the
+user directly, to any of the user's groups, and to the state of the user's
+profile.
+
+Resolved permissions are cached under a fingerprint of everything they depend on:
+
+1. The catalog version, for the permission details.
+2. A per-user version token in Django's cache, which is bumped whenever the
+   user's direct permissions or flags change (see :mod:`aa_permission_management.signals`).
+3. The user's state and groups with their permission set versions, which are read
+   with a single query on every call.
+
+So a cached result is never served after any of them has changed, and nothing has
+to be invalidated when a group or state changes its permissions.
+"""
+
+# Standard Library
+import hashlib
+from collections.abc import Iterable
+from uuid import uuid4
+
+# Django
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db.models import CharField, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# Alliance Auth
+from allianceauth.authentication.models import State, UserProfile
+
+# AA Permission Management
+from aa_permission_management.constants import (
+    EFFECTIVE_PERMISSIONS_CACHE_KEY,
+    EFFECTIVE_PERMISSIONS_CACHE_TIMEOUT,
+    EFFECTIVE_PERMISSIONS_VERSION_CACHE_KEY,
+)
+from aa_permission_management.helper.catalog import (
+    get_catalog_version,
+    get_permission_catalog,
+)
+from aa_permission_management.models import PermissionSetVersion
+
+# Source types of effective permissions
+SOURCE_USER = "user"
+SOURCE_GROUP = PermissionSetVersion.TargetType.GROUP.value
+SOURCE_STATE = PermissionSetVersion.TargetType.STATE.value
+
+
+def get_user_permission_version(user_id: int) -> str:
+    """
+    Get the version token of a user's direct permissions and flags, initializing
+    it if needed.
+
+    :param user_id: ID of the user
+    :type user_id: int
+    :return: Version token
+    :rtype: str
+    """
+
+    key = f"{EFFECTIVE_PERMISSIONS_VERSION_CACHE_KEY}:{user_id}"
+    version = cache.get(key=key)
+
+    if version is None:
+        # Only one process wins, everyone else reads the winner's token
+        cache.add(key=key, value=uuid4().hex, timeout=None)
+        version = cache.get(key=key)
+
+    return version
+
+
+def bump_user_permission_versions(user_ids: Iterable[int]) -> None:
+    """
+    Bump the version tokens of the given users, so their effective permissions
+    are resolved again.
+
+    :param user_ids: IDs of the users
+    :type user_ids: Iterable[int]
+    :return:
+    :rtype:
+    """
+
+    keys = [
+        f"{EFFECTIVE_PERMISSIONS_VERSION_CACHE_KEY}:{user_id}"
+        for user_id in set(user_ids)
+    ]
+
+    if keys:
+        cache.delete_many(keys=keys)
+
+
+def _version_subquery(target_type: str, target_field: str) -> Coalesce:
+    """
+    Annotation with the permission set version of the group or state a row refers to.
+
+    :param target_type: Target type ("group" or "state")
+    :type target_type: str
+    :param target_field: Name of the field holding the group or state ID
+    :type target_field: str
+    :return: Version annotation, 0 for targets without a version row
+    :rtype: Coalesce
+    """
+
+    return Coalesce(
+        Subquery(
+            PermissionSetVersion.objects.filter(
+                target_type=target_type, target_id=OuterRef(target_field)
+            ).values("version")[:1]
+        ),
+        0,
+    )
+
+
+def _get_fingerprint(user_id: int) -> str:
+    """
+    Get a fingerprint of the user's state and groups with their permission set
+    versions, with a single query.
+
+    :param user_id: ID of the user
+    :type user_id: int
+    :return: Fingerprint
+    :rtype: str
+    """
+
+    state = (
+        UserProfile.objects.filter(user_id=user_id)
+        .annotate(
+            target_type=Value(SOURCE_STATE, output_field=CharField()),
+            target_id=F("state_id"),
+            version=_version_subquery(SOURCE_STATE, "state_id"),
+        )
+        .values_list("target_type", "target_id", "version")
+    )
+    groups = (
+        User.groups.through.objects.filter(user_id=user_id)
+        .annotate(
+            target_type=Value(SOURCE_GROUP, output_field=CharField()),
+            target_id=F("group_id"),
+            version=_version_subquery(SOURCE_GROUP, "group_id"),
+        )
+        .values_list("target_type", "target_id", "version")
+    )
+    rows = sorted(state.union(groups, all=True), key=lambda row: row[:2])
+
+    return hashlib.md5(repr(rows).encode(), usedforsecurity=False).hexdigest()
+
+
+def _resolve_effective_permissions(user_id: int) -> dict:
+    """
+    Resolve the effective permissions of a user from the database.
+
+    Costs three queries: the user with its state, the user's groups, and the
+    permissions of all sources at once.
+
+    :param user_id: ID of the user
+    :type user_id: int
+    :return: Effective permissions
+    :rtype: dict
+    """
+
+    user = (
+        User.objects.filter(pk=user_id)
+        .values(
+            "username",
+            "is_active",
+            "is_superuser",
+            "profile__state_id",
+            "profile__state__name",
+        )
+        .first()
+    )
+
+    if user is None:
+        raise ValueError("User does not exist")
+
+    state_id = user["profile__state_id"]
+    groups = list(
+        Group.objects.filter(user__pk=user_id).order_by("name").values("id", "name")
+    )
+
+    # One UNION ALL over the three through tables, tagged with their source
+    sources = User.user_permissions.through.objects.filter(user_id=user_id).annotate(
+        source_type=Value(SOURCE_USER, output_field=CharField()),
+        source_id=F("user_id"),
+    )
+    sources = sources.values_list("source_type", "source_id", "permission_id").union(
+        Group.permissions.through.objects.filter(
+            group_id__in=[group["id"] for group in groups]
+        )
+        .annotate(
+            source_type=Value(SOURCE_GROUP, output_field=CharField()),
+            source_id=F("group_id"),
+        )
+        .values_list("source_type", "source_id", "permission_id"),
+        State.permissions.through.objects.filter(state_id=state_id)
+        .annotate(
+            source_type=Value(SOURCE_STATE, output_field=CharField()),
+            source_id=F("state_id"),
+        )
+        .values_list("source_type", "source_id", "permission_id"),
+        all=True,
+    )
+
+    permission_sources = {}
+
+    for source_type, source_id, permission_id in sources:
+        permission_sources.setdefault(permission_id, []).append(
+            {"type": source_type, "id": source_id}
+        )
+
+    permissions = [
+        {
+            "id": permission.pk,
+            "permission": f"{permission.content_type.app_label}.{permission.codename}",
+            "name": permission.name,
+            "content_type": str(permission.content_type),
+            "sources": sorted(
+                permission_sources[permission.pk],
+                key=lambda source: (source["type"], source["id"]),
+            ),
+        }
+        for permission in get_permission_catalog()
+        if permission.pk in permission_sources
+    ]
+
+    return {
+        "user_id": user_id,
+        "username": user["username"],
+        "is_active": user["is_active"],
+        "is_superuser": user["is_superuser"],
+        "state": (
+            {"id": state_id, "name": user["profile__state__name"]}
+            if state_id is not None
+            else None
+        ),
+        "groups": groups,
+        "permissions": permissions,
+    }
+
+
+def get_effective_permissions(user_id: int) -> dict:
+    """
+    Get the effective permissions of a user, with the sources each permission is
+    granted by.
+
+    Superusers are flagged, but only their assigned permissions are listed, even
+    though Django grants them every permission.
+
+    :param user_id: ID of the user
+    :type user_id: int
+    :return: User, state, groups, effective permissions and the version they
+        are cached under
+    :rtype: dict
+    """
+
+    version = hashlib.md5(
+        (
+            f"{get_catalog_version()}:{get_user_permission_version(user_id)}:"
+            f"{_get_fingerprint(user_id)}"
+        ).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    cache_key = f"{EFFECTIVE_PERMISSIONS_CACHE_KEY}:{user_id}:{version}"
+    effective_permissions = cache.get(key=cache_key)
+
+    if effective_permissions is None:
+        effective_permissions = {
+            **_resolve_effective_permissions(user_id),
+            "version": version,
+        }
+
+        cache.set(
+            key=cache_key,
+            value=effective_permissions,
+            timeout=EFFECTIVE_PERMISSIONS_CACHE_TIMEOUT,
+        )
+
+    return effective_permissions
+
+
+def get_effective_permission_names(user_id: int) -> set[str]:
+    """
+    Get the effective permissions of a user as "app_label.codename" strings.
+
+    :param user_id: ID of the user
+    :type user_id: int
+    :return: Effective permissions
+    :rtype: set[str]
+    """
+
+    return {
+        permission["permission"]
+        for permission in get_effective_permissions(user_id)["permissions"]
+    }
+
+
+def has_effective_permission(user_id: int, permission: str) -> bool:
+    """
+    Check whether a user effectively has a permission, like `User.has_perm()`
+    does: inactive users have no permissions, active superusers have all of them.
+
+    :param user_id: ID of the user
+    :type user_id: int
+    :param permission: Permission as "app_label.codename"
+    :type permission: str
+    :return: Whether the user has the permission
+    :rtype: bool
+    """
+
+    effective_permissions = get_effective_permissions(user_id)
+
+    if not effective_permissions["is_active"]:
+        return False
+
+    if effective_permissions["is_superuser"]:
+        return True
+
+    return any(
+        assigned["permission"] == permission
+        for assigned in effective_permissions["permissions"]
+    )
@@ -0,0 +1,191 @@
+"""
+Streaming export of the permission assignments of groups and states.
+
+Assignments are read with `.iterator()`, which uses server-side cursors where the
+database supports them, and are serialized chunk by chunk, so memory use doesn't
+depend on the number of assignments.
+"""
+
+# Standard Library
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from itertools import chain, islice
+
+# Django
+from django.contrib.auth.models import Group
+
+# Alliance Auth
+from allianceauth.authentication.models import State
+
+# AA Permission Management
+from aa_permission_management.constants import EXPORT_CHUNK_SIZE
+from aa_permission_management.models import PermissionSetVersion
+
+# Fields of an exported assignment, in the order of the CSV columns
+EXPORT_FIELDS = ("target_type", "target", "app_label", "model", "codename")
+
+# Export formats
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_JSONL = "jsonl"
+
+# Through tables and their target field per target type
+_TARGETS = {
+    PermissionSetVersion.TargetType.GROUP: (Group.permissions.through, "group"),
+    PermissionSetVersion.TargetType.STATE: (State.permissions.through, "state"),
+}
+
+
+class _EchoBuffer:  # pylint: disable=too-few-public-methods
+    """
+    File-like object returning what is written to it, so `csv.writer` can
+    serialize rows without buffering them.
+    """
+
+    def write(self, value: str) -> str:
+        """
+        Return the written value.
+
+        :param value:
+        :type value:
+        :return:
+        :rtype:
+        """
+
+        return value
+
+
+def _tag_rows(target_type: str, rows: Iterable[tuple]) -> Iterator[tuple]:
+    """
+    Prefix rows with their target type.
+
+    :param target_type: Target type
+    :type target_type: str
+    :param rows: Rows
+    :type rows: Iterable[tuple]
+    :return: Tagged rows
+    :rtype: Iterator[tuple]
+    """
+
+    for row in rows:
+        yield target_type, *row
+
+
+def iter_permission_assignments(
+    target_type: str | None = None,
+    target_id: int | None = None,
+    app_label: str | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[tuple]:
+    """
+    Iterate over the permission assignments of groups and states as tuples of
+    :data:`EXPORT_FIELDS`, ordered by target type, target name and permission.
+
+    :param target_type: Only export the assignments of groups or states
+    :type target_type: str | None
+    :param target_id: Only export the assignments of this group or state,
+        requires `target_type`
+    :type target_id: int | None
+    :param app_label: Only export the permissions of this app label
+    :type app_label: str | None
+    :param chunk_size: Number of rows fetched from the database at once
+    :type chunk_size: int
+    :return: Assignments
+    :rtype: Iterator[tuple]
+    """
+
+    if target_type is not None and target_type not in _TARGETS:
+        raise ValueError("Invalid target type")
+
+    if target_id is not None and target_type is None:
+        raise ValueError("Filtering by target requires a target type")
+
+    assignments = []
+
+    for current_type, (through_model, target_field) in _TARGETS.items():
+        if target_type is not None and current_type != target_type:
+            continue
+
+        queryset = through_model.objects.all()
+
+        if target_id is not None:
+            queryset = queryset.filter(**{f"{target_field}_id": target_id})
+
+        if app_label is not None:
+            queryset = queryset.filter(permission__content_type__app_label=app_label)
+
+        assignments.append(
+            _tag_rows(
+                target_type=current_type.value,
+                rows=queryset.order_by(
+                    f"{target_field}__name",
+                    f"{target_field}_id",
+                    "permission__content_type__app_label",
+                    "permission__content_type__model",
+                    "permission__codename",
+                )
+                .values_list(
+                    f"{target_field}__name",
+                    "permission__content_type__app_label",
+                    "permission__content_type__model",
+                    "permission__codename",
+                )
+                .iterator(chunk_size=chunk_size),
+            )
+        )
+
+    return chain.from_iterable(assignments)
+
+
+def _iter_chunks(lines: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """
+    Join lines into chunks, so the response isn't written line by line.
+
+    :param lines: Lines
+    :type lines: Iterable[str]
+    :param chunk_size: Number of lines per chunk
+    :type chunk_size: int
+    :return: Chunks
+    :rtype: Iterator[str]
+    """
+
+    lines = iter(lines)
+
+    while chunk := "".join(islice(lines, chunk_size)):
+        yield chunk
+
+
+def stream_permission_assignments(
+    export_format: str, chunk_size: int = EXPORT_CHUNK_SIZE, **filters
+) -> Iterator[str]:
+    """
+    Stream the permission assignments of groups and states as CSV (with header)
+    or JSON lines.
+
+    :param export_format: Export format (:data:`EXPORT_FORMAT_CSV` or
+        :data:`EXPORT_FORMAT_JSONL`)
+    :type export_format: str
+    :param chunk_size: Number of rows fetched and written at once
+    :type chunk_size: int
+    :param filters: Filters of :func:`iter_permission_assignments`
+    :type filters: Any
+    :return: Chunks of the export
+    :rtype: Iterator[str]
+    """
+
+    assignments = iter_permission_assignments(chunk_size=chunk_size, **filters)
+
+    if export_format == EXPORT_FORMAT_CSV:
+        writer = csv.writer(_EchoBuffer())
+        lines = chain(
+            [writer.writerow(EXPORT_FIELDS)],
+            (writer.writerow(row) for row in assignments),
+        )
+    elif export_format == EXPORT_FORMAT_JSONL:
+        lines = (
+            json.dumps(dict(zip(EXPORT_FIELDS, row))) + "\n" for row in assignments
+        )
+    else:
+        raise ValueError("Invalid export format")
+
+    return _iter_chunks(lines, chunk_size=chunk_size)
@@ -0,0 +1,222 @@
+"""
+Impact of a permission change on the members of a group or state.
+
+For every added or removed permission, the members who would gain or lose it
+are counted, leaving out those who have it from another source anyway: directly,
+through another group, or through their state if that's not the changed state.
+Only active users who aren't superusers are counted, since the permissions of
+all others don't depend on their groups and state.
+
+All permissions are counted in a single aggregate query with one filtered
+count per permission, whose sources are set-based subqueries. The counts are
+cached per group or state, permission set version and permission, so a preview
+that changes one permission at a time only counts the new one, and no count
+outlives a change of the permission set. Changed memberships show up once the
+counts expire.
+"""
+
+# Standard Library
+from collections.abc import Iterable
+
+# Django
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+# Alliance Auth
+from allianceauth.authentication.models import State, UserProfile
+
+# AA Permission Management
+from aa_permission_management.constants import (
+    PERMISSION_IMPACT_CACHE_KEY,
+    PERMISSION_IMPACT_CACHE_TIMEOUT,
+)
+from aa_permission_management.helper.catalog import get_permission_catalog
+from aa_permission_management.helper.versions import get_permission_set_version
+from aa_permission_management.models import PermissionSetVersion
+
+# Impact actions
+IMPACT_ADD = "add"
+IMPACT_REMOVE = "remove"
+
+
+def _other_sources(target_type: str, target_id: int, permission_id: int) -> Q:
+    """
+    Filter for the users who have a permission from a source other than the
+    given group or state.
+
+    :param target_type: Target type ("group" or "state")
+    :type target_type: str
+    :param target_id: ID of the group or state
+    :type target_id: int
+    :param permission_id: ID of the permission
+    :type permission_id: int
+    :return: Filter
+    :rtype: Q
+    """
+
+    groups = Group.permissions.through.objects.filter(permission_id=permission_id)
+    states = State.permissions.through.objects.filter(permission_id=permission_id)
+
+    if target_type == PermissionSetVersion.TargetType.GROUP:
+        groups = groups.exclude(group_id=target_id)
+    else:
+        states = states.exclude(state_id=target_id)
+
+    return (
+        Q(
+            pk__in=User.user_permissions.through.objects.filter(
+                permission_id=permission_id
+            ).values("user_id")
+        )
+        | Q(
+            pk__in=User.groups.through.objects.filter(
+                group_id__in=groups.values("group_id")
+            ).values("user_id")
+        )
+        | Q(
+            pk__in=UserProfile.objects.filter(
+                state_id__in=states.values("state_id")
+            ).values("user_id")
+        )
+    )
+
+
+def _count_impact(
+    target_type: str, target_id: int, changes: Iterable[tuple[str, int]]
+) -> dict:
+    """
+    Count the members of a group or state, and for every change the members
+    who would gain or lose the permission.
+
+    :param target_type: Target type ("group" or "state")
+    :type target_type: str
+    :param target_id: ID of the group or state
+    :type target_id: int
+    :param changes: Actions and permission IDs
+    :type changes: Iterable[tuple[str, int]]
+    :return: Member count as "members", and the counts per action and permission ID
+    :rtype: dict
+    """
+
+    if target_type == PermissionSetVersion.TargetType.GROUP:
+        through_model, target_field = Group.permissions.through, "group_id"
+        members = User.objects.filter(groups=target_id)
+    else:
+        through_model, target_field = State.permissions.through, "state_id"
+        members = User.objects.filter(profile__state_id=target_id)
+
+    changes = list(changes)
+    assigned = set(
+        through_model.objects.filter(
+            **{target_field: target_id},
+            permission_id__in={permission_id for _, permission_id in changes},
+        ).values_list("permission_id", flat=True)
+    )
+    aggregates = {"members": Count("pk")}
+    counts = {}
+
+    for action, permission_id in changes:
+        # Adding an assigned or removing an unassigned permission changes nothing
+        if (permission_id in assigned) == (action == IMPACT_ADD):
+            counts[(action, permission_id)] = 0
+
+            continue
+
+        aggregates[f"{action}_{permission_id}"] = Count(
+            "pk", filter=~_other_sources(target_type, target_id, permission_id)
+        )
+
+    result = members.filter(is_active=True, is_superuser=False).aggregate(**aggregates)
+
+    for action, permission_id in changes:
+        if (action, permission_id) not in counts:
+            counts[(action, permission_id)] = result[f"{action}_{permission_id}"]
+
+    counts["members"] = result["members"]
+
+    return counts
+
+
+def get_permission_change_impact(
+    target_type: str,
+    target_id: int,
+    add: Iterable[int] = (),
+    remove: Iterable[int] = (),
+) -> dict:
+    """
+    Get the numbers of members of a group or state who would gain or lose each
+    permission of a change.
+
+    :param target_type: Target type ("group" or "state")
+    :type target_type: str
+    :param target_id: ID of the group or state
+    :type target_id: int
+    :param add: IDs of the permissions to add
+    :type add: Iterable[int]
+    :param remove: IDs of the permissions to remove
+    :type remove: Iterable[int]
+    :return: Member count, and the affected users per permission
+    :rtype: dict
+    """
+
+    models = {
+        PermissionSetVersion.TargetType.GROUP: Group,
+        PermissionSetVersion.TargetType.STATE: State,
+    }
+
+    if target_type not in models:
+        raise ValueError("Invalid target type")
+
+    add = set(add)
+    remove = set(remove)
+
+    if add & remove:
+        raise ValueError("Permissions cannot be added and removed at once")
+
+    if not models[target_type].objects.filter(pk=target_id).exists():
+        raise ValueError(f"{models[target_type].__name__} does not exist")
+
+    version = get_permission_set_version(target_type=target_type, target_id=target_id)
+    prefix = f"{PERMISSION_IMPACT_CACHE_KEY}:{target_type}:{target_id}:{version}"
+    changes = sorted(
+        [(IMPACT_ADD, permission_id) for permission_id in add]
+        + [(IMPACT_REMOVE, permission_id) for permission_id in remove]
+    )
+    keys = {
+        "members": f"{prefix}:members",
+        **{change: f"{prefix}:{change[0]}:{change[1]}" for change in changes},
+    }
+    cached = cache.get_many(keys.values())
+    missing = [change for change in changes if keys[change] not in cached]
+
+    if missing or keys["members"] not in cached:
+        counts = _count_impact(
+            target_type=target_type, target_id=target_id, changes=missing
+        )
+        cache.set_many(
+            {keys[change]: count for change, count in counts.items()},
+            timeout=PERMISSION_IMPACT_CACHE_TIMEOUT,
+        )
+        cached.update({keys[change]: count for change, count in counts.items()})
+
+    names = {
+        permission.pk: f"{permission.content_type.app_label}.{permission.codename}"
+        for permission in get_permission_catalog()
+    }
+
+    return {
+        "target_type": target_type,
+        "target_id": target_id,
+        "version": version,
+        "members": cached[keys["members"]],
+        "permissions": [
+            {
+                "permission_id": permission_id,
+                "permission": names.get(permission_id, ""),
+                "action": action,
+                "users": cached[keys[(action, permission_id)]],
+            }
+            for action, permission_id in changes
+        ],
+    }
@@ -0,0 +1,502 @@
+"""
+Streaming import of the permission assignments of groups and states.
+
+The counterpart of :mod:`aa_permission_management.helper.export`: files in the
+same CSV or JSON lines format are parsed row by row from the uploaded file,
+permissions are resolved against the in-memory permission catalog and targets
+against their names, which are read once. Only the resolved IDs are kept, never
+the file.
+
+The import either adds the listed permissions (`add`), or makes them the only
+permissions of the listed groups and states (`replace`). The resulting changes
+are computed against the current assignments in chunks of targets, reported,
+and unless it's a dry run, applied in chunked bulk transactions, or by a
+background job for large imports.
+"""
+
+# Standard Library
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import IO
+
+# Django
+from django.contrib.auth.models import Group, User
+
+# Alliance Auth
+from allianceauth.authentication.models import State
+
+# AA Permission Management
+from aa_permission_management.constants import (
+    IMPORT_CHUNK_SIZE,
+    IMPORT_MAX_ERRORS,
+    IMPORT_REPORT_MAX_TARGETS,
+)
+from aa_permission_management.helper.catalog import get_permission_catalog
+from aa_permission_management.helper.export import (
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_JSONL,
+)
+from aa_permission_management.helper.views import apply_permission_changes
+from aa_permission_management.models import PermissionSetVersion
+
+# Import modes
+IMPORT_MODE_ADD = "add"
+IMPORT_MODE_REPLACE = "replace"
+
+# Models and through table fields per target type
+_TARGETS = {
+    PermissionSetVersion.TargetType.GROUP: (Group, "group_id"),
+    PermissionSetVersion.TargetType.STATE: (State, "state_id"),
+}
+
+
+class ImportRowError(ValueError):
+    """
+    A row of an import file can't be imported.
+    """
+
+
+def iter_import_rows(file: IO[bytes], import_format: str) -> Iterator[tuple[int, dict]]:
+    """
+    Parse an import file row by row.
+
+    :param file: Binary file object, e.g. an uploaded file
+    :type file: IO[bytes]
+    :param import_format: Import format ("csv" or "jsonl")
+    :type import_format: str
+    :return: Line numbers and rows, or the error of a row that couldn't be parsed
+    :rtype: Iterator[tuple[int, dict]]
+    """
+
+    if import_format not in (EXPORT_FORMAT_CSV, EXPORT_FORMAT_JSONL):
+        raise ValueError("Invalid import format")
+
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+    try:
+        if import_format == EXPORT_FORMAT_CSV:
+            reader = csv.DictReader(text)
+
+            for row in reader:
+                yield reader.line_num, row
+
+            return
+
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                yield line_number, ImportRowError("Invalid JSON")
+
+                continue
+
+            if not isinstance(row, dict):
+                yield line_number, ImportRowError("Invalid JSON")
+
+                continue
+
+            yield line_number, row
+    finally:
+        # Leave the underlying file open for its owner
+        text.detach()
+
+
+class AssignmentResolver:
+    """
+    Resolve targets by name and permissions by natural key, with the targets
+    read once and the permissions taken from the catalog.
+    """
+
+    def __init__(self):
+        """
+        Read the names of all groups and states and index the catalog.
+        """
+
+        self.targets = {
+            target_type: dict(model.objects.values_list("name", "pk"))
+            for target_type, (model, _) in _TARGETS.items()
+        }
+        self.target_names = {
+            target_type: {pk: name for name, pk in names.items()}
+            for target_type, names in self.targets.items()
+        }
+        self.permissions = {}
+        self.permission_names = {}
+        by_codename = {}
+
+        for permission in get_permission_catalog():
+            app_label = permission.content_type.app_label
+            key = (app_label, permission.content_type.model, permission.codename)
+
+            self.permissions[key] = permission.pk
+            self.permission_names[permission.pk] = f"{app_label}.{permission.codename}"
+            # Permissions without a model need a codename unique within its app
+            by_codename[(app_label, permission.codename)] = (
+                None
+                if (app_label, permission.codename) in by_codename
+                else permission.pk
+            )
+
+        self.by_codename = by_codename
+
+    def resolve_target(self, target_type: str, name: str) -> int:
+        """
+        Resolve a group or state by name.
+
+        :param target_type: Target type ("group" or "state")
+        :type target_type: str
+        :param name: Name of the group or state
+        :type name: str
+        :return: Target ID
+        :rtype: int
+        """
+
+        if target_type not in self.targets:
+            raise ImportRowError("Invalid target type")
+
+        target_id = self.targets[target_type].get(name)
+
+        if target_id is None:
+            raise ImportRowError(f"Unknown {target_type}")
+
+        return target_id
+
+    def resolve_permission(
+        self, app_label: str, codename: str, model: str | None = None
+    ) -> int:
+        """
+        Resolve a permission by app label, codename and optionally model.
+
+        :param app_label: App label
+        :type app_label: str
+        :param codename: Codename
+        :type codename: str
+        :param model: Model, only needed when the codename isn't unique in the app
+        :type model: str | None
+        :return: Permission ID
+        :rtype: int
+        """
+
+        if model:
+            permission_id = self.permissions.get((app_label, model, codename))
+        else:
+            permission_id = self.by_codename.get((app_label, codename))
+
+        if permission_id is None:
+            raise ImportRowError("Unknown permission")
+
+        return permission_id
+
+    def resolve(self, row: dict) -> tuple[str, int, int]:
+        """
+        Resolve a row to its target type, target ID and permission ID.
+
+        :param row: Row
+        :type row: dict
+        :return: Target type, target ID and permission ID
+        :rtype: tuple[str, int, int]
+        """
+
+        for field in ("target_type", "target", "app_label", "codename"):
+            if not row.get(field):
+                raise ImportRowError(f"Missing {field}")
+
+        # JSON rows can hold any value, and lists or dicts aren't hashable
+        for field in ("target_type", "target", "app_label", "codename", "model"):
+            if row.get(field) and not isinstance(row[field], str):
+                raise ImportRowError(f"Invalid {field}")
+
+        return (
+            row["target_type"],
+            self.resolve_target(target_type=row["target_type"], name=row["target"]),
+            self.resolve_permission(
+                app_label=row["app_label"],
+                codename=row["codename"],
+                model=row.get("model"),
+            ),
+        )
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    """
+    Split items into lists of the given size.
+
+    :param items: Items
+    :type items: Iterable
+    :param size: Chunk size
+    :type size: int
+    :return: Chunks
+    :rtype: Iterator[list]
+    """
+
+    items = iter(items)
+
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def diff_assignments(
+    wanted: dict[str, dict[int, set[int]]],
+    mode: str = IMPORT_MODE_ADD,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> dict:
+    """
+    Compute the changes to get the wanted permissions of groups and states.
+
+    Only the given targets are read, with one query per chunk of targets.
+
+    :param wanted: Wanted permission IDs per target ID and target type
+    :type wanted: dict[str, dict[int, set[int]]]
+    :param mode: :data:`IMPORT_MODE_ADD` to only add missing permissions, or
+        :data:`IMPORT_MODE_REPLACE` to also remove the others
+    :type mode: str
+    :param chunk_size: Number of targets whose assignments are read at once
+    :type chunk_size: int
+    :return: Added and removed (target ID, permission ID) pairs per target type
+    :rtype: dict
+    """
+
+    changes = {}
+
+    for target_type, (model, target_field) in _TARGETS.items():
+        targets = wanted.get(target_type, {})
+        added = []
+        removed = []
+
+        for target_ids in _chunks(sorted(targets), chunk_size):
+            current = {}
+
+            for target_id, permission_id in model.permissions.through.objects.filter(
+                **{f"{target_field}__in": target_ids}
+            ).values_list(target_field, "permission_id"):
+                current.setdefault(target_id, set()).add(permission_id)
+
+            for target_id in target_ids:
+                assigned = current.get(target_id, set())
+                permission_ids = targets[target_id]
+
+                added.extend(
+                    (target_id, permission_id)
+                    for permission_id in sorted(permission_ids - assigned)
+                )
+
+                if mode == IMPORT_MODE_REPLACE:
+                    removed.extend(
+                        (target_id, permission_id)
+                        for permission_id in sorted(assigned - permission_ids)
+                    )
+
+        changes[target_type] = {"added": added, "removed": removed}
+
+    return changes
+
+
+def plan_import(
+    rows: Iterable[tuple[int, dict]],
+    mode: str = IMPORT_MODE_ADD,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> dict:
+    """
+    Compute the changes of an import against the current assignments.
+
+    Costs two queries for the target names, and one query per chunk of targets
+    for their current assignments, independent of the number of rows.
+
+    :param rows: Line numbers and rows, see :func:`iter_import_rows`
+    :type rows: Iterable[tuple[int, dict]]
+    :param mode: Import mode (:data:`IMPORT_MODE_ADD` or :data:`IMPORT_MODE_REPLACE`)
+    :type mode: str
+    :param chunk_size: Number of targets whose assignments are read at once
+    :type chunk_size: int
+    :return: Import plan with the rows, the errors and the changes per target type
+    :rtype: dict
+    """
+
+    if mode not in (IMPORT_MODE_ADD, IMPORT_MODE_REPLACE):
+        raise ValueError("Invalid import mode")
+
+    resolver = AssignmentResolver()
+    wanted = {target_type: {} for target_type in _TARGETS}
+    plan = {
+        "mode": mode,
+        "rows": 0,
+        "invalid": 0,
+        "errors": [],
+        "changes": {},
+        "resolver": resolver,
+    }
+
+    for line_number, row in rows:
+        plan["rows"] += 1
+
+        try:
+            if isinstance(row, ImportRowError):
+                raise row
+
+            target_type, target_id, permission_id = resolver.resolve(row)
+        except ImportRowError as exc:
+            plan["invalid"] += 1
+
+            if len(plan["errors"]) < IMPORT_MAX_ERRORS:
+                plan["errors"].append({"line": line_number, "error": str(exc)})
+
+            continue
+
+        wanted[target_type].setdefault(target_id, set()).add(permission_id)
+
+    plan["changes"] = diff_assignments(wanted=wanted, mode=mode, chunk_size=chunk_size)
+
+    return plan
+
+
+def count_import_changes(changes: dict) -> int:
+    """
+    Count the changes of an import plan.
+
+    :param changes: Changes of an import plan, per target type
+    :type changes: dict
+    :return: Number of added and removed permissions
+    :rtype: int
+    """
+
+    return sum(
+        len(target_changes["added"]) + len(target_changes["removed"])
+        for target_changes in changes.values()
+    )
+
+
+def split_import_changes(changes: dict, chunk_size: int) -> Iterator[dict]:
+    """
+    Split the changes of an import plan into chunks of the given size.
+
+    Every chunk has the shape of the changes, so it can be stored on its own
+    and applied with :func:`apply_import_changes`. Per target type, removals
+    come before additions.
+
+    :param changes: Changes of an import plan, per target type
+    :type changes: dict
+    :param chunk_size: Number of changes per chunk
+    :type chunk_size: int
+    :return: Chunks of changes, per target type
+    :rtype: Iterator[dict]
+    """
+
+    ordered = (
+        (target_type, key, change)
+        for target_type, target_changes in changes.items()
+        for key in ("removed", "added")
+        for change in target_changes[key]
+    )
+
+    for chunk in _chunks(ordered, chunk_size):
+        chunk_changes = {}
+
+        for target_type, key, change in chunk:
+            chunk_changes.setdefault(target_type, {"added": [], "removed": []})[
+                key
+            ].append(change)
+
+        yield chunk_changes
+
+
+def apply_import_changes(
+    changes: dict, actor: User | None = None, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> dict:
+    """
+    Apply the changes of an import plan in chunked bulk transactions.
+
+    Per target type, removals are applied before additions. Changes which have
+    been stored as JSON are accepted as well.
+
+    :param changes: Changes of an import plan, per target type
+    :type changes: dict
+    :param actor: User importing the file, for the audit log
+    :type actor: User | None
+    :param chunk_size: Number of changes per transaction
+    :type chunk_size: int
+    :return: Numbers of added and removed permissions
+    :rtype: dict
+    """
+
+    result = {"added": 0, "removed": 0}
+
+    for target_type, target_changes in changes.items():
+        for key in ("removed", "added"):
+            for chunk in _chunks(map(tuple, target_changes[key]), chunk_size):
+                applied = apply_permission_changes(
+                    target_type=target_type, **{key: chunk}, actor=actor
+                )
+                result[key] += applied[key]
+
+    return result
+
+
+def apply_import(
+    plan: dict, actor: User | None = None, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> None:
+    """
+    Apply the changes of an import plan in chunked bulk transactions.
+
+    :param plan: Import plan, see :func:`plan_import`
+    :type plan: dict
+    :param actor: User importing the file, for the audit log
+    :type actor: User | None
+    :param chunk_size: Number of changes per transaction
+    :type chunk_size: int
+    :return:
+    :rtype:
+    """
+
+    apply_import_changes(changes=plan["changes"], actor=actor, chunk_size=chunk_size)
+
+
+def get_import_report(plan: dict, dry_run: bool) -> dict:
+    """
+    Get the report of an import plan, with the changes per group and state.
+
+    Only the changes of the first targets are listed, the totals always cover
+    all of them.
+
+    :param plan: Import plan, see :func:`plan_import`
+    :type plan: dict
+    :param dry_run: Whether the changes have been applied
+    :type dry_run: bool
+    :return: Import report
+    :rtype: dict
+    """
+
+    resolver = plan["resolver"]
+    targets = {}
+
+    for target_type, changes in plan["changes"].items():
+        for key in ("added", "removed"):
+            for target_id, permission_id in changes[key]:
+                target = targets.setdefault(
+                    (target_type, target_id),
+                    {
+                        "target_type": target_type,
+                        "target_id": target_id,
+                        "target": resolver.target_names[target_type][target_id],
+                        "added": [],
+                        "removed": [],
+                    },
+                )
+                target[key].append(resolver.permission_names[permission_id])
+
+    return {
+        "mode": plan["mode"],
+        "dry_run": dry_run,
+        "rows": plan["rows"],
+        "invalid": plan["invalid"],
+        "errors": plan["errors"],
+        "added": sum(len(changes["added"]) for changes in plan["changes"].values()),
+        "removed": sum(len(changes["removed"]) for changes in plan["changes"].values()),
+        "targets": list(targets.values())[:IMPORT_REPORT_MAX_TARGETS],
+        "truncated": len(targets) > IMPORT_REPORT_MAX_TARGETS,
+    }
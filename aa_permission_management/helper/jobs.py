@@ -0,0 +1,334 @@
+"""
+Background jobs for large permission operations.
+
+A job is created with everything it needs in its payload and processed by
+Celery tasks (see :mod:`aa_permission_management.tasks`), one chunk per task,
+so a huge change never blocks a web worker and its progress can be polled.
+Large payloads are stored chunk by chunk instead, so every task reads only
+the payload of its own chunk.
+"""
+
+# Standard Library
+from collections.abc import Callable, Iterable
+from datetime import datetime
+
+# Django
+from django.contrib.auth.models import User
+from django.db import transaction
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA Permission Management
+from aa_permission_management import app_settings
+from aa_permission_management.constants import JOB_CHUNK_BATCH_SIZE
+from aa_permission_management.helper.audit import prune_audit_log_batch
+from aa_permission_management.helper.importer import apply_import_changes
+from aa_permission_management.helper.snapshots import plan_snapshot_restore
+from aa_permission_management.helper.views import apply_permissions
+from aa_permission_management.models import (
+    PermissionJob,
+    PermissionJobChunk,
+    PermissionSnapshot,
+)
+from aa_permission_management.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(name=__name__))
+
+
+def _apply_permissions_chunk(
+    payload: dict, offset: int, limit: int, actor: User | None = None
+) -> dict:
+    """
+    Apply the permission delta of a job to a chunk of its groups and states.
+
+    Groups come first, then states.
+
+    :param payload: Job payload
+    :type payload: dict
+    :param offset: Index of the first group or state of the chunk
+    :type offset: int
+    :param limit: Size of the chunk
+    :type limit: int
+    :param actor: User who created the job, for the audit log
+    :type actor: User | None
+    :return: Numbers of added and removed permissions and changed groups and states
+    :rtype: dict
+    """
+
+    group_ids = payload.get("group_ids", [])
+    state_ids = payload.get("state_ids", [])
+
+    result = apply_permissions(
+        group_ids=group_ids[offset : offset + limit],
+        state_ids=state_ids[
+            max(offset - len(group_ids), 0) : max(offset + limit - len(group_ids), 0)
+        ],
+        add=payload.get("add", []),
+        remove=payload.get("remove", []),
+        actor=actor,
+    )
+
+    return {
+        "added": result["added"],
+        "removed": result["removed"],
+        "groups": len(result["groups"]),
+        "states": len(result["states"]),
+    }
+
+
+def _apply_import_chunk(
+    payload: dict,
+    offset: int,  # pylint: disable=unused-argument
+    limit: int,  # pylint: disable=unused-argument
+    actor: User | None = None,
+) -> dict:
+    """
+    Apply a chunk of the planned changes of an import.
+
+    The changes are stored chunk by chunk, so the payload holds the changes of
+    this chunk only.
+
+    :param payload: Chunk payload
+    :type payload: dict
+    :param offset: Unused
+    :type offset: int
+    :param limit: Unused
+    :type limit: int
+    :param actor: User who created the job, for the audit log
+    :type actor: User | None
+    :return: Numbers of added and removed permissions
+    :rtype: dict
+    """
+
+    return apply_import_changes(changes=payload["changes"], actor=actor)
+
+
+def _restore_snapshot_chunk(
+    payload: dict, offset: int, limit: int, actor: User | None = None
+) -> dict:
+    """
+    Restore a chunk of the groups and states of a snapshot.
+
+    The diff of the chunk is computed when it's processed, so every chunk
+    restores the snapshot against the current assignments.
+
+    :param payload: Job payload
+    :type payload: dict
+    :param offset: Index of the first group or state of the chunk
+    :type offset: int
+    :param limit: Size of the chunk
+    :type limit: int
+    :param actor: User who created the job, for the audit log
+    :type actor: User | None
+    :return: Numbers of added and removed permissions and deleted groups and states
+    :rtype: dict
+    """
+
+    snapshot = PermissionSnapshot.objects.filter(pk=payload["snapshot_id"]).first()
+
+    if snapshot is None:
+        raise ValueError("Snapshot does not exist")
+
+    plan = plan_snapshot_restore(snapshot=snapshot, offset=offset, limit=limit)
+
+    return {
+        **apply_import_changes(changes=plan["changes"], actor=actor),
+        "invalid": plan["invalid"],
+    }
+
+
+def _prune_audit_log_chunk(
+    payload: dict,
+    offset: int,  # pylint: disable=unused-argument
+    limit: int,
+    actor: User | None = None,  # pylint: disable=unused-argument
+) -> dict:
+    """
+    Delete the oldest chunk of outdated audit log entries.
+
+    Deleted entries drop out of the query, so every chunk starts at the oldest
+    remaining entry, whatever the offset.
+
+    :param payload: Job payload
+    :type payload: dict
+    :param offset: Unused
+    :type offset: int
+    :param limit: Size of the chunk
+    :type limit: int
+    :param actor: Unused
+    :type actor: User | None
+    :return: Number of deleted entries
+    :rtype: dict
+    """
+
+    return {
+        "deleted": prune_audit_log_batch(
+            before=datetime.fromisoformat(payload["before"]), batch_size=limit
+        )
+    }
+
+
+# Chunk handlers per job kind, returning summable counts
+JOB_HANDLERS: dict[str, Callable[[dict, int, int, User | None], dict]] = {
+    PermissionJob.Kind.APPLY: _apply_permissions_chunk,
+    PermissionJob.Kind.IMPORT: _apply_import_chunk,
+    PermissionJob.Kind.RESTORE: _restore_snapshot_chunk,
+    PermissionJob.Kind.PRUNE: _prune_audit_log_chunk,
+}
+
+
+def create_job(
+    kind: str,
+    payload: dict,
+    total: int,
+    user: User | None = None,
+    chunks: Iterable[dict] | None = None,
+) -> PermissionJob:
+    """
+    Create a pending background job.
+
+    :param kind: Job kind
+    :type kind: str
+    :param payload: Everything the job needs, JSON serializable
+    :type payload: dict
+    :param total: Number of items to process
+    :type total: int
+    :param user: User who created the job
+    :type user: User | None
+    :param chunks: Payloads of the chunks, stored separately and handed to
+        the handler instead of the job payload, which must then set the
+        `chunk_size` of every chunk
+    :type chunks: Iterable[dict] | None
+    :return: Job
+    :rtype: PermissionJob
+    """
+
+    if kind not in JOB_HANDLERS:
+        raise ValueError("Invalid job kind")
+
+    if chunks is None:
+        return PermissionJob.objects.create(
+            kind=kind, payload=payload, total=total, created_by=user
+        )
+
+    if not payload.get("chunk_size"):
+        raise ValueError("Missing chunk size")
+
+    with transaction.atomic():
+        job = PermissionJob.objects.create(
+            kind=kind,
+            payload={**payload, "chunked": True},
+            total=total,
+            created_by=user,
+        )
+        PermissionJobChunk.objects.bulk_create(
+            (
+                PermissionJobChunk(job=job, seq=seq, payload=chunk)
+                for seq, chunk in enumerate(chunks)
+            ),
+            batch_size=JOB_CHUNK_BATCH_SIZE,
+        )
+
+    return job
+
+
+def run_job_chunk(job_id: int, chunk_size: int | None = None) -> bool:
+    """
+    Process the next chunk of a background job.
+
+    The job row is locked while the chunk is processed, so a chunk is never
+    processed twice. If processing fails, the chunk is rolled back and the job
+    is marked as failed. Chunks processed before stay applied.
+
+    :param job_id: ID of the job
+    :type job_id: int
+    :param chunk_size: Number of items to process, defaults to the `chunk_size`
+        of the job's payload, then to the setting
+    :type chunk_size: int | None
+    :return: Whether the job has more chunks to process
+    :rtype: bool
+    """
+
+    try:
+        with transaction.atomic():
+            job = PermissionJob.objects.select_for_update().get(pk=job_id)
+
+            if job.status in (PermissionJob.Status.DONE, PermissionJob.Status.FAILED):
+                return False
+
+            if job.payload.get("chunked"):
+                # Stored chunks are addressed by their index, so their size is fixed
+                chunk_size = job.payload["chunk_size"]
+                payload = (
+                    job.chunks.filter(seq=job.processed // chunk_size)
+                    .values_list("payload", flat=True)
+                    .get()
+                )
+            else:
+                chunk_size = (
+                    chunk_size
+                    or job.payload.get("chunk_size")
+                    or app_settings.AA_PERMISSION_MANAGEMENT_JOB_CHUNK_SIZE
+                )
+                payload = job.payload
+
+            with logger.timed(
+                "Job chunk processed", job_id=job.pk, kind=job.kind
+            ) as fields:
+                chunk_result = JOB_HANDLERS[job.kind](
+                    payload, job.processed, chunk_size, job.created_by
+                )
+
+                job.processed = min(job.processed + chunk_size, job.total)
+                job.result = {
+                    key: job.result.get(key, 0) + value
+                    for key, value in chunk_result.items()
+                }
+                job.status = (
+                    PermissionJob.Status.DONE
+                    if job.processed >= job.total
+                    else PermissionJob.Status.RUNNING
+                )
+                job.save(update_fields=["processed", "result", "status", "updated"])
+
+                fields.update(processed=job.processed, total=job.total)
+    except PermissionJob.DoesNotExist:
+        logger.warning("Job does not exist", fields={"job_id": job_id})
+
+        return False
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.exception("Job failed", fields={"job_id": job_id})
+
+        PermissionJob.objects.filter(pk=job_id).update(
+            status=PermissionJob.Status.FAILED, error=str(exc)
+        )
+
+        return False
+
+    return job.status == PermissionJob.Status.RUNNING
+
+
+def get_job_status(job_id: int) -> dict:
+    """
+    Get the status and progress of a background job.
+
+    :param job_id: ID of the job
+    :type job_id: int
+    :return: Job status
+    :rtype: dict
+    """
+
+    job = (
+        PermissionJob.objects.filter(pk=job_id)
+        .values("pk", "kind", "status", "processed", "total", "result", "error")
+        .first()
+    )
+
+    if job is None:
+        raise ValueError("Job does not exist")
+
+    job["id"] = job.pop("pk")
+    job["progress"] = round(job["processed"] / job["total"], 4) if job["total"] else 1.0
+
+    return job
@@ -0,0 +1,109 @@
+"""
+Matrix of groups or states against permissions.
+
+The matrix is paged in both dimensions. Rows are groups or states ordered by name,
+columns are the permissions of the catalog, optionally limited to one app label.
+The columns come from the cached permission catalog, so a page only costs the
+rows, their count and one bulk fetch of the assigned permissions from the through
+table.
+"""
+
+# Django
+from django.contrib.auth.models import Group
+
+# Alliance Auth
+from allianceauth.authentication.models import State
+
+# AA Permission Management
+from aa_permission_management.helper.catalog import (
+    get_catalog_version,
+    get_permission_catalog,
+)
+from aa_permission_management.models import PermissionSetVersion
+
+# Models and through table fields of the matrix rows per target type
+_TARGETS = {
+    PermissionSetVersion.TargetType.GROUP: (Group, "group_id"),
+    PermissionSetVersion.TargetType.STATE: (State, "state_id"),
+}
+
+
+def get_permission_matrix(  # pylint: disable=too-many-arguments
+    target_type: str,
+    row_offset: int,
+    row_limit: int,
+    column_offset: int,
+    column_limit: int,
+    app_label: str | None = None,
+) -> dict:
+    """
+    Get a page of the matrix of groups or states against permissions.
+
+    The assigned permissions of every row are returned as the indexes of their
+    columns on the page, so the payload grows with the assignments, not with the
+    size of the page.
+
+    :param target_type: Target type of the rows ("group" or "state")
+    :type target_type: str
+    :param row_offset: Index of the first row
+    :type row_offset: int
+    :param row_limit: Maximum number of rows
+    :type row_limit: int
+    :param column_offset: Index of the first column
+    :type column_offset: int
+    :param column_limit: Maximum number of columns
+    :type column_limit: int
+    :param app_label: Only show the permissions of this app label
+    :type app_label: str | None
+    :return: Rows, columns and assigned cells of the page
+    :rtype: dict
+    """
+
+    if target_type not in _TARGETS:
+        raise ValueError("Invalid target type")
+
+    model, target_field = _TARGETS[target_type]
+    catalog = get_permission_catalog()
+    app_labels = sorted({permission.content_type.app_label for permission in catalog})
+    columns = [
+        permission.pk
+        for permission in catalog
+        if app_label is None or permission.content_type.app_label == app_label
+    ]
+    column_ids = columns[column_offset : column_offset + column_limit]
+
+    targets = model.objects.order_by("name", "pk")
+    rows = list(targets.values_list("pk", "name")[row_offset : row_offset + row_limit])
+    row_ids = [row_id for row_id, _ in rows]
+    cells = {row_id: [] for row_id in row_ids}
+
+    if row_ids and column_ids:
+        column_indexes = {
+            permission_id: index for index, permission_id in enumerate(column_ids)
+        }
+
+        assigned = model.permissions.through.objects.filter(
+            **{f"{target_field}__in": row_ids}, permission_id__in=column_ids
+        ).values_list(target_field, "permission_id")
+
+        for row_id, permission_id in assigned:
+            cells[row_id].append(column_indexes[permission_id])
+
+    return {
+        "target_type": target_type,
+        "catalog_version": get_catalog_version(),
+        "app_label": app_label,
+        "app_labels": app_labels,
+        "rows": {
+            "total": targets.count(),
+            "offset": row_offset,
+            "ids": row_ids,
+            "names": [name for _, name in rows],
+        },
+        "columns": {
+            "total": len(columns),
+            "offset": column_offset,
+            "ids": column_ids,
+        },
+        "cells": [sorted(cells[row_id]) for row_id in row_ids],
+    }
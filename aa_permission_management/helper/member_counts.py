@@ -0,0 +1,177 @@
+"""
+Member counters for groups and states.
+
+The counters are maintained incrementally from membership and state changes (see
+:mod:`aa_permission_management.signals`), so the tables can show member counts
+without joins or aggregates. Changes bypassing signals, like bulk updates, are
+fixed by recounting (see the `aa_permission_management_recount_members` command).
+"""
+
+# Standard Library
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+
+# Django
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Count, F, Model
+from django.db.models.functions import Greatest
+
+# Alliance Auth
+from allianceauth.authentication.models import UserProfile
+
+# AA Permission Management
+from aa_permission_management.models import GroupMemberCount, StateMemberCount
+
+
+def _save_member_counts(model: type[Model], target_field: str, counts: dict) -> None:
+    """
+    Insert or update member counters with the given counts.
+
+    :param model: Counter model
+    :type model: type[Model]
+    :param target_field: Name of the counter's target field
+    :type target_field: str
+    :param counts: Member counts by target ID
+    :type counts: dict
+    :return:
+    :rtype:
+    """
+
+    # MySQL doesn't support (and doesn't need) a conflict target
+    unique_fields = (
+        [target_field]
+        if connection.features.supports_update_conflicts_with_target
+        else None
+    )
+
+    model.objects.bulk_create(
+        [model(pk=pk, count=count) for pk, count in counts.items()],
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=["count"],
+    )
+
+
+def recount_group_member_counts(group_ids: Iterable[int]) -> dict:
+    """
+    Recount the members of the given groups.
+
+    :param group_ids: IDs of the groups
+    :type group_ids: Iterable[int]
+    :return: Member counts by group ID
+    :rtype: dict
+    """
+
+    counts = dict.fromkeys(group_ids, 0)
+
+    if not counts:
+        return counts
+
+    counts.update(
+        User.groups.through.objects.filter(group_id__in=counts)
+        .order_by()
+        .values("group_id")
+        .annotate(count=Count("pk"))
+        .values_list("group_id", "count")
+    )
+
+    _save_member_counts(model=GroupMemberCount, target_field="group", counts=counts)
+
+    return counts
+
+
+def recount_state_member_counts(state_ids: Iterable[int]) -> dict:
+    """
+    Recount the members of the given states.
+
+    :param state_ids: IDs of the states
+    :type state_ids: Iterable[int]
+    :return: Member counts by state ID
+    :rtype: dict
+    """
+
+    counts = dict.fromkeys(state_ids, 0)
+
+    if not counts:
+        return counts
+
+    counts.update(
+        UserProfile.objects.filter(state_id__in=counts)
+        .order_by()
+        .values("state_id")
+        .annotate(count=Count("pk"))
+        .values_list("state_id", "count")
+    )
+
+    _save_member_counts(model=StateMemberCount, target_field="state", counts=counts)
+
+    return counts
+
+
+def _adjust_member_counts(
+    model: type[Model], deltas: dict, recount: Callable[[Iterable[int]], dict]
+) -> None:
+    """
+    Adjust member counters by the given deltas.
+
+    Targets with the same delta are updated with a single UPDATE. Targets without
+    a counter yet are recounted, which has to happen after the change itself.
+
+    :param model: Counter model
+    :type model: type[Model]
+    :param deltas: Member count changes by target ID
+    :type deltas: dict
+    :param recount: Function recounting the members of the given targets
+    :type recount: Callable[[Iterable[int]], dict]
+    :return:
+    :rtype:
+    """
+
+    targets_by_delta = defaultdict(list)
+
+    for pk, delta in deltas.items():
+        if delta:
+            targets_by_delta[delta].append(pk)
+
+    missing = []
+
+    for delta, pks in targets_by_delta.items():
+        counters = model.objects.filter(pk__in=pks)
+
+        if counters.update(count=Greatest(F("count") + delta, 0)) < len(pks):
+            existing = set(counters.values_list("pk", flat=True))
+            missing.extend(pk for pk in pks if pk not in existing)
+
+    if missing:
+        recount(missing)
+
+
+def adjust_group_member_counts(deltas: dict) -> None:
+    """
+    Adjust the member counters of groups by the given deltas.
+
+    :param deltas: Member count changes by group ID
+    :type deltas: dict
+    :return:
+    :rtype:
+    """
+
+    _adjust_member_counts(
+        model=GroupMemberCount, deltas=deltas, recount=recount_group_member_counts
+    )
+
+
+def adjust_state_member_counts(deltas: dict) -> None:
+    """
+    Adjust the member counters of states by the given deltas.
+
+    :param deltas: Member count changes by state ID
+    :type deltas: dict
+    :return:
+    :rtype:
+    """
+
+    _adjust_member_counts(
+        model=StateMemberCount, deltas=deltas, recount=recount_state_member_counts
+    )
@@ -0,0 +1,301 @@
+"""
+Point-in-time snapshots of the permissions of all groups and states.
+
+A snapshot stores one packed array of permission IDs per group and state. It is
+restored through the minimal diff against the current assignments, computed
+chunk by chunk from the packed arrays and applied in chunked bulk statements
+like an import in replace mode, all in one transaction. Groups and states
+created after the snapshot have no entry in it and keep their permissions,
+deleted ones and deleted permissions are skipped. Large snapshots are restored
+by a background job instead, one chunk of groups and states per transaction.
+"""
+
+# Standard Library
+import struct
+from collections.abc import Iterable, Iterator
+from itertools import groupby, islice
+from operator import itemgetter
+
+# Django
+from django.contrib.auth.models import Group, User
+from django.db import router, transaction
+
+# Alliance Auth
+from allianceauth.authentication.models import State
+
+# AA Permission Management
+from aa_permission_management.constants import (
+    IMPORT_MAX_ERRORS,
+    SNAPSHOT_CHUNK_SIZE,
+    SNAPSHOTS_MAX_LISTED,
+)
+from aa_permission_management.helper.importer import (
+    IMPORT_MODE_REPLACE,
+    AssignmentResolver,
+    apply_import,
+    diff_assignments,
+    get_import_report,
+)
+from aa_permission_management.models import (
+    PermissionSetVersion,
+    PermissionSnapshot,
+    PermissionSnapshotEntry,
+)
+
+# Models and through table fields per target type
+_TARGETS = {
+    PermissionSetVersion.TargetType.GROUP: (Group, "group_id"),
+    PermissionSetVersion.TargetType.STATE: (State, "state_id"),
+}
+
+
+def pack_permission_ids(permission_ids: Iterable[int]) -> bytes:
+    """
+    Pack permission IDs into a sorted array of unsigned 32-bit integers.
+
+    :param permission_ids: Permission IDs
+    :type permission_ids: Iterable[int]
+    :return: Packed permission IDs
+    :rtype: bytes
+    """
+
+    permission_ids = sorted(permission_ids)
+
+    return struct.pack(f"<{len(permission_ids)}I", *permission_ids)
+
+
+def unpack_permission_ids(data: bytes | memoryview) -> tuple[int, ...]:
+    """
+    Unpack permission IDs packed by :func:`pack_permission_ids`.
+
+    :param data: Packed permission IDs
+    :type data: bytes | memoryview
+    :return: Permission IDs
+    :rtype: tuple[int, ...]
+    """
+
+    return struct.unpack(f"<{len(data) // 4}I", data)
+
+
+def _iter_permission_sets(target_type: str) -> Iterator[tuple[int, list[int]]]:
+    """
+    Iterate over the permission IDs of all groups or states, including those
+    without permissions, ordered by ID.
+
+    :param target_type: Target type ("group" or "state")
+    :type target_type: str
+    :return: Target IDs and their permission IDs
+    :rtype: Iterator[tuple[int, list[int]]]
+    """
+
+    model, target_field = _TARGETS[target_type]
+    target_ids = list(model.objects.order_by("pk").values_list("pk", flat=True))
+    assignments = groupby(
+        model.permissions.through.objects.order_by(target_field, "permission_id")
+        .values_list(target_field, "permission_id")
+        .iterator(chunk_size=SNAPSHOT_CHUNK_SIZE),
+        key=itemgetter(0),
+    )
+    current = next(assignments, None)
+
+    for target_id in target_ids:
+        permission_ids = []
+
+        # Both are ordered by target ID, and assignments only exist for targets
+        if current is not None and current[0] == target_id:
+            permission_ids = [permission_id for _, permission_id in current[1]]
+            current = next(assignments, None)
+
+        yield target_id, permission_ids
+
+
+def take_snapshot(
+    name: str = "", actor: User | None = None, chunk_size: int = SNAPSHOT_CHUNK_SIZE
+) -> PermissionSnapshot:
+    """
+    Take a snapshot of the permissions of all groups and states.
+
+    The assignments are streamed from the through tables and written as one
+    packed entry per group and state, in bulk, chunk by chunk.
+
+    :param name: Name of the snapshot
+    :type name: str
+    :param actor: User taking the snapshot
+    :type actor: User | None
+    :param chunk_size: Number of entries written at once
+    :type chunk_size: int
+    :return: Snapshot
+    :rtype: PermissionSnapshot
+    """
+
+    with transaction.atomic(using=router.db_for_write(PermissionSnapshotEntry)):
+        snapshot = PermissionSnapshot.objects.create(name=name, created_by=actor)
+
+        for target_type in _TARGETS:
+            permission_sets = _iter_permission_sets(target_type)
+
+            while chunk := list(islice(permission_sets, chunk_size)):
+                PermissionSnapshotEntry.objects.bulk_create(
+                    [
+                        PermissionSnapshotEntry(
+                            snapshot=snapshot,
+                            target_type=target_type,
+                            target_id=target_id,
+                            permission_ids=pack_permission_ids(permission_ids),
+                        )
+                        for target_id, permission_ids in chunk
+                    ]
+                )
+                snapshot.targets += len(chunk)
+                snapshot.assignments += sum(
+                    len(permission_ids) for _, permission_ids in chunk
+                )
+
+        snapshot.save(update_fields=["targets", "assignments"])
+
+    return snapshot
+
+
+def get_snapshots(limit: int = SNAPSHOTS_MAX_LISTED) -> list[dict]:
+    """
+    Get the newest snapshots, without their entries.
+
+    :param limit: Maximum number of snapshots
+    :type limit: int
+    :return: Snapshots
+    :rtype: list[dict]
+    """
+
+    return [
+        {
+            "id": row["id"],
+            "name": row["name"],
+            "created": row["created"].isoformat(),
+            "created_by": row["created_by__username"] or "",
+            "targets": row["targets"],
+            "assignments": row["assignments"],
+        }
+        for row in PermissionSnapshot.objects.order_by("-id").values(
+            "id", "name", "created", "created_by__username", "targets", "assignments"
+        )[:limit]
+    ]
+
+
+def plan_snapshot_restore(
+    snapshot: PermissionSnapshot,
+    chunk_size: int = SNAPSHOT_CHUNK_SIZE,
+    offset: int = 0,
+    limit: int | None = None,
+) -> dict:
+    """
+    Compute the changes to restore a snapshot.
+
+    The entries are read and compared with the current assignments chunk by
+    chunk, so only one chunk of the snapshot is unpacked at a time. The plan has
+    the shape of an import plan in replace mode. Groups and states created after
+    the snapshot aren't part of it, so they keep their permissions.
+
+    With `offset` and `limit`, only a slice of the groups and states of the
+    snapshot is compared, in the order of their type and ID, which is how a
+    background job restores a large snapshot.
+
+    :param snapshot: Snapshot
+    :type snapshot: PermissionSnapshot
+    :param chunk_size: Number of groups and states compared at once
+    :type chunk_size: int
+    :param offset: Index of the first group or state to compare
+    :type offset: int
+    :param limit: Number of groups and states to compare, all if not given
+    :type limit: int | None
+    :return: Restore plan, with one error per deleted group or state
+    :rtype: dict
+    """
+
+    resolver = AssignmentResolver()
+    plan = {
+        "mode": IMPORT_MODE_REPLACE,
+        "rows": 0,
+        "invalid": 0,
+        "errors": [],
+        "changes": {
+            target_type: {"added": [], "removed": []} for target_type in _TARGETS
+        },
+        "resolver": resolver,
+    }
+    entries = snapshot.entries.order_by("target_type", "target_id").values_list(
+        "target_type", "target_id", "permission_ids"
+    )[offset : None if limit is None else offset + limit]
+    entries = entries.iterator(chunk_size=chunk_size)
+
+    while chunk := list(islice(entries, chunk_size)):
+        wanted = {}
+
+        for target_type, target_id, permission_ids in chunk:
+            plan["rows"] += 1
+
+            if target_id not in resolver.target_names[target_type]:
+                plan["invalid"] += 1
+
+                if len(plan["errors"]) < IMPORT_MAX_ERRORS:
+                    plan["errors"].append(
+                        {
+                            "target_type": target_type,
+                            "target_id": target_id,
+                            "error": f"Deleted {target_type}",
+                        }
+                    )
+
+                continue
+
+            # Permissions deleted since the snapshot can't be restored
+            wanted.setdefault(target_type, {})[target_id] = {
+                permission_id
+                for permission_id in unpack_permission_ids(permission_ids)
+                if permission_id in resolver.permission_names
+            }
+
+        for target_type, changes in diff_assignments(
+            wanted=wanted, mode=IMPORT_MODE_REPLACE, chunk_size=chunk_size
+        ).items():
+            plan["changes"][target_type]["added"].extend(changes["added"])
+            plan["changes"][target_type]["removed"].extend(changes["removed"])
+
+    return plan
+
+
+def get_snapshot_diff(snapshot: PermissionSnapshot) -> dict:
+    """
+    Get the changes restoring a snapshot would make, as an import report.
+
+    :param snapshot: Snapshot
+    :type snapshot: PermissionSnapshot
+    :return: Report of the changes
+    :rtype: dict
+    """
+
+    return get_import_report(plan=plan_snapshot_restore(snapshot), dry_run=True)
+
+
+def restore_snapshot(snapshot: PermissionSnapshot, actor: User | None = None) -> dict:
+    """
+    Restore a snapshot through the minimal diff, applied in bulk.
+
+    The snapshot is locked, and the diff is computed and applied in one
+    transaction, so a failure leaves all permissions as they were and concurrent
+    restores of the same snapshot run one after the other. Groups and states
+    created after the snapshot keep their permissions.
+
+    :param snapshot: Snapshot
+    :type snapshot: PermissionSnapshot
+    :param actor: User restoring the snapshot, for the audit log
+    :type actor: User | None
+    :return: Report of the changes
+    :rtype: dict
+    """
+
+    with transaction.atomic(using=router.db_for_write(PermissionSnapshotEntry)):
+        snapshot = PermissionSnapshot.objects.select_for_update().get(pk=snapshot.pk)
+        plan = plan_snapshot_restore(snapshot)
+        apply_import(plan=plan, actor=actor)
+
+    return get_import_report(plan=plan, dry_run=False)
@@ -0,0 +1,144 @@
+"""
+Declarative sync of the permissions of groups and states.
+
+A spec lists the wanted permissions per group and state by name, as
+`app_label.codename` (or `app_label.model.codename` where a codename isn't
+unique within its app):
+
+.. code-block:: yaml
+
+    groups:
+      Fleet Commanders:
+        - fittings.access_fittings
+    states:
+      Member:
+        - aa_permission_management.access_permission_management
+
+The listed groups and states get exactly the listed permissions, all others are
+left alone. Syncing a database that already matches the spec costs only the
+reads of the diff and writes nothing.
+"""
+
+# Standard Library
+import json
+from pathlib import Path
+
+# Third Party
+import yaml
+
+# AA Permission Management
+from aa_permission_management.constants import IMPORT_CHUNK_SIZE
+from aa_permission_management.helper.importer import (
+    IMPORT_MODE_REPLACE,
+    AssignmentResolver,
+    ImportRowError,
+    diff_assignments,
+)
+from aa_permission_management.models import PermissionSetVersion
+
+# Keys of the spec per target type
+SPEC_KEYS = {
+    "groups": PermissionSetVersion.TargetType.GROUP,
+    "states": PermissionSetVersion.TargetType.STATE,
+}
+
+
+def load_sync_spec(path: str | Path) -> dict:
+    """
+    Load a sync spec from a JSON file (`.json`) or a YAML file (anything else).
+
+    :param path: Path of the spec
+    :type path: str | Path
+    :return: Spec
+    :rtype: dict
+    """
+
+    path = Path(path)
+
+    with path.open(encoding="utf-8") as file:
+        try:
+            if path.suffix.lower() == ".json":
+                return json.load(file)
+
+            return yaml.safe_load(file)
+        except (json.JSONDecodeError, yaml.YAMLError) as exc:
+            raise ValueError(f"Invalid spec: {exc}") from exc
+
+
+def plan_sync(spec: dict, chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+    """
+    Compute the changes to sync the groups and states of a spec.
+
+    The plan has the shape of an import plan in replace mode, so it can be
+    applied with :func:`aa_permission_management.helper.importer.apply_import`
+    and reported with :func:`aa_permission_management.helper.importer.get_import_report`.
+
+    :param spec: Spec, see :func:`load_sync_spec`
+    :type spec: dict
+    :param chunk_size: Number of targets whose assignments are read at once
+    :type chunk_size: int
+    :return: Sync plan, with one error per unknown group, state or permission
+    :rtype: dict
+    """
+
+    if not isinstance(spec, dict) or not set(spec) <= set(SPEC_KEYS):
+        raise ValueError(
+            f"The spec must be a mapping with the keys {', '.join(SPEC_KEYS)}"
+        )
+
+    resolver = AssignmentResolver()
+    wanted = {}
+    plan = {
+        "mode": IMPORT_MODE_REPLACE,
+        "rows": 0,
+        "invalid": 0,
+        "errors": [],
+        "resolver": resolver,
+    }
+
+    for key, target_type in SPEC_KEYS.items():
+        targets = spec.get(key) or {}
+
+        if not isinstance(targets, dict):
+            raise ValueError(f"{key} must map names to lists of permissions")
+
+        for name, permissions in targets.items():
+            permissions = permissions or []
+
+            if not isinstance(permissions, list):
+                raise ValueError(f"The permissions of {name} must be a list")
+
+            try:
+                target_id = resolver.resolve_target(target_type=target_type, name=name)
+            except ImportRowError as exc:
+                plan["invalid"] += 1
+                plan["errors"].append({"target": name, "error": str(exc)})
+
+                continue
+
+            permission_ids = wanted.setdefault(target_type, {}).setdefault(
+                target_id, set()
+            )
+
+            for permission in permissions:
+                plan["rows"] += 1
+                app_label, _, codename = str(permission).partition(".")
+                model, _, codename = codename.rpartition(".")
+
+                try:
+                    permission_ids.add(
+                        resolver.resolve_permission(
+                            app_label=app_label, codename=codename, model=model
+                        )
+                    )
+                except ImportRowError as exc:
+                    plan["invalid"] += 1
+                    plan["errors"].append(
+                        {"target": name, "permission": permission, "error": str(exc)}
+                    )
+
+    plan["changes"] = diff_assignments(
+        wanted=wanted, mode=IMPORT_MODE_REPLACE, chunk_size=chunk_size
+    )
+
+    return plan
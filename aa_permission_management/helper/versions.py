@@ -0,0 +1,135 @@
+"""
+Permission set versions.
+
+Every group and state carries a version that is bumped whenever its permission set
+changes (see :mod:`aa_permission_management.signals`). Targets without a version
+row yet are at version 0.
+"""
+
+# Standard Library
+from collections.abc import Iterable
+
+# Django
+from django.db.models import F
+
+# AA Permission Management
+from aa_permission_management.models import PermissionSetVersion
+
+
+class PermissionSetVersionConflict(Exception):
+    """
+    The permission set has been changed since the version the change is based on.
+    """
+
+    def __init__(self, version: int):
+        """
+        Initializes the conflict with the current version.
+
+        :param version: Current version of the permission set
+        :type version: int
+        """
+
+        super().__init__("Permission set has been changed in the meantime")
+
+        self.version = version
+
+
+def get_permission_set_version(target_type: str, target_id: int) -> int:
+    """
+    Get the version of the permission set of a group or state.
+
+    :param target_type: Target type ("group" or "state")
+    :type target_type: str
+    :param target_id: ID of the group or state
+    :type target_id: int
+    :return: Version of the permission set
+    :rtype: int
+    """
+
+    version = (
+        PermissionSetVersion.objects.filter(
+            target_type=target_type, target_id=target_id
+        )
+        .values_list("version", flat=True)
+        .first()
+    )
+
+    return version or 0
+
+
+def bump_permission_set_versions(target_type: str, target_ids: Iterable[int]) -> None:
+    """
+    Bump the versions of the permission sets of the given groups or states.
+
+    In the common case, all targets already have a version row and this costs a
+    single UPDATE. Missing rows are created at version 0 and bumped right after,
+    so concurrent first bumps never get lost. A version might be bumped twice
+    then, which is harmless, since versions only need to change.
+
+    :param target_type: Target type ("group" or "state")
+    :type target_type: str
+    :param target_ids: IDs of the groups or states
+    :type target_ids: Iterable[int]
+    :return:
+    :rtype:
+    """
+
+    target_ids = set(target_ids)
+
+    if not target_ids:
+        return
+
+    versions = PermissionSetVersion.objects.filter(
+        target_type=target_type, target_id__in=target_ids
+    )
+
+    if versions.update(version=F("version") + 1) == len(target_ids):
+        return
+
+    PermissionSetVersion.objects.bulk_create(
+        [
+            PermissionSetVersion(target_type=target_type, target_id=target_id)
+            for target_id in target_ids
+        ],
+        ignore_conflicts=True,
+    )
+    versions.update(version=F("version") + 1)
+
+
+def compare_and_bump_permission_set_version(
+    target_type: str, target_id: int, version: int
+) -> int:
+    """
+    Bump the version of a permission set, if it is still at the given version.
+
+    This is a single conditional UPDATE, so it must run in the transaction of the
+    change it guards. A concurrent change of the same permission set waits for
+    that transaction and fails afterward, without any lock being held between
+    reading the permissions and sending the change.
+
+    :param target_type: Target type ("group" or "state")
+    :type target_type: str
+    :param target_id: ID of the group or state
+    :type target_id: int
+    :param version: Version the change is based on
+    :type version: int
+    :return: Bumped version
+    :rtype: int
+    """
+
+    if version == 0:
+        PermissionSetVersion.objects.bulk_create(
+            [PermissionSetVersion(target_type=target_type, target_id=target_id)],
+            ignore_conflicts=True,
+        )
+
+    if not PermissionSetVersion.objects.filter(
+        target_type=target_type, target_id=target_id, version=version
+    ).update(version=F("version") + 1):
+        raise PermissionSetVersionConflict(
+            version=get_permission_set_version(
+                target_type=target_type, target_id=target_id
+            )
+        )
+
+    return version + 1
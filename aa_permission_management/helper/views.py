@@ -6,9 +6,29 @@ Helper functions for the views in aa_permission_management.
 from collections.abc import Iterable
 from typing import Any
 
+# Django
+from django.contrib.auth.models import Group, User
+from django.db import router, transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed
+
 # Alliance Auth
 from allianceauth.authentication.models import Permission, State
 from allianceauth.groupmanagement.models import AuthGroup
+from allianceauth.services.hooks import ServicesHook
+
+# AA Permission Management
+from aa_permission_management.helper.audit import log_permission_changes
+from aa_permission_management.helper.catalog import (
+    get_permission_catalog,
+    hydrate_permissions,
+)
+from aa_permission_management.helper.versions import (
+    bump_permission_set_versions,
+    compare_and_bump_permission_set_version,
+    get_permission_set_version,
+)
+from aa_permission_management.models import PermissionSetVersion
 
 
 def _get_permissions_to_set(permissions: Iterable[str]) -> list[str] | list[str | Any]:
@@ -32,6 +52,241 @@ def _get_permissions_to_set(permissions: Iterable[str]) -> list[str] | list[str
     return perms_to_set
 
 
+def _get_permission_ids(permissions: Iterable) -> set[int]:
+    """
+    Get the set of permission IDs from permission instances or IDs.
+
+    :param permissions: Permissions or permission IDs
+    :type permissions: Iterable
+    :return: Permission IDs
+    :rtype: set[int]
+    """
+
+    return {int(permission) for permission in _get_permissions_to_set(permissions)}
+
+
+def _send_permissions_changed(
+    instance: Group | State, action: str, pk_set: set
+) -> None:
+    """
+    Send `m2m_changed` for a change of the permissions of a group or state, just
+    like `permissions.add()` and `permissions.remove()` would.
+
+    :param instance: Group or state
+    :type instance: Group | State
+    :param action: M2M action, e.g. "post_add"
+    :type action: str
+    :param pk_set: IDs of the added or removed permissions
+    :type pk_set: set
+    :return:
+    :rtype:
+    """
+
+    through_model = type(instance).permissions.through
+
+    m2m_changed.send(
+        sender=through_model,
+        instance=instance,
+        action=action,
+        reverse=False,
+        model=through_model._meta.get_field("permission").related_model,
+        pk_set=pk_set,
+        using=router.db_for_write(through_model, instance=instance),
+    )
+
+
+def _get_target(instance: Group | State) -> tuple[str, str]:
+    """
+    Get the target type and the target field on the through model of a group or state.
+
+    :param instance: Group or state
+    :type instance: Group | State
+    :return: Target type and target field
+    :rtype: tuple[str, str]
+    """
+
+    if isinstance(instance, Group):
+        return PermissionSetVersion.TargetType.GROUP, "group_id"
+
+    return PermissionSetVersion.TargetType.STATE, "state_id"
+
+
+def _update_permission_set(
+    instance: Group | State,
+    add: Iterable,
+    remove: Iterable,
+    version: int | None = None,
+    actor: User | None = None,
+) -> dict:
+    """
+    Apply a permission delta to a group or state.
+
+    The delta is written to the M2M through table in bulk, with one INSERT for the
+    added and one DELETE for the removed permissions, in a single transaction.
+    `m2m_changed` is sent as usual, so service validation and permission set
+    versions keep working. Every change is recorded in the audit log, in the same
+    transaction. Permissions that are already assigned, not assigned, or don't
+    exist at all are skipped.
+
+    If a version is given, the delta is only applied if the permission set is
+    still at that version, otherwise :class:`PermissionSetVersionConflict` is
+    raised.
+
+    :param instance: Group or state
+    :type instance: Group | State
+    :param add: Permissions or permission IDs to add
+    :type add: Iterable
+    :param remove: Permissions or permission IDs to remove
+    :type remove: Iterable
+    :param version: Version the delta is based on
+    :type version: int | None
+    :param actor: User making the change, for the audit log
+    :type actor: User | None
+    :return: New permission set version and the numbers of added, removed and
+        assigned permissions
+    :rtype: dict
+    """
+
+    add = _get_permission_ids(add)
+    remove = _get_permission_ids(remove)
+
+    if add & remove:
+        raise ValueError("Permissions cannot be added and removed at once")
+
+    through_model = type(instance).permissions.through
+    permission_model = through_model._meta.get_field("permission").related_model
+    target_type, target_field = _get_target(instance)
+
+    with transaction.atomic(using=router.db_for_write(through_model)):
+        if version is not None:
+            compare_and_bump_permission_set_version(
+                target_type=target_type, target_id=instance.pk, version=version
+            )
+
+        assigned = through_model.objects.filter(**{target_field: instance.pk})
+        existing = set(
+            assigned.filter(permission_id__in=add | remove).values_list(
+                "permission_id", flat=True
+            )
+        )
+        to_remove = remove & existing
+        to_add = set()
+
+        if add - existing:
+            to_add = set(
+                permission_model.objects.filter(pk__in=add - existing).values_list(
+                    "pk", flat=True
+                )
+            )
+
+        if to_remove:
+            _send_permissions_changed(instance, "pre_remove", to_remove)
+            assigned.filter(permission_id__in=to_remove).delete()
+            _send_permissions_changed(instance, "post_remove", to_remove)
+
+        if to_add:
+            _send_permissions_changed(instance, "pre_add", to_add)
+            through_model.objects.bulk_create(
+                [
+                    through_model(**{target_field: instance.pk, "permission_id": pk})
+                    for pk in to_add
+                ],
+                ignore_conflicts=True,
+            )
+            _send_permissions_changed(instance, "post_add", to_add)
+
+        log_permission_changes(
+            target_type=target_type,
+            added=[(instance.pk, pk) for pk in to_add],
+            removed=[(instance.pk, pk) for pk in to_remove],
+            actor=actor,
+        )
+
+        return {
+            "version": get_permission_set_version(
+                target_type=target_type, target_id=instance.pk
+            ),
+            "added": len(to_add),
+            "removed": len(to_remove),
+            "count": assigned.count(),
+        }
+
+
+def _set_permission_set(
+    instance: Group | State,
+    permissions: Iterable,
+    version: int | None = None,
+    actor: User | None = None,
+) -> dict:
+    """
+    Set the permissions of a group or state by applying the difference to the
+    currently assigned permissions.
+
+    :param instance: Group or state
+    :type instance: Group | State
+    :param permissions: Permissions or permission IDs to set
+    :type permissions: Iterable
+    :param version: Version the permissions are based on
+    :type version: int | None
+    :param actor: User making the change, for the audit log
+    :type actor: User | None
+    :return: New permission set version and the numbers of added, removed and
+        assigned permissions
+    :rtype: dict
+    """
+
+    permissions = _get_permission_ids(permissions)
+    through_model = type(instance).permissions.through
+    target_type, _ = _get_target(instance)
+
+    with transaction.atomic(using=router.db_for_write(through_model)):
+        if version is not None:
+            compare_and_bump_permission_set_version(
+                target_type=target_type, target_id=instance.pk, version=version
+            )
+
+        current = set(instance.permissions.values_list("pk", flat=True))
+
+        return _update_permission_set(
+            instance,
+            add=permissions - current,
+            remove=current - permissions,
+            actor=actor,
+        )
+
+
+def _get_group(group_id: int) -> Group:
+    """
+    Get the Django group of an Alliance Auth group.
+
+    :param group_id: ID of the group
+    :type group_id: int
+    :return: Group
+    :rtype: Group
+    """
+
+    try:
+        return AuthGroup.objects.select_related("group").get(pk=group_id).group
+    except AuthGroup.DoesNotExist as exc:
+        raise ValueError("Group does not exist") from exc
+
+
+def _get_state(state_id: int) -> State:
+    """
+    Get a state.
+
+    :param state_id: ID of the state
+    :type state_id: int
+    :return: State
+    :rtype: State
+    """
+
+    try:
+        return State.objects.get(pk=state_id)
+    except State.DoesNotExist as exc:
+        raise ValueError("State does not exist") from exc
+
+
 def get_group_permissions(group_id: int) -> list:
     """
     Get permissions for a specific group.
@@ -43,14 +298,39 @@ def get_group_permissions(group_id: int) -> list:
     """
 
     try:
-        group = AuthGroup.objects.get(pk=group_id)
+        group = AuthGroup.objects.select_related("group").get(pk=group_id)
 
-        return list(group.group.permissions.all())
+        return list(hydrate_permissions(group.group.permissions.all()))
     except AuthGroup.DoesNotExist as exc:
         raise ValueError("Group does not exist") from exc
 
 
-def set_group_permissions(group_id: int, permissions: Iterable[str]) -> None:
+def get_group_permission_ids(group_id: int) -> list[int]:
+    """
+    Get the IDs of the permissions assigned to a specific group.
+
+    :param group_id: ID of the group
+    :type group_id: int
+    :return: List of permission IDs
+    :rtype: list[int]
+    """
+
+    if not AuthGroup.objects.filter(pk=group_id).exists():
+        raise ValueError("Group does not exist")
+
+    return list(
+        Group.permissions.through.objects.filter(group_id=group_id)
+        .order_by("permission_id")
+        .values_list("permission_id", flat=True)
+    )
+
+
+def set_group_permissions(
+    group_id: int,
+    permissions: Iterable[str],
+    version: int | None = None,
+    actor: User | None = None,
+) -> dict:
     """
     Set permissions for a specific group.
 
@@ -58,14 +338,50 @@ def set_group_permissions(group_id: int, permissions: Iterable[str]) -> None:
     :type group_id: int
     :param permissions: List of permissions to set
     :type permissions: list
+    :param version: Permission set version the permissions are based on, the
+        permissions are only set if the group is still at this version
+    :type version: int | None
+    :param actor: User making the change, for the audit log
+    :type actor: User | None
+    :return: New permission set version and the numbers of added, removed and
+        assigned permissions
+    :rtype: dict
     """
 
-    try:
-        group = AuthGroup.objects.get(pk=group_id)
-        group.group.permissions.set(_get_permissions_to_set(permissions))
-        group.group.save()
-    except AuthGroup.DoesNotExist as exc:
-        raise ValueError("Group does not exist") from exc
+    return _set_permission_set(
+        _get_group(group_id), permissions, version=version, actor=actor
+    )
+
+
+def update_group_permissions(
+    group_id: int,
+    add: Iterable = (),
+    remove: Iterable = (),
+    version: int | None = None,
+    actor: User | None = None,
+) -> dict:
+    """
+    Add and remove permissions of a specific group.
+
+    :param group_id: ID of the group
+    :type group_id: int
+    :param add: Permissions or permission IDs to add
+    :type add: Iterable
+    :param remove: Permissions or permission IDs to remove
+    :type remove: Iterable
+    :param version: Permission set version the delta is based on, the delta is
+        only applied if the group is still at this version
+    :type version: int | None
+    :param actor: User making the change, for the audit log
+    :type actor: User | None
+    :return: New permission set version and the numbers of added, removed and
+        assigned permissions
+    :rtype: dict
+    """
+
+    return _update_permission_set(
+        _get_group(group_id), add=add, remove=remove, version=version, actor=actor
+    )
 
 
 def get_state_permissions(state_id: int) -> list:
@@ -81,12 +397,37 @@ def get_state_permissions(state_id: int) -> list:
     try:
         state = State.objects.get(pk=state_id)
 
-        return list(state.permissions.all())
+        return list(hydrate_permissions(state.permissions.all()))
     except State.DoesNotExist as exc:
         raise ValueError("State does not exist") from exc
 
 
-def set_state_permissions(state_id: int, permissions: Iterable[str]) -> None:
+def get_state_permission_ids(state_id: int) -> list[int]:
+    """
+    Get the IDs of the permissions assigned to a specific state.
+
+    :param state_id: ID of the state
+    :type state_id: int
+    :return: List of permission IDs
+    :rtype: list[int]
+    """
+
+    if not State.objects.filter(pk=state_id).exists():
+        raise ValueError("State does not exist")
+
+    return list(
+        State.permissions.through.objects.filter(state_id=state_id)
+        .order_by("permission_id")
+        .values_list("permission_id", flat=True)
+    )
+
+
+def set_state_permissions(
+    state_id: int,
+    permissions: Iterable[str],
+    version: int | None = None,
+    actor: User | None = None,
+) -> dict:
     """
     Set permissions for a specific state.
 
@@ -94,22 +435,412 @@ def set_state_permissions(state_id: int, permissions: Iterable[str]) -> None:
     :type state_id: int
     :param permissions: List of permissions to set
     :type permissions: list
+    :param version: Permission set version the permissions are based on, the
+        permissions are only set if the state is still at this version
+    :type version: int | None
+    :param actor: User making the change, for the audit log
+    :type actor: User | None
+    :return: New permission set version and the numbers of added, removed and
+        assigned permissions
+    :rtype: dict
     """
 
-    try:
-        state = State.objects.get(pk=state_id)
-        state.permissions.set(_get_permissions_to_set(permissions))
-        state.save()
-    except State.DoesNotExist as exc:
-        raise ValueError("State does not exist") from exc
+    return _set_permission_set(
+        _get_state(state_id), permissions, version=version, actor=actor
+    )
+
+
+def update_state_permissions(
+    state_id: int,
+    add: Iterable = (),
+    remove: Iterable = (),
+    version: int | None = None,
+    actor: User | None = None,
+) -> dict:
+    """
+    Add and remove permissions of a specific state.
+
+    :param state_id: ID of the state
+    :type state_id: int
+    :param add: Permissions or permission IDs to add
+    :type add: Iterable
+    :param remove: Permissions or permission IDs to remove
+    :type remove: Iterable
+    :param version: Permission set version the delta is based on, the delta is
+        only applied if the state is still at this version
+    :type version: int | None
+    :param actor: User making the change, for the audit log
+    :type actor: User | None
+    :return: New permission set version and the numbers of added, removed and
+        assigned permissions
+    :rtype: dict
+    """
+
+    return _update_permission_set(
+        _get_state(state_id), add=add, remove=remove, version=version, actor=actor
+    )
+
+
+def _apply_permission_delta_bulk(
+    through_model: type,
+    target_field: str,
+    target_type: str,
+    target_ids: set,
+    add: set,
+    remove: set,
+    actor: User | None = None,
+) -> dict:
+    """
+    Apply a permission delta to many groups or states with one INSERT and one
+    DELETE on the M2M through table, and record it in the audit log.
+
+    :param through_model: M2M through model of the permissions
+    :type through_model: type
+    :param target_field: Name of the group or state field on the through model
+    :type target_field: str
+    :param target_type: Target type ("group" or "state")
+    :type target_type: str
+    :param target_ids: IDs of the groups or states
+    :type target_ids: set
+    :param add: IDs of existing permissions to add
+    :type add: set
+    :param remove: IDs of permissions to remove
+    :type remove: set
+    :param actor: User making the change, for the audit log
+    :type actor: User | None
+    :return: Numbers of added and removed permissions per changed target
+    :rtype: dict
+    """
+
+    changes = {}
+
+    if not target_ids or not (add or remove):
+        return changes
+
+    existing = set(
+        through_model.objects.filter(
+            **{f"{target_field}__in": target_ids}, permission_id__in=add | remove
+        ).values_list(target_field, "permission_id")
+    )
+    to_add = [
+        (target_id, permission_id)
+        for target_id in target_ids
+        for permission_id in add
+        if (target_id, permission_id) not in existing
+    ]
+    removed = [
+        (target_id, permission_id)
+        for target_id, permission_id in existing
+        if permission_id in remove
+    ]
+
+    if removed:
+        through_model.objects.filter(
+            **{f"{target_field}__in": {target_id for target_id, _ in removed}},
+            permission_id__in=remove,
+        ).delete()
+
+    if to_add:
+        through_model.objects.bulk_create(
+            [
+                through_model(**{target_field: target_id, "permission_id": pk})
+                for target_id, pk in to_add
+            ],
+            ignore_conflicts=True,
+        )
+
+    log_permission_changes(
+        target_type=target_type, added=to_add, removed=removed, actor=actor
+    )
+
+    for key, rows in (("added", to_add), ("removed", removed)):
+        for target_id, _ in rows:
+            changes.setdefault(target_id, {"added": 0, "removed": 0})[key] += 1
+
+    return changes
+
+
+def _validate_services_on_commit(permission_ids: set, users: Q) -> None:
+    """
+    Validate the services of the affected users after removed service permissions.
+
+    Like Alliance Auth does for single groups and states, but once for all
+    targets of a bulk change. Users are only looked up if one of the removed
+    permissions is the access permission of a service.
+
+    :param permission_ids: IDs of the removed permissions
+    :type permission_ids: set
+    :param users: Filter for the affected users
+    :type users: Q
+    :return:
+    :rtype:
+    """
+
+    if not permission_ids or not users:
+        return
+
+    removed_permissions = {
+        f"{app_label}.{codename}"
+        for app_label, codename in Permission.objects.filter(
+            pk__in=permission_ids
+        ).values_list("content_type__app_label", "codename")
+    }
+    services = [
+        service
+        for service in ServicesHook.get_services()
+        if service.access_perm in removed_permissions
+    ]
+
+    if not services:
+        return
+
+    def validate_services():
+        for user in User.objects.filter(users).distinct():
+            for service in services:
+                service.validate_user(user)
+
+    transaction.on_commit(validate_services)
+
+
+def check_targets_exist(
+    group_ids: Iterable[int] = (), state_ids: Iterable[int] = ()
+) -> None:
+    """
+    Check that all the given groups and states exist.
+
+    :param group_ids: IDs of the groups
+    :type group_ids: Iterable[int]
+    :param state_ids: IDs of the states
+    :type state_ids: Iterable[int]
+    :return:
+    :rtype:
+    """
+
+    group_ids = set(group_ids)
+    state_ids = set(state_ids)
+
+    if group_ids - set(
+        AuthGroup.objects.filter(pk__in=group_ids).values_list("pk", flat=True)
+    ):
+        raise ValueError("Group does not exist")
+
+    if state_ids - set(
+        State.objects.filter(pk__in=state_ids).values_list("pk", flat=True)
+    ):
+        raise ValueError("State does not exist")
+
+
+def apply_permissions(
+    group_ids: Iterable[int] = (),
+    state_ids: Iterable[int] = (),
+    add: Iterable = (),
+    remove: Iterable = (),
+    actor: User | None = None,
+) -> dict:
+    """
+    Add and remove permissions of many groups and states at once.
+
+    The delta is written with one INSERT and one DELETE per through table, in a
+    single transaction, so the number of queries doesn't depend on the number of
+    targets. Instead of `m2m_changed` per target, the permission set versions of
+    all changed targets are bumped at once, and services are validated once for
+    the members of all targets that lost a service permission.
+
+    :param group_ids: IDs of the groups
+    :type group_ids: Iterable[int]
+    :param state_ids: IDs of the states
+    :type state_ids: Iterable[int]
+    :param add: Permissions or permission IDs to add
+    :type add: Iterable
+    :param remove: Permissions or permission IDs to remove
+    :type remove: Iterable
+    :param actor: User making the change, for the audit log
+    :type actor: User | None
+    :return: Numbers of added and removed permissions per changed group and state,
+        with their new permission set versions, and the totals
+    :rtype: dict
+    """
+
+    group_ids = {int(group_id) for group_id in group_ids}
+    state_ids = {int(state_id) for state_id in state_ids}
+    add = _get_permission_ids(add)
+    remove = _get_permission_ids(remove)
+
+    if add & remove:
+        raise ValueError("Permissions cannot be added and removed at once")
+
+    check_targets_exist(group_ids=group_ids, state_ids=state_ids)
+
+    if add:
+        add = set(Permission.objects.filter(pk__in=add).values_list("pk", flat=True))
+
+    result = {"groups": {}, "states": {}, "added": 0, "removed": 0}
+
+    with transaction.atomic(using=router.db_for_write(Group.permissions.through)):
+        for key, through_model, target_field, target_type, target_ids in (
+            (
+                "groups",
+                Group.permissions.through,
+                "group_id",
+                PermissionSetVersion.TargetType.GROUP,
+                group_ids,
+            ),
+            (
+                "states",
+                State.permissions.through,
+                "state_id",
+                PermissionSetVersion.TargetType.STATE,
+                state_ids,
+            ),
+        ):
+            changes = _apply_permission_delta_bulk(
+                through_model=through_model,
+                target_field=target_field,
+                target_type=target_type,
+                target_ids=target_ids,
+                add=add,
+                remove=remove,
+                actor=actor,
+            )
+
+            if not changes:
+                continue
+
+            bump_permission_set_versions(target_type=target_type, target_ids=changes)
+
+            for target_id, version in PermissionSetVersion.objects.filter(
+                target_type=target_type, target_id__in=changes
+            ).values_list("target_id", "version"):
+                changes[target_id]["version"] = version
+
+            result[key] = changes
+            result["added"] += sum(change["added"] for change in changes.values())
+            result["removed"] += sum(change["removed"] for change in changes.values())
+
+        groups_with_removals = [
+            group_id
+            for group_id, change in result["groups"].items()
+            if change["removed"]
+        ]
+        states_with_removals = [
+            state_id
+            for state_id, change in result["states"].items()
+            if change["removed"]
+        ]
+        users = Q()
+
+        if groups_with_removals:
+            users |= Q(groups__in=groups_with_removals)
+
+        if states_with_removals:
+            users |= Q(profile__state__in=states_with_removals)
+
+        _validate_services_on_commit(permission_ids=remove, users=users)
+
+    return result
+
+
+def apply_permission_changes(
+    target_type: str,
+    added: Iterable[tuple[int, int]] = (),
+    removed: Iterable[tuple[int, int]] = (),
+    actor: User | None = None,
+) -> dict:
+    """
+    Add and remove individual permissions of many groups or states at once.
+
+    Unlike :func:`apply_permissions`, every group or state can get its own delta.
+    The changes are written with one INSERT and one DELETE in a single
+    transaction, so callers with many changes should pass them in chunks, which
+    keeps every query within the parameter limits of the database. Pairs that
+    are already assigned or not assigned are skipped.
+
+    :param target_type: Target type ("group" or "state")
+    :type target_type: str
+    :param added: Permissions to add as (target ID, permission ID) pairs
+    :type added: Iterable[tuple[int, int]]
+    :param removed: Permissions to remove as (target ID, permission ID) pairs
+    :type removed: Iterable[tuple[int, int]]
+    :param actor: User making the change, for the audit log
+    :type actor: User | None
+    :return: Numbers of added and removed permissions and changed targets
+    :rtype: dict
+    """
+
+    if target_type == PermissionSetVersion.TargetType.GROUP:
+        through_model, target_field = Group.permissions.through, "group_id"
+        users_field = "groups__in"
+    elif target_type == PermissionSetVersion.TargetType.STATE:
+        through_model, target_field = State.permissions.through, "state_id"
+        users_field = "profile__state__in"
+    else:
+        raise ValueError("Invalid target type")
+
+    added = set(added)
+    removed = set(removed)
+
+    if added & removed:
+        raise ValueError("Permissions cannot be added and removed at once")
+
+    pairs = added | removed
+
+    if not pairs:
+        return {"added": 0, "removed": 0, "targets": 0}
+
+    with transaction.atomic(using=router.db_for_write(through_model)):
+        existing = {
+            (target_id, permission_id): pk
+            for pk, target_id, permission_id in through_model.objects.filter(
+                **{f"{target_field}__in": {target_id for target_id, _ in pairs}},
+                permission_id__in={permission_id for _, permission_id in pairs},
+            ).values_list("pk", target_field, "permission_id")
+        }
+        to_remove = [pair for pair in removed if pair in existing]
+        to_add = [pair for pair in added if pair not in existing]
+
+        if to_remove:
+            through_model.objects.filter(
+                pk__in=[existing[pair] for pair in to_remove]
+            ).delete()
+
+        if to_add:
+            through_model.objects.bulk_create(
+                [
+                    through_model(**{target_field: target_id, "permission_id": pk})
+                    for target_id, pk in to_add
+                ],
+                ignore_conflicts=True,
+            )
+
+        log_permission_changes(
+            target_type=target_type, added=to_add, removed=to_remove, actor=actor
+        )
+
+        changed_targets = {target_id for target_id, _ in to_add + to_remove}
+
+        bump_permission_set_versions(
+            target_type=target_type, target_ids=changed_targets
+        )
+
+        if to_remove:
+            _validate_services_on_commit(
+                permission_ids={permission_id for _, permission_id in to_remove},
+                users=Q(**{users_field: {target_id for target_id, _ in to_remove}}),
+            )
+
+    return {
+        "added": len(to_add),
+        "removed": len(to_remove),
+        "targets": len(changed_targets),
+    }
 
 
 def get_all_permissions() -> list:
     """
-    Get all Django permissions.
+    Get all Django permissions from the permission catalog.
 
     :return: List of all unique permissions
     :rtype: list
     """
 
-    return list(Permission.objects.all())
+    return list(get_permission_catalog())
@@ -0,0 +1,110 @@
+"""
+Prune outdated entries from the audit log.
+"""
+
+# Standard Library
+from datetime import timedelta
+
+# Django
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+# AA Permission Management
+from aa_permission_management import app_settings
+from aa_permission_management.helper.audit import prune_audit_log
+from aa_permission_management.helper.jobs import create_job
+from aa_permission_management.models import PermissionAuditLog, PermissionJob
+from aa_permission_management.tasks import queue_permission_job
+
+
+class Command(BaseCommand):
+    """
+    Prune outdated entries from the audit log
+    """
+
+    help = (
+        "Deletes audit log entries older than the retention period in batches, "
+        "so the audit log table is never locked for long. With --background, "
+        "the batches are deleted by a background job instead."
+    )
+
+    def add_arguments(self, parser):
+        """
+        Add arguments to the command
+
+        :param parser:
+        :type parser:
+        :return:
+        :rtype:
+        """
+
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=app_settings.AA_PERMISSION_MANAGEMENT_AUDIT_LOG_RETENTION_DAYS,
+            help=(
+                "Keep the entries of this many days "
+                "(default: AA_PERMISSION_MANAGEMENT_AUDIT_LOG_RETENTION_DAYS)"
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of entries deleted per batch (default: 5000)",
+        )
+        parser.add_argument(
+            "--background",
+            action="store_true",
+            help="Queue a background job deleting the entries, one batch per task",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Handle the command
+
+        :param args:
+        :type args:
+        :param options:
+        :type options:
+        :return:
+        :rtype:
+        """
+
+        if options["days"] < 0:
+            self.stderr.write(self.style.ERROR("The number of days can't be negative."))
+
+            return
+
+        if options["batch_size"] < 1:
+            self.stderr.write(self.style.ERROR("The batch size must be at least 1."))
+
+            return
+
+        before = timezone.now() - timedelta(days=options["days"])
+
+        if options["background"]:
+            job = create_job(
+                kind=PermissionJob.Kind.PRUNE,
+                payload={
+                    "before": before.isoformat(),
+                    "chunk_size": options["batch_size"],
+                },
+                total=PermissionAuditLog.objects.filter(timestamp__lt=before).count(),
+            )
+            queue_permission_job(job=job)
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Queued job {job.pk} deleting {job.total} outdated audit log "
+                    "entries."
+                )
+            )
+
+            return
+
+        deleted = prune_audit_log(before=before, batch_size=options["batch_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} outdated audit log entries.")
+        )
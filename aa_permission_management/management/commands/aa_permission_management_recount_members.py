@@ -0,0 +1,145 @@
+"""
+Recount the members of all groups and states.
+"""
+
+# Standard Library
+from collections.abc import Callable, Iterator
+
+# Django
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import QuerySet
+
+# Alliance Auth
+from allianceauth.authentication.models import State
+
+# AA Permission Management
+from aa_permission_management.helper.member_counts import (
+    recount_group_member_counts,
+    recount_state_member_counts,
+)
+
+
+def _iter_pk_batches(queryset: QuerySet, batch_size: int) -> Iterator[list[int]]:
+    """
+    Iterate over the primary keys of a queryset in batches, ordered by primary key.
+
+    :param queryset:
+    :type queryset:
+    :param batch_size:
+    :type batch_size:
+    :return:
+    :rtype:
+    """
+
+    last_pk = None
+
+    while True:
+        batch = queryset.order_by("pk")
+
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+
+        pks = list(batch.values_list("pk", flat=True)[:batch_size])
+
+        if not pks:
+            return
+
+        yield pks
+
+        last_pk = pks[-1]
+
+
+class Command(BaseCommand):
+    """
+    Recount the members of all groups and states
+    """
+
+    help = (
+        "Recounts the members of all groups and states in batches, repairing "
+        "member counters that drifted, e.g. through bulk updates."
+    )
+
+    def add_arguments(self, parser):
+        """
+        Add arguments to the command
+
+        :param parser:
+        :type parser:
+        :return:
+        :rtype:
+        """
+
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of groups or states recounted per batch (default: 500)",
+        )
+
+    def _recount(
+        self,
+        label: str,
+        queryset: QuerySet,
+        recount: Callable[[list[int]], dict],
+        batch_size: int,
+    ) -> None:
+        """
+        Recount the members of all targets in a queryset, one transaction per batch.
+
+        :param label:
+        :type label:
+        :param queryset:
+        :type queryset:
+        :param recount:
+        :type recount:
+        :param batch_size:
+        :type batch_size:
+        :return:
+        :rtype:
+        """
+
+        total = 0
+
+        for pks in _iter_pk_batches(queryset=queryset, batch_size=batch_size):
+            with transaction.atomic():
+                recount(pks)
+
+            total += len(pks)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Recounted the members of {total} {label}.")
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Handle the command
+
+        :param args:
+        :type args:
+        :param options:
+        :type options:
+        :return:
+        :rtype:
+        """
+
+        batch_size = options["batch_size"]
+
+        if batch_size < 1:
+            self.stderr.write(self.style.ERROR("The batch size must be at least 1."))
+
+            return
+
+        self._recount(
+            label="groups",
+            queryset=Group.objects.all(),
+            recount=recount_group_member_counts,
+            batch_size=batch_size,
+        )
+        self._recount(
+            label="states",
+            queryset=State.objects.all(),
+            recount=recount_state_member_counts,
+            batch_size=batch_size,
+        )
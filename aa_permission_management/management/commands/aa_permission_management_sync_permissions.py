@@ -0,0 +1,109 @@
+"""
+Sync the permissions of groups and states with a spec.
+"""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+
+# AA Permission Management
+from aa_permission_management.helper.importer import apply_import, get_import_report
+from aa_permission_management.helper.sync import load_sync_spec, plan_sync
+
+# Exit code of --check when changes are pending
+EXIT_CODE_CHANGES_PENDING = 2
+
+
+class Command(BaseCommand):
+    """
+    Sync the permissions of groups and states with a spec
+    """
+
+    help = (
+        "Gives the groups and states of a YAML or JSON spec exactly the listed "
+        "permissions, in bulk, and leaves all others alone. Exits with 1 if the "
+        "spec is invalid, and with --check, with 2 if changes are pending."
+    )
+
+    def add_arguments(self, parser):
+        """
+        Add arguments to the command
+
+        :param parser:
+        :type parser:
+        :return:
+        :rtype:
+        """
+
+        parser.add_argument("spec", help="Path of the YAML or JSON spec")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only show the changes, don't apply them",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Like --dry-run, but exit with 2 if changes are pending",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Handle the command
+
+        :param args:
+        :type args:
+        :param options:
+        :type options:
+        :return:
+        :rtype:
+        """
+
+        dry_run = options["dry_run"] or options["check"]
+
+        try:
+            plan = plan_sync(spec=load_sync_spec(options["spec"]))
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        if plan["errors"]:
+            for error in plan["errors"]:
+                subject = " ".join(
+                    str(error[key]) for key in ("target", "permission") if key in error
+                )
+
+                self.stderr.write(self.style.ERROR(f"{subject}: {error['error']}"))
+
+            raise CommandError("The spec is invalid, nothing has been changed.")
+
+        if not dry_run:
+            apply_import(plan=plan)
+
+        report = get_import_report(plan=plan, dry_run=dry_run)
+
+        for target in report["targets"]:
+            self.stdout.write(f"{target['target_type']} {target['target']}")
+
+            for permission in target["added"]:
+                self.stdout.write(self.style.SUCCESS(f"  + {permission}"))
+
+            for permission in target["removed"]:
+                self.stdout.write(self.style.WARNING(f"  - {permission}"))
+
+        if report["truncated"]:
+            self.stdout.write("Only the first changed groups and states are listed.")
+
+        if not report["added"] and not report["removed"]:
+            self.stdout.write(self.style.SUCCESS("Permissions are in sync."))
+
+            return
+
+        summary = (
+            f"{report['added']} permissions to add and {report['removed']} to remove."
+            if dry_run
+            else f"Added {report['added']} and removed {report['removed']} permissions."
+        )
+
+        if options["check"]:
+            raise CommandError(summary, returncode=EXIT_CODE_CHANGES_PENDING)
+
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:27
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("aa_permission_management", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PermissionSetVersion",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "target_type",
+                    models.CharField(
+                        choices=[("group", "Group"), ("state", "State")],
+                        max_length=5,
+                        verbose_name="Target type",
+                    ),
+                ),
+                ("target_id", models.PositiveIntegerField(verbose_name="Target ID")),
+                (
+                    "version",
+                    models.PositiveBigIntegerField(default=0, verbose_name="Version"),
+                ),
+            ],
+            options={
+                "verbose_name": "Permission set version",
+                "verbose_name_plural": "Permission set versions",
+                "default_permissions": (),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("target_type", "target_id"),
+                        name="aa_permission_management_unique_permission_set_version",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:37
+
+# Django
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_member_counts(apps, schema_editor):
+    """
+    Populate the member counters from the current memberships.
+
+    :param apps:
+    :type apps:
+    :param schema_editor:
+    :type schema_editor:
+    :return:
+    :rtype:
+    """
+
+    Group = apps.get_model("auth", "Group")
+    User = apps.get_model("auth", "User")
+    State = apps.get_model("authentication", "State")
+    UserProfile = apps.get_model("authentication", "UserProfile")
+    GroupMemberCount = apps.get_model("aa_permission_management", "GroupMemberCount")
+    StateMemberCount = apps.get_model("aa_permission_management", "StateMemberCount")
+
+    group_counts = dict(
+        User.groups.through.objects.order_by()
+        .values("group_id")
+        .annotate(count=Count("pk"))
+        .values_list("group_id", "count")
+    )
+    state_counts = dict(
+        UserProfile.objects.order_by()
+        .values("state_id")
+        .annotate(count=Count("pk"))
+        .values_list("state_id", "count")
+    )
+
+    GroupMemberCount.objects.bulk_create(
+        [
+            GroupMemberCount(group_id=group_id, count=group_counts.get(group_id, 0))
+            for group_id in Group.objects.values_list("pk", flat=True)
+        ],
+        batch_size=1000,
+    )
+    StateMemberCount.objects.bulk_create(
+        [
+            StateMemberCount(state_id=state_id, count=state_counts.get(state_id, 0))
+            for state_id in State.objects.values_list("pk", flat=True)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("aa_permission_management", "0002_permissionsetversion"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("authentication", "0026_alter_characterownership_user_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GroupMemberCount",
+            fields=[
+                (
+                    "group",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="aa_permission_management_member_count",
+                        serialize=False,
+                        to="auth.group",
+                        verbose_name="Group",
+                    ),
+                ),
+                ("count", models.IntegerField(default=0, verbose_name="Member count")),
+            ],
+            options={
+                "verbose_name": "Group member count",
+                "verbose_name_plural": "Group member counts",
+                "default_permissions": (),
+            },
+        ),
+        migrations.CreateModel(
+            name="StateMemberCount",
+            fields=[
+                (
+                    "state",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="aa_permission_management_member_count",
+                        serialize=False,
+                        to="authentication.state",
+                        verbose_name="State",
+                    ),
+                ),
+                ("count", models.IntegerField(default=0, verbose_name="Member count")),
+            ],
+            options={
+                "verbose_name": "State member count",
+                "verbose_name_plural": "State member counts",
+                "default_permissions": (),
+            },
+        ),
+        migrations.RunPython(
+            code=populate_member_counts, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,128 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:50
+
+# Django
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("aa_permission_management", "0003_membercounts"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PermissionJob",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("apply", "Apply permissions"),
+                            ("import", "Import permissions"),
+                            ("restore", "Restore snapshot"),
+                            ("prune", "Prune audit log"),
+                        ],
+                        max_length=20,
+                        verbose_name="Kind",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("payload", models.JSONField(default=dict, verbose_name="Payload")),
+                ("result", models.JSONField(default=dict, verbose_name="Result")),
+                (
+                    "error",
+                    models.TextField(blank=True, default="", verbose_name="Error"),
+                ),
+                ("total", models.PositiveIntegerField(default=0, verbose_name="Total")),
+                (
+                    "processed",
+                    models.PositiveIntegerField(default=0, verbose_name="Processed"),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created"),
+                ),
+                (
+                    "updated",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated"),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Created by",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Permission job",
+                "verbose_name_plural": "Permission jobs",
+                "default_permissions": (),
+            },
+        ),
+        migrations.CreateModel(
+            name="PermissionJobChunk",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("seq", models.PositiveIntegerField(verbose_name="Sequence number")),
+                ("payload", models.JSONField(default=dict, verbose_name="Payload")),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunks",
+                        to="aa_permission_management.permissionjob",
+                        verbose_name="Job",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Permission job chunk",
+                "verbose_name_plural": "Permission job chunks",
+                "default_permissions": (),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("job", "seq"), name="aa_pm_job_chunk_seq_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
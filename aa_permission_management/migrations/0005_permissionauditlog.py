@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:56
+
+# Django
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("aa_permission_management", "0004_permissionjob"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PermissionAuditLog",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "timestamp",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Timestamp"
+                    ),
+                ),
+                (
+                    "target_type",
+                    models.CharField(
+                        choices=[("group", "Group"), ("state", "State")],
+                        max_length=5,
+                        verbose_name="Target type",
+                    ),
+                ),
+                ("target_id", models.PositiveIntegerField(verbose_name="Target ID")),
+                (
+                    "permission_id",
+                    models.PositiveIntegerField(verbose_name="Permission ID"),
+                ),
+                (
+                    "action",
+                    models.PositiveSmallIntegerField(
+                        choices=[(1, "Added"), (2, "Removed")], verbose_name="Action"
+                    ),
+                ),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Actor",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Permission audit log entry",
+                "verbose_name_plural": "Permission audit log entries",
+                "default_permissions": (),
+                "indexes": [
+                    models.Index(
+                        fields=["target_type", "target_id", "id"],
+                        name="aa_pm_audit_target_idx",
+                    ),
+                    models.Index(
+                        fields=["timestamp"], name="aa_pm_audit_timestamp_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
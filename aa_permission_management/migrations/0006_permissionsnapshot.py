@@ -0,0 +1,111 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:29
+
+# Django
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("aa_permission_management", "0005_permissionauditlog"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PermissionSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        blank=True, default="", max_length=100, verbose_name="Name"
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created"),
+                ),
+                (
+                    "targets",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Groups and states"
+                    ),
+                ),
+                (
+                    "assignments",
+                    models.PositiveIntegerField(default=0, verbose_name="Assignments"),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Created by",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Permission snapshot",
+                "verbose_name_plural": "Permission snapshots",
+                "default_permissions": (),
+            },
+        ),
+        migrations.CreateModel(
+            name="PermissionSnapshotEntry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "target_type",
+                    models.CharField(
+                        choices=[("group", "Group"), ("state", "State")],
+                        max_length=5,
+                        verbose_name="Target type",
+                    ),
+                ),
+                ("target_id", models.PositiveIntegerField(verbose_name="Target ID")),
+                ("permission_ids", models.BinaryField(verbose_name="Permission IDs")),
+                (
+                    "snapshot",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="entries",
+                        to="aa_permission_management.permissionsnapshot",
+                        verbose_name="Snapshot",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Permission snapshot entry",
+                "verbose_name_plural": "Permission snapshot entries",
+                "default_permissions": (),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("snapshot", "target_type", "target_id"),
+                        name="aa_pm_snapshot_target_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
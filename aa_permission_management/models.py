@@ -3,9 +3,14 @@ Models for the Permission Management app
 """
 
 # Django
+from django.contrib.auth.models import Group, User
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+# Alliance Auth
+from allianceauth.authentication.models import State
+
 
 class General(models.Model):
     """
@@ -26,3 +31,410 @@ class General(models.Model):
             ),
         )
         verbose_name = _("Permission Management")
+
+
+class PermissionSetVersion(models.Model):
+    """
+    Version of the permission set of a group or state.
+
+    The version is bumped whenever permissions are added to or removed from the
+    target, so it can be used to tell whether a permission set has changed
+    without looking at the permissions themselves.
+    """
+
+    class TargetType(models.TextChoices):
+        """
+        Target types
+        """
+
+        GROUP = "group", _("Group")
+        STATE = "state", _("State")
+
+    target_type = models.CharField(
+        max_length=5, choices=TargetType.choices, verbose_name=_("Target type")
+    )
+    target_id = models.PositiveIntegerField(verbose_name=_("Target ID"))
+    version = models.PositiveBigIntegerField(default=0, verbose_name=_("Version"))
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """
+        Meta class
+        """
+
+        default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(
+                fields=["target_type", "target_id"],
+                name="aa_permission_management_unique_permission_set_version",
+            )
+        ]
+        verbose_name = _("Permission set version")
+        verbose_name_plural = _("Permission set versions")
+
+    def __str__(self) -> str:
+        """
+        String representation
+
+        :return:
+        :rtype:
+        """
+
+        return f"{self.target_type} {self.target_id}: {self.version}"
+
+
+class GroupMemberCount(models.Model):
+    """
+    Number of members of a group, maintained from membership changes.
+    """
+
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="aa_permission_management_member_count",
+        verbose_name=_("Group"),
+    )
+    count = models.IntegerField(default=0, verbose_name=_("Member count"))
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """
+        Meta class
+        """
+
+        default_permissions = ()
+        verbose_name = _("Group member count")
+        verbose_name_plural = _("Group member counts")
+
+    def __str__(self) -> str:
+        """
+        String representation
+
+        :return:
+        :rtype:
+        """
+
+        return f"{self.group_id}: {self.count}"
+
+
+class StateMemberCount(models.Model):
+    """
+    Number of members of a state, maintained from state changes of user profiles.
+    """
+
+    state = models.OneToOneField(
+        State,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="aa_permission_management_member_count",
+        verbose_name=_("State"),
+    )
+    count = models.IntegerField(default=0, verbose_name=_("Member count"))
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """
+        Meta class
+        """
+
+        default_permissions = ()
+        verbose_name = _("State member count")
+        verbose_name_plural = _("State member counts")
+
+    def __str__(self) -> str:
+        """
+        String representation
+
+        :return:
+        :rtype:
+        """
+
+        return f"{self.state_id}: {self.count}"
+
+
+class PermissionJob(models.Model):
+    """
+    Background job for a large permission operation.
+
+    Jobs are processed in chunks by Celery tasks, which record their progress
+    here, so it can be polled while the job is running.
+    """
+
+    class Kind(models.TextChoices):
+        """
+        Job kinds
+        """
+
+        APPLY = "apply", _("Apply permissions")
+        IMPORT = "import", _("Import permissions")
+        RESTORE = "restore", _("Restore snapshot")
+        PRUNE = "prune", _("Prune audit log")
+
+    class Status(models.TextChoices):
+        """
+        Job states
+        """
+
+        PENDING = "pending", _("Pending")
+        RUNNING = "running", _("Running")
+        DONE = "done", _("Done")
+        FAILED = "failed", _("Failed")
+
+    kind = models.CharField(max_length=20, choices=Kind.choices, verbose_name=_("Kind"))
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_("Status"),
+    )
+    payload = models.JSONField(default=dict, verbose_name=_("Payload"))
+    result = models.JSONField(default=dict, verbose_name=_("Result"))
+    error = models.TextField(blank=True, default="", verbose_name=_("Error"))
+    total = models.PositiveIntegerField(default=0, verbose_name=_("Total"))
+    processed = models.PositiveIntegerField(default=0, verbose_name=_("Processed"))
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Created by"),
+    )
+    created = models.DateTimeField(auto_now_add=True, verbose_name=_("Created"))
+    updated = models.DateTimeField(auto_now=True, verbose_name=_("Updated"))
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """
+        Meta class
+        """
+
+        default_permissions = ()
+        verbose_name = _("Permission job")
+        verbose_name_plural = _("Permission jobs")
+
+    def __str__(self) -> str:
+        """
+        String representation
+
+        :return:
+        :rtype:
+        """
+
+        return f"{self.kind} #{self.pk}: {self.status}"
+
+
+class PermissionJobChunk(models.Model):
+    """
+    Payload of a single chunk of a background job.
+
+    Jobs with a large payload store it chunk by chunk, so every chunk reads
+    only its own part, and the job row stays small.
+    """
+
+    job = models.ForeignKey(
+        PermissionJob,
+        on_delete=models.CASCADE,
+        related_name="chunks",
+        verbose_name=_("Job"),
+    )
+    seq = models.PositiveIntegerField(verbose_name=_("Sequence number"))
+    payload = models.JSONField(default=dict, verbose_name=_("Payload"))
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """
+        Meta class
+        """
+
+        default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "seq"], name="aa_pm_job_chunk_seq_uniq"
+            ),
+        ]
+        verbose_name = _("Permission job chunk")
+        verbose_name_plural = _("Permission job chunks")
+
+    def __str__(self) -> str:
+        """
+        String representation
+
+        :return:
+        :rtype:
+        """
+
+        return f"{self.job_id}: {self.seq}"
+
+
+class PermissionAuditLog(models.Model):
+    """
+    Audit log entry for a permission added to or removed from a group or state.
+
+    Entries are append-only, one per changed permission. The permission is stored
+    as a plain ID, so entries outlive deleted permissions.
+    """
+
+    class Action(models.IntegerChoices):
+        """
+        Audit log actions
+        """
+
+        ADD = 1, _("Added")
+        REMOVE = 2, _("Removed")
+
+    id = models.BigAutoField(primary_key=True)
+    timestamp = models.DateTimeField(default=timezone.now, verbose_name=_("Timestamp"))
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Actor"),
+    )
+    target_type = models.CharField(
+        max_length=5,
+        choices=PermissionSetVersion.TargetType.choices,
+        verbose_name=_("Target type"),
+    )
+    target_id = models.PositiveIntegerField(verbose_name=_("Target ID"))
+    permission_id = models.PositiveIntegerField(verbose_name=_("Permission ID"))
+    action = models.PositiveSmallIntegerField(
+        choices=Action.choices, verbose_name=_("Action")
+    )
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """
+        Meta class
+        """
+
+        default_permissions = ()
+        indexes = [
+            models.Index(
+                fields=["target_type", "target_id", "id"],
+                name="aa_pm_audit_target_idx",
+            ),
+            models.Index(fields=["timestamp"], name="aa_pm_audit_timestamp_idx"),
+        ]
+        verbose_name = _("Permission audit log entry")
+        verbose_name_plural = _("Permission audit log entries")
+
+    def __str__(self) -> str:
+        """
+        String representation
+
+        :return:
+        :rtype:
+        """
+
+        return (
+            f"{self.timestamp:%Y-%m-%d %H:%M:%S} {self.get_action_display()} "
+            f"{self.permission_id} {self.target_type} {self.target_id}"
+        )
+
+    def save(self, *args, **kwargs):
+        """
+        Save a new audit log entry, existing entries can't be changed.
+
+        :param args:
+        :type args:
+        :param kwargs:
+        :type kwargs:
+        :return:
+        :rtype:
+        """
+
+        if not self._state.adding:
+            raise ValueError("Audit log entries cannot be changed")
+
+        super().save(*args, **kwargs)
+
+
+class PermissionSnapshot(models.Model):
+    """
+    Point-in-time snapshot of the permissions of all groups and states.
+
+    The permissions are stored per group and state as packed ID arrays, see
+    :class:`PermissionSnapshotEntry`.
+    """
+
+    name = models.CharField(
+        max_length=100, blank=True, default="", verbose_name=_("Name")
+    )
+    created = models.DateTimeField(auto_now_add=True, verbose_name=_("Created"))
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Created by"),
+    )
+    targets = models.PositiveIntegerField(
+        default=0, verbose_name=_("Groups and states")
+    )
+    assignments = models.PositiveIntegerField(default=0, verbose_name=_("Assignments"))
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """
+        Meta class
+        """
+
+        default_permissions = ()
+        verbose_name = _("Permission snapshot")
+        verbose_name_plural = _("Permission snapshots")
+
+    def __str__(self) -> str:
+        """
+        String representation
+
+        :return:
+        :rtype:
+        """
+
+        return f"#{self.pk} {self.name}".rstrip()
+
+
+class PermissionSnapshotEntry(models.Model):
+    """
+    Permissions of a group or state in a snapshot.
+
+    One row per group or state, with the sorted permission IDs packed into a
+    binary array of unsigned 32-bit integers, instead of one row per assignment.
+    """
+
+    snapshot = models.ForeignKey(
+        PermissionSnapshot,
+        on_delete=models.CASCADE,
+        related_name="entries",
+        verbose_name=_("Snapshot"),
+    )
+    target_type = models.CharField(
+        max_length=5,
+        choices=PermissionSetVersion.TargetType.choices,
+        verbose_name=_("Target type"),
+    )
+    target_id = models.PositiveIntegerField(verbose_name=_("Target ID"))
+    permission_ids = models.BinaryField(verbose_name=_("Permission IDs"))
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """
+        Meta class
+        """
+
+        default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(
+                fields=["snapshot", "target_type", "target_id"],
+                name="aa_pm_snapshot_target_uniq",
+            ),
+        ]
+        verbose_name = _("Permission snapshot entry")
+        verbose_name_plural = _("Permission snapshot entries")
+
+    def __str__(self) -> str:
+        """
+        String representation
+
+        :return:
+        :rtype:
+        """
+
+        return f"{self.snapshot_id}: {self.target_type} {self.target_id}"
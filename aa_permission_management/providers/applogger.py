@@ -4,15 +4,113 @@ AppLogger provider
 
 # Standard Library
 import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
 
 # AA Permission Management
 from aa_permission_management import __title__
 
 
+class Lazy:
+    """
+    Log argument that is only evaluated when the log record is formatted.
+
+    Example:
+
+        .. code-block:: python
+
+            logger.debug("Permissions: %s", Lazy(list, group.permissions.all()))
+
+    """
+
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func: Callable, *args, **kwargs):
+        """
+        Initializes the lazy argument with a callable and its arguments.
+
+        :param func: Callable returning the value to log
+        :type func: Callable
+        :param args: Positional arguments for the callable
+        :type args: Any
+        :param kwargs: Keyword arguments for the callable
+        :type kwargs: Any
+        """
+
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def resolve(self) -> Any:
+        """
+        Evaluates the callable.
+
+        :return: Value to log
+        :rtype: Any
+        """
+
+        return self.func(*self.args, **self.kwargs)
+
+    def __str__(self) -> str:
+        """
+        String representation, evaluated on formatting
+
+        :return:
+        :rtype:
+        """
+
+        return str(self.resolve())
+
+    def __repr__(self) -> str:
+        """
+        Representation, evaluated on formatting
+
+        :return:
+        :rtype:
+        """
+
+        return repr(self.resolve())
+
+
+class _Fields:
+    """
+    Structured log fields, rendered as `key=value` pairs on formatting.
+    """
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: dict):
+        """
+        Initializes the fields.
+
+        :param fields: Resolved log fields
+        :type fields: dict
+        """
+
+        self.fields = fields
+
+    def __str__(self) -> str:
+        """
+        String representation
+
+        :return:
+        :rtype:
+        """
+
+        return " ".join(f"{key}={value}" for key, value in self.fields.items())
+
+
 class AppLogger(logging.LoggerAdapter):
     """
     Custom logger adapter that adds a prefix to log messages.
 
+    On top of the prefix, log calls accept structured `fields`, which are appended
+    to the message as `key=value` pairs and attached to the log record as
+    `record.fields`. Field values wrapped in :class:`Lazy` are only evaluated when
+    the level is enabled, just like :class:`Lazy` log arguments.
+
     Taken from the `allianceauth-app-utils` package.
     Credits to: Erik Kalkoken
     """
@@ -42,3 +140,83 @@ class AppLogger(logging.LoggerAdapter):
         """
 
         return f"[{self.prefix}] {msg}", kwargs
+
+    def log(
+        self, level, msg, *args, fields: dict | None = None, **kwargs
+    ):  # pylint: disable=arguments-differ
+        """
+        Logs a message with optional structured fields.
+
+        Nothing is evaluated when the level is disabled.
+
+        :param level: Log level
+        :type level: int
+        :param msg: Log message
+        :type msg: str
+        :param args: Log message arguments
+        :type args: Any
+        :param fields: Structured log fields
+        :type fields: dict | None
+        :param kwargs: Additional keyword arguments
+        :type kwargs: Any
+        :return:
+        :rtype:
+        """
+
+        if not self.isEnabledFor(level):
+            return
+
+        if fields:
+            fields = {
+                key: value.resolve() if isinstance(value, Lazy) else value
+                for key, value in fields.items()
+            }
+
+            msg = f"{msg} %s"
+            args = (*args, _Fields(fields))
+            kwargs["extra"] = {**kwargs.get("extra", {}), "fields": fields}
+
+        super().log(level, msg, *args, **kwargs)
+
+    @contextmanager
+    def timed(
+        self, msg: str, *args, level: int = logging.DEBUG, **fields
+    ) -> Iterator[dict]:
+        """
+        Logs a message with the duration of the wrapped block as `duration_ms`.
+
+        The yielded dict holds the structured fields, so the block can add to them,
+        e.g. counts only known at the end. When the level is disabled, the block
+        isn't timed at all.
+
+        Example:
+
+            .. code-block:: python
+
+                with logger.timed("Permissions updated", element_id=1) as fields:
+                    fields["count"] = update_permissions()
+
+        :param msg: Log message
+        :type msg: str
+        :param args: Log message arguments
+        :type args: Any
+        :param level: Log level
+        :type level: int
+        :param fields: Structured log fields
+        :type fields: Any
+        :return: Structured log fields
+        :rtype: Iterator[dict]
+        """
+
+        if not self.isEnabledFor(level):
+            yield fields
+
+            return
+
+        start = time.perf_counter()
+
+        yield fields
+
+        fields["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+        self.log(level, msg, *args, fields=fields)
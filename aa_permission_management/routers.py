@@ -0,0 +1,263 @@
+"""
+Read replica routing for the read-only views.
+
+Views decorated with :func:`use_read_replica` read from the database alias in
+`AA_PERMISSION_MANAGEMENT_READ_REPLICA`, as long as the
+:class:`ReadReplicaRouter` is in `DATABASE_ROUTERS`:
+
+.. code-block:: python
+
+    DATABASES["replica"] = {...}
+    DATABASE_ROUTERS = ["aa_permission_management.routers.ReadReplicaRouter"]
+    AA_PERMISSION_MANAGEMENT_READ_REPLICA = "replica"
+
+Everything else, all writes, and every read after a write stay on the primary.
+Views decorated with :func:`record_write` note the time of a successful write in
+the session, and the session reads from the primary until the replica has
+caught up (`AA_PERMISSION_MANAGEMENT_READ_YOUR_WRITES_SECONDS`), so users see
+their own changes.
+"""
+
+# Standard Library
+import time
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from functools import wraps
+
+# Django
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA Permission Management
+from aa_permission_management import app_settings
+from aa_permission_management.constants import LAST_WRITE_SESSION_KEY
+from aa_permission_management.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(name=__name__))
+
+# Database alias reads are routed to, if any
+_read_database: ContextVar[str | None] = ContextVar(
+    "aa_permission_management_read_database", default=None
+)
+
+
+def get_read_replica() -> str | None:
+    """
+    Get the database alias of the configured read replica.
+
+    :return: Alias, or None if no replica is configured or the alias doesn't exist
+    :rtype: str | None
+    """
+
+    alias = app_settings.AA_PERMISSION_MANAGEMENT_READ_REPLICA
+
+    if not alias or alias not in connections.settings:
+        return None
+
+    return alias
+
+
+class ReadReplicaRouter:
+    """
+    Database router sending the reads of views decorated with
+    :func:`use_read_replica` to the read replica.
+    """
+
+    def db_for_read(
+        self, model, **hints  # pylint: disable=unused-argument
+    ) -> str | None:
+        """
+        Route reads to the replica while a decorated view runs.
+
+        :param model:
+        :type model:
+        :param hints:
+        :type hints:
+        :return:
+        :rtype:
+        """
+
+        return _read_database.get()
+
+    def db_for_write(
+        self, model, **hints  # pylint: disable=unused-argument
+    ) -> str | None:
+        """
+        Route writes to the primary, and all reads after them as well.
+
+        :param model:
+        :type model:
+        :param hints:
+        :type hints:
+        :return:
+        :rtype:
+        """
+
+        if _read_database.get() is None:
+            return None
+
+        # Objects read from the replica would be saved there otherwise
+        _read_database.set(None)
+
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(
+        self, obj1, obj2, **hints  # pylint: disable=unused-argument
+    ) -> bool | None:
+        """
+        Allow relations between objects of the primary and the replica.
+
+        :param obj1:
+        :type obj1:
+        :param obj2:
+        :type obj2:
+        :param hints:
+        :type hints:
+        :return:
+        :rtype:
+        """
+
+        databases = {DEFAULT_DB_ALIAS, get_read_replica()}
+
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+
+        return None
+
+    def allow_migrate(
+        self, db, app_label, model_name=None, **hints  # pylint: disable=unused-argument
+    ) -> bool | None:
+        """
+        Never migrate the replica, it follows the primary.
+
+        :param db:
+        :type db:
+        :param app_label:
+        :type app_label:
+        :param model_name:
+        :type model_name:
+        :param hints:
+        :type hints:
+        :return:
+        :rtype:
+        """
+
+        if db == get_read_replica():
+            return False
+
+        return None
+
+
+def _has_recent_write(request: HttpRequest) -> bool:
+    """
+    Check whether the session has written recently enough to read its writes
+    from the primary.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    session = getattr(request, "session", None)
+    last_write = session.get(LAST_WRITE_SESSION_KEY) if session is not None else None
+
+    return (
+        last_write is not None
+        and time.time() - last_write
+        < app_settings.AA_PERMISSION_MANAGEMENT_READ_YOUR_WRITES_SECONDS
+    )
+
+
+def _iter_from(alias: str, iterator: Iterator) -> Iterator:
+    """
+    Iterate with the reads of every step routed to a database, for streaming
+    responses, whose content is produced after the view has returned.
+
+    :param alias: Database alias
+    :type alias: str
+    :param iterator: Streaming content
+    :type iterator: Iterator
+    :return:
+    :rtype: Iterator
+    """
+
+    iterator = iter(iterator)
+
+    while True:
+        token = _read_database.set(alias)
+
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _read_database.reset(token)
+
+        yield chunk
+
+
+def use_read_replica(view: Callable) -> Callable:
+    """
+    Decorator routing the reads of a read-only view to the read replica, unless
+    the session has written recently.
+
+    :param view: View function
+    :type view: Callable
+    :return: Decorated view function
+    :rtype: Callable
+    """
+
+    @wraps(view)
+    def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        alias = get_read_replica()
+
+        if alias is None or _has_recent_write(request):
+            return view(request, *args, **kwargs)
+
+        logger.debug("Reading %s from %s", request.path, alias)
+
+        token = _read_database.set(alias)
+
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            _read_database.reset(token)
+
+        if response.streaming:
+            response.streaming_content = _iter_from(alias, response.streaming_content)
+
+        return response
+
+    return wrapper
+
+
+def record_write(view: Callable) -> Callable:
+    """
+    Decorator noting successful writes of a view in the session, so the session
+    reads its writes from the primary.
+
+    :param view: View function
+    :type view: Callable
+    :return: Decorated view function
+    :rtype: Callable
+    """
+
+    @wraps(view)
+    def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        response = view(request, *args, **kwargs)
+
+        if (
+            get_read_replica() is not None
+            and request.method not in ("GET", "HEAD", "OPTIONS")
+            and response.status_code < 400
+            and hasattr(request, "session")
+        ):
+            request.session[LAST_WRITE_SESSION_KEY] = time.time()
+
+        return response
+
+    return wrapper
@@ -0,0 +1,475 @@
+"""
+Signals for the AA Permission Management app.
+"""
+
+# Standard Library
+from functools import partial
+
+# Django
+from django.contrib.auth.models import Group
+from django.contrib.auth.models import Permission as BasePermission
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+# Alliance Auth
+from allianceauth.authentication.models import (
+    Permission,
+    State,
+    UserProfile,
+    get_guest_state_pk,
+)
+
+# AA Permission Management
+from aa_permission_management.helper.catalog import bump_catalog_version
+from aa_permission_management.helper.effective_permissions import (
+    bump_user_permission_versions,
+)
+from aa_permission_management.helper.member_counts import (
+    adjust_group_member_counts,
+    adjust_state_member_counts,
+    recount_state_member_counts,
+)
+from aa_permission_management.helper.versions import bump_permission_set_versions
+from aa_permission_management.models import (
+    GroupMemberCount,
+    PermissionSetVersion,
+    StateMemberCount,
+)
+
+
+@receiver(signal=post_migrate)
+@receiver(signal=[post_save, post_delete], sender=BasePermission)
+@receiver(signal=[post_save, post_delete], sender=Permission)
+@receiver(signal=[post_save, post_delete], sender=ContentType)
+def invalidate_permission_catalog(
+    sender, **kwargs  # pylint: disable=unused-argument
+) -> None:
+    """
+    Invalidate the permission catalog when permissions or content types change.
+
+    The version is bumped after the transaction commits, so no process can
+    rebuild the catalog from uncommitted data under the new version.
+
+    :param sender:
+    :type sender:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(signal=m2m_changed, sender=Group.permissions.through)
+@receiver(signal=m2m_changed, sender=State.permissions.through)
+def bump_permission_set_version(  # pylint: disable=too-many-arguments,unused-argument
+    sender, instance, action: str, reverse: bool, pk_set: set | None, **kwargs
+) -> None:
+    """
+    Bump the permission set version of the groups or states whose permissions change.
+
+    The version is bumped in the same transaction as the change itself. For
+    changes made from the permission's side, `pk_set` holds the affected targets,
+    except for `clear()`, where they have to be looked up before they are gone.
+
+    :param sender:
+    :type sender:
+    :param instance:
+    :type instance:
+    :param action:
+    :type action:
+    :param reverse:
+    :type reverse:
+    :param pk_set:
+    :type pk_set:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    target_type, target_field = (
+        (PermissionSetVersion.TargetType.GROUP, "group_id")
+        if sender is Group.permissions.through
+        else (PermissionSetVersion.TargetType.STATE, "state_id")
+    )
+
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            bump_permission_set_versions(
+                target_type=target_type, target_ids=[instance.pk]
+            )
+    elif action in ("post_add", "post_remove"):
+        bump_permission_set_versions(target_type=target_type, target_ids=pk_set)
+    elif action == "pre_clear":
+        bump_permission_set_versions(
+            target_type=target_type,
+            target_ids=sender.objects.filter(permission_id=instance.pk).values_list(
+                target_field, flat=True
+            ),
+        )
+
+
+@receiver(signal=post_delete, sender=Group)
+@receiver(signal=post_delete, sender=State)
+def bump_deleted_permission_set_version(
+    sender, instance, **kwargs  # pylint: disable=unused-argument
+) -> None:
+    """
+    Bump the permission set version of a deleted group or state.
+
+    Deleting a target removes its permissions without any `m2m_changed` signal,
+    so payloads cached for its last version must not be served anymore.
+
+    :param sender:
+    :type sender:
+    :param instance:
+    :type instance:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    bump_permission_set_versions(
+        target_type=(
+            PermissionSetVersion.TargetType.GROUP
+            if sender is Group
+            else PermissionSetVersion.TargetType.STATE
+        ),
+        target_ids=[instance.pk],
+    )
+
+
+@receiver(signal=post_save, sender=Group)
+@receiver(signal=post_save, sender=State)
+def create_member_count(
+    sender, instance, created: bool, **kwargs  # pylint: disable=unused-argument
+) -> None:
+    """
+    Create the empty member counter of a new group or state.
+
+    :param sender:
+    :type sender:
+    :param instance:
+    :type instance:
+    :param created:
+    :type created:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    if not created:
+        return
+
+    if sender is Group:
+        GroupMemberCount.objects.get_or_create(group_id=instance.pk)
+    else:
+        StateMemberCount.objects.get_or_create(state_id=instance.pk)
+
+
+@receiver(signal=m2m_changed, sender=User.groups.through)
+def update_group_member_counts(  # pylint: disable=too-many-arguments,unused-argument
+    sender, instance, action: str, reverse: bool, pk_set: set | None, **kwargs
+) -> None:
+    """
+    Update the member counters of groups when group memberships change.
+
+    `pk_set` of a removal also holds IDs that weren't related at all, so the
+    memberships actually removed are looked up before they are gone and
+    remembered on the instance until the removal is done.
+
+    :param sender:
+    :type sender:
+    :param instance:
+    :type instance:
+    :param action:
+    :type action:
+    :param reverse:
+    :type reverse:
+    :param pk_set:
+    :type pk_set:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    if reverse:
+        # Members added to or removed from a group
+        memberships = sender.objects.filter(group_id=instance.pk)
+        related_field = "user_id"
+    else:
+        # Groups added to or removed from a user
+        memberships = sender.objects.filter(user_id=instance.pk)
+        related_field = "group_id"
+
+    if action in ("pre_remove", "pre_clear"):
+        if pk_set is not None:
+            memberships = memberships.filter(**{f"{related_field}__in": pk_set})
+
+        instance._aa_permission_management_removed_memberships = list(
+            memberships.values_list(related_field, flat=True)
+        )
+
+        return
+
+    if action == "post_add":
+        changed, delta = pk_set, 1
+    elif action in ("post_remove", "post_clear"):
+        changed, delta = (
+            instance.__dict__.pop("_aa_permission_management_removed_memberships", []),
+            -1,
+        )
+    else:
+        return
+
+    if reverse:
+        adjust_group_member_counts(deltas={instance.pk: delta * len(changed)})
+    else:
+        adjust_group_member_counts(deltas=dict.fromkeys(changed, delta))
+
+
+@receiver(signal=pre_delete, sender=User)
+def remember_deleted_user_groups(
+    sender, instance, **kwargs  # pylint: disable=unused-argument
+) -> None:
+    """
+    Remember the groups of a user about to be deleted.
+
+    Deleting a user removes its memberships without any `m2m_changed` signal.
+
+    :param sender:
+    :type sender:
+    :param instance:
+    :type instance:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    instance._aa_permission_management_removed_memberships = list(
+        instance.groups.values_list("pk", flat=True)
+    )
+
+
+@receiver(signal=post_delete, sender=User)
+def update_deleted_user_group_member_counts(
+    sender, instance, **kwargs  # pylint: disable=unused-argument
+) -> None:
+    """
+    Update the member counters of the groups of a deleted user.
+
+    :param sender:
+    :type sender:
+    :param instance:
+    :type instance:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    adjust_group_member_counts(
+        deltas=dict.fromkeys(
+            instance.__dict__.pop("_aa_permission_management_removed_memberships", []),
+            -1,
+        )
+    )
+
+
+@receiver(signal=post_init, sender=UserProfile)
+def remember_user_profile_state(
+    sender, instance, **kwargs  # pylint: disable=unused-argument
+) -> None:
+    """
+    Remember the state a user profile was loaded with, so state changes can be
+    detected on save without another query.
+
+    :param sender:
+    :type sender:
+    :param instance:
+    :type instance:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    instance._aa_permission_management_state_id = instance.__dict__.get("state_id")
+
+
+@receiver(signal=post_save, sender=UserProfile)
+def update_state_member_counts(
+    sender, instance, created: bool, **kwargs  # pylint: disable=unused-argument
+) -> None:
+    """
+    Update the member counters of states when a user profile changes its state.
+
+    :param sender:
+    :type sender:
+    :param instance:
+    :type instance:
+    :param created:
+    :type created:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    old_state_id = instance._aa_permission_management_state_id
+    new_state_id = instance.state_id
+
+    instance._aa_permission_management_state_id = new_state_id
+
+    if created:
+        adjust_state_member_counts(deltas={new_state_id: 1})
+    elif old_state_id is None:
+        # Loaded with a deferred state, so the old state is unknown
+        recount_state_member_counts(
+            state_ids=State.objects.values_list("pk", flat=True)
+        )
+    elif old_state_id != new_state_id:
+        adjust_state_member_counts(deltas={old_state_id: -1, new_state_id: 1})
+
+
+@receiver(signal=post_delete, sender=UserProfile)
+def update_deleted_user_profile_state_member_counts(
+    sender, instance, **kwargs  # pylint: disable=unused-argument
+) -> None:
+    """
+    Update the member counter of the state of a deleted user profile.
+
+    :param sender:
+    :type sender:
+    :param instance:
+    :type instance:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    state_id = instance._aa_permission_management_state_id
+
+    if state_id is None:
+        # Loaded with a deferred state, so the state is unknown
+        recount_state_member_counts(
+            state_ids=State.objects.values_list("pk", flat=True)
+        )
+    else:
+        adjust_state_member_counts(deltas={state_id: -1})
+
+
+@receiver(signal=post_delete, sender=State)
+def recount_guest_state_member_count(
+    sender, instance, **kwargs  # pylint: disable=unused-argument
+) -> None:
+    """
+    Recount the members of the guest state after a state has been deleted.
+
+    The members of a deleted state fall back to the guest state with a bulk update,
+    which doesn't send any signals.
+
+    :param sender:
+    :type sender:
+    :param instance:
+    :type instance:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    recount_state_member_counts(state_ids=[get_guest_state_pk()])
+
+
+@receiver(signal=m2m_changed, sender=User.user_permissions.through)
+def bump_user_permission_version(  # pylint: disable=too-many-arguments,unused-argument
+    sender, instance, action: str, reverse: bool, pk_set: set | None, **kwargs
+) -> None:
+    """
+    Bump the version of the effective permissions of users whose direct
+    permissions change.
+
+    The version is bumped after the transaction commits, so the effective
+    permissions can't be resolved from uncommitted data under the new version.
+
+    :param sender:
+    :type sender:
+    :param instance:
+    :type instance:
+    :param action:
+    :type action:
+    :param reverse:
+    :type reverse:
+    :param pk_set:
+    :type pk_set:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    if not reverse:
+        if action not in ("post_add", "post_remove", "post_clear"):
+            return
+
+        user_ids = [instance.pk]
+    elif action in ("post_add", "post_remove"):
+        user_ids = pk_set
+    elif action == "pre_clear":
+        user_ids = list(
+            sender.objects.filter(permission_id=instance.pk).values_list(
+                "user_id", flat=True
+            )
+        )
+    else:
+        return
+
+    transaction.on_commit(partial(bump_user_permission_versions, user_ids=user_ids))
+
+
+@receiver(signal=post_save, sender=User)
+def bump_saved_user_permission_version(
+    sender, instance, update_fields=None, **kwargs  # pylint: disable=unused-argument
+) -> None:
+    """
+    Bump the version of the effective permissions of a saved user, unless only
+    fields were saved that don't affect permissions, like `last_login` on login.
+
+    :param sender:
+    :type sender:
+    :param instance:
+    :type instance:
+    :param update_fields:
+    :type update_fields:
+    :param kwargs:
+    :type kwargs:
+    :return:
+    :rtype:
+    """
+
+    if update_fields is not None and not {"is_active", "is_superuser"} & set(
+        update_fields
+    ):
+        return
+
+    transaction.on_commit(
+        partial(bump_user_permission_versions, user_ids=[instance.pk])
+    )
@@ -0,0 +1,92 @@
+/* global DataTable, objectDeepMerge, permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides */
+
+$(document).ready(() => {
+    'use strict';
+
+    // Build the settings object
+    const permissionManagamentSettings = typeof permissionManagamentSettingsOverrides !== 'undefined'
+        ? objectDeepMerge(permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides) // jshint ignore: line
+        : permissionManagamentSettingsDefaults;
+
+    // Cursor (ID of the last entry of the previous page) per page start
+    const cursors = new Map([[0, '']]);
+
+    // Start and length of the page currently requested
+    let requestedPage = {start: 0, length: 0};
+
+    /**
+     * Escape a string for use in HTML
+     *
+     * @param {string} text The text to escape
+     * @returns {string} The escaped text
+     * @private
+     */
+    const _escapeHtml = (text) => {
+        return $('<div>').text(text).html();
+    };
+
+    // Initialize the audit log DataTable
+    new DataTable('#table-audit-log', { // jshint ignore: line
+        ...permissionManagamentSettings.dataTable,
+        ajax: {
+            url: permissionManagamentSettings.url.api.getAuditLog,
+            data: (data) => {
+                requestedPage = {start: data.start, length: data.length};
+
+                // Pages are addressed by cursor, only the paging parameters are needed
+                return {
+                    draw: data.draw,
+                    start: data.start,
+                    length: data.length,
+                    after: cursors.get(data.start) ?? ''
+                };
+            },
+            dataSrc: (json) => {
+                if (json.next !== null) {
+                    cursors.set(requestedPage.start + requestedPage.length, json.next);
+                }
+
+                return json.data;
+            },
+            error: (xhr, error) => console.error('Error loading data for table #table-audit-log:', xhr, error)
+        },
+        columns: [
+            {
+                data: 'timestamp',
+                render: (data, type) => type === 'display' ? new Date(data).toLocaleString(permissionManagamentSettings.language) : data
+            },
+            {
+                data: 'actor',
+                render: (data, type) => type === 'display' ? _escapeHtml(data || '—') : data
+            },
+            {
+                data: 'target',
+                render: (data, type, row) => type === 'display'
+                    ? `${_escapeHtml(row.target_type_display)}: ${_escapeHtml(data || `#${row.target_id}`)}`
+                    : data
+            },
+            {
+                data: 'permission',
+                render: (data, type, row) => type === 'display'
+                    ? `<span title="${_escapeHtml(row.permission_name)}">${_escapeHtml(data || `#${row.permission_id}`)}</span>`
+                    : data
+            },
+            {
+                data: 'action_display',
+                render: (data, type, row) => type === 'display'
+                    ? `<span class="badge text-bg-${row.action === 1 ? 'success' : 'danger'}">${_escapeHtml(data)}</span>`
+                    : data
+            }
+        ],
+        columnControl: [],
+        ordering: false,
+        searching: false,
+        pagingType: 'simple',
+        layout: {
+            topStart: 'pageLength',
+            topEnd: null,
+            bottomStart: null,
+            bottomEnd: 'paging'
+        }
+    });
+});
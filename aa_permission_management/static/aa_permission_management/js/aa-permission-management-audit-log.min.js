@@ -0,0 +1,2 @@
+$(document).ready(()=>{'use strict';const t='undefined'!=typeof permissionManagamentSettingsOverrides?objectDeepMerge(permissionManagamentSettingsDefaults,permissionManagamentSettingsOverrides):permissionManagamentSettingsDefaults,a=new Map([[0,'']]);let e={start:0,length:0};const n=t=>$('<div>').text(t).html();new DataTable('#table-audit-log',{...t.dataTable,ajax:{url:t.url.api.getAuditLog,data:t=>(e={start:t.start,length:t.length},{draw:t.draw,start:t.start,length:t.length,after:a.get(t.start)??''}),dataSrc:t=>(null!==t.next&&a.set(e.start+e.length,t.next),t.data),error:(t,a)=>console.error('Error loading data for table #table-audit-log:',t,a)},columns:[{data:'timestamp',render:(a,e)=>'display'===e?new Date(a).toLocaleString(t.language):a},{data:'actor',render:(t,a)=>'display'===a?n(t||'—'):t},{data:'target',render:(t,a,e)=>'display'===a?`${n(e.target_type_display)}: ${n(t||`#${e.target_id}`)}`:t},{data:'permission',render:(t,a,e)=>'display'===a?`<span title="${n(e.permission_name)}">${n(t||`#${e.permission_id}`)}</span>`:t},{data:'action_display',render:(t,a,e)=>'display'===a?`<span class="badge text-bg-${1===e.action?'success':'danger'}">${n(t)}</span>`:t}],columnControl:[],ordering:!1,searching:!1,pagingType:'simple',layout:{topStart:'pageLength',topEnd:null,bottomStart:null,bottomEnd:'paging'}})});
+//# sourceMappingURL=aa-permission-management-audit-log.min.js.map
\ No newline at end of file
@@ -0,0 +1,199 @@
+/* global DataTable, fetchGet, objectDeepMerge, permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides */
+
+$(document).ready(() => {
+    'use strict';
+
+    // Build the settings object
+    const permissionManagamentSettings = typeof permissionManagamentSettingsOverrides !== 'undefined'
+        ? objectDeepMerge(permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides) // jshint ignore: line
+        : permissionManagamentSettingsDefaults;
+
+    // Delay before a search is sent while typing (in milliseconds)
+    const searchDelay = 300;
+
+    // DataTable of the effective permissions, created with the first user shown
+    let effectivePermissionsTable = null;
+
+    // Timer of the pending user search
+    let searchTimer = null;
+
+    /**
+     * Escape a string for use in HTML
+     *
+     * @param {string} text The text to escape
+     * @returns {string} The escaped text
+     * @private
+     */
+    const _escapeHtml = (text) => {
+        return $('<div>').text(text).html();
+    };
+
+    /**
+     * Get the labels of the sources granting a permission
+     *
+     * @param {Object} data The effective permissions of the user
+     * @returns {Function} Function returning the labels of a permission's sources
+     * @private
+     */
+    const _sourceLabels = (data) => {
+        const groupNames = new Map(data.groups.map((group) => [group.id, group.name]));
+
+        return (sources) => sources.map((source) => {
+            switch (source.type) {
+                case 'group':
+                    return `${permissionManagamentSettings.l10n.group}: ${groupNames.get(source.id)}`;
+                case 'state':
+                    return `${permissionManagamentSettings.l10n.state}: ${data.state.name}`;
+                default:
+                    return permissionManagamentSettings.l10n.direct;
+            }
+        });
+    };
+
+    /**
+     * Show the effective permissions of a user
+     *
+     * @param {Object} data The effective permissions of the user
+     * @private
+     */
+    const _showEffectivePermissions = (data) => {
+        const labels = _sourceLabels(data);
+        const rows = data.permissions.map((permission) => ({
+            ...permission,
+            granted_by: labels(permission.sources)
+        }));
+        const flags = [];
+
+        if (!data.is_active) {
+            flags.push(`<span class="badge text-bg-secondary">${_escapeHtml(permissionManagamentSettings.l10n.inactive)}</span>`);
+        } else if (data.is_superuser) {
+            flags.push(`<span class="badge text-bg-warning">${_escapeHtml(permissionManagamentSettings.l10n.superuser)}</span>`);
+        }
+
+        $('#user-flags').html(flags.join(' ')).toggleClass('d-none', flags.length === 0);
+        $('#effective-permissions').removeClass('d-none');
+
+        if (effectivePermissionsTable === null) {
+            effectivePermissionsTable = new DataTable('#table-effective-permissions', {
+                ...permissionManagamentSettings.dataTable,
+                serverSide: false,
+                processing: false,
+                columnControl: [],
+                data: rows,
+                columns: [
+                    {
+                        data: 'permission',
+                        render: (value, type) => type === 'display' ? `<code>${_escapeHtml(value)}</code>` : value
+                    },
+                    {
+                        data: 'name',
+                        render: (value, type, row) => type === 'display'
+                            ? `${_escapeHtml(value)}<br><small class="text-body-secondary">${_escapeHtml(row.content_type)}</small>`
+                            : value
+                    },
+                    {
+                        data: 'granted_by',
+                        render: (value, type) => type === 'display'
+                            ? value.map((label) => `<span class="badge text-bg-primary me-1">${_escapeHtml(label)}</span>`).join('')
+                            : value.join(' ')
+                    }
+                ],
+                order: [[0, 'asc']],
+                layout: {
+                    topStart: 'pageLength',
+                    topEnd: 'search',
+                    bottomStart: 'info',
+                    bottomEnd: 'paging'
+                }
+            });
+        } else {
+            effectivePermissionsTable.clear().rows.add(rows).draw();
+        }
+    };
+
+    /**
+     * Load and show the effective permissions of a user
+     *
+     * @param {HTMLElement} userElement The element that was clicked to show the user
+     * @private
+     */
+    const _loadEffectivePermissions = (userElement) => {
+        const {userId, userName} = userElement.dataset;
+        const elementLoadingSpinner = $('#loading-spinner');
+        const url = permissionManagamentSettings.url.api.getEffectivePermissions
+            .replace('/0/', `/${userId}/`);
+
+        $('#user-search-results .active').removeClass('active');
+        $(userElement).addClass('active');
+        $('#selected-user').removeClass('d-none').text(userName);
+        $('#effective-permissions').addClass('d-none');
+        elementLoadingSpinner.removeClass('d-none');
+
+        fetchGet({url: url})
+            .then((data) => {
+                elementLoadingSpinner.addClass('d-none');
+
+                _showEffectivePermissions(data);
+            })
+            .catch((error) => {
+                elementLoadingSpinner.addClass('d-none');
+
+                console.error('Error loading effective permissions:', error);
+            });
+    };
+
+    /**
+     * Search users and list them
+     *
+     * @param {string} search The search term
+     * @private
+     */
+    const _searchUsers = (search) => {
+        const elementResults = $('#user-search-results');
+
+        if (search === '') {
+            elementResults.empty();
+
+            return;
+        }
+
+        fetchGet({url: `${permissionManagamentSettings.url.api.searchUsers}?q=${encodeURIComponent(search)}`})
+            .then(({users}) => {
+                elementResults.empty();
+
+                if (users.length === 0) {
+                    elementResults.append(
+                        $('<div class="list-group-item text-body-secondary">').text(permissionManagamentSettings.l10n.noUsersFound)
+                    );
+
+                    return;
+                }
+
+                users.forEach((user) => {
+                    const name = user.main_character ? `${user.main_character} (${user.username})` : user.username;
+
+                    elementResults.append(
+                        $('<button type="button" class="list-group-item list-group-item-action btn-show-user">')
+                            .attr('data-user-id', user.id)
+                            .attr('data-user-name', name)
+                            .text(name)
+                    );
+                });
+            })
+            .catch((error) => {
+                console.error('Error searching users:', error);
+            });
+    };
+
+    // User search input handler
+    $('#user-search').on('input', (event) => {
+        clearTimeout(searchTimer);
+
+        searchTimer = setTimeout(() => _searchUsers(event.currentTarget.value.trim()), searchDelay);
+    });
+
+    // Show user button click handler
+    $('#user-search-results').on('click', '.btn-show-user', (event) => {
+        _loadEffectivePermissions(event.currentTarget);
+    });
+});
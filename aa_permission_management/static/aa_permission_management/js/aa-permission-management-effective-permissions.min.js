@@ -0,0 +1,2 @@
+$(document).ready(()=>{'use strict';const e='undefined'!=typeof permissionManagamentSettingsOverrides?objectDeepMerge(permissionManagamentSettingsDefaults,permissionManagamentSettingsOverrides):permissionManagamentSettingsDefaults,s=300;let t=null,a=null;const n=e=>$('<div>').text(e).html(),r=s=>{const t=new Map(s.groups.map(e=>[e.id,e.name]));return a=>a.map(a=>{switch(a.type){case'group':return`${e.l10n.group}: ${t.get(a.id)}`;case'state':return`${e.l10n.state}: ${s.state.name}`;default:return e.l10n.direct}})},o=s=>{const a=r(s),o=s.permissions.map(e=>({...e,granted_by:a(e.sources)})),i=[];s.is_active?s.is_superuser&&i.push(`<span class="badge text-bg-warning">${n(e.l10n.superuser)}</span>`):i.push(`<span class="badge text-bg-secondary">${n(e.l10n.inactive)}</span>`),$('#user-flags').html(i.join(' ')).toggleClass('d-none',0===i.length),$('#effective-permissions').removeClass('d-none'),null===t?t=new DataTable('#table-effective-permissions',{...e.dataTable,serverSide:!1,processing:!1,columnControl:[],data:o,columns:[{data:'permission',render:(e,s)=>'display'===s?`<code>${n(e)}</code>`:e},{data:'name',render:(e,s,t)=>'display'===s?`${n(e)}<br><small class="text-body-secondary">${n(t.content_type)}</small>`:e},{data:'granted_by',render:(e,s)=>'display'===s?e.map(e=>`<span class="badge text-bg-primary me-1">${n(e)}</span>`).join(''):e.join(' ')}],order:[[0,'asc']],layout:{topStart:'pageLength',topEnd:'search',bottomStart:'info',bottomEnd:'paging'}}):t.clear().rows.add(o).draw()},i=s=>{const{userId:t,userName:a}=s.dataset,n=$('#loading-spinner'),r=e.url.api.getEffectivePermissions.replace('/0/',`/${t}/`);$('#user-search-results .active').removeClass('active'),$(s).addClass('active'),$('#selected-user').removeClass('d-none').text(a),$('#effective-permissions').addClass('d-none'),n.removeClass('d-none'),fetchGet({url:r}).then(e=>{n.addClass('d-none'),o(e)}).catch(e=>{n.addClass('d-none'),console.error('Error loading effective permissions:',e)})},c=s=>{const t=$('#user-search-results');''!==s?fetchGet({url:`${e.url.api.searchUsers}?q=${encodeURIComponent(s)}`}).then(({users:s})=>{t.empty(),0!==s.length?s.forEach(e=>{const s=e.main_character?`${e.main_character} (${e.username})`:e.username;t.append($('<button type="button" class="list-group-item list-group-item-action btn-show-user">').attr('data-user-id',e.id).attr('data-user-name',s).text(s))}):t.append($('<div class="list-group-item text-body-secondary">').text(e.l10n.noUsersFound))}).catch(e=>{console.error('Error searching users:',e)}):t.empty()};$('#user-search').on('input',e=>{clearTimeout(a),a=setTimeout(()=>c(e.currentTarget.value.trim()),s)}),$('#user-search-results').on('click','.btn-show-user',e=>{i(e.currentTarget)})});
+//# sourceMappingURL=aa-permission-management-effective-permissions.min.js.map
\ No newline at end of file
@@ -0,0 +1,148 @@
+/* global objectDeepMerge, permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides, pollPermissionJob */
+
+$(document).ready(() => {
+    'use strict';
+
+    // Build the settings object
+    const permissionManagamentSettings = typeof permissionManagamentSettingsOverrides !== 'undefined'
+        ? objectDeepMerge(permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides) // jshint ignore: line
+        : permissionManagamentSettingsDefaults;
+
+    const l10n = permissionManagamentSettings.l10n;
+    const elementForm = document.getElementById('import-permissions-form');
+    const elementResult = $('#import-result');
+    const elementJobProgress = $('#import-job-progress');
+    const elementSpinner = $('#loading-spinner');
+
+    /**
+     * Escape a string for use in HTML
+     *
+     * @param {string} text The text to escape
+     * @returns {string} The escaped text
+     * @private
+     */
+    const _escapeHtml = (text) => {
+        return String(text).replace(/[&<>"']/g, (character) => `&#${character.charCodeAt(0)};`);
+    };
+
+    /**
+     * Render the list of changed permissions of a target
+     *
+     * @param {Array<string>} permissions The permission names
+     * @param {string} className Class of the list items
+     * @param {string} sign Sign shown before each permission
+     * @returns {string} The HTML
+     * @private
+     */
+    const _renderPermissions = (permissions, className, sign) => {
+        return permissions
+            .map((permission) => `<li class="${className}">${sign} ${_escapeHtml(permission)}</li>`)
+            .join('');
+    };
+
+    /**
+     * Render the report of an import
+     *
+     * @param {Object} report The import report
+     * @returns {string} The HTML
+     * @private
+     */
+    const _renderReport = (report) => {
+        const html = [];
+
+        if (report.dry_run) {
+            html.push(`<div class="alert alert-info">${_escapeHtml(l10n.dryRunNotice)}</div>`);
+        }
+
+        html.push(
+            '<ul class="list-inline">'
+            + `<li class="list-inline-item">${_escapeHtml(l10n.rows)}: ${report.rows}</li>`
+            + `<li class="list-inline-item text-danger">${_escapeHtml(l10n.invalid)}: ${report.invalid}</li>`
+            + `<li class="list-inline-item text-success">${_escapeHtml(l10n.added)}: ${report.added}</li>`
+            + `<li class="list-inline-item text-warning">${_escapeHtml(l10n.removed)}: ${report.removed}</li>`
+            + '</ul>'
+        );
+
+        if (report.errors.length > 0) {
+            html.push(
+                '<ul class="text-danger">'
+                + report.errors
+                    .map((error) => `<li>${_escapeHtml(l10n.line)} ${error.line}: ${_escapeHtml(error.error)}</li>`)
+                    .join('')
+                + '</ul>'
+            );
+        }
+
+        report.targets.forEach((target) => {
+            const targetType = target.target_type === 'group' ? l10n.group : l10n.state;
+
+            html.push(
+                `<h6>${_escapeHtml(targetType)}: ${_escapeHtml(target.target)}</h6>`
+                + '<ul class="list-unstyled font-monospace small">'
+                + _renderPermissions(target.added, 'text-success', '+')
+                + _renderPermissions(target.removed, 'text-warning', '−')
+                + '</ul>'
+            );
+        });
+
+        if (report.truncated) {
+            html.push(`<p class="text-muted">${_escapeHtml(l10n.truncated)}</p>`);
+        }
+
+        return html.join('');
+    };
+
+    elementForm.addEventListener('submit', (event) => {
+        event.preventDefault();
+
+        const formData = new FormData(elementForm);
+
+        // Unchecked checkboxes aren't submitted
+        formData.set('dry_run', document.getElementById('import-dry-run').checked ? 'true' : 'false');
+        formData.set('background', document.getElementById('import-background').checked ? 'true' : 'false');
+
+        elementResult.empty();
+        elementJobProgress.empty().addClass('d-none');
+        elementSpinner.removeClass('d-none');
+
+        // The file is sent as multipart form data, not as JSON
+        fetch(permissionManagamentSettings.url.api.uploadPermissions, {
+            method: 'POST',
+            headers: {'X-CSRFToken': formData.get('csrfmiddlewaretoken')},
+            body: formData
+        })
+            .then(async (response) => {
+                const data = await response.json();
+
+                if (!response.ok) {
+                    throw new Error(data.error ?? response.statusText);
+                }
+
+                elementResult.html(_renderReport(data));
+
+                // Large imports are applied by a background job
+                if (data.status_url !== undefined) {
+                    const elementNotice = $('<div class="alert alert-info"></div>')
+                        .text(l10n.jobRunning)
+                        .prependTo(elementResult);
+
+                    elementSpinner.addClass('d-none');
+
+                    const job = await pollPermissionJob({url: data.status_url, element: elementJobProgress});
+
+                    elementNotice
+                        .removeClass('alert-info')
+                        .addClass('alert-success')
+                        .text(`${l10n.jobDone} ${l10n.added}: ${job.result.added ?? 0}, ${l10n.removed}: ${job.result.removed ?? 0}`);
+                }
+            })
+            .catch((error) => {
+                elementResult.html(`<div class="alert alert-danger">${_escapeHtml(error.message)}</div>`);
+
+                console.error('Error importing the permissions:', error);
+            })
+            .finally(() => {
+                elementSpinner.addClass('d-none');
+            });
+    });
+});
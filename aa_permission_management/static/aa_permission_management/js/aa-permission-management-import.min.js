@@ -0,0 +1,2 @@
+$(document).ready(()=>{'use strict';const e='undefined'!=typeof permissionManagamentSettingsOverrides?objectDeepMerge(permissionManagamentSettingsDefaults,permissionManagamentSettingsOverrides):permissionManagamentSettingsDefaults,t=e.l10n,s=document.getElementById('import-permissions-form'),n=$('#import-result'),r=$('#import-job-progress'),i=$('#loading-spinner'),a=e=>String(e).replace(/[&<>"']/g,e=>`&#${e.charCodeAt(0)};`),l=(e,t,s)=>e.map(e=>`<li class="${t}">${s} ${a(e)}</li>`).join(''),o=e=>{const s=[];return e.dry_run&&s.push(`<div class="alert alert-info">${a(t.dryRunNotice)}</div>`),s.push(`<ul class="list-inline"><li class="list-inline-item">${a(t.rows)}: ${e.rows}</li><li class="list-inline-item text-danger">${a(t.invalid)}: ${e.invalid}</li><li class="list-inline-item text-success">${a(t.added)}: ${e.added}</li><li class="list-inline-item text-warning">${a(t.removed)}: ${e.removed}</li></ul>`),e.errors.length>0&&s.push('<ul class="text-danger">'+e.errors.map(e=>`<li>${a(t.line)} ${e.line}: ${a(e.error)}</li>`).join('')+'</ul>'),e.targets.forEach(e=>{const n='group'===e.target_type?t.group:t.state;s.push(`<h6>${a(n)}: ${a(e.target)}</h6><ul class="list-unstyled font-monospace small">`+l(e.added,'text-success','+')+l(e.removed,'text-warning','−')+'</ul>')}),e.truncated&&s.push(`<p class="text-muted">${a(t.truncated)}</p>`),s.join('')};s.addEventListener('submit',l=>{l.preventDefault();const d=new FormData(s);d.set('dry_run',document.getElementById('import-dry-run').checked?'true':'false'),d.set('background',document.getElementById('import-background').checked?'true':'false'),n.empty(),r.empty().addClass('d-none'),i.removeClass('d-none'),fetch(e.url.api.uploadPermissions,{method:'POST',headers:{'X-CSRFToken':d.get('csrfmiddlewaretoken')},body:d}).then(async e=>{const s=await e.json();if(!e.ok)throw new Error(s.error??e.statusText);if(n.html(o(s)),void 0!==s.status_url){const e=$('<div class="alert alert-info"></div>').text(t.jobRunning).prependTo(n);i.addClass('d-none');const a=await pollPermissionJob({url:s.status_url,element:r});e.removeClass('alert-info').addClass('alert-success').text(`${t.jobDone} ${t.added}: ${a.result.added??0}, ${t.removed}: ${a.result.removed??0}`)}}).catch(e=>{n.html(`<div class="alert alert-danger">${a(e.message)}</div>`),console.error('Error importing the permissions:',e)}).finally(()=>{i.addClass('d-none')})})});
+//# sourceMappingURL=aa-permission-management-import.min.js.map
\ No newline at end of file
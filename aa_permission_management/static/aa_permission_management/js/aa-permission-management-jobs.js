@@ -0,0 +1,62 @@
+/* global fetchGet */
+/* exported pollPermissionJob */
+
+/**
+ * Poll a background job until it is done or has failed, and show its progress
+ *
+ * The progress bar is rendered into the given element and updated with every
+ * poll, so it keeps showing the final state when the job is finished.
+ *
+ * @param {Object} options The options
+ * @param {string} options.url The status URL of the job
+ * @param {HTMLElement|jQuery|string} options.element The element to show the progress bar in
+ * @param {number} [options.interval=1000] The polling interval in milliseconds
+ * @returns {Promise<Object>} The status of the finished job, rejected with the error if the job has failed
+ */
+const pollPermissionJob = (options) => {
+    'use strict';
+
+    const {url, element, interval = 1000} = options;
+    const bar = $('<div class="progress-bar progress-bar-striped progress-bar-animated"></div>');
+    const progress = $('<div class="progress mb-3" role="progressbar" aria-valuemin="0" aria-valuemax="100" aria-valuenow="0"></div>')
+        .append(bar);
+
+    $(element).empty().append(progress).removeClass('d-none');
+
+    /**
+     * Show the progress of the job
+     *
+     * @param {Object} job The job status
+     * @private
+     */
+    const _showProgress = (job) => {
+        const percent = Math.round(job.progress * 100);
+
+        progress.attr('aria-valuenow', percent);
+        bar.css('width', `${percent}%`).text(`${job.processed} / ${job.total}`);
+    };
+
+    return new Promise((resolve, reject) => {
+        const _poll = () => {
+            fetchGet({url: url})
+                .then((job) => {
+                    _showProgress(job);
+
+                    if (job.status === 'done') {
+                        bar.removeClass('progress-bar-striped progress-bar-animated').addClass('bg-success');
+
+                        resolve(job);
+                    } else if (job.status === 'failed') {
+                        bar.removeClass('progress-bar-striped progress-bar-animated').addClass('bg-danger');
+
+                        reject(new Error(job.error));
+                    } else {
+                        setTimeout(_poll, interval);
+                    }
+                })
+                .catch(reject);
+        };
+
+        _poll();
+    });
+};
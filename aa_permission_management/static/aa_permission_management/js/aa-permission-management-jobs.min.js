@@ -0,0 +1,2 @@
+const pollPermissionJob=s=>{'use strict';const{url:r,element:e,interval:a=1e3}=s,t=$('<div class="progress-bar progress-bar-striped progress-bar-animated"></div>'),o=$('<div class="progress mb-3" role="progressbar" aria-valuemin="0" aria-valuemax="100" aria-valuenow="0"></div>').append(t);$(e).empty().append(o).removeClass('d-none');const n=s=>{const r=Math.round(100*s.progress);o.attr('aria-valuenow',r),t.css('width',`${r}%`).text(`${s.processed} / ${s.total}`)};return new Promise((s,e)=>{const o=()=>{fetchGet({url:r}).then(r=>{n(r),'done'===r.status?(t.removeClass('progress-bar-striped progress-bar-animated').addClass('bg-success'),s(r)):'failed'===r.status?(t.removeClass('progress-bar-striped progress-bar-animated').addClass('bg-danger'),e(new Error(r.error))):setTimeout(o,a)}).catch(e)};o()})};
+//# sourceMappingURL=aa-permission-management-jobs.min.js.map
\ No newline at end of file
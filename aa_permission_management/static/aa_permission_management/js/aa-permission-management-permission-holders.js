@@ -0,0 +1,153 @@
+/* global DataTable, fetchGet, objectDeepMerge, permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides */
+
+$(document).ready(() => {
+    'use strict';
+
+    // Build the settings object
+    const permissionManagamentSettings = typeof permissionManagamentSettingsOverrides !== 'undefined'
+        ? objectDeepMerge(permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides) // jshint ignore: line
+        : permissionManagamentSettingsDefaults;
+
+    // ColumnControl configuration for the count columns (ordering and number search)
+    const countColumnControl = [
+        {
+            target: 0,
+            content: [
+                'order'
+            ]
+        },
+        {
+            target: 1,
+            content: [
+                'searchNumber'
+            ]
+        }
+    ];
+
+    // ColumnControl configuration to remove controls from specific columns
+    const removeColumnControl = [
+        {
+            target: 0,
+            content: []
+        },
+        {
+            target: 1,
+            content: []
+        }
+    ];
+
+    // Tables of the permission holders, created with the first permission shown
+    const holderTables = [
+        {
+            selector: '#table-permission-groups',
+            url: permissionManagamentSettings.url.api.getPermissionGroups,
+            columnDefs: [
+                {
+                    target: 1,
+                    type: 'num',
+                    columnControl: countColumnControl
+                }
+            ]
+        },
+        {
+            selector: '#table-permission-states',
+            url: permissionManagamentSettings.url.api.getPermissionStates,
+            columnDefs: [
+                {
+                    target: 1,
+                    type: 'num',
+                    columnControl: countColumnControl
+                }
+            ]
+        },
+        {
+            selector: '#table-permission-users',
+            url: permissionManagamentSettings.url.api.getPermissionUsers,
+            columnDefs: [
+                {
+                    target: 2,
+                    sortable: false,
+                    searchable: false,
+                    columnControl: removeColumnControl
+                }
+            ]
+        }
+    ];
+
+    /**
+     * Fill the permission select from the permission catalog
+     *
+     * @param {Object} catalog The permission catalog
+     * @param {string|null} selectedId The ID of the permission to select
+     * @private
+     */
+    const _buildPermissionOptions = (catalog, selectedId) => {
+        const options = document.createDocumentFragment();
+
+        catalog.ids.forEach((permissionId, index) => {
+            const contentType = catalog.content_types[catalog.content_type_index[index]];
+            const text = `${contentType} | ${catalog.codenames[index]} - ${catalog.names[index]}`;
+            const isSelected = String(permissionId) === selectedId;
+
+            options.appendChild(new Option(text, permissionId, isSelected, isSelected));
+        });
+
+        document.getElementById('permission-holders-permission').appendChild(options);
+    };
+
+    /**
+     * Show the groups, states and users holding a permission
+     *
+     * @param {string} permissionId The ID of the permission
+     * @private
+     */
+    const _showPermissionHolders = (permissionId) => {
+        $('#permission-holders').removeClass('d-none');
+
+        holderTables.forEach((table) => {
+            const url = table.url.replace('/0/', `/${permissionId}/`);
+
+            if (table.dataTable) {
+                table.dataTable.ajax.url(url).load();
+
+                return;
+            }
+
+            table.dataTable = new DataTable(table.selector, {
+                ...permissionManagamentSettings.dataTable,
+                ajax: {
+                    url: url,
+                    error: (xhr, error) => console.error(`Error loading data for table ${table.selector}:`, xhr, error)
+                },
+                columnDefs: table.columnDefs,
+                order: [[0, 'asc']]
+            });
+        });
+    };
+
+    // The permission can be preselected by the "permission" query parameter
+    const preselectedId = new URLSearchParams(window.location.search).get('permission');
+
+    fetchGet({url: permissionManagamentSettings.url.api.getPermissionCatalog})
+        .then((catalog) => {
+            _buildPermissionOptions(catalog, preselectedId);
+
+            if (preselectedId !== null && catalog.ids.includes(Number(preselectedId))) {
+                _showPermissionHolders(preselectedId);
+            }
+        })
+        .catch((error) => {
+            console.error('Error loading the permission catalog:', error);
+        });
+
+    // Permission select change handler
+    $('#permission-holders-permission').on('change', (event) => {
+        const permissionId = event.currentTarget.value;
+        const url = new URL(window.location.href);
+
+        url.searchParams.set('permission', permissionId);
+        window.history.replaceState(null, '', url);
+
+        _showPermissionHolders(permissionId);
+    });
+});
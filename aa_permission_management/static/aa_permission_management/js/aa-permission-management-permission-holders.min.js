@@ -0,0 +1,2 @@
+$(document).ready(()=>{'use strict';const e='undefined'!=typeof permissionManagamentSettingsOverrides?objectDeepMerge(permissionManagamentSettingsDefaults,permissionManagamentSettingsOverrides):permissionManagamentSettingsDefaults,t=[{target:0,content:['order']},{target:1,content:['searchNumber']}],r=[{target:0,content:[]},{target:1,content:[]}],n=[{selector:'#table-permission-groups',url:e.url.api.getPermissionGroups,columnDefs:[{target:1,type:'num',columnControl:t}]},{selector:'#table-permission-states',url:e.url.api.getPermissionStates,columnDefs:[{target:1,type:'num',columnControl:t}]},{selector:'#table-permission-users',url:e.url.api.getPermissionUsers,columnDefs:[{target:2,sortable:!1,searchable:!1,columnControl:r}]}],s=(e,t)=>{const r=document.createDocumentFragment();e.ids.forEach((n,s)=>{const o=`${e.content_types[e.content_type_index[s]]} | ${e.codenames[s]} - ${e.names[s]}`,a=String(n)===t;r.appendChild(new Option(o,n,a,a))}),document.getElementById('permission-holders-permission').appendChild(r)},o=t=>{$('#permission-holders').removeClass('d-none'),n.forEach(r=>{const n=r.url.replace('/0/',`/${t}/`);r.dataTable?r.dataTable.ajax.url(n).load():r.dataTable=new DataTable(r.selector,{...e.dataTable,ajax:{url:n,error:(e,t)=>console.error(`Error loading data for table ${r.selector}:`,e,t)},columnDefs:r.columnDefs,order:[[0,'asc']]})})},a=new URLSearchParams(window.location.search).get('permission');fetchGet({url:e.url.api.getPermissionCatalog}).then(e=>{s(e,a),null!==a&&e.ids.includes(Number(a))&&o(a)}).catch(e=>{console.error('Error loading the permission catalog:',e)}),$('#permission-holders-permission').on('change',e=>{const t=e.currentTarget.value,r=new URL(window.location.href);r.searchParams.set('permission',t),window.history.replaceState(null,'',r),o(t)})});
+//# sourceMappingURL=aa-permission-management-permission-holders.min.js.map
\ No newline at end of file
@@ -0,0 +1,292 @@
+/* global fetchGet, objectDeepMerge, permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides */
+
+$(document).ready(() => {
+    'use strict';
+
+    // Build the settings object
+    const permissionManagamentSettings = typeof permissionManagamentSettingsOverrides !== 'undefined'
+        ? objectDeepMerge(permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides) // jshint ignore: line
+        : permissionManagamentSettingsDefaults;
+
+    // Size of a cell, width of the row headers and height of the column headers (in pixels)
+    const cellSize = 24;
+    const rowHeaderWidth = 240;
+    const columnHeaderHeight = 200;
+
+    // Number of rows and columns fetched per block, within the limits of the server
+    const blockRows = 100;
+    const blockColumns = 200;
+
+    // Number of rows and columns rendered beyond the visible area
+    const overscan = 4;
+
+    const elementMatrix = document.getElementById('permission-matrix');
+    const elementCanvas = document.getElementById('permission-matrix-canvas');
+    const elementTargetType = document.getElementById('permission-matrix-target-type');
+    const elementAppLabel = document.getElementById('permission-matrix-app-label');
+
+    // Layer holding the rendered part of the matrix, always covering the visible area
+    const elementLayer = document.createElement('div');
+
+    elementLayer.className = 'position-absolute overflow-hidden';
+    elementCanvas.appendChild(elementLayer);
+
+    // Labels of the permissions by ID, from the permission catalog
+    const permissionLabels = new Map();
+
+    // State of the matrix, replaced whenever the rows or the app label change
+    let matrix = null;
+
+    // Pending render frame
+    let renderFrame = null;
+
+    /**
+     * Escape a string for use in HTML
+     *
+     * @param {string} text The text to escape
+     * @returns {string} The escaped text
+     * @private
+     */
+    const _escapeHtml = (text) => {
+        return String(text).replace(/[&<>"']/g, (character) => `&#${character.charCodeAt(0)};`);
+    };
+
+    /**
+     * Create an empty matrix state
+     *
+     * @returns {Object} The matrix state
+     * @private
+     */
+    const _createMatrix = () => ({
+        targetType: elementTargetType.value,
+        appLabel: elementAppLabel.value,
+        rowsTotal: 0,
+        columnsTotal: 0,
+        blocks: new Map(),
+        rowNames: new Map(),
+        columnIds: new Map(),
+        assigned: new Map()
+    });
+
+    /**
+     * Store a fetched block in the matrix state
+     *
+     * @param {Object} state The matrix state the block was fetched for
+     * @param {Object} data The block
+     * @private
+     */
+    const _storeBlock = (state, data) => {
+        state.rowsTotal = data.rows.total;
+        state.columnsTotal = data.columns.total;
+
+        data.columns.ids.forEach((permissionId, index) => {
+            state.columnIds.set(data.columns.offset + index, permissionId);
+        });
+
+        data.rows.ids.forEach((rowId, index) => {
+            const row = data.rows.offset + index;
+            const assigned = state.assigned.get(row) ?? new Set();
+
+            state.rowNames.set(row, data.rows.names[index]);
+
+            data.cells[index].forEach((column) => assigned.add(data.columns.offset + column));
+            state.assigned.set(row, assigned);
+        });
+    };
+
+    /**
+     * Fetch a block of the matrix, unless it is loaded or loading already
+     *
+     * @param {Object} state The matrix state
+     * @param {number} rowBlock Index of the row block
+     * @param {number} columnBlock Index of the column block
+     * @returns {Promise<void>}
+     * @private
+     */
+    const _fetchBlock = (state, rowBlock, columnBlock) => {
+        const key = `${rowBlock}:${columnBlock}`;
+
+        if (state.blocks.has(key)) {
+            return state.blocks.get(key);
+        }
+
+        const params = new URLSearchParams({
+            row_offset: rowBlock * blockRows,
+            row_limit: blockRows,
+            column_offset: columnBlock * blockColumns,
+            column_limit: blockColumns,
+            app_label: state.appLabel
+        });
+        const url = permissionManagamentSettings.url.api.getPermissionMatrix
+            .replace('__target_type__', state.targetType);
+
+        const request = fetchGet({url: `${url}?${params}`})
+            .then((data) => {
+                _storeBlock(state, data);
+
+                if (state === matrix) {
+                    _scheduleRender();
+                }
+
+                return data;
+            })
+            .catch((error) => {
+                // Allow the block to be fetched again
+                state.blocks.delete(key);
+
+                console.error('Error loading the permission matrix:', error);
+            });
+
+        state.blocks.set(key, request);
+
+        return request;
+    };
+
+    /**
+     * Render the visible part of the matrix
+     *
+     * Only the visible rows and columns (and a few beyond) are in the DOM, so the
+     * size of the matrix doesn't matter to the browser.
+     *
+     * @private
+     */
+    const _render = () => {
+        renderFrame = null;
+
+        const state = matrix;
+        const {scrollTop, scrollLeft, clientWidth, clientHeight} = elementMatrix;
+
+        elementCanvas.style.width = `${rowHeaderWidth + state.columnsTotal * cellSize}px`;
+        elementCanvas.style.height = `${columnHeaderHeight + state.rowsTotal * cellSize}px`;
+        Object.assign(elementLayer.style, {
+            left: `${scrollLeft}px`,
+            top: `${scrollTop}px`,
+            width: `${clientWidth}px`,
+            height: `${clientHeight}px`
+        });
+
+        const firstRow = Math.max(Math.floor(scrollTop / cellSize) - overscan, 0);
+        const lastRow = Math.min(
+            Math.ceil((scrollTop + clientHeight - columnHeaderHeight) / cellSize) + overscan,
+            state.rowsTotal
+        );
+        const firstColumn = Math.max(Math.floor(scrollLeft / cellSize) - overscan, 0);
+        const lastColumn = Math.min(
+            Math.ceil((scrollLeft + clientWidth - rowHeaderWidth) / cellSize) + overscan,
+            state.columnsTotal
+        );
+
+        // Fetch the blocks of the visible area
+        for (let rowBlock = Math.floor(firstRow / blockRows); rowBlock * blockRows < lastRow; rowBlock++) {
+            for (let columnBlock = Math.floor(firstColumn / blockColumns); columnBlock * blockColumns < lastColumn; columnBlock++) {
+                _fetchBlock(state, rowBlock, columnBlock);
+            }
+        }
+
+        const html = [];
+        const rowY = (row) => columnHeaderHeight + row * cellSize - scrollTop;
+        const columnX = (column) => rowHeaderWidth + column * cellSize - scrollLeft;
+
+        // Assigned cells
+        for (let row = firstRow; row < lastRow; row++) {
+            const assigned = state.assigned.get(row);
+
+            if (assigned === undefined) {
+                continue;
+            }
+
+            for (let column = firstColumn; column < lastColumn; column++) {
+                if (assigned.has(column)) {
+                    html.push(
+                        `<div class="position-absolute text-center text-success" style="left:${columnX(column)}px;top:${rowY(row)}px;width:${cellSize}px;height:${cellSize}px;line-height:${cellSize}px;">`
+                        + '<i class="fa-solid fa-check"></i></div>'
+                    );
+                }
+            }
+        }
+
+        // Row headers
+        html.push(`<div class="position-absolute bg-body border-end" style="left:0;top:0;width:${rowHeaderWidth}px;height:100%;"></div>`);
+
+        for (let row = firstRow; row < lastRow; row++) {
+            const name = state.rowNames.get(row) ?? '…';
+
+            html.push(
+                `<div class="position-absolute text-truncate px-2 border-bottom" style="left:0;top:${rowY(row)}px;width:${rowHeaderWidth}px;height:${cellSize}px;line-height:${cellSize}px;" title="${_escapeHtml(name)}">`
+                + `${_escapeHtml(name)}</div>`
+            );
+        }
+
+        // Column headers
+        html.push(`<div class="position-absolute bg-body border-bottom" style="left:0;top:0;width:100%;height:${columnHeaderHeight}px;"></div>`);
+
+        for (let column = firstColumn; column < lastColumn; column++) {
+            const permissionId = state.columnIds.get(column);
+            const label = permissionLabels.get(permissionId) ?? {codename: '…', title: ''};
+
+            html.push(
+                `<div class="position-absolute text-truncate border-end" style="left:${columnX(column)}px;top:0;width:${cellSize}px;height:${columnHeaderHeight}px;line-height:${cellSize}px;writing-mode:vertical-rl;transform:rotate(180deg);" title="${_escapeHtml(label.title)}">`
+                + `${_escapeHtml(label.codename)}</div>`
+            );
+        }
+
+        // Corner
+        html.push(`<div class="position-absolute bg-body border-end border-bottom" style="left:0;top:0;width:${rowHeaderWidth}px;height:${columnHeaderHeight}px;"></div>`);
+
+        elementLayer.innerHTML = html.join('');
+
+        $('#permission-matrix-size').text(`${state.rowsTotal} × ${state.columnsTotal}`);
+    };
+
+    /**
+     * Render the matrix with the next animation frame
+     *
+     * @private
+     */
+    const _scheduleRender = () => {
+        if (renderFrame === null) {
+            renderFrame = window.requestAnimationFrame(_render);
+        }
+    };
+
+    /**
+     * Show the matrix for the selected rows and app label from the start
+     *
+     * @returns {Promise<Object>} The first block of the matrix
+     * @private
+     */
+    const _resetMatrix = () => {
+        matrix = _createMatrix();
+        elementMatrix.scrollTop = 0;
+        elementMatrix.scrollLeft = 0;
+
+        return _fetchBlock(matrix, 0, 0);
+    };
+
+    fetchGet({url: permissionManagamentSettings.url.api.getPermissionCatalog})
+        .then((catalog) => {
+            catalog.ids.forEach((permissionId, index) => {
+                const contentType = catalog.content_types[catalog.content_type_index[index]];
+
+                permissionLabels.set(permissionId, {
+                    codename: catalog.codenames[index],
+                    title: `${contentType} | ${catalog.codenames[index]} - ${catalog.names[index]}`
+                });
+            });
+
+            return _resetMatrix();
+        })
+        .then((data) => {
+            const options = document.createDocumentFragment();
+
+            data.app_labels.forEach((appLabel) => options.appendChild(new Option(appLabel, appLabel)));
+            elementAppLabel.appendChild(options);
+        })
+        .catch((error) => {
+            console.error('Error loading the permission matrix:', error);
+        });
+
+    elementMatrix.addEventListener('scroll', _scheduleRender, {passive: true});
+    window.addEventListener('resize', _scheduleRender);
+    $(elementTargetType).add(elementAppLabel).on('change', _resetMatrix);
+});
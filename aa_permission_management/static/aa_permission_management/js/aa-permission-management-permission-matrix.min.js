@@ -0,0 +1,2 @@
+$(document).ready(()=>{'use strict';const e='undefined'!=typeof permissionManagamentSettingsOverrides?objectDeepMerge(permissionManagamentSettingsDefaults,permissionManagamentSettingsOverrides):permissionManagamentSettingsDefaults,t=24,o=240,s=200,n=100,i=200,a=4,l=document.getElementById('permission-matrix'),r=document.getElementById('permission-matrix-canvas'),c=document.getElementById('permission-matrix-target-type'),d=document.getElementById('permission-matrix-app-label'),p=document.createElement('div');p.className='position-absolute overflow-hidden',r.appendChild(p);const m=new Map;let h=null,u=null;const g=e=>String(e).replace(/[&<>"']/g,e=>`&#${e.charCodeAt(0)};`),f=()=>({targetType:c.value,appLabel:d.value,rowsTotal:0,columnsTotal:0,blocks:new Map,rowNames:new Map,columnIds:new Map,assigned:new Map}),x=(e,t)=>{e.rowsTotal=t.rows.total,e.columnsTotal=t.columns.total,t.columns.ids.forEach((o,s)=>{e.columnIds.set(t.columns.offset+s,o)}),t.rows.ids.forEach((o,s)=>{const n=t.rows.offset+s,i=e.assigned.get(n)??new Set;e.rowNames.set(n,t.rows.names[s]),t.cells[s].forEach(e=>i.add(t.columns.offset+e)),e.assigned.set(n,i)})},w=(t,o,s)=>{const a=`${o}:${s}`;if(t.blocks.has(a))return t.blocks.get(a);const l=new URLSearchParams({row_offset:o*n,row_limit:n,column_offset:s*i,column_limit:i,app_label:t.appLabel}),r=e.url.api.getPermissionMatrix.replace('__target_type__',t.targetType),c=fetchGet({url:`${r}?${l}`}).then(e=>(x(t,e),t===h&&v(),e)).catch(e=>{t.blocks.delete(a),console.error('Error loading the permission matrix:',e)});return t.blocks.set(a,c),c},b=()=>{u=null;const e=h,{scrollTop:c,scrollLeft:d,clientWidth:f,clientHeight:x}=l;r.style.width=`${o+e.columnsTotal*t}px`,r.style.height=`${s+e.rowsTotal*t}px`,Object.assign(p.style,{left:`${d}px`,top:`${c}px`,width:`${f}px`,height:`${x}px`});const b=Math.max(Math.floor(c/t)-a,0),v=Math.min(Math.ceil((c+x-s)/t)+a,e.rowsTotal),y=Math.max(Math.floor(d/t)-a,0),M=Math.min(Math.ceil((d+f-o)/t)+a,e.columnsTotal);for(let t=Math.floor(b/n);t*n<v;t++)for(let o=Math.floor(y/i);o*i<M;o++)w(e,t,o);const T=[],E=e=>s+e*t-c,_=e=>o+e*t-d;for(let o=b;o<v;o++){const s=e.assigned.get(o);if(void 0!==s)for(let e=y;e<M;e++)s.has(e)&&T.push(`<div class="position-absolute text-center text-success" style="left:${_(e)}px;top:${E(o)}px;width:${t}px;height:${t}px;line-height:${t}px;"><i class="fa-solid fa-check"></i></div>`)}T.push(`<div class="position-absolute bg-body border-end" style="left:0;top:0;width:${o}px;height:100%;"></div>`);for(let s=b;s<v;s++){const n=e.rowNames.get(s)??'…';T.push(`<div class="position-absolute text-truncate px-2 border-bottom" style="left:0;top:${E(s)}px;width:${o}px;height:${t}px;line-height:${t}px;" title="${g(n)}">${g(n)}</div>`)}T.push(`<div class="position-absolute bg-body border-bottom" style="left:0;top:0;width:100%;height:${s}px;"></div>`);for(let o=y;o<M;o++){const n=e.columnIds.get(o),i=m.get(n)??{codename:'…',title:''};T.push(`<div class="position-absolute text-truncate border-end" style="left:${_(o)}px;top:0;width:${t}px;height:${s}px;line-height:${t}px;writing-mode:vertical-rl;transform:rotate(180deg);" title="${g(i.title)}">${g(i.codename)}</div>`)}T.push(`<div class="position-absolute bg-body border-end border-bottom" style="left:0;top:0;width:${o}px;height:${s}px;"></div>`),p.innerHTML=T.join(''),$('#permission-matrix-size').text(`${e.rowsTotal} × ${e.columnsTotal}`)},v=()=>{null===u&&(u=window.requestAnimationFrame(b))},y=()=>(h=f(),l.scrollTop=0,l.scrollLeft=0,w(h,0,0));fetchGet({url:e.url.api.getPermissionCatalog}).then(e=>(e.ids.forEach((t,o)=>{const s=e.content_types[e.content_type_index[o]];m.set(t,{codename:e.codenames[o],title:`${s} | ${e.codenames[o]} - ${e.names[o]}`})}),y())).then(e=>{const t=document.createDocumentFragment();e.app_labels.forEach(e=>t.appendChild(new Option(e,e))),d.appendChild(t)}).catch(e=>{console.error('Error loading the permission matrix:',e)}),l.addEventListener('scroll',v,{passive:!0}),window.addEventListener('resize',v),$(c).add(d).on('change',y)});
+//# sourceMappingURL=aa-permission-management-permission-matrix.min.js.map
\ No newline at end of file
@@ -0,0 +1,211 @@
+/* global fetchGet, fetchPost, objectDeepMerge, permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides, pollPermissionJob */
+
+$(document).ready(() => {
+    'use strict';
+
+    // Build the settings object
+    const permissionManagamentSettings = typeof permissionManagamentSettingsOverrides !== 'undefined'
+        ? objectDeepMerge(permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides) // jshint ignore: line
+        : permissionManagamentSettingsDefaults;
+
+    const l10n = permissionManagamentSettings.l10n;
+    const api = permissionManagamentSettings.url.api;
+    const csrfToken = $('#create-snapshot-form input[name="csrfmiddlewaretoken"]').val();
+    const elementTable = $('#table-snapshots tbody');
+    const elementDiff = $('#snapshot-diff');
+    const elementJobProgress = $('#snapshot-job-progress');
+    const elementSpinner = $('#loading-spinner');
+
+    /**
+     * Escape a string for use in HTML
+     *
+     * @param {string} text The text to escape
+     * @returns {string} The escaped text
+     * @private
+     */
+    const _escapeHtml = (text) => {
+        return String(text).replace(/[&<>"']/g, (character) => `&#${character.charCodeAt(0)};`);
+    };
+
+    /**
+     * Get the URL of a snapshot endpoint
+     *
+     * @param {string} url The endpoint URL for snapshot 0
+     * @param {number} snapshotId The ID of the snapshot
+     * @returns {string} The URL
+     * @private
+     */
+    const _snapshotUrl = (url, snapshotId) => url.replace('/0/', `/${snapshotId}/`);
+
+    /**
+     * Render the changes of a snapshot
+     *
+     * @param {Object} report The report of the changes
+     * @returns {string} The HTML
+     * @private
+     */
+    const _renderReport = (report) => {
+        const html = [];
+
+        if (!report.dry_run) {
+            html.push(`<div class="alert alert-success">${_escapeHtml(l10n.restored)}</div>`);
+        }
+
+        if (report.added === 0 && report.removed === 0) {
+            html.push(`<p class="text-muted">${_escapeHtml(l10n.inSync)}</p>`);
+        } else {
+            html.push(
+                '<ul class="list-inline">'
+                + `<li class="list-inline-item text-success">${_escapeHtml(l10n.added)}: ${report.added}</li>`
+                + `<li class="list-inline-item text-warning">${_escapeHtml(l10n.removed)}: ${report.removed}</li>`
+                + '</ul>'
+            );
+        }
+
+        if (report.invalid > 0) {
+            html.push(`<p class="text-muted">${_escapeHtml(l10n.deleted)}: ${report.invalid}</p>`);
+        }
+
+        report.targets.forEach((target) => {
+            const targetType = target.target_type === 'group' ? l10n.group : l10n.state;
+
+            html.push(
+                `<h6>${_escapeHtml(targetType)}: ${_escapeHtml(target.target)}</h6>`
+                + '<ul class="list-unstyled font-monospace small">'
+                + target.added.map((permission) => `<li class="text-success">+ ${_escapeHtml(permission)}</li>`).join('')
+                + target.removed.map((permission) => `<li class="text-warning">− ${_escapeHtml(permission)}</li>`).join('')
+                + '</ul>'
+            );
+        });
+
+        if (report.truncated) {
+            html.push(`<p class="text-muted">${_escapeHtml(l10n.truncated)}</p>`);
+        }
+
+        return html.join('');
+    };
+
+    /**
+     * Show the result of a request in the changes card
+     *
+     * @param {Promise<Object>} request The request of the report
+     * @private
+     */
+    const _showReport = (request) => {
+        elementDiff.empty();
+        elementJobProgress.empty().addClass('d-none');
+        elementSpinner.removeClass('d-none');
+
+        request
+            .then((report) => elementDiff.html(_renderReport(report)))
+            .catch((error) => {
+                elementDiff.html(`<div class="alert alert-danger">${_escapeHtml(error.message)}</div>`);
+
+                console.error('Error loading the snapshot changes:', error);
+            })
+            .finally(() => elementSpinner.addClass('d-none'));
+    };
+
+    /**
+     * Load the list of snapshots
+     *
+     * @private
+     */
+    const _loadSnapshots = () => {
+        fetchGet({url: api.getSnapshots})
+            .then((data) => {
+                if (data.snapshots.length === 0) {
+                    elementTable.html(`<tr><td colspan="6" class="text-muted">${_escapeHtml(l10n.noSnapshots)}</td></tr>`);
+
+                    return;
+                }
+
+                elementTable.html(data.snapshots.map((snapshot) => (
+                    '<tr>'
+                    + `<td>${_escapeHtml(new Date(snapshot.created).toLocaleString())}</td>`
+                    + `<td>${_escapeHtml(snapshot.name)}</td>`
+                    + `<td>${_escapeHtml(snapshot.created_by)}</td>`
+                    + `<td class="text-end">${snapshot.targets}</td>`
+                    + `<td class="text-end">${snapshot.assignments}</td>`
+                    + '<td class="text-end text-nowrap">'
+                    + `<button type="button" class="btn btn-sm btn-primary me-1" data-action="diff" data-snapshot-id="${snapshot.id}">${_escapeHtml(l10n.showChanges)}</button>`
+                    + `<button type="button" class="btn btn-sm btn-warning me-1" data-action="restore" data-snapshot-id="${snapshot.id}">${_escapeHtml(l10n.restore)}</button>`
+                    + `<button type="button" class="btn btn-sm btn-danger" data-action="delete" data-snapshot-id="${snapshot.id}">${_escapeHtml(l10n.delete)}</button>`
+                    + '</td>'
+                    + '</tr>'
+                )).join(''));
+            })
+            .catch((error) => {
+                console.error('Error loading the snapshots:', error);
+            });
+    };
+
+    $('#create-snapshot-form').on('submit', (event) => {
+        event.preventDefault();
+
+        fetchPost({
+            url: api.createSnapshot,
+            csrfToken: csrfToken,
+            payload: {name: $('#snapshot-name').val()},
+            responseIsJson: true
+        })
+            .then(() => {
+                $('#snapshot-name').val('');
+
+                _loadSnapshots();
+            })
+            .catch((error) => {
+                console.error('Error taking the snapshot:', error);
+            });
+    });
+
+    elementTable.on('click', 'button[data-action]', (event) => {
+        const {action, snapshotId} = event.currentTarget.dataset;
+
+        if (action === 'diff') {
+            _showReport(fetchGet({url: _snapshotUrl(api.getSnapshotDiff, snapshotId)}));
+        } else if (action === 'restore' && window.confirm(l10n.confirmRestore)) {
+            _showReport(
+                fetchPost({
+                    url: _snapshotUrl(api.restoreSnapshot, snapshotId),
+                    csrfToken: csrfToken,
+                    payload: {background: document.getElementById('restore-background').checked},
+                    responseIsJson: true
+                })
+                    .then(async (response) => {
+                        // Large snapshots are restored by a background job
+                        if (response.status_url === undefined) {
+                            return response;
+                        }
+
+                        elementSpinner.addClass('d-none');
+                        elementDiff.html(`<div class="alert alert-info">${_escapeHtml(l10n.jobRunning)}</div>`);
+
+                        const job = await pollPermissionJob({url: response.status_url, element: elementJobProgress});
+
+                        return {
+                            dry_run: false,
+                            added: job.result.added ?? 0,
+                            removed: job.result.removed ?? 0,
+                            invalid: job.result.invalid ?? 0,
+                            targets: [],
+                            truncated: false
+                        };
+                    })
+            );
+        } else if (action === 'delete' && window.confirm(l10n.confirmDelete)) {
+            fetchPost({
+                url: _snapshotUrl(api.deleteSnapshot, snapshotId),
+                csrfToken: csrfToken,
+                payload: {},
+                responseIsJson: true
+            })
+                .then(_loadSnapshots)
+                .catch((error) => {
+                    console.error('Error deleting the snapshot:', error);
+                });
+        }
+    });
+
+    _loadSnapshots();
+});
@@ -0,0 +1,2 @@
+$(document).ready(()=>{'use strict';const t='undefined'!=typeof permissionManagamentSettingsOverrides?objectDeepMerge(permissionManagamentSettingsDefaults,permissionManagamentSettingsOverrides):permissionManagamentSettingsDefaults,e=t.l10n,s=t.url.api,n=$('#create-snapshot-form input[name="csrfmiddlewaretoken"]').val(),a=$('#table-snapshots tbody'),o=$('#snapshot-diff'),r=$('#snapshot-job-progress'),d=$('#loading-spinner'),l=t=>String(t).replace(/[&<>"']/g,t=>`&#${t.charCodeAt(0)};`),i=(t,e)=>t.replace('/0/',`/${e}/`),c=t=>{const s=[];return t.dry_run||s.push(`<div class="alert alert-success">${l(e.restored)}</div>`),0===t.added&&0===t.removed?s.push(`<p class="text-muted">${l(e.inSync)}</p>`):s.push(`<ul class="list-inline"><li class="list-inline-item text-success">${l(e.added)}: ${t.added}</li><li class="list-inline-item text-warning">${l(e.removed)}: ${t.removed}</li></ul>`),t.invalid>0&&s.push(`<p class="text-muted">${l(e.deleted)}: ${t.invalid}</p>`),t.targets.forEach(t=>{const n='group'===t.target_type?e.group:e.state;s.push(`<h6>${l(n)}: ${l(t.target)}</h6><ul class="list-unstyled font-monospace small">`+t.added.map(t=>`<li class="text-success">+ ${l(t)}</li>`).join('')+t.removed.map(t=>`<li class="text-warning">− ${l(t)}</li>`).join('')+'</ul>')}),t.truncated&&s.push(`<p class="text-muted">${l(e.truncated)}</p>`),s.join('')},p=t=>{o.empty(),r.empty().addClass('d-none'),d.removeClass('d-none'),t.then(t=>o.html(c(t))).catch(t=>{o.html(`<div class="alert alert-danger">${l(t.message)}</div>`),console.error('Error loading the snapshot changes:',t)}).finally(()=>d.addClass('d-none'))},u=()=>{fetchGet({url:s.getSnapshots}).then(t=>{0!==t.snapshots.length?a.html(t.snapshots.map(t=>`<tr><td>${l(new Date(t.created).toLocaleString())}</td><td>${l(t.name)}</td><td>${l(t.created_by)}</td><td class="text-end">${t.targets}</td><td class="text-end">${t.assignments}</td><td class="text-end text-nowrap"><button type="button" class="btn btn-sm btn-primary me-1" data-action="diff" data-snapshot-id="${t.id}">${l(e.showChanges)}</button><button type="button" class="btn btn-sm btn-warning me-1" data-action="restore" data-snapshot-id="${t.id}">${l(e.restore)}</button><button type="button" class="btn btn-sm btn-danger" data-action="delete" data-snapshot-id="${t.id}">${l(e.delete)}</button></td></tr>`).join('')):a.html(`<tr><td colspan="6" class="text-muted">${l(e.noSnapshots)}</td></tr>`)}).catch(t=>{console.error('Error loading the snapshots:',t)})};$('#create-snapshot-form').on('submit',t=>{t.preventDefault(),fetchPost({url:s.createSnapshot,csrfToken:n,payload:{name:$('#snapshot-name').val()},responseIsJson:!0}).then(()=>{$('#snapshot-name').val(''),u()}).catch(t=>{console.error('Error taking the snapshot:',t)})}),a.on('click','button[data-action]',t=>{const{action:a,snapshotId:c}=t.currentTarget.dataset;'diff'===a?p(fetchGet({url:i(s.getSnapshotDiff,c)})):'restore'===a&&window.confirm(e.confirmRestore)?p(fetchPost({url:i(s.restoreSnapshot,c),csrfToken:n,payload:{background:document.getElementById('restore-background').checked},responseIsJson:!0}).then(async t=>{if(void 0===t.status_url)return t;d.addClass('d-none'),o.html(`<div class="alert alert-info">${l(e.jobRunning)}</div>`);const s=await pollPermissionJob({url:t.status_url,element:r});return{dry_run:!1,added:s.result.added??0,removed:s.result.removed??0,invalid:s.result.invalid??0,targets:[],truncated:!1}})):'delete'===a&&window.confirm(e.confirmDelete)&&fetchPost({url:i(s.deleteSnapshot,c),csrfToken:n,payload:{},responseIsJson:!0}).then(u).catch(t=>{console.error('Error deleting the snapshot:',t)})}),u()});
+//# sourceMappingURL=aa-permission-management-snapshots.min.js.map
\ No newline at end of file
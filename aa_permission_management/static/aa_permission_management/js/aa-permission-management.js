@@ -1,4 +1,4 @@
-/* global bootstrap, DataTable, fetchGet, objectDeepMerge, permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides */
+/* global bootstrap, DataTable, fetchGet, fetchPost, objectDeepMerge, permissionManagamentSettingsDefaults, permissionManagamentSettingsOverrides, pollPermissionJob */
 
 $(document).ready(() => {
     'use strict';
@@ -41,6 +41,157 @@ $(document).ready(() => {
             });
     };
 
+    // Data rendered with the dashboard: the catalog version, the page length, and
+    // the totals of the tables, of which the first states page is in the DOM
+    const dashboardBootstrap = JSON.parse(document.getElementById('aa-permission-management-bootstrap').textContent);
+
+    // Local storage key for the permission catalog
+    const permissionCatalogStorageKey = 'aa-permission-management-permission-catalog';
+
+    // In-memory copy of the permission catalog
+    let permissionCatalog = null;
+
+    // IDs of the permissions assigned to the group or state shown in the picker
+    let assignedPermissions = new Set();
+
+    // Permission set version the assigned permissions are based on
+    let assignedPermissionsVersion = null;
+
+    /**
+     * Check if a permission catalog is current
+     *
+     * @param {Object|null} catalog The permission catalog
+     * @param {string} version The current catalog version
+     * @returns {boolean} True if the catalog is current
+     * @private
+     */
+    const _isCurrentCatalog = (catalog, version) => {
+        return catalog !== null
+            && catalog.version === version
+            && catalog.language === permissionManagamentSettings.language;
+    };
+
+    /**
+     * Get the permission catalog in the given version.
+     *
+     * The catalog is taken from memory or local storage if possible, and only
+     * fetched from the server when the catalog version has changed.
+     *
+     * @param {string} version The current catalog version
+     * @returns {Promise<Object>} The permission catalog
+     * @private
+     */
+    const _getPermissionCatalog = async (version) => {
+        if (_isCurrentCatalog(permissionCatalog, version)) {
+            return permissionCatalog;
+        }
+
+        try {
+            const storedCatalog = JSON.parse(localStorage.getItem(permissionCatalogStorageKey));
+
+            if (_isCurrentCatalog(storedCatalog, version)) {
+                permissionCatalog = storedCatalog;
+
+                return permissionCatalog;
+            }
+        } catch (error) {
+            console.warn('Could not read the permission catalog from local storage:', error);
+        }
+
+        permissionCatalog = await fetchGet({url: permissionManagamentSettings.url.api.getPermissionCatalog});
+
+        try {
+            localStorage.setItem(permissionCatalogStorageKey, JSON.stringify(permissionCatalog));
+        } catch (error) {
+            console.warn('Could not store the permission catalog in local storage:', error);
+        }
+
+        return permissionCatalog;
+    };
+
+    /**
+     * Build the permission picker from the permission catalog
+     *
+     * @param {Object} catalog The permission catalog
+     * @param {Object} permissions The permissions of the group or state
+     * @returns {DocumentFragment} The permission picker
+     * @private
+     */
+    const _buildPermissionPicker = (catalog, permissions) => {
+        const picker = document.getElementById('permission-picker-template').content.cloneNode(true);
+        const select = picker.getElementById('permissionSelect');
+        const button = picker.getElementById('update-permissions');
+        const assigned = new Set(permissions.assigned);
+        const assignedOptions = document.createDocumentFragment();
+        const availableOptions = document.createDocumentFragment();
+
+        catalog.ids.forEach((permissionId, index) => {
+            const contentType = catalog.content_types[catalog.content_type_index[index]];
+            const text = `${contentType} | ${catalog.codenames[index]} - ${catalog.names[index]}`;
+            const isAssigned = assigned.has(permissionId);
+            const option = new Option(text, permissionId, isAssigned, isAssigned);
+
+            (isAssigned ? assignedOptions : availableOptions).appendChild(option);
+        });
+
+        select.append(assignedOptions, availableOptions);
+
+        assignedPermissions = assigned;
+        assignedPermissionsVersion = permissions.version;
+
+        button.dataset.permissionType = permissions.permission_type;
+        button.dataset.elementId = permissions.element_id;
+
+        return picker;
+    };
+
+    /**
+     * Initialize the multi-select permission picker
+     *
+     * @private
+     */
+    const _initPermissionPicker = () => {
+        const searchField = `<input type="text" class="form-control mb-3" autocomplete="off" placeholder="${permissionManagamentSettings.l10n.search}">`;
+
+        $('#permissionSelect').multiSelect({
+            selectableHeader: searchField,
+            selectionHeader: searchField,
+            afterInit: function () {
+                let ms = this,
+                    $selectableSearch = ms.$selectableUl.prev(),
+                    $selectionSearch = ms.$selectionUl.prev(),
+                    selectableSearchString = `#${ms.$container.attr('id')} .ms-elem-selectable:not(.ms-selected)`,
+                    selectionSearchString = `#${ms.$container.attr('id')} .ms-elem-selection.ms-selected`;
+
+                ms.qs1 = $selectableSearch.quicksearch(selectableSearchString)
+                    .on('keydown', (e) => {
+                        if (e.which === 40) {
+                            ms.$selectableUl.focus();
+
+                            return false;
+                        }
+                    });
+
+                ms.qs2 = $selectionSearch.quicksearch(selectionSearchString)
+                    .on('keydown', (e) => {
+                        if (e.which === 40) {
+                            ms.$selectionUl.focus();
+
+                            return false;
+                        }
+                    });
+            },
+            afterSelect: function () {
+                this.qs1.cache();
+                this.qs2.cache();
+            },
+            afterDeselect: function () {
+                this.qs1.cache();
+                this.qs2.cache();
+            }
+        });
+    };
+
     /**
      * Show permissions in the permissions container
      *
@@ -62,61 +213,225 @@ $(document).ready(() => {
         elementLoadingSpinner.removeClass('d-none');
         elementSelected.removeClass('d-none').text(`${permissionTypeTranslated}: ${elementName}`);
 
-        const url = permissionManagamentSettings.url.api.getPermissions
+        const url = permissionManagamentSettings.url.api.getPermissionsJson
             .replace('__permission_type__', permissionType)
-            .replace(0, elementId);
+            .replace('/0/', `/${elementId}/`);
+
+        fetchGet({url: url})
+            .then(async (permissions) => {
+                const catalog = await _getPermissionCatalog(permissions.catalog_version);
 
-        fetchGet({url: url, responseIsJson: false})
-            .then((response) => response)
-            .then((data) => {
                 elementLoadingSpinner.addClass('d-none');
-                elementPermissionsContainer.html(data).removeClass('d-none');
-
-                const searchField = `<input type="text" class="form-control mb-3" autocomplete="off" placeholder="${permissionManagamentSettings.l10n.search}">`;
-
-                $('#permissionSelect').multiSelect({
-                    selectableHeader: searchField,
-                    selectionHeader: searchField,
-                    afterInit: function () {
-                        let ms = this,
-                            $selectableSearch = ms.$selectableUl.prev(),
-                            $selectionSearch = ms.$selectionUl.prev(),
-                            selectableSearchString = `#${ms.$container.attr('id')} .ms-elem-selectable:not(.ms-selected)`,
-                            selectionSearchString = `#${ms.$container.attr('id')} .ms-elem-selection.ms-selected`;
-
-                        ms.qs1 = $selectableSearch.quicksearch(selectableSearchString)
-                            .on('keydown', (e) => {
-                                if (e.which === 40) {
-                                    ms.$selectableUl.focus();
-
-                                    return false;
-                                }
-                            });
-
-                        ms.qs2 = $selectionSearch.quicksearch(selectionSearchString)
-                            .on('keydown', (e) => {
-                                if (e.which === 40) {
-                                    ms.$selectionUl.focus();
-
-                                    return false;
-                                }
-                            });
-                    },
-                    afterSelect: function () {
-                        this.qs1.cache();
-                        this.qs2.cache();
-                    },
-                    afterDeselect: function () {
-                        this.qs1.cache();
-                        this.qs2.cache();
-                    }
-                });
+                elementPermissionsContainer
+                    .append(_buildPermissionPicker(catalog, permissions))
+                    .removeClass('d-none');
+
+                _initPermissionPicker();
             })
             .catch((error) => {
                 console.error('There was a problem with the fetch operation:', error);
             });
     };
 
+    /**
+     * Get the difference between the selected and the assigned permissions
+     *
+     * @param {Array} permissions The selected permission IDs
+     * @returns {{add: Array<number>, remove: Array<number>}} The permission IDs to add and remove
+     * @private
+     */
+    const _getPermissionDelta = (permissions) => {
+        const selected = new Set(permissions.map(Number));
+
+        return {
+            add: [...selected].filter((permissionId) => !assignedPermissions.has(permissionId)),
+            remove: [...assignedPermissions].filter((permissionId) => !selected.has(permissionId))
+        };
+    };
+
+    /**
+     * Preview how many members would gain or lose each changed permission
+     *
+     * Users who have a permission from another source anyway aren't counted.
+     *
+     * @param {string} permissionType The permission type (group or state)
+     * @param {string} elementId The ID of the group or state
+     * @param {Array} permissions The selected permission IDs
+     * @private
+     */
+    const _previewPermissionImpact = (permissionType, elementId, permissions) => {
+        const elementImpact = $('#permissions .permission-impact');
+        const {add, remove} = _getPermissionDelta(permissions);
+        const l10n = permissionManagamentSettings.l10n;
+
+        if (add.length === 0 && remove.length === 0) {
+            elementImpact.text(l10n.impactNoChanges).show();
+
+            return;
+        }
+
+        const params = new URLSearchParams();
+
+        add.forEach((permissionId) => params.append('add', permissionId));
+        remove.forEach((permissionId) => params.append('remove', permissionId));
+
+        const url = permissionManagamentSettings.url.api.getPermissionChangeImpact
+            .replace('__permission_type__', permissionType)
+            .replace('/0/', `/${elementId}/`);
+
+        fetchGet({url: `${url}?${params}`})
+            .then((impact) => {
+                const list = $('<ul class="list-unstyled font-monospace mb-0"></ul>');
+
+                impact.permissions.forEach((change) => {
+                    const isAdd = change.action === 'add';
+
+                    $('<li></li>')
+                        .addClass(isAdd ? 'text-success' : 'text-warning')
+                        .text(`${isAdd ? '+' : '−'} ${change.permission}: ${change.users} ${isAdd ? l10n.impactGain : l10n.impactLose}`)
+                        .appendTo(list);
+                });
+
+                elementImpact
+                    .empty()
+                    .append($('<p class="mb-1"></p>').text(`${l10n.impactMembers}: ${impact.members}`), list)
+                    .show();
+            })
+            .catch((error) => {
+                console.error('Error loading the permission change impact:', error);
+            });
+    };
+
+    /**
+     * Update the permissions of a group or state
+     *
+     * Only the difference to the assigned permissions is sent, and the response
+     * holds the new permission set version, so the permissions don't need to be
+     * fetched again. If someone else has changed the permissions in the meantime,
+     * the change is rejected.
+     *
+     * @param {string} permissionType The permission type (group or state)
+     * @param {string} elementId The ID of the group or state
+     * @param {Array} permissions The selected permission IDs
+     * @private
+     */
+    const _updatePermissions = (permissionType, elementId, permissions) => {
+        const csrfToken = $('#permissions input[name="csrfmiddlewaretoken"]').val();
+        const url = permissionManagamentSettings.url.api.updatePermissions;
+        const selected = new Set(permissions.map(Number));
+
+        fetchPost({
+            url: url,
+            csrfToken: csrfToken,
+            payload: {
+                permission_type: permissionType,
+                element_id: elementId,
+                ..._getPermissionDelta(permissions),
+                version: assignedPermissionsVersion
+            },
+            responseIsJson: true
+        })
+            .then((response) => {
+                if (response?.version !== undefined) {
+                    assignedPermissions = selected;
+                    assignedPermissionsVersion = response.version;
+
+                    $('.permission-update-success').fadeIn().delay(2000).fadeOut();
+                } else {
+                    $('.permission-update-error').fadeIn().delay(2000).fadeOut();
+                }
+            })
+            .catch((error) => {
+                console.error('Error updating permissions:', error);
+
+                if (error.message.includes('409')) {
+                    $('.permission-update-conflict').fadeIn().delay(5000).fadeOut();
+                } else {
+                    $('.permission-update-error').fadeIn().delay(2000).fadeOut();
+                }
+            });
+    };
+
+    /**
+     * Update the permissions of a group or state with a background job
+     *
+     * The difference to the assigned permissions is queued as a bulk change, and
+     * the progress of the job is shown until it is done. The permissions are
+     * fetched again afterwards, for their new permission set version.
+     *
+     * @param {string} permissionType The permission type (group or state)
+     * @param {string} elementId The ID of the group or state
+     * @param {Array} permissions The selected permission IDs
+     * @private
+     */
+    const _updatePermissionsInBackground = (permissionType, elementId, permissions) => {
+        const csrfToken = $('#permissions input[name="csrfmiddlewaretoken"]').val();
+        const button = $('#update-permissions');
+        const url = permissionManagamentSettings.url.api.getPermissionsJson
+            .replace('__permission_type__', permissionType)
+            .replace('/0/', `/${elementId}/`);
+
+        button.prop('disabled', true);
+
+        fetchPost({
+            url: permissionManagamentSettings.url.api.bulkUpdatePermissions,
+            csrfToken: csrfToken,
+            payload: {
+                [`${permissionType}_ids`]: [Number(elementId)],
+                ..._getPermissionDelta(permissions),
+                background: true
+            },
+            responseIsJson: true
+        })
+            .then((response) => pollPermissionJob({
+                url: response.status_url,
+                element: $('#permissions .permission-job-progress')
+            }))
+            .then(() => fetchGet({url: url}))
+            .then((response) => {
+                assignedPermissions = new Set(response.assigned);
+                assignedPermissionsVersion = response.version;
+
+                $('.permission-update-success').fadeIn().delay(2000).fadeOut();
+            })
+            .catch((error) => {
+                console.error('Error updating permissions in the background:', error);
+
+                $('.permission-update-error').fadeIn().delay(2000).fadeOut();
+            })
+            .finally(() => button.prop('disabled', false));
+    };
+
+    // Update permissions button click handler
+    $('#permissions').on('click', '#update-permissions', (event) => {
+        event.preventDefault();
+
+        const {
+            permissionType,
+            elementId
+        } = event.currentTarget.dataset;
+        const selectedPermissions = $('#permissionSelect').val() || [];
+
+        if (document.getElementById('update-permissions-background').checked) {
+            _updatePermissionsInBackground(permissionType, elementId, selectedPermissions);
+        } else {
+            _updatePermissions(permissionType, elementId, selectedPermissions);
+        }
+    });
+
+    // Preview impact button click handler
+    $('#permissions').on('click', '#preview-permission-impact', (event) => {
+        event.preventDefault();
+
+        const {
+            permissionType,
+            elementId
+        } = document.getElementById('update-permissions').dataset;
+        const selectedPermissions = $('#permissionSelect').val() || [];
+
+        _previewPermissionImpact(permissionType, elementId, selectedPermissions);
+    });
+
     /**
      * DataTable initialization complete handler
      *
@@ -147,27 +462,78 @@ $(document).ready(() => {
         }
     ];
 
+    // ColumnControl configuration for the count columns (ordering and number search)
+    const countColumnControl = [
+        {
+            target: 0,
+            content: [
+                'order'
+            ]
+        },
+        {
+            target: 1,
+            content: [
+                'searchNumber'
+            ]
+        }
+    ];
+
+    // Cursors of the current page of every table, for paging by keyset
+    const keysetPages = {};
+
+    /**
+     * Add the keyset pagination parameters to a DataTables request.
+     *
+     * Moving one page forward or back from the current page sends its last or
+     * first row as cursor, so the server doesn't need to skip rows by offset.
+     * Everything else, e.g. a new ordering or search, is requested by offset.
+     *
+     * @param {string} selector Selector for the table element
+     * @param {Object} params DataTables request parameters
+     * @private
+     */
+    const _addKeysetParams = (selector, params) => {
+        const signature = JSON.stringify({...params, draw: undefined, start: undefined});
+        const page = keysetPages[selector];
+
+        if (page?.cursors && page.signature === signature) {
+            if (params.start === page.start + params.length) {
+                params.cursor = page.cursors.last;
+                params.direction = 'next';
+            } else if (params.start === page.start - params.length) {
+                params.cursor = page.cursors.first;
+                params.direction = 'previous';
+            }
+        }
+
+        params.keyset = true;
+        keysetPages[selector] = {signature: signature, start: params.start, cursors: null};
+    };
+
     /**
      * Create and return a DataTable instance.
      *
      * @param {String} selector Selector for the table element
      * @param {String} ajaxUrl URL for AJAX data source
+     * @param {Array<number>|null} [deferLoading=null] Filtered and total records of the first page, if it is in the DOM already
      * @param {Function} [initComplete=() => {}] Callback function to be executed when DataTable initialization is complete
      * @return {DataTable} DataTable instance
      * @private
      */
     const _createDataTable = ({
-        selector, ajaxUrl, initComplete = () => {}
+        selector, ajaxUrl, deferLoading = null, initComplete = () => {}
     }) => {
         const columnDefs = [
             {
                 targets: [1, 2],
-                sortable: false,
-                searchable: false,
-                columnControl: removeColumnControl
+                type: 'num',
+                columnControl: countColumnControl
             },
             {
-                target: 2,
+                target: 3,
+                sortable: false,
+                searchable: false,
+                columnControl: removeColumnControl,
                 class: 'text-end'
             }
         ];
@@ -176,28 +542,53 @@ $(document).ready(() => {
             ...permissionManagamentSettings.dataTable,
             ajax: {
                 url: ajaxUrl,
+                data: (params) => _addKeysetParams(selector, params),
+                dataSrc: (json) => {
+                    if (keysetPages[selector]) {
+                        keysetPages[selector].cursors = json.keyset;
+                    }
+
+                    return json.data;
+                },
                 error: (xhr, error) => console.error(`Error loading data for table ${selector}:`, xhr, error)
             },
             columnDefs,
             order: [[0, 'asc']],
+            pageLength: dashboardBootstrap.pageLength,
+            deferLoading: deferLoading,
             initComplete: initComplete
         });
     };
 
-    // Initialize DataTables
-    [
+    // Tables of the groups and states
+    const tables = [
         {
             selector: '#table-groups',
-            url: permissionManagamentSettings.url.api.getGroups
+            url: permissionManagamentSettings.url.api.getGroups,
+            tab: 'groups-tab'
         },
         {
             selector: '#table-states',
-            url: permissionManagamentSettings.url.api.getStates
+            url: permissionManagamentSettings.url.api.getStates,
+            deferLoading: [
+                dashboardBootstrap.states.recordsFiltered,
+                dashboardBootstrap.states.recordsTotal
+            ]
         }
-    ].forEach(({selector, url}) => {
+    ];
+
+    /**
+     * Initialize the DataTable of a table
+     *
+     * @param {Object} table The table
+     * @private
+     */
+    const _initDataTable = (table) => {
+        const {selector, deferLoading} = table;
         const dt = _createDataTable({
             selector: selector,
-            ajaxUrl: url,
+            ajaxUrl: table.ajaxUrl || table.url,
+            deferLoading: deferLoading,
             initComplete: () => {
                 _initComplete(selector);
 
@@ -205,5 +596,50 @@ $(document).ready(() => {
                 dt.on('draw.dt', () => _initComplete(selector));
             }
         });
+
+        table.dataTable = dt;
+    };
+
+    // Initialize DataTables, those on hidden tabs once their tab is shown
+    tables.forEach((table) => {
+        if (table.tab) {
+            document.getElementById(table.tab)
+                .addEventListener('shown.bs.tab', () => _initDataTable(table), {once: true});
+        } else {
+            _initDataTable(table);
+        }
+    });
+
+    // Fill the "has permission" filter from the permission catalog, which is
+    // kept for the permission picker as well
+    _getPermissionCatalog(dashboardBootstrap.catalogVersion)
+        .then((catalog) => {
+            const options = document.createDocumentFragment();
+
+            catalog.ids.forEach((permissionId, index) => {
+                const contentType = catalog.content_types[catalog.content_type_index[index]];
+                const text = `${contentType} | ${catalog.codenames[index]} - ${catalog.names[index]}`;
+
+                options.appendChild(new Option(text, permissionId));
+            });
+
+            document.getElementById('filter-has-permission').appendChild(options);
+        })
+        .catch((error) => {
+            console.error('Error loading the permission catalog:', error);
+        });
+
+    // "Has permission" filter change handler
+    $('#filter-has-permission').on('change', (event) => {
+        const permissionId = event.currentTarget.value;
+
+        tables.forEach((table) => {
+            table.ajaxUrl = permissionId ? `${table.url}?permission=${permissionId}` : table.url;
+
+            delete keysetPages[table.selector];
+
+            // Tables not shown yet are initialized with the filter
+            table.dataTable?.ajax.url(table.ajaxUrl).load();
+        });
     });
 });
@@ -1,2 +1,2 @@
-$(document).ready(()=>{'use strict';const e='undefined'!=typeof permissionManagamentSettingsOverrides?objectDeepMerge(permissionManagamentSettingsDefaults,permissionManagamentSettingsOverrides):permissionManagamentSettingsDefaults,t=({selector:e='.aa-permission-management',namespace:t='aa-permission-management'})=>{document.querySelectorAll(`${e} [data-bs-tooltip="${t}"]`).forEach(e=>{const t=bootstrap.Tooltip.getInstance(e);return t&&t.dispose(),$('.bs-tooltip-auto').remove(),new bootstrap.Tooltip(e)})},s=t=>{const s=$('#loading-spinner'),n=$('#permissions'),o=$('#selected-element'),{permissionType:a,elementId:r,elementName:l}=t.dataset,c=e.l10n?.[a]??a;n.empty().addClass('d-none'),s.removeClass('d-none'),o.removeClass('d-none').text(`${c}: ${l}`);const i=e.url.api.getPermissions.replace('__permission_type__',a).replace(0,r);fetchGet({url:i,responseIsJson:!1}).then(e=>e).then(t=>{s.addClass('d-none'),n.html(t).removeClass('d-none');const o=`<input type="text" class="form-control mb-3" autocomplete="off" placeholder="${e.l10n.search}">`;$('#permissionSelect').multiSelect({selectableHeader:o,selectionHeader:o,afterInit:function(){let e=this,t=e.$selectableUl.prev(),s=e.$selectionUl.prev(),n=`#${e.$container.attr('id')} .ms-elem-selectable:not(.ms-selected)`,o=`#${e.$container.attr('id')} .ms-elem-selection.ms-selected`;e.qs1=t.quicksearch(n).on('keydown',t=>{if(40===t.which)return e.$selectableUl.focus(),!1}),e.qs2=s.quicksearch(o).on('keydown',t=>{if(40===t.which)return e.$selectionUl.focus(),!1})},afterSelect:function(){this.qs1.cache(),this.qs2.cache()},afterDeselect:function(){this.qs1.cache(),this.qs2.cache()}})}).catch(e=>{console.error('There was a problem with the fetch operation:',e)})},n=e=>{t({selector:e}),$('.btn-edit-permissions').off('click').on('click',e=>{const t=e.currentTarget;s(t)})},o=[{target:0,content:[]},{target:1,content:[]}],a=({selector:t,ajaxUrl:s,initComplete:n=()=>{}})=>{const a=[{targets:[1,2],sortable:!1,searchable:!1,columnControl:o},{target:2,class:'text-end'}];return new DataTable(t,{...e.dataTable,ajax:{url:s,error:(e,s)=>console.error(`Error loading data for table ${t}:`,e,s)},columnDefs:a,order:[[0,'asc']],initComplete:n})};[{selector:'#table-groups',url:e.url.api.getGroups},{selector:'#table-states',url:e.url.api.getStates}].forEach(({selector:e,url:t})=>{const s=a({selector:e,ajaxUrl:t,initComplete:()=>{n(e),s.on('draw.dt',()=>n(e))}})})});
+$(document).ready(()=>{'use strict';const e='undefined'!=typeof permissionManagamentSettingsOverrides?objectDeepMerge(permissionManagamentSettingsDefaults,permissionManagamentSettingsOverrides):permissionManagamentSettingsDefaults,t=({selector:e='.aa-permission-management',namespace:t='aa-permission-management'})=>{document.querySelectorAll(`${e} [data-bs-tooltip="${t}"]`).forEach(e=>{const t=bootstrap.Tooltip.getInstance(e);return t&&t.dispose(),$('.bs-tooltip-auto').remove(),new bootstrap.Tooltip(e)})},s=JSON.parse(document.getElementById('aa-permission-management-bootstrap').textContent),n='aa-permission-management-permission-catalog';let a=null,r=new Set,o=null;const i=(t,s)=>null!==t&&t.version===s&&t.language===e.language,c=async t=>{if(i(a,t))return a;try{const e=JSON.parse(localStorage.getItem(n));if(i(e,t))return a=e,a}catch(e){console.warn('Could not read the permission catalog from local storage:',e)}a=await fetchGet({url:e.url.api.getPermissionCatalog});try{localStorage.setItem(n,JSON.stringify(a))}catch(e){console.warn('Could not store the permission catalog in local storage:',e)}return a},l=(e,t)=>{const s=document.getElementById('permission-picker-template').content.cloneNode(!0),n=s.getElementById('permissionSelect'),a=s.getElementById('update-permissions'),i=new Set(t.assigned),c=document.createDocumentFragment(),l=document.createDocumentFragment();return e.ids.forEach((t,s)=>{const n=`${e.content_types[e.content_type_index[s]]} | ${e.codenames[s]} - ${e.names[s]}`,a=i.has(t),r=new Option(n,t,a,a);(a?c:l).appendChild(r)}),n.append(c,l),r=i,o=t.version,a.dataset.permissionType=t.permission_type,a.dataset.elementId=t.element_id,s},p=()=>{const t=`<input type="text" class="form-control mb-3" autocomplete="off" placeholder="${e.l10n.search}">`;$('#permissionSelect').multiSelect({selectableHeader:t,selectionHeader:t,afterInit:function(){let e=this,t=e.$selectableUl.prev(),s=e.$selectionUl.prev(),n=`#${e.$container.attr('id')} .ms-elem-selectable:not(.ms-selected)`,a=`#${e.$container.attr('id')} .ms-elem-selection.ms-selected`;e.qs1=t.quicksearch(n).on('keydown',t=>{if(40===t.which)return e.$selectableUl.focus(),!1}),e.qs2=s.quicksearch(a).on('keydown',t=>{if(40===t.which)return e.$selectionUl.focus(),!1})},afterSelect:function(){this.qs1.cache(),this.qs2.cache()},afterDeselect:function(){this.qs1.cache(),this.qs2.cache()}})},d=t=>{const s=$('#loading-spinner'),n=$('#permissions'),a=$('#selected-element'),{permissionType:r,elementId:o,elementName:i}=t.dataset,d=e.l10n?.[r]??r;n.empty().addClass('d-none'),s.removeClass('d-none'),a.removeClass('d-none').text(`${d}: ${i}`);const m=e.url.api.getPermissionsJson.replace('__permission_type__',r).replace('/0/',`/${o}/`);fetchGet({url:m}).then(async e=>{const t=await c(e.catalog_version);s.addClass('d-none'),n.append(l(t,e)).removeClass('d-none'),p()}).catch(e=>{console.error('There was a problem with the fetch operation:',e)})},m=e=>{const t=new Set(e.map(Number));return{add:[...t].filter(e=>!r.has(e)),remove:[...r].filter(e=>!t.has(e))}},u=(t,s,n)=>{const a=$('#permissions .permission-impact'),{add:r,remove:o}=m(n),i=e.l10n;if(0===r.length&&0===o.length)return void a.text(i.impactNoChanges).show();const c=new URLSearchParams;r.forEach(e=>c.append('add',e)),o.forEach(e=>c.append('remove',e));const l=e.url.api.getPermissionChangeImpact.replace('__permission_type__',t).replace('/0/',`/${s}/`);fetchGet({url:`${l}?${c}`}).then(e=>{const t=$('<ul class="list-unstyled font-monospace mb-0"></ul>');e.permissions.forEach(e=>{const s='add'===e.action;$('<li></li>').addClass(s?'text-success':'text-warning').text(`${s?'+':'−'} ${e.permission}: ${e.users} ${s?i.impactGain:i.impactLose}`).appendTo(t)}),a.empty().append($('<p class="mb-1"></p>').text(`${i.impactMembers}: ${e.members}`),t).show()}).catch(e=>{console.error('Error loading the permission change impact:',e)})},g=(t,s,n)=>{const a=$('#permissions input[name="csrfmiddlewaretoken"]').val(),i=e.url.api.updatePermissions,c=new Set(n.map(Number));fetchPost({url:i,csrfToken:a,payload:{permission_type:t,element_id:s,...m(n),version:o},responseIsJson:!0}).then(e=>{void 0!==e?.version?(r=c,o=e.version,$('.permission-update-success').fadeIn().delay(2e3).fadeOut()):$('.permission-update-error').fadeIn().delay(2e3).fadeOut()}).catch(e=>{console.error('Error updating permissions:',e),e.message.includes('409')?$('.permission-update-conflict').fadeIn().delay(5e3).fadeOut():$('.permission-update-error').fadeIn().delay(2e3).fadeOut()})},h=(t,s,n)=>{const a=$('#permissions input[name="csrfmiddlewaretoken"]').val(),i=$('#update-permissions'),c=e.url.api.getPermissionsJson.replace('__permission_type__',t).replace('/0/',`/${s}/`);i.prop('disabled',!0),fetchPost({url:e.url.api.bulkUpdatePermissions,csrfToken:a,payload:{[`${t}_ids`]:[Number(s)],...m(n),background:!0},responseIsJson:!0}).then(e=>pollPermissionJob({url:e.status_url,element:$('#permissions .permission-job-progress')})).then(()=>fetchGet({url:c})).then(e=>{r=new Set(e.assigned),o=e.version,$('.permission-update-success').fadeIn().delay(2e3).fadeOut()}).catch(e=>{console.error('Error updating permissions in the background:',e),$('.permission-update-error').fadeIn().delay(2e3).fadeOut()}).finally(()=>i.prop('disabled',!1))};$('#permissions').on('click','#update-permissions',e=>{e.preventDefault();const{permissionType:t,elementId:s}=e.currentTarget.dataset,n=$('#permissionSelect').val()||[];document.getElementById('update-permissions-background').checked?h(t,s,n):g(t,s,n)}),$('#permissions').on('click','#preview-permission-impact',e=>{e.preventDefault();const{permissionType:t,elementId:s}=document.getElementById('update-permissions').dataset,n=$('#permissionSelect').val()||[];u(t,s,n)});const f=e=>{t({selector:e}),$('.btn-edit-permissions').off('click').on('click',e=>{const t=e.currentTarget;d(t)})},y=[{target:0,content:[]},{target:1,content:[]}],b=[{target:0,content:['order']},{target:1,content:['searchNumber']}],v={},w=(e,t)=>{const s=JSON.stringify({...t,draw:void 0,start:void 0}),n=v[e];n?.cursors&&n.signature===s&&(t.start===n.start+t.length?(t.cursor=n.cursors.last,t.direction='next'):t.start===n.start-t.length&&(t.cursor=n.cursors.first,t.direction='previous')),t.keyset=!0,v[e]={signature:s,start:t.start,cursors:null}},_=({selector:t,ajaxUrl:n,deferLoading:a=null,initComplete:r=()=>{}})=>{const o=[{targets:[1,2],type:'num',columnControl:b},{target:3,sortable:!1,searchable:!1,columnControl:y,class:'text-end'}];return new DataTable(t,{...e.dataTable,ajax:{url:n,data:e=>w(t,e),dataSrc:e=>(v[t]&&(v[t].cursors=e.keyset),e.data),error:(e,s)=>console.error(`Error loading data for table ${t}:`,e,s)},columnDefs:o,order:[[0,'asc']],pageLength:s.pageLength,deferLoading:a,initComplete:r})},I=[{selector:'#table-groups',url:e.url.api.getGroups,tab:'groups-tab'},{selector:'#table-states',url:e.url.api.getStates,deferLoading:[s.states.recordsFiltered,s.states.recordsTotal]}],S=e=>{const{selector:t,deferLoading:s}=e,n=_({selector:t,ajaxUrl:e.ajaxUrl||e.url,deferLoading:s,initComplete:()=>{f(t),n.on('draw.dt',()=>f(t))}});e.dataTable=n};I.forEach(e=>{e.tab?document.getElementById(e.tab).addEventListener('shown.bs.tab',()=>S(e),{once:!0}):S(e)}),c(s.catalogVersion).then(e=>{const t=document.createDocumentFragment();e.ids.forEach((s,n)=>{const a=`${e.content_types[e.content_type_index[n]]} | ${e.codenames[n]} - ${e.names[n]}`;t.appendChild(new Option(a,s))}),document.getElementById('filter-has-permission').appendChild(t)}).catch(e=>{console.error('Error loading the permission catalog:',e)}),$('#filter-has-permission').on('change',e=>{const t=e.currentTarget.value;I.forEach(e=>{e.ajaxUrl=t?`${e.url}?permission=${t}`:e.url,delete v[e.selector],e.dataTable?.ajax.url(e.ajaxUrl).load()})})});
 //# sourceMappingURL=aa-permission-management.min.js.map
\ No newline at end of file
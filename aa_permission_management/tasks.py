@@ -0,0 +1,67 @@
+"""
+Celery tasks for the AA Permission Management app.
+"""
+
+# Third Party
+from celery import shared_task
+
+# Django
+from django.db import transaction
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA Permission Management
+from aa_permission_management import app_settings
+from aa_permission_management.helper.jobs import run_job_chunk
+from aa_permission_management.models import PermissionJob
+from aa_permission_management.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(name=__name__))
+
+
+@shared_task(bind=True)
+def run_permission_job(self, job_id: int, priority: int | None = None) -> None:
+    """
+    Process the next chunk of a background job and queue the task for the
+    chunk after, with the same priority.
+
+    :param job_id: ID of the job
+    :type job_id: int
+    :param priority: Celery priority
+    :type priority: int | None
+    :return:
+    :rtype:
+    """
+
+    if run_job_chunk(job_id):
+        self.apply_async(
+            kwargs={"job_id": job_id, "priority": priority}, priority=priority
+        )
+
+
+def queue_permission_job(job: PermissionJob, priority: int | None = None) -> None:
+    """
+    Queue a background job, once the transaction creating it is committed.
+
+    :param job: Job
+    :type job: PermissionJob
+    :param priority: Celery priority (0 is the highest, 9 the lowest priority),
+        defaults to the setting
+    :type priority: int | None
+    :return:
+    :rtype:
+    """
+
+    if priority is None:
+        priority = app_settings.AA_PERMISSION_MANAGEMENT_JOB_PRIORITY
+
+    priority = min(max(int(priority), 0), 9)
+
+    logger.debug("Job queued", fields={"job_id": job.pk, "priority": priority})
+
+    transaction.on_commit(
+        lambda: run_permission_job.apply_async(
+            kwargs={"job_id": job.pk, "priority": priority}, priority=priority
+        )
+    )
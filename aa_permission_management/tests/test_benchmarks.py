@@ -0,0 +1,202 @@
+"""
+Tests for the benchmark tooling in aa_permission_management.benchmarks
+"""
+
+# Standard Library
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+# Django
+from django.contrib.auth.models import Group, User
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission, State
+
+# AA Permission Management
+from aa_permission_management.benchmarks.data import (
+    SCALES,
+    generate_dataset,
+    get_dataset_size,
+)
+from aa_permission_management.benchmarks.runner import measure
+from aa_permission_management.models import GroupMemberCount
+from aa_permission_management.tests import BaseTestCase
+
+
+class TestGetDatasetSize(BaseTestCase):
+    """
+    Tests for the get_dataset_size function.
+    """
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_defaults_to_small_scale(self):
+        """
+        Test that the small scale is used by default.
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(get_dataset_size(), SCALES["small"])
+
+    @patch.dict(
+        os.environ,
+        {
+            "AA_PERMISSION_MANAGEMENT_BENCHMARK_SCALE": "large",
+            "AA_PERMISSION_MANAGEMENT_BENCHMARK_USERS": "500",
+        },
+        clear=True,
+    )
+    def test_overrides_single_sizes(self):
+        """
+        Test that single sizes can be overridden.
+
+        :return:
+        :rtype:
+        """
+
+        size = get_dataset_size()
+
+        self.assertEqual(size["users"], 500)
+        self.assertEqual(size["groups"], SCALES["large"]["groups"])
+
+    @patch.dict(
+        os.environ, {"AA_PERMISSION_MANAGEMENT_BENCHMARK_SCALE": "huge"}, clear=True
+    )
+    def test_raises_value_error_for_unknown_scale(self):
+        """
+        Test that an unknown scale raises a ValueError.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError):
+            get_dataset_size()
+
+
+class TestGenerateDataset(BaseTestCase):
+    """
+    Tests for the generate_dataset function.
+    """
+
+    def test_generates_requested_dataset(self):
+        """
+        Test that the dataset has the requested size.
+
+        :return:
+        :rtype:
+        """
+
+        dataset = generate_dataset(
+            users=20,
+            states=2,
+            groups=5,
+            memberships_per_user=3,
+            permissions=10,
+            permissions_per_group=4,
+            permissions_per_state=6,
+        )
+
+        self.assertEqual(len(dataset["user_ids"]), 20)
+        self.assertEqual(len(dataset["state_ids"]), 2)
+        self.assertEqual(len(dataset["group_ids"]), 5)
+        self.assertEqual(len(dataset["permission_ids"]), 10)
+        self.assertEqual(
+            Permission.objects.filter(pk__in=dataset["permission_ids"])
+            .values("content_type")
+            .distinct()
+            .count(),
+            3,
+        )
+        self.assertEqual(
+            User.groups.through.objects.filter(user_id__in=dataset["user_ids"]).count(),
+            60,
+        )
+        self.assertEqual(
+            Group.permissions.through.objects.filter(
+                group_id__in=dataset["group_ids"]
+            ).count(),
+            20,
+        )
+        self.assertEqual(
+            State.permissions.through.objects.filter(
+                state_id__in=dataset["state_ids"]
+            ).count(),
+            12,
+        )
+        self.assertEqual(
+            User.objects.filter(
+                pk__in=dataset["user_ids"], profile__state_id__in=dataset["state_ids"]
+            ).count(),
+            20,
+        )
+        self.assertEqual(
+            sum(
+                GroupMemberCount.objects.filter(
+                    pk__in=dataset["group_ids"]
+                ).values_list("count", flat=True)
+            ),
+            60,
+        )
+
+
+class TestMeasure(BaseTestCase):
+    """
+    Tests for the measure function.
+    """
+
+    def test_reports_wall_time_queries_and_peak_memory(self):
+        """
+        Test that a measurement is reported as a JSON line.
+
+        :return:
+        :rtype:
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.jsonl")
+
+            with patch.dict(
+                os.environ, {"AA_PERMISSION_MANAGEMENT_BENCHMARK_OUTPUT": output}
+            ):
+                result = measure(
+                    "test", lambda: list(Permission.objects.all()), repeat=3, size=1
+                )
+
+            with open(output, encoding="utf-8") as file:
+                lines = file.readlines()
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0]), result)
+        self.assertEqual(result["benchmark"], "test")
+        self.assertEqual(result["queries"], 1)
+        self.assertEqual(result["repeat"], 3)
+        self.assertEqual(result["size"], 1)
+        self.assertGreater(result["peak_memory_kib"], 0)
+        self.assertLessEqual(
+            result["wall_time_ms"]["min"], result["wall_time_ms"]["max"]
+        )
+
+    def test_runs_setup_before_every_run(self):
+        """
+        Test that the setup runs before every run.
+
+        :return:
+        :rtype:
+        """
+
+        calls = []
+
+        with patch("aa_permission_management.benchmarks.runner.report"):
+            measure(
+                "test",
+                lambda: calls.append("run"),
+                setup=lambda: calls.append("setup"),
+                repeat=2,
+                warmup=1,
+            )
+
+        self.assertEqual(calls, ["setup", "run"] * 4)
@@ -0,0 +1,214 @@
+"""
+Unit tests for aa_permission_management.helper.audit
+"""
+
+# Standard Library
+from datetime import timedelta
+
+# Django
+from django.contrib.auth.models import Group
+from django.utils import timezone
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission
+
+# AA Permission Management
+from aa_permission_management.helper.audit import (
+    get_audit_log_page,
+    log_permission_changes,
+    prune_audit_log,
+)
+from aa_permission_management.models import PermissionAuditLog
+from aa_permission_management.tests import BaseTestCase
+
+
+class TestLogPermissionChanges(BaseTestCase):
+    """
+    Test cases for log_permission_changes function.
+    """
+
+    def test_writes_one_entry_per_change_in_one_query(self):
+        """
+        Test that all changes are written with a single INSERT.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertNumQueries(1):
+            count = log_permission_changes(
+                target_type="group",
+                added=[(1, 10), (1, 11)],
+                removed=[(2, 10)],
+                actor=self.user_with_permission,
+            )
+
+        self.assertEqual(count, 3)
+        self.assertEqual(
+            set(
+                PermissionAuditLog.objects.values_list(
+                    "actor", "target_type", "target_id", "permission_id", "action"
+                )
+            ),
+            {
+                (self.user_with_permission.pk, "group", 1, 10, 1),
+                (self.user_with_permission.pk, "group", 1, 11, 1),
+                (self.user_with_permission.pk, "group", 2, 10, 2),
+            },
+        )
+
+    def test_writes_nothing_without_changes(self):
+        """
+        Test that no query is made without changes.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertNumQueries(0):
+            count = log_permission_changes(target_type="state")
+
+        self.assertEqual(count, 0)
+
+
+class TestGetAuditLogPage(BaseTestCase):
+    """
+    Test cases for get_audit_log_page function.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a group and some audit log entries.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.group = Group.objects.create(name="Test Group")
+        self.permission = Permission.objects.select_related("content_type").first()
+
+        log_permission_changes(
+            target_type="group",
+            added=[(self.group.pk, self.permission.pk)] * 5,
+            actor=self.user_with_permission,
+        )
+
+    def test_pages_through_entries_by_cursor(self):
+        """
+        Test that the pages are chained by cursor, newest entries first.
+
+        :return:
+        :rtype:
+        """
+
+        ids = list(
+            PermissionAuditLog.objects.order_by("-id").values_list("id", flat=True)
+        )
+
+        first = get_audit_log_page(limit=3)
+        second = get_audit_log_page(limit=3, after=first["next"])
+
+        self.assertEqual([entry["id"] for entry in first["entries"]], ids[:3])
+        self.assertEqual(first["next"], ids[2])
+        self.assertEqual([entry["id"] for entry in second["entries"]], ids[3:])
+        self.assertIsNone(second["next"])
+
+    def test_resolves_names_and_labels(self):
+        """
+        Test that targets, permissions, actors and actions are resolved.
+
+        :return:
+        :rtype:
+        """
+
+        entry = get_audit_log_page(limit=1)["entries"][0]
+
+        self.assertEqual(entry["target"], "Test Group")
+        self.assertEqual(entry["actor"], self.user_with_permission.username)
+        self.assertEqual(
+            entry["permission"],
+            f"{self.permission.content_type.app_label}.{self.permission.codename}",
+        )
+        self.assertEqual(entry["action_display"], "Added")
+
+    def test_keeps_entries_of_deleted_targets_and_permissions(self):
+        """
+        Test that entries of deleted groups and permissions are still returned.
+
+        :return:
+        :rtype:
+        """
+
+        log_permission_changes(
+            target_type="group", removed=[(999999, 999999)], actor=None
+        )
+
+        entry = get_audit_log_page(limit=1)["entries"][0]
+
+        self.assertEqual(entry["target"], "")
+        self.assertEqual(entry["permission"], "")
+        self.assertEqual(entry["actor"], "")
+        self.assertEqual(entry["permission_id"], 999999)
+
+    def test_filters_by_target(self):
+        """
+        Test that the entries can be filtered by target.
+
+        :return:
+        :rtype:
+        """
+
+        log_permission_changes(target_type="state", added=[(1, self.permission.pk)])
+
+        self.assertEqual(
+            len(get_audit_log_page(limit=10, target_type="state")["entries"]), 1
+        )
+        self.assertEqual(
+            len(
+                get_audit_log_page(
+                    limit=10, target_type="group", target_id=self.group.pk
+                )["entries"]
+            ),
+            5,
+        )
+
+    def test_costs_constant_number_of_queries(self):
+        """
+        Test that a page costs the same number of queries, no matter its size.
+
+        :return:
+        :rtype:
+        """
+
+        get_audit_log_page(limit=1)
+
+        with self.assertNumQueries(2):
+            get_audit_log_page(limit=5)
+
+
+class TestPruneAuditLog(BaseTestCase):
+    """
+    Test cases for prune_audit_log function.
+    """
+
+    def test_deletes_outdated_entries_in_chunks(self):
+        """
+        Test that only outdated entries are deleted, chunk by chunk.
+
+        :return:
+        :rtype:
+        """
+
+        log_permission_changes(target_type="group", added=[(1, 1)] * 5)
+        PermissionAuditLog.objects.update(timestamp=timezone.now() - timedelta(days=10))
+        log_permission_changes(target_type="group", added=[(1, 1)])
+
+        with self.assertNumQueries(6):
+            deleted = prune_audit_log(
+                before=timezone.now() - timedelta(days=1), batch_size=2
+            )
+
+        self.assertEqual(deleted, 5)
+        self.assertEqual(PermissionAuditLog.objects.count(), 1)
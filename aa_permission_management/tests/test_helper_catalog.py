@@ -0,0 +1,361 @@
+"""
+Unit tests for aa_permission_management.helper.catalog
+"""
+
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models.signals import post_migrate
+from django.utils.translation import override
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission
+
+# AA Permission Management
+from aa_permission_management.constants import (
+    CATALOG_DATA_CACHE_KEY,
+    CATALOG_LOCK_CACHE_KEY,
+    CATALOG_VERSION_CACHE_KEY,
+)
+from aa_permission_management.helper import catalog
+from aa_permission_management.helper.catalog import (
+    bump_catalog_version,
+    get_catalog_version,
+    get_permission_catalog,
+    get_permission_catalog_columns,
+)
+from aa_permission_management.tests import BaseTestCase
+
+
+class TestGetCatalogVersion(BaseTestCase):
+    """
+    Test cases for get_catalog_version function.
+    """
+
+    def test_initializes_version_when_missing(self):
+        """
+        Test that a version is created when none exists yet.
+
+        :return:
+        :rtype:
+        """
+
+        cache.delete(CATALOG_VERSION_CACHE_KEY)
+
+        version = get_catalog_version()
+
+        self.assertTrue(version)
+        self.assertEqual(cache.get(CATALOG_VERSION_CACHE_KEY), version)
+
+    def test_returns_same_version_until_bumped(self):
+        """
+        Test that the version is stable until it is bumped.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_catalog_version()
+
+        self.assertEqual(get_catalog_version(), version)
+
+        new_version = bump_catalog_version()
+
+        self.assertNotEqual(new_version, version)
+        self.assertEqual(get_catalog_version(), new_version)
+
+
+class TestGetPermissionCatalog(BaseTestCase):
+    """
+    Test cases for get_permission_catalog function.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with an invalidated permission catalog.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        bump_catalog_version()
+
+    def test_returns_all_permissions(self):
+        """
+        Test that the catalog contains all permissions.
+
+        :return:
+        :rtype:
+        """
+
+        result = get_permission_catalog()
+
+        self.assertEqual(set(result), set(Permission.objects.all()))
+
+    def test_costs_no_queries_in_steady_state(self):
+        """
+        Test that the catalog is served from the process-local copy.
+
+        :return:
+        :rtype:
+        """
+
+        get_permission_catalog()
+
+        with self.assertNumQueries(0):
+            get_permission_catalog()
+
+    def test_uses_shared_cache_when_local_copy_is_missing(self):
+        """
+        Test that another process is served from the shared cache.
+
+        :return:
+        :rtype:
+        """
+
+        expected = get_permission_catalog()
+        catalog._local_catalog.update(version=None, permissions=None)
+
+        with self.assertNumQueries(0):
+            result = get_permission_catalog()
+
+        self.assertEqual(result, expected)
+
+    def test_rebuilds_after_version_bump(self):
+        """
+        Test that the catalog is rebuilt once after the version is bumped.
+
+        :return:
+        :rtype:
+        """
+
+        get_permission_catalog()
+        bump_catalog_version()
+
+        with self.assertNumQueries(1):
+            get_permission_catalog()
+
+        with self.assertNumQueries(0):
+            get_permission_catalog()
+
+    def test_waits_for_catalog_when_locked_by_another_process(self):
+        """
+        Test that a process waits for the rebuild of the process holding the lock.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_catalog_version()
+        cache.add(f"{CATALOG_LOCK_CACHE_KEY}:{version}", True)
+
+        def rebuild_elsewhere(*args, **kwargs):
+            cache.set(f"{CATALOG_DATA_CACHE_KEY}:{version}", ["perm1"])
+
+        with patch(
+            "aa_permission_management.helper.catalog.time.sleep",
+            side_effect=rebuild_elsewhere,
+        ):
+            with self.assertNumQueries(0):
+                result = get_permission_catalog()
+
+        self.assertEqual(result, ["perm1"])
+
+        cache.delete(f"{CATALOG_LOCK_CACHE_KEY}:{version}")
+
+    def test_builds_without_storing_when_waiting_times_out(self):
+        """
+        Test that a process builds the catalog itself when the lock holder is too slow.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_catalog_version()
+        cache.add(f"{CATALOG_LOCK_CACHE_KEY}:{version}", True)
+
+        with patch("aa_permission_management.helper.catalog.CATALOG_LOCK_WAIT", 0):
+            result = get_permission_catalog()
+
+        self.assertEqual(set(result), set(Permission.objects.all()))
+        self.assertIsNone(cache.get(f"{CATALOG_DATA_CACHE_KEY}:{version}"))
+
+        cache.delete(f"{CATALOG_LOCK_CACHE_KEY}:{version}")
+
+
+class TestGetPermissionCatalogColumns(BaseTestCase):
+    """
+    Test cases for get_permission_catalog_columns function.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with an invalidated permission catalog.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        bump_catalog_version()
+
+    def test_returns_columnar_catalog(self):
+        """
+        Test that the catalog is returned as aligned columns.
+
+        :return:
+        :rtype:
+        """
+
+        permissions = get_permission_catalog()
+
+        with override("en"):
+            result = get_permission_catalog_columns()
+
+        self.assertEqual(result["version"], get_catalog_version())
+        self.assertEqual(result["language"], "en")
+        self.assertEqual(result["ids"], [p.pk for p in permissions])
+        self.assertEqual(result["codenames"], [p.codename for p in permissions])
+        self.assertEqual(result["names"], [p.name for p in permissions])
+        self.assertEqual(
+            [result["content_types"][i] for i in result["content_type_index"]],
+            [str(p.content_type) for p in permissions],
+        )
+        self.assertEqual(
+            len(result["content_types"]), len(set(result["content_types"]))
+        )
+
+    def test_memoizes_columns_per_language(self):
+        """
+        Test that the columns are memoized per language.
+
+        :return:
+        :rtype:
+        """
+
+        with override("en"):
+            english = get_permission_catalog_columns()
+
+            self.assertIs(get_permission_catalog_columns(), english)
+
+        with override("de"):
+            german = get_permission_catalog_columns()
+
+        self.assertIsNot(german, english)
+        self.assertEqual(german["language"], "de")
+
+    def test_rebuilds_columns_after_version_bump(self):
+        """
+        Test that the columns are rebuilt after the catalog version is bumped.
+
+        :return:
+        :rtype:
+        """
+
+        columns = get_permission_catalog_columns()
+        bump_catalog_version()
+
+        result = get_permission_catalog_columns()
+
+        self.assertIsNot(result, columns)
+        self.assertNotEqual(result["version"], columns["version"])
+
+
+class TestCatalogInvalidationSignals(BaseTestCase):
+    """
+    Test cases for the signals invalidating the permission catalog.
+    """
+
+    def test_bumps_version_when_permission_is_saved(self):
+        """
+        Test that saving a permission bumps the catalog version.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_catalog_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Permission.objects.create(
+                codename="test_permission",
+                name="Test permission",
+                content_type=ContentType.objects.get_for_model(Permission),
+            )
+
+        self.assertNotEqual(get_catalog_version(), version)
+
+    def test_bumps_version_when_permission_is_deleted(self):
+        """
+        Test that deleting a permission bumps the catalog version.
+
+        :return:
+        :rtype:
+        """
+
+        permission = Permission.objects.first()
+        version = get_catalog_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            permission.delete()
+
+        self.assertNotEqual(get_catalog_version(), version)
+
+    def test_bumps_version_when_content_type_is_saved(self):
+        """
+        Test that saving a content type bumps the catalog version.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_catalog_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ContentType.objects.create(app_label="test_app", model="test_model")
+
+        self.assertNotEqual(get_catalog_version(), version)
+
+    def test_bumps_version_after_migrate(self):
+        """
+        Test that running migrations bumps the catalog version.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_catalog_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post_migrate.send(
+                sender=apps.get_app_config("aa_permission_management"),
+                app_config=apps.get_app_config("aa_permission_management"),
+            )
+
+        self.assertNotEqual(get_catalog_version(), version)
+
+    def test_does_not_bump_version_before_commit(self):
+        """
+        Test that the version is only bumped once the transaction is committed.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_catalog_version()
+
+        with self.captureOnCommitCallbacks(execute=False):
+            Permission.objects.create(
+                codename="test_permission",
+                name="Test permission",
+                content_type=ContentType.objects.get_for_model(Permission),
+            )
+
+        self.assertEqual(get_catalog_version(), version)
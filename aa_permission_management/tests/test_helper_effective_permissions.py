@@ -0,0 +1,278 @@
+"""
+Unit tests for aa_permission_management.helper.effective_permissions
+"""
+
+# Django
+from django.contrib.auth.models import Group
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission, State
+
+# AA Permission Management
+from aa_permission_management.helper.catalog import (
+    bump_catalog_version,
+    get_permission_catalog,
+)
+from aa_permission_management.helper.effective_permissions import (
+    get_effective_permission_names,
+    get_effective_permissions,
+    get_user_permission_version,
+    has_effective_permission,
+)
+from aa_permission_management.tests import BaseTestCase
+
+
+class EffectivePermissionsTestCase(BaseTestCase):
+    """
+    Test case with a user holding permissions directly, through a group and
+    through the user's state.
+    """
+
+    def setUp(self):
+        """
+        Set up the user, its group and its state with their permissions.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        # A new catalog version makes cached results of earlier tests unreachable,
+        # warming it up leaves only the resolver's queries to be counted
+        bump_catalog_version()
+        get_permission_catalog()
+
+        self.user = self.user_without_permission
+        self.permissions = list(
+            Permission.objects.select_related("content_type").order_by("pk")[:4]
+        )
+        self.group = Group.objects.create(name="Test Group")
+        self.state = State.objects.get(pk=self.user.profile.state_id)
+
+        self.user.user_permissions.add(self.permissions[0])
+        self.user.groups.add(self.group)
+        self.group.permissions.add(self.permissions[0], self.permissions[1])
+        self.state.permissions.add(self.permissions[2])
+
+    def _name(self, index: int) -> str:
+        """
+        Get a permission of the test case as "app_label.codename".
+
+        :param index:
+        :type index:
+        :return:
+        :rtype:
+        """
+
+        permission = self.permissions[index]
+
+        return f"{permission.content_type.app_label}.{permission.codename}"
+
+
+class TestGetEffectivePermissions(EffectivePermissionsTestCase):
+    """
+    Test cases for get_effective_permissions function.
+    """
+
+    def test_resolves_permissions_of_all_sources(self):
+        """
+        Test that direct, group and state permissions are combined with their sources.
+
+        :return:
+        :rtype:
+        """
+
+        result = get_effective_permissions(self.user.pk)
+        permissions = {
+            permission["id"]: permission["sources"]
+            for permission in result["permissions"]
+        }
+
+        self.assertEqual(result["user_id"], self.user.pk)
+        self.assertEqual(
+            result["state"], {"id": self.state.pk, "name": self.state.name}
+        )
+        self.assertEqual(
+            result["groups"], [{"id": self.group.pk, "name": "Test Group"}]
+        )
+        self.assertEqual(
+            permissions,
+            {
+                self.permissions[0].pk: [
+                    {"type": "group", "id": self.group.pk},
+                    {"type": "user", "id": self.user.pk},
+                ],
+                self.permissions[1].pk: [{"type": "group", "id": self.group.pk}],
+                self.permissions[2].pk: [{"type": "state", "id": self.state.pk}],
+            },
+        )
+
+    def test_costs_one_query_when_cached(self):
+        """
+        Test that a cached result only costs the fingerprint query.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertNumQueries(4):
+            get_effective_permissions(self.user.pk)
+
+        with self.assertNumQueries(1):
+            get_effective_permissions(self.user.pk)
+
+    def test_costs_constant_number_of_queries(self):
+        """
+        Test that the number of queries doesn't depend on the number of groups.
+
+        :return:
+        :rtype:
+        """
+
+        groups = [Group.objects.create(name=f"Group {i}") for i in range(10)]
+        self.user.groups.add(*groups)
+
+        for group in groups:
+            group.permissions.add(self.permissions[3])
+
+        with self.assertNumQueries(4):
+            result = get_effective_permissions(self.user.pk)
+
+        self.assertEqual(len(result["groups"]), 11)
+
+    def test_reflects_group_permission_changes(self):
+        """
+        Test that a changed group permission set is picked up at once.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_effective_permissions(self.user.pk)["version"]
+
+        self.group.permissions.add(self.permissions[3])
+
+        result = get_effective_permissions(self.user.pk)
+
+        self.assertNotEqual(result["version"], version)
+        self.assertIn(self._name(3), get_effective_permission_names(self.user.pk))
+
+    def test_reflects_group_membership_changes(self):
+        """
+        Test that a removed group membership is picked up at once.
+
+        :return:
+        :rtype:
+        """
+
+        get_effective_permissions(self.user.pk)
+
+        self.user.groups.remove(self.group)
+
+        self.assertEqual(
+            get_effective_permission_names(self.user.pk),
+            {self._name(0), self._name(2)},
+        )
+
+    def test_reflects_direct_permission_changes(self):
+        """
+        Test that changed direct permissions bump the user's version.
+
+        :return:
+        :rtype:
+        """
+
+        get_effective_permissions(self.user.pk)
+        version = get_user_permission_version(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.user_permissions.add(self.permissions[3])
+
+        self.assertNotEqual(get_user_permission_version(self.user.pk), version)
+        self.assertIn(self._name(3), get_effective_permission_names(self.user.pk))
+
+    def test_reflects_direct_permission_changes_from_permission_side(self):
+        """
+        Test that users given a permission from the permission's side are bumped.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_user_permission_version(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.permissions[0].user_set.clear()
+
+        self.assertNotEqual(get_user_permission_version(self.user.pk), version)
+
+    def test_does_not_bump_version_on_login(self):
+        """
+        Test that saving only the last login keeps the user's version.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_user_permission_version(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save(update_fields=["last_login"])
+
+        self.assertEqual(get_user_permission_version(self.user.pk), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_superuser = True
+            self.user.save(update_fields=["is_superuser"])
+
+        self.assertNotEqual(get_user_permission_version(self.user.pk), version)
+
+    def test_raises_for_nonexistent_user(self):
+        """
+        Test that a nonexistent user raises ValueError.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError):
+            get_effective_permissions(999999)
+
+
+class TestHasEffectivePermission(EffectivePermissionsTestCase):
+    """
+    Test cases for has_effective_permission function.
+    """
+
+    def test_checks_effective_permissions(self):
+        """
+        Test that permissions of any source are granted.
+
+        :return:
+        :rtype:
+        """
+
+        self.assertTrue(has_effective_permission(self.user.pk, self._name(1)))
+        self.assertTrue(has_effective_permission(self.user.pk, self._name(2)))
+        self.assertFalse(has_effective_permission(self.user.pk, self._name(3)))
+
+    def test_follows_django_semantics_for_flags(self):
+        """
+        Test that inactive users have no and superusers all permissions.
+
+        :return:
+        :rtype:
+        """
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_superuser = True
+            self.user.save()
+
+        self.assertTrue(has_effective_permission(self.user.pk, self._name(3)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        self.assertFalse(has_effective_permission(self.user.pk, self._name(1)))
@@ -0,0 +1,206 @@
+"""
+Unit tests for aa_permission_management.helper.export
+"""
+
+# Standard Library
+import csv
+import json
+
+# Django
+from django.contrib.auth.models import Group
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission, State
+
+# AA Permission Management
+from aa_permission_management.helper.export import (
+    EXPORT_FIELDS,
+    iter_permission_assignments,
+    stream_permission_assignments,
+)
+from aa_permission_management.tests import BaseTestCase
+
+
+class ExportTestCase(BaseTestCase):
+    """
+    Test case with a group and a state holding permissions.
+    """
+
+    def setUp(self):
+        """
+        Set up the group and the state with their permissions.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.permission = Permission.objects.get(
+            codename="access_permission_management"
+        )
+        self.other_permission = Permission.objects.exclude(
+            content_type__app_label="aa_permission_management"
+        ).first()
+        self.group = Group.objects.create(name="Test Group")
+        self.group.permissions.add(self.permission, self.other_permission)
+        self.state = State.objects.create(name="Test State", priority=20)
+        self.state.permissions.add(self.permission)
+
+    def _row(self, target_type: str, target: str, permission: Permission) -> tuple:
+        """
+        Get the exported row of an assignment.
+
+        :param target_type:
+        :type target_type:
+        :param target:
+        :type target:
+        :param permission:
+        :type permission:
+        :return:
+        :rtype:
+        """
+
+        return (
+            target_type,
+            target,
+            permission.content_type.app_label,
+            permission.content_type.model,
+            permission.codename,
+        )
+
+
+class TestIterPermissionAssignments(ExportTestCase):
+    """
+    Test cases for iter_permission_assignments function.
+    """
+
+    def test_exports_assignments_of_groups_and_states(self):
+        """
+        Test that the assignments of all groups and states are exported.
+
+        :return:
+        :rtype:
+        """
+
+        rows = list(iter_permission_assignments())
+
+        self.assertIn(self._row("group", "Test Group", self.permission), rows)
+        self.assertIn(self._row("group", "Test Group", self.other_permission), rows)
+        self.assertIn(self._row("state", "Test State", self.permission), rows)
+        self.assertEqual(
+            len(rows),
+            Group.permissions.through.objects.count()
+            + State.permissions.through.objects.count(),
+        )
+
+    def test_filters_by_target_and_app_label(self):
+        """
+        Test that the export can be limited to a target and an app label.
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(
+            list(
+                iter_permission_assignments(
+                    target_type="group",
+                    target_id=self.group.pk,
+                    app_label="aa_permission_management",
+                )
+            ),
+            [self._row("group", "Test Group", self.permission)],
+        )
+
+    def test_rejects_invalid_filters(self):
+        """
+        Test that an invalid target type or a target without type raise ValueError.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError):
+            iter_permission_assignments(target_type="user")
+
+        with self.assertRaises(ValueError):
+            iter_permission_assignments(target_id=self.group.pk)
+
+    def test_reads_each_table_with_one_query(self):
+        """
+        Test that the assignments are streamed from one query per through table,
+        however small the chunks are.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertNumQueries(2):
+            rows = list(iter_permission_assignments(chunk_size=1))
+
+        self.assertGreater(len(rows), 2)
+
+
+class TestStreamPermissionAssignments(ExportTestCase):
+    """
+    Test cases for stream_permission_assignments function.
+    """
+
+    def test_streams_csv_with_header(self):
+        """
+        Test that the CSV export starts with a header.
+
+        :return:
+        :rtype:
+        """
+
+        content = "".join(
+            stream_permission_assignments(
+                export_format="csv", chunk_size=1, target_type="state"
+            )
+        )
+        rows = list(csv.reader(content.splitlines()))
+
+        self.assertEqual(tuple(rows[0]), EXPORT_FIELDS)
+        self.assertIn(list(self._row("state", "Test State", self.permission)), rows)
+
+    def test_streams_json_lines(self):
+        """
+        Test that the JSON lines export holds one object per assignment.
+
+        :return:
+        :rtype:
+        """
+
+        content = "".join(
+            stream_permission_assignments(
+                export_format="jsonl", target_type="group", target_id=self.group.pk
+            )
+        )
+
+        self.assertEqual(
+            [json.loads(line) for line in content.splitlines()],
+            [
+                dict(zip(EXPORT_FIELDS, self._row("group", "Test Group", permission)))
+                for permission in sorted(
+                    (self.permission, self.other_permission),
+                    key=lambda permission: (
+                        permission.content_type.app_label,
+                        permission.content_type.model,
+                        permission.codename,
+                    ),
+                )
+            ],
+        )
+
+    def test_rejects_invalid_format(self):
+        """
+        Test that an invalid export format raises ValueError.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError):
+            stream_permission_assignments(export_format="xml")
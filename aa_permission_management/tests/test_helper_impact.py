@@ -0,0 +1,173 @@
+"""
+Unit tests for aa_permission_management.helper.impact
+"""
+
+# Django
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission, State, UserProfile
+
+# AA Permission Management
+from aa_permission_management.constants import PERMISSION_IMPACT_CACHE_KEY
+from aa_permission_management.helper.catalog import (
+    bump_catalog_version,
+    get_permission_catalog,
+)
+from aa_permission_management.helper.impact import get_permission_change_impact
+from aa_permission_management.tests import BaseTestCase
+from aa_permission_management.tests.fixtures.utils import create_fake_user
+
+
+class ImpactTestCase(BaseTestCase):
+    """
+    Test case with a group and a state whose members hold permissions from
+    different sources.
+    """
+
+    def setUp(self):
+        """
+        Set up the group, the state and their members.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        # IDs and versions repeat across tests, so counts of earlier tests must go
+        cache.delete_pattern(f"{PERMISSION_IMPACT_CACHE_KEY}:*")
+        bump_catalog_version()
+        get_permission_catalog()
+
+        self.permissions = list(Permission.objects.order_by("pk")[:3])
+        self.group = Group.objects.create(name="Test Group")
+        self.other_group = Group.objects.create(name="Other Group")
+        self.other_group.permissions.add(self.permissions[0])
+        self.state = State.objects.create(name="Test State", priority=20)
+        self.state.permissions.add(self.permissions[1])
+
+        self.plain = create_fake_user(character_id=10101, character_name="Plain")
+        self.direct = create_fake_user(character_id=10102, character_name="Direct")
+        self.direct.user_permissions.add(self.permissions[0])
+        self.grouped = create_fake_user(character_id=10103, character_name="Grouped")
+        self.grouped.groups.add(self.other_group)
+        self.inactive = create_fake_user(character_id=10104, character_name="Inactive")
+        User.objects.filter(pk=self.inactive.pk).update(is_active=False)
+        self.members = [self.plain, self.direct, self.grouped, self.inactive]
+
+        for user in self.members:
+            user.groups.add(self.group)
+
+        UserProfile.objects.filter(user__in=self.members).update(state=self.state)
+
+
+class TestGetPermissionChangeImpact(ImpactTestCase):
+    """
+    Test cases for get_permission_change_impact function.
+    """
+
+    def test_counts_users_without_other_sources(self):
+        """
+        Test that users holding a permission from another source aren't counted.
+
+        :return:
+        :rtype:
+        """
+
+        impact = get_permission_change_impact(
+            target_type="group",
+            target_id=self.group.pk,
+            add=[self.permissions[0].pk, self.permissions[1].pk],
+        )
+
+        self.assertEqual(impact["members"], 3)
+        self.assertEqual(
+            [(change["action"], change["users"]) for change in impact["permissions"]],
+            [("add", 1), ("add", 0)],
+        )
+        self.assertEqual(
+            impact["permissions"][0]["permission_id"], self.permissions[0].pk
+        )
+
+    def test_counts_removal_from_state(self):
+        """
+        Test that removing a state permission only counts the members who lose it.
+
+        :return:
+        :rtype:
+        """
+
+        self.other_group.permissions.add(self.permissions[1])
+
+        impact = get_permission_change_impact(
+            target_type="state",
+            target_id=self.state.pk,
+            remove=[self.permissions[1].pk],
+        )
+
+        self.assertEqual(impact["members"], 3)
+        self.assertEqual(impact["permissions"][0]["users"], 2)
+
+    def test_counts_no_op_changes_as_zero(self):
+        """
+        Test that adding an assigned permission or removing an unassigned one
+        affects nobody.
+
+        :return:
+        :rtype:
+        """
+
+        impact = get_permission_change_impact(
+            target_type="state",
+            target_id=self.state.pk,
+            add=[self.permissions[1].pk],
+            remove=[self.permissions[2].pk],
+        )
+
+        self.assertEqual([change["users"] for change in impact["permissions"]], [0, 0])
+
+    def test_costs_two_queries_when_cached(self):
+        """
+        Test that cached counts only cost the existence and version queries.
+
+        :return:
+        :rtype:
+        """
+
+        kwargs = {
+            "target_type": "group",
+            "target_id": self.group.pk,
+            "add": [self.permissions[0].pk],
+        }
+        impact = get_permission_change_impact(**kwargs)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(get_permission_change_impact(**kwargs), impact)
+
+        self.assertEqual(len(queries), 2)
+
+    def test_rejects_invalid_changes(self):
+        """
+        Test that invalid target types, unknown targets and overlapping changes
+        raise ValueError.
+
+        :return:
+        :rtype:
+        """
+
+        for kwargs in (
+            {"target_type": "user", "target_id": self.group.pk},
+            {"target_type": "group", "target_id": 0},
+            {
+                "target_type": "group",
+                "target_id": self.group.pk,
+                "add": [self.permissions[0].pk],
+                "remove": [self.permissions[0].pk],
+            },
+        ):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                get_permission_change_impact(**kwargs)
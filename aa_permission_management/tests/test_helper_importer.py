@@ -0,0 +1,467 @@
+"""
+Unit tests for aa_permission_management.helper.importer
+"""
+
+# Standard Library
+import io
+import json
+
+# Django
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission, State
+
+# AA Permission Management
+from aa_permission_management.helper.catalog import bump_catalog_version
+from aa_permission_management.helper.export import (
+    EXPORT_FIELDS,
+    stream_permission_assignments,
+)
+from aa_permission_management.helper.importer import (
+    apply_import,
+    get_import_report,
+    iter_import_rows,
+    plan_import,
+    split_import_changes,
+)
+from aa_permission_management.models import PermissionAuditLog
+from aa_permission_management.tests import BaseTestCase
+
+
+class ImportTestCase(BaseTestCase):
+    """
+    Test case with a group and a state, and a warm permission catalog.
+    """
+
+    def setUp(self):
+        """
+        Set up the group and the state with their permissions.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        bump_catalog_version()
+
+        self.permission = Permission.objects.get(
+            codename="access_permission_management"
+        )
+        self.other_permission = Permission.objects.exclude(
+            content_type__app_label="aa_permission_management"
+        ).first()
+        self.group = Group.objects.create(name="Test Group")
+        self.group.permissions.add(self.other_permission)
+        self.state = State.objects.create(name="Test State", priority=20)
+
+    def _jsonl(self, *rows: tuple) -> io.BytesIO:
+        """
+        Build a JSON lines file from export rows.
+
+        :param rows:
+        :type rows:
+        :return:
+        :rtype:
+        """
+
+        return io.BytesIO(
+            "".join(
+                json.dumps(dict(zip(EXPORT_FIELDS, row))) + "\n" for row in rows
+            ).encode()
+        )
+
+    def _row(self, target_type: str, target: str, permission: Permission) -> tuple:
+        """
+        Get the row of an assignment.
+
+        :param target_type:
+        :type target_type:
+        :param target:
+        :type target:
+        :param permission:
+        :type permission:
+        :return:
+        :rtype:
+        """
+
+        return (
+            target_type,
+            target,
+            permission.content_type.app_label,
+            permission.content_type.model,
+            permission.codename,
+        )
+
+
+class TestIterImportRows(ImportTestCase):
+    """
+    Test cases for iter_import_rows function.
+    """
+
+    def test_parses_csv_with_line_numbers(self):
+        """
+        Test that CSV rows are parsed with their line numbers, BOM or not.
+
+        :return:
+        :rtype:
+        """
+
+        file = io.BytesIO(
+            "\ufefftarget_type,target,app_label,model,codename\r\n"
+            "group,Test Group,auth,user,add_user\r\n".encode()
+        )
+
+        self.assertEqual(
+            list(iter_import_rows(file=file, import_format="csv")),
+            [
+                (
+                    2,
+                    {
+                        "target_type": "group",
+                        "target": "Test Group",
+                        "app_label": "auth",
+                        "model": "user",
+                        "codename": "add_user",
+                    },
+                )
+            ],
+        )
+        self.assertFalse(file.closed)
+
+    def test_parses_json_lines_and_reports_invalid_lines(self):
+        """
+        Test that JSON lines are parsed, skipping blank lines, and invalid lines
+        are returned as errors.
+
+        :return:
+        :rtype:
+        """
+
+        file = io.BytesIO(b'{"target": "a"}\n\nnot json\n[1]\n')
+        rows = list(iter_import_rows(file=file, import_format="jsonl"))
+
+        self.assertEqual(rows[0], (1, {"target": "a"}))
+        self.assertEqual([line for line, _ in rows[1:]], [3, 4])
+        self.assertTrue(all(isinstance(row, ValueError) for _, row in rows[1:]))
+
+    def test_rejects_invalid_format(self):
+        """
+        Test that an invalid import format raises ValueError.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError):
+            list(iter_import_rows(file=io.BytesIO(), import_format="xml"))
+
+
+class TestPlanImport(ImportTestCase):
+    """
+    Test cases for plan_import function.
+    """
+
+    def test_adds_missing_assignments(self):
+        """
+        Test that only missing assignments are planned in add mode.
+
+        :return:
+        :rtype:
+        """
+
+        plan = plan_import(
+            rows=iter_import_rows(
+                file=self._jsonl(
+                    self._row("group", "Test Group", self.permission),
+                    self._row("group", "Test Group", self.other_permission),
+                    self._row("state", "Test State", self.permission),
+                ),
+                import_format="jsonl",
+            )
+        )
+
+        self.assertEqual(plan["rows"], 3)
+        self.assertEqual(plan["invalid"], 0)
+        self.assertEqual(
+            plan["changes"],
+            {
+                "group": {
+                    "added": [(self.group.pk, self.permission.pk)],
+                    "removed": [],
+                },
+                "state": {
+                    "added": [(self.state.pk, self.permission.pk)],
+                    "removed": [],
+                },
+            },
+        )
+
+    def test_replaces_assignments_of_listed_targets(self):
+        """
+        Test that replace mode removes the unlisted permissions of listed targets only.
+
+        :return:
+        :rtype:
+        """
+
+        other_group = Group.objects.create(name="Other Group")
+        other_group.permissions.add(self.other_permission)
+
+        plan = plan_import(
+            rows=iter_import_rows(
+                file=self._jsonl(self._row("group", "Test Group", self.permission)),
+                import_format="jsonl",
+            ),
+            mode="replace",
+        )
+
+        self.assertEqual(
+            plan["changes"]["group"],
+            {
+                "added": [(self.group.pk, self.permission.pk)],
+                "removed": [(self.group.pk, self.other_permission.pk)],
+            },
+        )
+
+    def test_reports_unresolvable_rows(self):
+        """
+        Test that unknown targets and permissions and incomplete rows are reported.
+
+        :return:
+        :rtype:
+        """
+
+        plan = plan_import(
+            rows=[
+                (2, dict(zip(EXPORT_FIELDS, ("group", "Nope", "auth", "", "x")))),
+                (
+                    3,
+                    dict(
+                        zip(EXPORT_FIELDS, ("group", "Test Group", "auth", "", "nope"))
+                    ),
+                ),
+                (4, {"target_type": "group"}),
+                (5, dict(zip(EXPORT_FIELDS, ("user", "Test Group", "auth", "", "x")))),
+            ]
+        )
+
+        self.assertEqual(plan["invalid"], 4)
+        self.assertEqual(
+            plan["errors"],
+            [
+                {"line": 2, "error": "Unknown group"},
+                {"line": 3, "error": "Unknown permission"},
+                {"line": 4, "error": "Missing target"},
+                {"line": 5, "error": "Invalid target type"},
+            ],
+        )
+        self.assertEqual(plan["changes"]["group"], {"added": [], "removed": []})
+
+    def test_reports_rows_with_values_other_than_strings(self):
+        """
+        Test that list and dict values are reported instead of crashing the import.
+
+        :return:
+        :rtype:
+        """
+
+        row = dict(
+            zip(EXPORT_FIELDS, self._row("group", "Test Group", self.permission))
+        )
+
+        plan = plan_import(
+            rows=[
+                (2, {**row, "target_type": ["group"]}),
+                (3, {**row, "target": {"name": "Test Group"}}),
+                (4, {**row, "app_label": ["auth"]}),
+                (5, {**row, "codename": {"codename": "x"}}),
+                (6, {**row, "model": ["user"]}),
+            ]
+        )
+
+        self.assertEqual(plan["invalid"], 5)
+        self.assertEqual(
+            plan["errors"],
+            [
+                {"line": 2, "error": "Invalid target_type"},
+                {"line": 3, "error": "Invalid target"},
+                {"line": 4, "error": "Invalid app_label"},
+                {"line": 5, "error": "Invalid codename"},
+                {"line": 6, "error": "Invalid model"},
+            ],
+        )
+
+    def test_costs_constant_number_of_queries(self):
+        """
+        Test that the number of queries depends on the chunks of targets, not rows.
+
+        :return:
+        :rtype:
+        """
+
+        groups = [Group.objects.create(name=f"Group {i}") for i in range(10)]
+        permissions = list(Permission.objects.all()[:10])
+        rows = [
+            (line, dict(zip(EXPORT_FIELDS, self._row("group", group.name, permission))))
+            for line, (group, permission) in enumerate(
+                ((group, permission) for group in groups for permission in permissions),
+                start=2,
+            )
+        ]
+
+        # Warm the permission catalog
+        plan_import(rows=[])
+
+        with CaptureQueriesContext(connection) as few:
+            plan_import(rows=rows[:1])
+
+        with CaptureQueriesContext(connection) as many:
+            plan = plan_import(rows=rows)
+
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(len(plan["changes"]["group"]["added"]), 100)
+
+    def test_rejects_invalid_mode(self):
+        """
+        Test that an invalid import mode raises ValueError.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError):
+            plan_import(rows=[], mode="merge")
+
+
+class TestApplyImport(ImportTestCase):
+    """
+    Test cases for apply_import and get_import_report functions.
+    """
+
+    def test_applies_changes_in_chunks(self):
+        """
+        Test that the planned changes are applied and recorded in the audit log.
+
+        :return:
+        :rtype:
+        """
+
+        plan = plan_import(
+            rows=iter_import_rows(
+                file=self._jsonl(
+                    self._row("group", "Test Group", self.permission),
+                    self._row("state", "Test State", self.permission),
+                ),
+                import_format="jsonl",
+            ),
+            mode="replace",
+        )
+
+        apply_import(plan=plan, actor=self.user_with_permission, chunk_size=1)
+
+        self.assertEqual(list(self.group.permissions.all()), [self.permission])
+        self.assertEqual(list(self.state.permissions.all()), [self.permission])
+        self.assertEqual(
+            PermissionAuditLog.objects.filter(actor=self.user_with_permission).count(),
+            3,
+        )
+
+    def test_reports_changes_per_target(self):
+        """
+        Test that the report lists the changes per target by name.
+
+        :return:
+        :rtype:
+        """
+
+        plan = plan_import(
+            rows=iter_import_rows(
+                file=self._jsonl(self._row("group", "Test Group", self.permission)),
+                import_format="jsonl",
+            ),
+            mode="replace",
+        )
+
+        report = get_import_report(plan=plan, dry_run=True)
+
+        self.assertEqual(report["added"], 1)
+        self.assertEqual(report["removed"], 1)
+        self.assertEqual(
+            report["targets"],
+            [
+                {
+                    "target_type": "group",
+                    "target_id": self.group.pk,
+                    "target": "Test Group",
+                    "added": ["aa_permission_management.access_permission_management"],
+                    "removed": [
+                        f"{self.other_permission.content_type.app_label}."
+                        f"{self.other_permission.codename}"
+                    ],
+                }
+            ],
+        )
+        self.assertFalse(report["truncated"])
+        # A dry run changes nothing
+        self.assertEqual(list(self.group.permissions.all()), [self.other_permission])
+
+    def test_reimports_export_without_changes(self):
+        """
+        Test that an export imported in replace mode is a no-op.
+
+        :return:
+        :rtype:
+        """
+
+        self.state.permissions.add(self.permission)
+
+        for export_format in ("csv", "jsonl"):
+            with self.subTest(export_format=export_format):
+                file = io.BytesIO(
+                    "".join(
+                        stream_permission_assignments(export_format=export_format)
+                    ).encode()
+                )
+
+                plan = plan_import(
+                    rows=iter_import_rows(file=file, import_format=export_format),
+                    mode="replace",
+                )
+                report = get_import_report(plan=plan, dry_run=True)
+
+                self.assertEqual(report["invalid"], 0)
+                self.assertEqual((report["added"], report["removed"]), (0, 0))
+
+
+class TestSplitImportChanges(ImportTestCase):
+    """
+    Test cases for split_import_changes function.
+    """
+
+    def test_splits_changes_in_order(self):
+        """
+        Test that the chunks keep removals before additions per target type.
+
+        :return:
+        :rtype:
+        """
+
+        changes = {
+            "group": {"added": [(1, 2), (1, 3)], "removed": [(1, 1)]},
+            "state": {"added": [(2, 2)], "removed": []},
+        }
+
+        self.assertEqual(
+            list(split_import_changes(changes=changes, chunk_size=2)),
+            [
+                {"group": {"added": [(1, 2)], "removed": [(1, 1)]}},
+                {
+                    "group": {"added": [(1, 3)], "removed": []},
+                    "state": {"added": [(2, 2)], "removed": []},
+                },
+            ],
+        )
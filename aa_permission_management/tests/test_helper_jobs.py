@@ -0,0 +1,393 @@
+"""
+Unit tests for aa_permission_management.helper.jobs
+"""
+
+# Standard Library
+from datetime import timedelta
+from unittest.mock import patch
+
+# Django
+from django.contrib.auth.models import Group
+from django.utils import timezone
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission, State
+
+# AA Permission Management
+from aa_permission_management.helper.importer import split_import_changes
+from aa_permission_management.helper.jobs import (
+    create_job,
+    get_job_status,
+    run_job_chunk,
+)
+from aa_permission_management.helper.snapshots import take_snapshot
+from aa_permission_management.models import PermissionAuditLog, PermissionJob
+from aa_permission_management.tests import BaseTestCase
+
+
+class TestCreateJob(BaseTestCase):
+    """
+    Test cases for create_job function.
+    """
+
+    def test_creates_pending_job(self):
+        """
+        Test that a pending job is created for the user.
+
+        :return:
+        :rtype:
+        """
+
+        job = create_job(
+            kind=PermissionJob.Kind.APPLY,
+            payload={"group_ids": [1], "add": [1]},
+            total=1,
+            user=self.user_with_permission,
+        )
+
+        self.assertEqual(job.status, PermissionJob.Status.PENDING)
+        self.assertEqual(job.created_by, self.user_with_permission)
+
+    def test_raises_value_error_for_invalid_kind(self):
+        """
+        Test that a job of an unknown kind can't be created.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError):
+            create_job(kind="invalid", payload={}, total=0)
+
+    def test_raises_value_error_for_chunks_without_chunk_size(self):
+        """
+        Test that a job with stored chunks needs the size of its chunks.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError):
+            create_job(kind=PermissionJob.Kind.IMPORT, payload={}, total=1, chunks=[{}])
+
+        self.assertFalse(PermissionJob.objects.exists())
+
+
+class TestRunJobChunk(BaseTestCase):
+    """
+    Test cases for run_job_chunk function.
+    """
+
+    def setUp(self):
+        """
+        Set up a job applying permissions to groups and a state.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.groups = [Group.objects.create(name=f"Group {i}") for i in range(3)]
+        self.state = State.objects.get(name="Guest")
+        self.permission_ids = list(Permission.objects.values_list("pk", flat=True)[:2])
+        self.job = create_job(
+            kind=PermissionJob.Kind.APPLY,
+            payload={
+                "group_ids": [group.pk for group in self.groups],
+                "state_ids": [self.state.pk],
+                "add": self.permission_ids,
+            },
+            total=4,
+        )
+
+    def test_processes_job_in_chunks(self):
+        """
+        Test that every call processes one chunk and records the progress.
+
+        :return:
+        :rtype:
+        """
+
+        self.assertTrue(run_job_chunk(self.job.pk, chunk_size=2))
+
+        self.job.refresh_from_db()
+
+        self.assertEqual(self.job.status, PermissionJob.Status.RUNNING)
+        self.assertEqual(self.job.processed, 2)
+        self.assertEqual(self.groups[1].permissions.count(), 2)
+        self.assertFalse(self.groups[2].permissions.exists())
+
+        self.assertFalse(run_job_chunk(self.job.pk, chunk_size=2))
+
+        self.job.refresh_from_db()
+
+        self.assertEqual(self.job.status, PermissionJob.Status.DONE)
+        self.assertEqual(self.job.processed, 4)
+        self.assertEqual(
+            self.job.result, {"added": 8, "removed": 0, "groups": 3, "states": 1}
+        )
+        self.assertEqual(self.state.permissions.count(), 2)
+
+    def test_does_not_process_finished_job(self):
+        """
+        Test that a finished job isn't processed again.
+
+        :return:
+        :rtype:
+        """
+
+        PermissionJob.objects.filter(pk=self.job.pk).update(
+            status=PermissionJob.Status.DONE
+        )
+
+        self.assertFalse(run_job_chunk(self.job.pk))
+        self.assertFalse(self.groups[0].permissions.exists())
+
+    def test_marks_job_as_failed_on_error(self):
+        """
+        Test that a failing chunk is rolled back and the job marked as failed.
+
+        :return:
+        :rtype:
+        """
+
+        with patch(
+            "aa_permission_management.helper.jobs.apply_permissions",
+            side_effect=ValueError("Group does not exist"),
+        ):
+            self.assertFalse(run_job_chunk(self.job.pk))
+
+        self.job.refresh_from_db()
+
+        self.assertEqual(self.job.status, PermissionJob.Status.FAILED)
+        self.assertEqual(self.job.error, "Group does not exist")
+        self.assertEqual(self.job.processed, 0)
+
+    def test_returns_false_for_nonexistent_job(self):
+        """
+        Test that a job that doesn't exist anymore is ignored.
+
+        :return:
+        :rtype:
+        """
+
+        self.assertFalse(run_job_chunk(999))
+
+
+class TestImportJob(BaseTestCase):
+    """
+    Test cases for background jobs applying the changes of an import.
+    """
+
+    def test_applies_changes_in_chunks(self):
+        """
+        Test that the stored changes are applied chunk by chunk, removals first.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+        state = State.objects.get(name="Guest")
+        permissions = list(Permission.objects.all()[:2])
+        group.permissions.add(permissions[0])
+        job = create_job(
+            kind=PermissionJob.Kind.IMPORT,
+            payload={"chunk_size": 2},
+            total=3,
+            chunks=(
+                {"changes": changes}
+                for changes in split_import_changes(
+                    changes={
+                        "group": {
+                            "added": [(group.pk, permissions[1].pk)],
+                            "removed": [(group.pk, permissions[0].pk)],
+                        },
+                        "state": {
+                            "added": [(state.pk, permissions[1].pk)],
+                            "removed": [],
+                        },
+                    },
+                    chunk_size=2,
+                )
+            ),
+        )
+
+        self.assertEqual(job.chunks.count(), 2)
+        self.assertNotIn("changes", job.payload)
+
+        self.assertTrue(run_job_chunk(job.pk))
+        self.assertEqual(list(group.permissions.all()), [permissions[1]])
+        self.assertFalse(state.permissions.exists())
+
+        # Every chunk reads only its own changes
+        job.chunks.filter(seq=0).delete()
+
+        self.assertFalse(run_job_chunk(job.pk))
+
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, PermissionJob.Status.DONE)
+        self.assertEqual(job.result, {"added": 2, "removed": 1})
+        self.assertEqual(list(state.permissions.all()), [permissions[1]])
+
+
+class TestRestoreJob(BaseTestCase):
+    """
+    Test cases for background jobs restoring a snapshot.
+    """
+
+    def setUp(self):
+        """
+        Set up a snapshot and change the permissions after it.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.groups = [Group.objects.create(name=f"Group {i}") for i in range(3)]
+        self.permission = Permission.objects.first()
+
+        for group in self.groups:
+            group.permissions.add(self.permission)
+
+        self.snapshot = take_snapshot()
+
+        for group in self.groups:
+            group.permissions.remove(self.permission)
+
+        self.job = create_job(
+            kind=PermissionJob.Kind.RESTORE,
+            payload={"snapshot_id": self.snapshot.pk},
+            total=self.snapshot.targets,
+        )
+
+    def test_restores_snapshot_in_chunks(self):
+        """
+        Test that every chunk restores its groups and states.
+
+        :return:
+        :rtype:
+        """
+
+        while run_job_chunk(self.job.pk, chunk_size=2):
+            pass
+
+        self.job.refresh_from_db()
+
+        self.assertEqual(self.job.status, PermissionJob.Status.DONE)
+        self.assertEqual(self.job.result, {"added": 3, "removed": 0, "invalid": 0})
+
+        for group in self.groups:
+            self.assertEqual(list(group.permissions.all()), [self.permission])
+
+    def test_fails_for_deleted_snapshot(self):
+        """
+        Test that the job fails when the snapshot has been deleted.
+
+        :return:
+        :rtype:
+        """
+
+        self.snapshot.delete()
+
+        self.assertFalse(run_job_chunk(self.job.pk))
+
+        self.job.refresh_from_db()
+
+        self.assertEqual(self.job.status, PermissionJob.Status.FAILED)
+        self.assertEqual(self.job.error, "Snapshot does not exist")
+
+
+class TestPruneJob(BaseTestCase):
+    """
+    Test cases for background jobs pruning the audit log.
+    """
+
+    def test_deletes_one_batch_per_chunk(self):
+        """
+        Test that every chunk deletes a batch of the payload's chunk size.
+
+        :return:
+        :rtype:
+        """
+
+        for days in (40, 35, 20):
+            PermissionAuditLog.objects.create(
+                timestamp=timezone.now() - timedelta(days=days),
+                target_type="group",
+                target_id=1,
+                permission_id=1,
+                action=PermissionAuditLog.Action.ADD,
+            )
+
+        job = create_job(
+            kind=PermissionJob.Kind.PRUNE,
+            payload={
+                "before": (timezone.now() - timedelta(days=30)).isoformat(),
+                "chunk_size": 1,
+            },
+            total=2,
+        )
+
+        self.assertTrue(run_job_chunk(job.pk))
+        self.assertEqual(PermissionAuditLog.objects.count(), 2)
+        self.assertFalse(run_job_chunk(job.pk))
+
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, PermissionJob.Status.DONE)
+        self.assertEqual(job.result, {"deleted": 2})
+        self.assertEqual(PermissionAuditLog.objects.count(), 1)
+
+
+class TestGetJobStatus(BaseTestCase):
+    """
+    Test cases for get_job_status function.
+    """
+
+    def test_returns_progress(self):
+        """
+        Test that the status holds the progress of the job.
+
+        :return:
+        :rtype:
+        """
+
+        job = PermissionJob.objects.create(
+            kind=PermissionJob.Kind.APPLY,
+            status=PermissionJob.Status.RUNNING,
+            total=4,
+            processed=1,
+        )
+
+        with self.assertNumQueries(1):
+            status = get_job_status(job.pk)
+
+        self.assertEqual(
+            status,
+            {
+                "id": job.pk,
+                "kind": "apply",
+                "status": "running",
+                "processed": 1,
+                "total": 4,
+                "progress": 0.25,
+                "result": {},
+                "error": "",
+            },
+        )
+
+    def test_raises_value_error_for_nonexistent_job(self):
+        """
+        Test that the function raises a ValueError when the job does not exist.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError):
+            get_job_status(999)
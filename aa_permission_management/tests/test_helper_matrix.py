@@ -0,0 +1,152 @@
+"""
+Unit tests for aa_permission_management.helper.matrix
+"""
+
+# Django
+from django.contrib.auth.models import Group
+
+# Alliance Auth
+from allianceauth.authentication.models import State
+
+# AA Permission Management
+from aa_permission_management.helper.catalog import (
+    bump_catalog_version,
+    get_permission_catalog,
+)
+from aa_permission_management.helper.matrix import get_permission_matrix
+from aa_permission_management.tests import BaseTestCase
+
+
+class TestGetPermissionMatrix(BaseTestCase):
+    """
+    Test cases for get_permission_matrix function.
+    """
+
+    def setUp(self):
+        """
+        Set up groups with permissions and a warm permission catalog.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        bump_catalog_version()
+
+        self.catalog = get_permission_catalog()
+        self.groups = [Group.objects.create(name=f"Group {i}") for i in range(3)]
+        self.groups[0].permissions.add(self.catalog[0], self.catalog[2])
+        self.groups[2].permissions.add(self.catalog[1])
+
+    def test_returns_assigned_cells_as_column_indexes(self):
+        """
+        Test that the assigned permissions are returned per row as column indexes.
+
+        :return:
+        :rtype:
+        """
+
+        matrix = get_permission_matrix(
+            target_type="group",
+            row_offset=0,
+            row_limit=10,
+            column_offset=0,
+            column_limit=3,
+        )
+
+        self.assertEqual(matrix["rows"]["total"], 3)
+        self.assertEqual(matrix["rows"]["names"], ["Group 0", "Group 1", "Group 2"])
+        self.assertEqual(matrix["columns"]["total"], len(self.catalog))
+        self.assertEqual(
+            matrix["columns"]["ids"], [permission.pk for permission in self.catalog[:3]]
+        )
+        self.assertEqual(matrix["cells"], [[0, 2], [], [1]])
+
+    def test_pages_rows_and_columns(self):
+        """
+        Test that rows and columns are paged independently.
+
+        :return:
+        :rtype:
+        """
+
+        matrix = get_permission_matrix(
+            target_type="group",
+            row_offset=2,
+            row_limit=1,
+            column_offset=1,
+            column_limit=2,
+        )
+
+        self.assertEqual(matrix["rows"]["ids"], [self.groups[2].pk])
+        self.assertEqual(
+            matrix["columns"]["ids"],
+            [permission.pk for permission in self.catalog[1:3]],
+        )
+        self.assertEqual(matrix["cells"], [[0]])
+
+    def test_filters_columns_by_app_label(self):
+        """
+        Test that the columns can be limited to the permissions of an app label.
+
+        :return:
+        :rtype:
+        """
+
+        matrix = get_permission_matrix(
+            target_type="state",
+            row_offset=0,
+            row_limit=10,
+            column_offset=0,
+            column_limit=500,
+            app_label="aa_permission_management",
+        )
+
+        self.assertIn("aa_permission_management", matrix["app_labels"])
+        self.assertEqual(
+            matrix["columns"]["ids"],
+            [
+                permission.pk
+                for permission in self.catalog
+                if permission.content_type.app_label == "aa_permission_management"
+            ],
+        )
+        self.assertEqual(matrix["rows"]["total"], State.objects.count())
+
+    def test_costs_constant_number_of_queries(self):
+        """
+        Test that a page costs the rows, their count and one bulk fetch of cells.
+
+        :return:
+        :rtype:
+        """
+
+        for group in Group.objects.all():
+            group.permissions.add(*self.catalog[:5])
+
+        with self.assertNumQueries(3):
+            get_permission_matrix(
+                target_type="group",
+                row_offset=0,
+                row_limit=100,
+                column_offset=0,
+                column_limit=100,
+            )
+
+    def test_raises_for_invalid_target_type(self):
+        """
+        Test that an invalid target type raises ValueError.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError):
+            get_permission_matrix(
+                target_type="user",
+                row_offset=0,
+                row_limit=10,
+                column_offset=0,
+                column_limit=10,
+            )
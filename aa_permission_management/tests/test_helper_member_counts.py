@@ -0,0 +1,384 @@
+"""
+Unit tests for aa_permission_management.helper.member_counts
+"""
+
+# Django
+from django.contrib.auth.models import Group
+
+# Alliance Auth
+from allianceauth.authentication.models import State, UserProfile
+from allianceauth.tests.auth_utils import AuthUtils
+
+# AA Permission Management
+from aa_permission_management.helper.member_counts import (
+    adjust_group_member_counts,
+    adjust_state_member_counts,
+    recount_group_member_counts,
+    recount_state_member_counts,
+)
+from aa_permission_management.models import GroupMemberCount, StateMemberCount
+from aa_permission_management.tests import BaseTestCase
+
+
+def _group_count(group: Group) -> int:
+    """
+    Get the member counter of a group.
+
+    :param group:
+    :type group:
+    :return:
+    :rtype:
+    """
+
+    return GroupMemberCount.objects.get(pk=group.pk).count
+
+
+def _state_count(state: State) -> int:
+    """
+    Get the member counter of a state.
+
+    :param state:
+    :type state:
+    :return:
+    :rtype:
+    """
+
+    return StateMemberCount.objects.get(pk=state.pk).count
+
+
+class TestRecountMemberCounts(BaseTestCase):
+    """
+    Test cases for recount_group_member_counts and recount_state_member_counts.
+    """
+
+    def test_recounts_group_members(self):
+        """
+        Test that drifted group counters are repaired.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+        empty_group = Group.objects.create(name="Empty Group")
+        self.user_with_permission.groups.add(group)
+        GroupMemberCount.objects.filter(pk=group.pk).update(count=42)
+        GroupMemberCount.objects.filter(pk=empty_group.pk).delete()
+
+        result = recount_group_member_counts([group.pk, empty_group.pk])
+
+        self.assertEqual(result, {group.pk: 1, empty_group.pk: 0})
+        self.assertEqual(_group_count(group), 1)
+        self.assertEqual(_group_count(empty_group), 0)
+
+    def test_recounts_state_members(self):
+        """
+        Test that drifted state counters are repaired.
+
+        :return:
+        :rtype:
+        """
+
+        state = self.user_with_permission.profile.state
+        StateMemberCount.objects.filter(pk=state.pk).update(count=42)
+
+        recount_state_member_counts([state.pk])
+
+        self.assertEqual(_state_count(state), state.userprofile_set.count())
+
+    def test_does_nothing_without_targets(self):
+        """
+        Test that no queries are made without targets.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertNumQueries(0):
+            recount_group_member_counts([])
+            recount_state_member_counts([])
+
+
+class TestAdjustMemberCounts(BaseTestCase):
+    """
+    Test cases for adjust_group_member_counts and adjust_state_member_counts.
+    """
+
+    def test_adjusts_counters_with_one_update_per_delta(self):
+        """
+        Test that counters with the same delta are adjusted with a single UPDATE.
+
+        :return:
+        :rtype:
+        """
+
+        groups = [Group.objects.create(name=f"Group {i}") for i in range(3)]
+        GroupMemberCount.objects.filter(pk__in=[g.pk for g in groups]).update(count=5)
+
+        with self.assertNumQueries(2):
+            adjust_group_member_counts(
+                {groups[0].pk: 1, groups[1].pk: 1, groups[2].pk: -2}
+            )
+
+        self.assertEqual([_group_count(g) for g in groups], [6, 6, 3])
+
+    def test_never_goes_below_zero(self):
+        """
+        Test that counters are clamped at zero.
+
+        :return:
+        :rtype:
+        """
+
+        state = State.objects.create(name="Test State", priority=500)
+        StateMemberCount.objects.update_or_create(pk=state.pk, defaults={"count": 0})
+
+        adjust_state_member_counts({state.pk: -1})
+
+        self.assertEqual(_state_count(state), 0)
+
+    def test_recounts_targets_without_counter(self):
+        """
+        Test that targets without a counter yet are recounted.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+        self.user_with_permission.groups.add(group)
+        GroupMemberCount.objects.filter(pk=group.pk).delete()
+
+        adjust_group_member_counts({group.pk: 1})
+
+        self.assertEqual(_group_count(group), 1)
+
+
+class TestMemberCountCreationSignals(BaseTestCase):
+    """
+    Test cases for the signals creating the member counters.
+    """
+
+    def test_creates_counters_for_new_groups_and_states(self):
+        """
+        Test that new groups and states start with an empty counter.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+        state = State.objects.create(name="Test State", priority=500)
+
+        self.assertEqual(_group_count(group), 0)
+        self.assertEqual(_state_count(state), 0)
+
+
+class TestGroupMemberCountSignals(BaseTestCase):
+    """
+    Test cases for the signals maintaining the group member counters.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a group.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.group = Group.objects.create(name="Test Group")
+
+    def test_counts_memberships_changed_from_user_side(self):
+        """
+        Test that adding and removing groups of a user updates the counters.
+
+        :return:
+        :rtype:
+        """
+
+        other_group = Group.objects.create(name="Other Group")
+
+        self.user_with_permission.groups.add(self.group, other_group)
+        self.assertEqual(_group_count(self.group), 1)
+        self.assertEqual(_group_count(other_group), 1)
+
+        # Adding an existing membership again doesn't count twice
+        self.user_with_permission.groups.add(self.group)
+        self.assertEqual(_group_count(self.group), 1)
+
+        self.user_with_permission.groups.remove(self.group)
+        self.assertEqual(_group_count(self.group), 0)
+        self.assertEqual(_group_count(other_group), 1)
+
+        self.user_with_permission.groups.clear()
+        self.assertEqual(_group_count(other_group), 0)
+
+    def test_ignores_removal_of_non_members(self):
+        """
+        Test that removing a group the user isn't a member of doesn't change the counter.
+
+        :return:
+        :rtype:
+        """
+
+        self.user_without_permission.groups.add(self.group)
+
+        self.user_with_permission.groups.remove(self.group)
+
+        self.assertEqual(_group_count(self.group), 1)
+
+    def test_counts_memberships_changed_from_group_side(self):
+        """
+        Test that adding and removing members of a group updates the counter.
+
+        :return:
+        :rtype:
+        """
+
+        self.group.user_set.add(self.user_with_permission, self.user_without_permission)
+        self.assertEqual(_group_count(self.group), 2)
+
+        self.group.user_set.remove(self.user_with_permission)
+        self.assertEqual(_group_count(self.group), 1)
+
+        self.group.user_set.set([])
+        self.assertEqual(_group_count(self.group), 0)
+
+    def test_counts_deleted_users(self):
+        """
+        Test that deleting a user updates the counters of its groups.
+
+        :return:
+        :rtype:
+        """
+
+        self.group.user_set.add(self.user_with_permission, self.user_without_permission)
+
+        self.user_without_permission.delete()
+
+        self.assertEqual(_group_count(self.group), 1)
+
+
+class TestStateMemberCountSignals(BaseTestCase):
+    """
+    Test cases for the signals maintaining the state member counters.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with two states.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.state = State.objects.create(name="Test State", priority=500)
+        self.other_state = State.objects.create(name="Other State", priority=600)
+        recount_state_member_counts(State.objects.values_list("pk", flat=True))
+
+    def test_counts_new_user_profiles(self):
+        """
+        Test that new users are counted in their state.
+
+        :return:
+        :rtype:
+        """
+
+        guest_state = UserProfile.objects.first().state
+        count = _state_count(guest_state)
+
+        user = AuthUtils.create_user("New User")
+
+        self.assertEqual(user.profile.state, guest_state)
+        self.assertEqual(_state_count(guest_state), count + 1)
+
+    def test_counts_state_changes(self):
+        """
+        Test that a state change moves the user between the counters.
+
+        :return:
+        :rtype:
+        """
+
+        profile = UserProfile.objects.get(user=self.user_with_permission)
+        old_state = profile.state
+        old_count = _state_count(old_state)
+
+        profile.state = self.state
+        profile.save(update_fields=["state"])
+
+        self.assertEqual(_state_count(old_state), old_count - 1)
+        self.assertEqual(_state_count(self.state), 1)
+
+        profile.state = self.other_state
+        profile.save(update_fields=["state"])
+
+        self.assertEqual(_state_count(self.state), 0)
+        self.assertEqual(_state_count(self.other_state), 1)
+
+    def test_ignores_saves_without_state_change(self):
+        """
+        Test that saving a profile without a state change doesn't change the counters.
+
+        :return:
+        :rtype:
+        """
+
+        profile = UserProfile.objects.get(user=self.user_with_permission)
+        count = _state_count(profile.state)
+
+        profile.save(update_fields=["language"])
+
+        self.assertEqual(_state_count(profile.state), count)
+
+    def test_recounts_states_for_profiles_loaded_without_state(self):
+        """
+        Test that the counters are recounted when the old state is unknown.
+
+        :return:
+        :rtype:
+        """
+
+        profile = UserProfile.objects.only("pk").get(user=self.user_with_permission)
+        profile.state = self.state
+        profile.save(update_fields=["state"])
+
+        self.assertEqual(_state_count(self.state), 1)
+
+    def test_counts_deleted_users(self):
+        """
+        Test that deleting a user updates the counter of its state.
+
+        :return:
+        :rtype:
+        """
+
+        state = self.user_without_permission.profile.state
+        count = _state_count(state)
+
+        self.user_without_permission.delete()
+
+        self.assertEqual(_state_count(state), count - 1)
+
+    def test_recounts_guest_state_when_state_is_deleted(self):
+        """
+        Test that the guest state is recounted when a state is deleted.
+
+        :return:
+        :rtype:
+        """
+
+        profile = UserProfile.objects.get(user=self.user_with_permission)
+        guest_state = UserProfile.objects.get(user=self.user_without_permission).state
+        profile.state = self.state
+        profile.save(update_fields=["state"])
+        guest_count = _state_count(guest_state)
+
+        self.state.delete()
+
+        self.assertEqual(_state_count(guest_state), guest_count + 1)
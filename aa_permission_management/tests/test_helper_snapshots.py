@@ -0,0 +1,274 @@
+"""
+Unit tests for aa_permission_management.helper.snapshots
+"""
+
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission, State
+
+# AA Permission Management
+from aa_permission_management.helper import importer
+from aa_permission_management.helper.catalog import bump_catalog_version
+from aa_permission_management.helper.snapshots import (
+    get_snapshot_diff,
+    get_snapshots,
+    pack_permission_ids,
+    plan_snapshot_restore,
+    restore_snapshot,
+    take_snapshot,
+    unpack_permission_ids,
+)
+from aa_permission_management.models import PermissionAuditLog, PermissionSnapshot
+from aa_permission_management.tests import BaseTestCase
+
+
+class TestPackPermissionIds(BaseTestCase):
+    """
+    Test cases for pack_permission_ids and unpack_permission_ids functions.
+    """
+
+    def test_round_trips_sorted_ids(self):
+        """
+        Test that IDs are packed sorted, four bytes each, and unpacked again.
+
+        :return:
+        :rtype:
+        """
+
+        data = pack_permission_ids([70000, 3, 12])
+
+        self.assertEqual(len(data), 12)
+        self.assertEqual(unpack_permission_ids(data), (3, 12, 70000))
+        self.assertEqual(unpack_permission_ids(memoryview(data)), (3, 12, 70000))
+        self.assertEqual(unpack_permission_ids(pack_permission_ids([])), ())
+
+
+class SnapshotTestCase(BaseTestCase):
+    """
+    Test case with groups and a state holding permissions.
+    """
+
+    def setUp(self):
+        """
+        Set up the groups and the state with their permissions.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        bump_catalog_version()
+
+        self.permissions = list(Permission.objects.order_by("pk")[:3])
+        self.group = Group.objects.create(name="Test Group")
+        self.group.permissions.add(self.permissions[0], self.permissions[1])
+        self.empty_group = Group.objects.create(name="Empty Group")
+        self.state = State.objects.create(name="Test State", priority=20)
+        self.state.permissions.add(self.permissions[2])
+
+
+class TestTakeSnapshot(SnapshotTestCase):
+    """
+    Test cases for take_snapshot and get_snapshots functions.
+    """
+
+    def test_stores_one_packed_entry_per_target(self):
+        """
+        Test that every group and state is stored as one packed entry, including
+        those without permissions.
+
+        :return:
+        :rtype:
+        """
+
+        snapshot = take_snapshot(name="Before", actor=self.user_with_permission)
+        entries = {
+            (target_type, target_id): unpack_permission_ids(permission_ids)
+            for target_type, target_id, permission_ids in snapshot.entries.values_list(
+                "target_type", "target_id", "permission_ids"
+            )
+        }
+
+        self.assertEqual(
+            entries[("group", self.group.pk)],
+            (self.permissions[0].pk, self.permissions[1].pk),
+        )
+        self.assertEqual(entries[("group", self.empty_group.pk)], ())
+        self.assertEqual(entries[("state", self.state.pk)], (self.permissions[2].pk,))
+        self.assertEqual(
+            snapshot.targets, Group.objects.count() + State.objects.count()
+        )
+        self.assertEqual(
+            snapshot.assignments,
+            Group.permissions.through.objects.count()
+            + State.permissions.through.objects.count(),
+        )
+
+    def test_writes_entries_in_chunks(self):
+        """
+        Test that the number of queries depends on the chunks, not the targets.
+
+        :return:
+        :rtype:
+        """
+
+        for i in range(10):
+            Group.objects.create(name=f"Group {i}").permissions.add(*self.permissions)
+
+        with CaptureQueriesContext(connection) as queries:
+            snapshot = take_snapshot(chunk_size=1000)
+
+        inserts = [
+            query
+            for query in queries
+            if query["sql"].startswith("INSERT")
+            and "permissionsnapshotentry" in query["sql"]
+        ]
+
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(snapshot.entries.count(), snapshot.targets)
+
+    def test_lists_newest_snapshots_first(self):
+        """
+        Test that the snapshots are listed newest first, with their creator.
+
+        :return:
+        :rtype:
+        """
+
+        take_snapshot(name="First")
+        take_snapshot(name="Second", actor=self.user_with_permission)
+
+        snapshots = get_snapshots()
+
+        self.assertEqual([row["name"] for row in snapshots], ["Second", "First"])
+        self.assertEqual(snapshots[0]["created_by"], self.user_with_permission.username)
+        self.assertEqual(get_snapshots(limit=1)[0]["name"], "Second")
+
+
+class TestRestoreSnapshot(SnapshotTestCase):
+    """
+    Test cases for restoring snapshots.
+    """
+
+    def test_restores_permissions_through_minimal_diff(self):
+        """
+        Test that only the changes since the snapshot are reverted.
+
+        :return:
+        :rtype:
+        """
+
+        snapshot = take_snapshot()
+        self.group.permissions.remove(self.permissions[1])
+        self.empty_group.permissions.add(self.permissions[0])
+        new_group = Group.objects.create(name="New Group")
+        new_group.permissions.add(self.permissions[0])
+
+        diff = get_snapshot_diff(snapshot=snapshot)
+
+        self.assertTrue(diff["dry_run"])
+        self.assertEqual((diff["added"], diff["removed"]), (1, 1))
+        self.assertEqual(
+            {target["target"] for target in diff["targets"]},
+            {"Test Group", "Empty Group"},
+        )
+
+        report = restore_snapshot(snapshot=snapshot, actor=self.user_with_permission)
+
+        self.assertFalse(report["dry_run"])
+        self.assertEqual(set(self.group.permissions.all()), set(self.permissions[:2]))
+        self.assertFalse(self.empty_group.permissions.exists())
+        # Groups created after the snapshot are left alone
+        self.assertEqual(list(new_group.permissions.all()), [self.permissions[0]])
+        self.assertEqual(
+            PermissionAuditLog.objects.filter(actor=self.user_with_permission).count(),
+            2,
+        )
+        self.assertEqual(get_snapshot_diff(snapshot=snapshot)["added"], 0)
+
+    def test_rolls_back_all_changes_on_failure(self):
+        """
+        Test that a failing chunk rolls back the chunks applied before it.
+
+        :return:
+        :rtype:
+        """
+
+        snapshot = take_snapshot()
+        self.group.permissions.remove(self.permissions[1])
+        self.empty_group.permissions.add(self.permissions[0])
+        apply_permission_changes = importer.apply_permission_changes
+        calls = []
+
+        def fail_second_chunk(**kwargs):
+            calls.append(kwargs)
+
+            if len(calls) > 1:
+                raise RuntimeError("Boom")
+
+            return apply_permission_changes(**kwargs)
+
+        # The removal is applied, adding the permission back fails
+        with (
+            patch.object(
+                importer, "apply_permission_changes", side_effect=fail_second_chunk
+            ),
+            self.assertRaises(RuntimeError),
+        ):
+            restore_snapshot(snapshot=snapshot)
+
+        self.assertEqual(list(self.group.permissions.all()), [self.permissions[0]])
+        self.assertEqual(
+            list(self.empty_group.permissions.all()), [self.permissions[0]]
+        )
+
+    def test_skips_deleted_targets_and_permissions(self):
+        """
+        Test that deleted groups are reported and deleted permissions skipped.
+
+        :return:
+        :rtype:
+        """
+
+        snapshot = take_snapshot()
+        self.empty_group.delete()
+        # A permission ID that doesn't exist anymore
+        entry = snapshot.entries.get(target_type="state", target_id=self.state.pk)
+        entry.permission_ids = pack_permission_ids([self.permissions[2].pk, 999999])
+        entry.save()
+
+        plan = plan_snapshot_restore(snapshot=snapshot)
+
+        self.assertEqual(plan["invalid"], 1)
+        self.assertEqual(plan["errors"][0]["error"], "Deleted group")
+        self.assertEqual(plan["changes"]["state"], {"added": [], "removed": []})
+
+    def test_compares_in_chunks(self):
+        """
+        Test that the diff costs one query per chunk and target type, not per
+        target.
+
+        :return:
+        :rtype:
+        """
+
+        for i in range(10):
+            Group.objects.create(name=f"Group {i}")
+
+        snapshot = PermissionSnapshot.objects.get(pk=take_snapshot().pk)
+
+        # Warm the permission catalog
+        plan_snapshot_restore(snapshot=snapshot)
+
+        # Names, entries, and the assignments of the groups and of the states
+        with self.assertNumQueries(5):
+            plan_snapshot_restore(snapshot=snapshot, chunk_size=1000)
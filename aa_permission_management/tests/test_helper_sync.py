@@ -0,0 +1,245 @@
+"""
+Unit tests for aa_permission_management.helper.sync
+"""
+
+# Standard Library
+import json
+import tempfile
+from pathlib import Path
+
+# Django
+from django.contrib.auth.models import Group
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission, State
+
+# AA Permission Management
+from aa_permission_management.helper.catalog import bump_catalog_version
+from aa_permission_management.helper.importer import apply_import
+from aa_permission_management.helper.sync import load_sync_spec, plan_sync
+from aa_permission_management.tests import BaseTestCase
+
+
+class TestLoadSyncSpec(BaseTestCase):
+    """
+    Test cases for load_sync_spec function.
+    """
+
+    def _write(self, name: str, content: str) -> Path:
+        """
+        Write a spec to a temporary file.
+
+        :param name:
+        :type name:
+        :param content:
+        :type content:
+        :return:
+        :rtype:
+        """
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / name
+        path.write_text(content, encoding="utf-8")
+
+        return path
+
+    def test_loads_yaml_and_json(self):
+        """
+        Test that specs are loaded as JSON or YAML by their file extension.
+
+        :return:
+        :rtype:
+        """
+
+        spec = {"groups": {"Test Group": ["auth.add_user"]}}
+
+        self.assertEqual(
+            load_sync_spec(self._write("spec.json", json.dumps(spec))), spec
+        )
+        self.assertEqual(
+            load_sync_spec(
+                self._write("spec.yml", "groups:\n  Test Group:\n    - auth.add_user\n")
+            ),
+            spec,
+        )
+
+    def test_raises_value_error_for_invalid_spec(self):
+        """
+        Test that an unparsable spec raises ValueError.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError):
+            load_sync_spec(self._write("spec.json", "{"))
+
+        with self.assertRaises(ValueError):
+            load_sync_spec(self._write("spec.yaml", "groups: [a"))
+
+
+class TestPlanSync(BaseTestCase):
+    """
+    Test cases for plan_sync function.
+    """
+
+    def setUp(self):
+        """
+        Set up a group and a state with permissions, and a warm permission catalog.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        bump_catalog_version()
+
+        self.permission = Permission.objects.get(
+            codename="access_permission_management"
+        )
+        self.other_permission = Permission.objects.get(
+            content_type__app_label="auth", codename="add_user"
+        )
+        self.group = Group.objects.create(name="Test Group")
+        self.group.permissions.add(self.other_permission)
+        self.other_group = Group.objects.create(name="Other Group")
+        self.other_group.permissions.add(self.other_permission)
+        self.state = State.objects.create(name="Test State", priority=20)
+        self.state.permissions.add(self.permission)
+
+    def test_replaces_permissions_of_listed_targets(self):
+        """
+        Test that listed targets get exactly the listed permissions, and unlisted
+        targets are left alone.
+
+        :return:
+        :rtype:
+        """
+
+        plan = plan_sync(
+            spec={
+                "groups": {
+                    "Test Group": [
+                        "aa_permission_management.access_permission_management"
+                    ]
+                },
+                "states": {"Test State": None},
+            }
+        )
+
+        self.assertEqual(plan["errors"], [])
+        self.assertEqual(
+            plan["changes"],
+            {
+                "group": {
+                    "added": [(self.group.pk, self.permission.pk)],
+                    "removed": [(self.group.pk, self.other_permission.pk)],
+                },
+                "state": {
+                    "added": [],
+                    "removed": [(self.state.pk, self.permission.pk)],
+                },
+            },
+        )
+
+        apply_import(plan=plan)
+
+        self.assertEqual(list(self.group.permissions.all()), [self.permission])
+        self.assertFalse(self.state.permissions.exists())
+        self.assertEqual(
+            list(self.other_group.permissions.all()), [self.other_permission]
+        )
+
+    def test_resolves_permissions_with_model(self):
+        """
+        Test that permissions can be given as app_label.model.codename.
+
+        :return:
+        :rtype:
+        """
+
+        plan = plan_sync(spec={"groups": {"Other Group": ["auth.user.add_user"]}})
+
+        self.assertEqual(plan["errors"], [])
+        self.assertEqual(plan["changes"]["group"], {"added": [], "removed": []})
+
+    def test_reports_unknown_targets_and_permissions(self):
+        """
+        Test that unknown groups, states and permissions are reported.
+
+        :return:
+        :rtype:
+        """
+
+        plan = plan_sync(
+            spec={
+                "groups": {"Nope": ["auth.add_user"], "Test Group": ["auth.nope"]},
+                "states": {"Nope": []},
+            }
+        )
+
+        self.assertEqual(
+            plan["errors"],
+            [
+                {"target": "Nope", "error": "Unknown group"},
+                {
+                    "target": "Test Group",
+                    "permission": "auth.nope",
+                    "error": "Unknown permission",
+                },
+                {"target": "Nope", "error": "Unknown state"},
+            ],
+        )
+
+    def test_raises_value_error_for_malformed_spec(self):
+        """
+        Test that a spec of the wrong shape raises ValueError.
+
+        :return:
+        :rtype:
+        """
+
+        for spec in (
+            [],
+            {"users": {}},
+            {"groups": ["Test Group"]},
+            {"groups": {"Test Group": "auth.add_user"}},
+        ):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    plan_sync(spec=spec)
+
+    def test_reads_synced_database_in_few_queries(self):
+        """
+        Test that a database already in sync costs the target names and one
+        query per target type.
+
+        :return:
+        :rtype:
+        """
+
+        spec = {
+            "groups": {
+                "Test Group": ["auth.add_user"],
+                "Other Group": ["auth.add_user"],
+            },
+            "states": {
+                "Test State": ["aa_permission_management.access_permission_management"]
+            },
+        }
+
+        # Warm the permission catalog
+        plan_sync(spec={})
+
+        with self.assertNumQueries(4):
+            plan = plan_sync(spec=spec)
+
+        self.assertEqual(
+            plan["changes"],
+            {
+                "group": {"added": [], "removed": []},
+                "state": {"added": [], "removed": []},
+            },
+        )
@@ -0,0 +1,278 @@
+"""
+Unit tests for aa_permission_management.helper.versions
+"""
+
+# Django
+from django.contrib.auth.models import Group
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission, State
+
+# AA Permission Management
+from aa_permission_management.helper.versions import (
+    PermissionSetVersionConflict,
+    bump_permission_set_versions,
+    compare_and_bump_permission_set_version,
+    get_permission_set_version,
+)
+from aa_permission_management.models import PermissionSetVersion
+from aa_permission_management.tests import BaseTestCase
+
+
+class TestGetPermissionSetVersion(BaseTestCase):
+    """
+    Test cases for get_permission_set_version function.
+    """
+
+    def test_returns_zero_for_target_without_version(self):
+        """
+        Test that a target without a version row is at version 0.
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(
+            get_permission_set_version(target_type="group", target_id=999), 0
+        )
+
+    def test_returns_stored_version(self):
+        """
+        Test that the stored version is returned.
+
+        :return:
+        :rtype:
+        """
+
+        PermissionSetVersion.objects.create(
+            target_type="state", target_id=1, version=42
+        )
+
+        self.assertEqual(
+            get_permission_set_version(target_type="state", target_id=1), 42
+        )
+
+
+class TestBumpPermissionSetVersions(BaseTestCase):
+    """
+    Test cases for bump_permission_set_versions function.
+    """
+
+    def test_creates_missing_versions(self):
+        """
+        Test that targets without a version row get one.
+
+        :return:
+        :rtype:
+        """
+
+        bump_permission_set_versions(target_type="group", target_ids=[1, 2])
+
+        self.assertEqual(
+            get_permission_set_version(target_type="group", target_id=1), 1
+        )
+        self.assertEqual(
+            get_permission_set_version(target_type="group", target_id=2), 1
+        )
+
+    def test_bumps_existing_versions_in_a_single_query(self):
+        """
+        Test that existing versions are bumped with a single UPDATE.
+
+        :return:
+        :rtype:
+        """
+
+        PermissionSetVersion.objects.create(target_type="group", target_id=1, version=3)
+        PermissionSetVersion.objects.create(target_type="group", target_id=2, version=7)
+
+        with self.assertNumQueries(1):
+            bump_permission_set_versions(target_type="group", target_ids=[1, 2])
+
+        self.assertEqual(
+            get_permission_set_version(target_type="group", target_id=1), 4
+        )
+        self.assertEqual(
+            get_permission_set_version(target_type="group", target_id=2), 8
+        )
+
+    def test_does_nothing_without_targets(self):
+        """
+        Test that no queries are made without targets.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertNumQueries(0):
+            bump_permission_set_versions(target_type="group", target_ids=[])
+
+    def test_does_not_bump_other_target_type(self):
+        """
+        Test that only the given target type is bumped.
+
+        :return:
+        :rtype:
+        """
+
+        PermissionSetVersion.objects.create(target_type="state", target_id=1, version=3)
+
+        bump_permission_set_versions(target_type="group", target_ids=[1])
+
+        self.assertEqual(
+            get_permission_set_version(target_type="state", target_id=1), 3
+        )
+
+
+class TestCompareAndBumpPermissionSetVersion(BaseTestCase):
+    """
+    Test cases for compare_and_bump_permission_set_version function.
+    """
+
+    def test_bumps_current_version(self):
+        """
+        Test that the version is bumped when it is still current.
+
+        :return:
+        :rtype:
+        """
+
+        PermissionSetVersion.objects.create(target_type="group", target_id=1, version=3)
+
+        with self.assertNumQueries(1):
+            version = compare_and_bump_permission_set_version("group", 1, version=3)
+
+        self.assertEqual(version, 4)
+        self.assertEqual(get_permission_set_version("group", 1), 4)
+
+    def test_bumps_initial_version_of_target_without_version(self):
+        """
+        Test that a target without a version row is at version 0.
+
+        :return:
+        :rtype:
+        """
+
+        version = compare_and_bump_permission_set_version("state", 1, version=0)
+
+        self.assertEqual(version, 1)
+        self.assertEqual(get_permission_set_version("state", 1), 1)
+
+    def test_raises_conflict_with_current_version_for_stale_version(self):
+        """
+        Test that a stale version is rejected with the current version.
+
+        :return:
+        :rtype:
+        """
+
+        PermissionSetVersion.objects.create(target_type="group", target_id=1, version=5)
+
+        with self.assertRaises(PermissionSetVersionConflict) as context:
+            compare_and_bump_permission_set_version("group", 1, version=4)
+
+        self.assertEqual(context.exception.version, 5)
+        self.assertEqual(get_permission_set_version("group", 1), 5)
+
+
+class TestPermissionSetVersionSignals(BaseTestCase):
+    """
+    Test cases for the signals bumping the permission set versions.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a group, a state and some permissions.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.group = Group.objects.create(name="Test Group")
+        self.state = State.objects.get(name="Guest")
+        self.permissions = list(Permission.objects.all()[:2])
+
+    def test_bumps_group_version_when_permissions_change(self):
+        """
+        Test that adding and removing group permissions bumps the version.
+
+        :return:
+        :rtype:
+        """
+
+        self.group.permissions.add(*self.permissions)
+        self.assertEqual(
+            get_permission_set_version(target_type="group", target_id=self.group.pk),
+            1,
+        )
+
+        self.group.permissions.remove(self.permissions[0])
+        self.assertEqual(
+            get_permission_set_version(target_type="group", target_id=self.group.pk),
+            2,
+        )
+
+        self.group.permissions.set([])
+        self.assertEqual(
+            get_permission_set_version(target_type="group", target_id=self.group.pk),
+            3,
+        )
+
+    def test_bumps_state_version_when_permissions_are_set(self):
+        """
+        Test that setting state permissions bumps the version.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_permission_set_version(
+            target_type="state", target_id=self.state.pk
+        )
+
+        self.state.permissions.set(self.permissions)
+
+        self.assertGreater(
+            get_permission_set_version(target_type="state", target_id=self.state.pk),
+            version,
+        )
+
+    def test_bumps_group_version_when_changed_from_permission_side(self):
+        """
+        Test that changes made from the permission's side bump the group version.
+
+        :return:
+        :rtype:
+        """
+
+        permission = self.permissions[0]
+
+        permission.group_set.add(self.group)
+        self.assertEqual(
+            get_permission_set_version(target_type="group", target_id=self.group.pk),
+            1,
+        )
+
+        permission.group_set.remove(self.group)
+        self.assertEqual(
+            get_permission_set_version(target_type="group", target_id=self.group.pk),
+            2,
+        )
+
+    def test_bumps_version_when_group_is_deleted(self):
+        """
+        Test that deleting a group bumps its version.
+
+        :return:
+        :rtype:
+        """
+
+        group_id = self.group.pk
+
+        self.group.delete()
+
+        self.assertEqual(
+            get_permission_set_version(target_type="group", target_id=group_id), 1
+        )
@@ -5,19 +5,37 @@ Unit tests for aa_permission_management.helper.views
 # Standard Library
 from unittest.mock import MagicMock, patch
 
+# Django
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.db.models.signals import m2m_changed
+from django.test.utils import CaptureQueriesContext
+
 # Alliance Auth
 from allianceauth.authentication.models import Permission, State
 from allianceauth.groupmanagement.models import AuthGroup
 
 # AA Permission Management
+from aa_permission_management.helper.catalog import bump_catalog_version
+from aa_permission_management.helper.versions import (
+    PermissionSetVersionConflict,
+    get_permission_set_version,
+)
 from aa_permission_management.helper.views import (
     _get_permissions_to_set,
+    apply_permission_changes,
+    apply_permissions,
     get_all_permissions,
+    get_group_permission_ids,
     get_group_permissions,
+    get_state_permission_ids,
     get_state_permissions,
     set_group_permissions,
     set_state_permissions,
+    update_group_permissions,
+    update_state_permissions,
 )
+from aa_permission_management.models import PermissionAuditLog
 from aa_permission_management.tests import BaseTestCase
 
 
@@ -34,13 +52,35 @@ class TestGetGroupPermissions(BaseTestCase):
         :rtype:
         """
 
-        mock_group = MagicMock()
-        mock_group.group.permissions.all.return_value = ["perm1", "perm2"]
-        AuthGroup.objects.get = MagicMock(return_value=mock_group)
+        group = Group.objects.create(name="Test Group")
+        permissions = list(Permission.objects.all()[:2])
+        group.permissions.set(permissions)
+
+        result = get_group_permissions(group.pk)
+
+        self.assertEqual(set(result), set(permissions))
+
+    def test_returns_hydrated_and_ordered_permissions(self):
+        """
+        Test that the function returns permissions with their content types,
+        ordered by app label, model and codename.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+        group.permissions.set(Permission.objects.all()[:10])
+
+        result = get_group_permissions(group.pk)
 
-        result = get_group_permissions(1)
+        with self.assertNumQueries(0):
+            keys = [
+                (p.content_type.app_label, p.content_type.model, p.codename)
+                for p in result
+            ]
 
-        self.assertEqual(result, ["perm1", "perm2"])
+        self.assertEqual(keys, sorted(keys))
 
     def test_raises_value_error_for_nonexistent_group(self):
         """
@@ -50,14 +90,48 @@ class TestGetGroupPermissions(BaseTestCase):
         :rtype:
         """
 
-        AuthGroup.objects.get = MagicMock(side_effect=AuthGroup.DoesNotExist)
-
         with self.assertRaises(ValueError) as context:
             get_group_permissions(999)
 
         self.assertEqual(str(context.exception), "Group does not exist")
 
 
+class TestGetGroupPermissionIds(BaseTestCase):
+    """
+    Test cases for get_group_permission_ids function.
+    """
+
+    def test_returns_permission_ids_for_existing_group(self):
+        """
+        Test that the function returns the sorted permission IDs of a group.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+        permissions = list(Permission.objects.all()[:3])
+        group.permissions.set(permissions)
+
+        with self.assertNumQueries(2):
+            result = get_group_permission_ids(group.pk)
+
+        self.assertEqual(result, sorted(p.pk for p in permissions))
+
+    def test_raises_value_error_for_nonexistent_group(self):
+        """
+        Test that the function raises a ValueError when the group does not exist.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError) as context:
+            get_group_permission_ids(999)
+
+        self.assertEqual(str(context.exception), "Group does not exist")
+
+
 class TestSetGroupPermissions(BaseTestCase):
     """
     Test cases for set_group_permissions function.
@@ -71,13 +145,62 @@ class TestSetGroupPermissions(BaseTestCase):
         :rtype:
         """
 
-        mock_group = MagicMock()
-        AuthGroup.objects.get = MagicMock(return_value=mock_group)
+        group = Group.objects.create(name="Test Group")
+        permissions = list(Permission.objects.all()[:3])
+        group.permissions.add(permissions[0], Permission.objects.last())
 
-        set_group_permissions(1, ["perm1", "perm2"])
+        result = set_group_permissions(
+            group.pk, [str(permission.pk) for permission in permissions]
+        )
+
+        self.assertEqual(set(group.permissions.all()), set(permissions))
+        self.assertEqual(result["added"], 2)
+        self.assertEqual(result["removed"], 1)
+        self.assertEqual(result["count"], 3)
+
+    def test_records_changes_in_audit_log(self):
+        """
+        Test that every added and removed permission is recorded with its actor.
 
-        mock_group.group.permissions.set.assert_called_once_with(["perm1", "perm2"])
-        mock_group.group.save.assert_called_once()
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+        permissions = list(Permission.objects.all()[:3])
+        group.permissions.add(permissions[0])
+
+        set_group_permissions(
+            group.pk, permissions[1:], actor=self.user_with_permission
+        )
+
+        self.assertEqual(
+            set(
+                PermissionAuditLog.objects.values_list(
+                    "actor", "target_type", "target_id", "permission_id", "action"
+                )
+            ),
+            {
+                (self.user_with_permission.pk, "group", group.pk, permissions[0].pk, 2),
+                (self.user_with_permission.pk, "group", group.pk, permissions[1].pk, 1),
+                (self.user_with_permission.pk, "group", group.pk, permissions[2].pk, 1),
+            },
+        )
+
+    def test_does_not_save_group(self):
+        """
+        Test that the group itself isn't saved.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+
+        with patch.object(Group, "save") as mock_save:
+            set_group_permissions(group.pk, Permission.objects.all()[:2])
+
+        mock_save.assert_not_called()
 
     def test_raises_value_error_for_nonexistent_group(self):
         """
@@ -108,16 +231,35 @@ class TestGetStatePermissions(BaseTestCase):
         :rtype:
         """
 
-        mock_state = MagicMock()
-        mock_state.permissions.all.return_value = ["perm1", "perm2"]
+        state = State.objects.get(name="Guest")
+        permissions = list(Permission.objects.all()[:2])
+        state.permissions.set(permissions)
 
-        with patch(
-            "allianceauth.authentication.models.State.objects.get",
-            return_value=mock_state,
-        ):
-            result = get_state_permissions(2)
+        result = get_state_permissions(state.pk)
+
+        self.assertEqual(set(result), set(permissions))
+
+    def test_returns_hydrated_and_ordered_permissions(self):
+        """
+        Test that the function returns permissions with their content types,
+        ordered by app label, model and codename.
+
+        :return:
+        :rtype:
+        """
+
+        state = State.objects.get(name="Guest")
+        state.permissions.set(Permission.objects.all()[:10])
+
+        result = get_state_permissions(state.pk)
+
+        with self.assertNumQueries(0):
+            keys = [
+                (p.content_type.app_label, p.content_type.model, p.codename)
+                for p in result
+            ]
 
-        self.assertEqual(result, ["perm1", "perm2"])
+        self.assertEqual(keys, sorted(keys))
 
     def test_raises_value_error_for_nonexistent_state(self):
         """
@@ -137,6 +279,42 @@ class TestGetStatePermissions(BaseTestCase):
         self.assertEqual(str(context.exception), "State does not exist")
 
 
+class TestGetStatePermissionIds(BaseTestCase):
+    """
+    Test cases for get_state_permission_ids function.
+    """
+
+    def test_returns_permission_ids_for_existing_state(self):
+        """
+        Test that the function returns the sorted permission IDs of a state.
+
+        :return:
+        :rtype:
+        """
+
+        state = State.objects.get(name="Guest")
+        permissions = list(Permission.objects.all()[:3])
+        state.permissions.set(permissions)
+
+        with self.assertNumQueries(2):
+            result = get_state_permission_ids(state.pk)
+
+        self.assertEqual(result, sorted(p.pk for p in permissions))
+
+    def test_raises_value_error_for_nonexistent_state(self):
+        """
+        Test that the function raises a ValueError when the state does not exist.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError) as context:
+            get_state_permission_ids(999)
+
+        self.assertEqual(str(context.exception), "State does not exist")
+
+
 class TestSetStatePermissions(BaseTestCase):
     """
     Test cases for set_state_permissions function.
@@ -191,6 +369,546 @@ class TestSetStatePermissions(BaseTestCase):
 
         self.assertEqual(set(state.permissions.all()), set())
 
+    def test_rejects_permissions_based_on_stale_version(self):
+        """
+        Test that permissions based on a stale version are not set.
+
+        :return:
+        :rtype:
+        """
+
+        state = State.objects.get(name="Guest")
+        permissions = Permission.objects.all()[:2]
+        version = get_permission_set_version("state", state.pk)
+        state.permissions.add(permissions[0])
+
+        with self.assertRaises(PermissionSetVersionConflict):
+            set_state_permissions(
+                state_id=state.pk, permissions=set(permissions), version=version
+            )
+
+        self.assertEqual(list(state.permissions.all()), [permissions[0]])
+
+    def test_does_not_save_state(self):
+        """
+        Test that the state isn't saved, which would check the state of all users.
+
+        :return:
+        :rtype:
+        """
+
+        state = State.objects.get(name="Guest")
+
+        with patch.object(State, "save") as mock_save:
+            set_state_permissions(
+                state_id=state.pk, permissions=Permission.objects.all()[:2]
+            )
+
+        mock_save.assert_not_called()
+
+
+class TestUpdateGroupPermissions(BaseTestCase):
+    """
+    Test cases for update_group_permissions function.
+    """
+
+    def setUp(self):
+        """
+        Set up a group with some permissions.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.group = Group.objects.create(name="Test Group")
+        self.permissions = list(Permission.objects.all()[:4])
+        self.group.permissions.add(*self.permissions[:2])
+
+    def test_adds_and_removes_permissions(self):
+        """
+        Test that the delta is applied and reported with the new version.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_permission_set_version("group", self.group.pk)
+
+        result = update_group_permissions(
+            self.group.pk,
+            add=[permission.pk for permission in self.permissions[2:]],
+            remove=[self.permissions[0].pk],
+        )
+
+        self.assertEqual(set(self.group.permissions.all()), set(self.permissions[1:]))
+        self.assertEqual(result["added"], 2)
+        self.assertEqual(result["removed"], 1)
+        self.assertEqual(result["count"], 3)
+        self.assertGreater(result["version"], version)
+        self.assertEqual(
+            result["version"], get_permission_set_version("group", self.group.pk)
+        )
+
+    def test_skips_unchanged_and_unknown_permissions(self):
+        """
+        Test that assigned, unassigned and unknown permissions are skipped.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_permission_set_version("group", self.group.pk)
+
+        result = update_group_permissions(
+            self.group.pk,
+            add=[self.permissions[0].pk, 999999],
+            remove=[self.permissions[3].pk],
+        )
+
+        self.assertEqual(result["added"], 0)
+        self.assertEqual(result["removed"], 0)
+        self.assertEqual(result["count"], 2)
+        self.assertEqual(result["version"], version)
+
+    def test_writes_delta_in_constant_number_of_queries(self):
+        """
+        Test that the number of queries doesn't depend on the size of the delta.
+
+        :return:
+        :rtype:
+        """
+
+        small_group = Group.objects.create(name="Small Group")
+        group = Group.objects.create(name="Large Group")
+        permission_ids = list(Permission.objects.values_list("pk", flat=True)[:50])
+
+        with CaptureQueriesContext(connection) as small:
+            update_group_permissions(small_group.pk, add=[permission_ids[-1]])
+
+        with CaptureQueriesContext(connection) as large:
+            update_group_permissions(group.pk, add=permission_ids)
+
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(group.permissions.count(), 50)
+
+    def test_sends_m2m_changed_with_changed_permissions(self):
+        """
+        Test that m2m_changed is sent with the permissions actually changed.
+
+        :return:
+        :rtype:
+        """
+
+        received = []
+
+        def receiver(sender, instance, action, pk_set, **kwargs):
+            received.append((instance.pk, action, set(pk_set)))
+
+        m2m_changed.connect(receiver, sender=Group.permissions.through)
+
+        try:
+            update_group_permissions(
+                self.group.pk,
+                add=[self.permissions[2].pk],
+                remove=[self.permissions[0].pk, self.permissions[3].pk],
+            )
+        finally:
+            m2m_changed.disconnect(receiver, sender=Group.permissions.through)
+
+        self.assertEqual(
+            received,
+            [
+                (self.group.pk, "pre_remove", {self.permissions[0].pk}),
+                (self.group.pk, "post_remove", {self.permissions[0].pk}),
+                (self.group.pk, "pre_add", {self.permissions[2].pk}),
+                (self.group.pk, "post_add", {self.permissions[2].pk}),
+            ],
+        )
+
+    def test_applies_delta_based_on_current_version(self):
+        """
+        Test that a delta based on the current version is applied.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_permission_set_version("group", self.group.pk)
+
+        result = update_group_permissions(
+            self.group.pk, add=[self.permissions[2].pk], version=version
+        )
+
+        self.assertEqual(result["added"], 1)
+        self.assertGreater(result["version"], version)
+
+    def test_rejects_delta_based_on_stale_version(self):
+        """
+        Test that a delta based on a stale version is rejected without changes.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_permission_set_version("group", self.group.pk)
+        self.group.permissions.add(self.permissions[3])
+
+        with self.assertRaises(PermissionSetVersionConflict):
+            update_group_permissions(
+                self.group.pk, remove=[self.permissions[0].pk], version=version
+            )
+
+        self.assertIn(self.permissions[0], self.group.permissions.all())
+
+    def test_raises_value_error_for_overlapping_delta(self):
+        """
+        Test that a permission can't be added and removed at once.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError):
+            update_group_permissions(
+                self.group.pk,
+                add=[self.permissions[2].pk],
+                remove=[self.permissions[2].pk],
+            )
+
+    def test_raises_value_error_for_nonexistent_group(self):
+        """
+        Test that the function raises a ValueError when the group does not exist.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError) as context:
+            update_group_permissions(999, add=[self.permissions[2].pk])
+
+        self.assertEqual(str(context.exception), "Group does not exist")
+
+
+class TestUpdateStatePermissions(BaseTestCase):
+    """
+    Test cases for update_state_permissions function.
+    """
+
+    def test_adds_and_removes_permissions(self):
+        """
+        Test that the delta is applied to the state.
+
+        :return:
+        :rtype:
+        """
+
+        state = State.objects.get(name="Guest")
+        permissions = list(Permission.objects.all()[:3])
+        state.permissions.add(permissions[0])
+
+        result = update_state_permissions(
+            state.pk,
+            add=[permissions[1], permissions[2]],
+            remove=[permissions[0]],
+        )
+
+        self.assertEqual(set(state.permissions.all()), set(permissions[1:]))
+        self.assertEqual(result["added"], 2)
+        self.assertEqual(result["removed"], 1)
+        self.assertEqual(result["count"], 2)
+
+    def test_raises_value_error_for_nonexistent_state(self):
+        """
+        Test that the function raises a ValueError when the state does not exist.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError) as context:
+            update_state_permissions(999, add=[Permission.objects.first().pk])
+
+        self.assertEqual(str(context.exception), "State does not exist")
+
+
+class TestApplyPermissions(BaseTestCase):
+    """
+    Test cases for apply_permissions function.
+    """
+
+    def setUp(self):
+        """
+        Set up groups and permissions.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.groups = [Group.objects.create(name=f"Group {i}") for i in range(3)]
+        self.state = State.objects.get(name="Guest")
+        self.permissions = list(Permission.objects.all()[:3])
+        self.groups[0].permissions.add(self.permissions[0], self.permissions[2])
+
+    def test_applies_delta_to_groups_and_states(self):
+        """
+        Test that the delta is applied to all targets and reported per target.
+
+        :return:
+        :rtype:
+        """
+
+        result = apply_permissions(
+            group_ids=[group.pk for group in self.groups],
+            state_ids=[self.state.pk],
+            add=[self.permissions[0].pk, self.permissions[1].pk],
+            remove=[self.permissions[2].pk],
+        )
+
+        for group in self.groups:
+            self.assertEqual(set(group.permissions.all()), set(self.permissions[:2]))
+
+        self.assertEqual(
+            result["groups"][self.groups[0].pk],
+            {
+                "added": 1,
+                "removed": 1,
+                "version": get_permission_set_version("group", self.groups[0].pk),
+            },
+        )
+        self.assertEqual(result["groups"][self.groups[1].pk]["added"], 2)
+        self.assertEqual(result["states"][self.state.pk]["added"], 2)
+        self.assertEqual(result["added"], 7)
+        self.assertEqual(result["removed"], 1)
+
+    def test_reports_only_changed_targets(self):
+        """
+        Test that targets without changes are neither reported nor bumped.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_permission_set_version("group", self.groups[0].pk)
+
+        result = apply_permissions(
+            group_ids=[self.groups[0].pk, self.groups[1].pk],
+            add=[self.permissions[0].pk],
+        )
+
+        self.assertEqual(list(result["groups"]), [self.groups[1].pk])
+        self.assertEqual(
+            get_permission_set_version("group", self.groups[0].pk), version
+        )
+
+    def test_records_changes_in_audit_log(self):
+        """
+        Test that the changes of all targets are recorded with their actor.
+
+        :return:
+        :rtype:
+        """
+
+        permission = self.permissions[1]
+        state = State.objects.create(name="Test State", priority=1)
+
+        apply_permissions(
+            group_ids=[group.pk for group in self.groups],
+            state_ids=[state.pk],
+            add=[permission.pk],
+            actor=self.user_with_permission,
+        )
+
+        self.assertEqual(
+            set(
+                PermissionAuditLog.objects.values_list(
+                    "actor", "target_type", "target_id", "permission_id", "action"
+                )
+            ),
+            {
+                (self.user_with_permission.pk, "group", group.pk, permission.pk, 1)
+                for group in self.groups
+            }
+            | {(self.user_with_permission.pk, "state", state.pk, permission.pk, 1)},
+        )
+
+    def test_applies_delta_in_constant_number_of_queries(self):
+        """
+        Test that the number of queries doesn't depend on the number of targets.
+
+        :return:
+        :rtype:
+        """
+
+        many_groups = [Group.objects.create(name=f"Many {i}") for i in range(30)]
+        few_groups = [Group.objects.create(name=f"Few {i}") for i in range(2)]
+        # Stays below SQLite's limit of query parameters, which splits the INSERTs
+        permission_ids = list(Permission.objects.values_list("pk", flat=True)[:3])
+
+        with CaptureQueriesContext(connection) as few:
+            apply_permissions(
+                group_ids=[group.pk for group in few_groups], add=permission_ids
+            )
+
+        with CaptureQueriesContext(connection) as many:
+            apply_permissions(
+                group_ids=[group.pk for group in many_groups], add=permission_ids
+            )
+
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(many_groups[-1].permissions.count(), 3)
+
+    def test_validates_services_of_members_after_removing_access_permission(self):
+        """
+        Test that services are validated when a service access permission is removed.
+
+        :return:
+        :rtype:
+        """
+
+        permission = self.permissions[0]
+        service = MagicMock()
+        service.access_perm = (
+            f"{permission.content_type.app_label}.{permission.codename}"
+        )
+        self.user_with_permission.groups.add(self.groups[0])
+
+        with patch(
+            "aa_permission_management.helper.views.ServicesHook.get_services",
+            return_value=[service],
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                apply_permissions(group_ids=[self.groups[0].pk], remove=[permission.pk])
+
+        service.validate_user.assert_called_once_with(self.user_with_permission)
+
+    def test_does_not_validate_services_for_other_permissions(self):
+        """
+        Test that services aren't validated when no service permission is removed.
+
+        :return:
+        :rtype:
+        """
+
+        service = MagicMock()
+        service.access_perm = "example.access_example"
+        self.user_with_permission.groups.add(self.groups[0])
+
+        with patch(
+            "aa_permission_management.helper.views.ServicesHook.get_services",
+            return_value=[service],
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                apply_permissions(
+                    group_ids=[self.groups[0].pk], remove=[self.permissions[0].pk]
+                )
+
+        service.validate_user.assert_not_called()
+
+    def test_raises_value_error_for_nonexistent_target(self):
+        """
+        Test that nothing is changed when one of the targets doesn't exist.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ValueError) as context:
+            apply_permissions(
+                group_ids=[self.groups[1].pk, 999], add=[self.permissions[1].pk]
+            )
+
+        self.assertEqual(str(context.exception), "Group does not exist")
+        self.assertFalse(self.groups[1].permissions.exists())
+
+
+class TestApplyPermissionChanges(BaseTestCase):
+    """
+    Test cases for apply_permission_changes function.
+    """
+
+    def setUp(self):
+        """
+        Set up groups and permissions.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.groups = [Group.objects.create(name=f"Group {i}") for i in range(2)]
+        self.permissions = list(Permission.objects.all()[:3])
+        self.groups[0].permissions.add(self.permissions[0])
+
+    def test_applies_individual_changes_per_target(self):
+        """
+        Test that every target gets its own changes and no-ops are skipped.
+
+        :return:
+        :rtype:
+        """
+
+        result = apply_permission_changes(
+            target_type="group",
+            added=[
+                (self.groups[0].pk, self.permissions[0].pk),
+                (self.groups[0].pk, self.permissions[1].pk),
+                (self.groups[1].pk, self.permissions[2].pk),
+            ],
+            removed=[
+                (self.groups[0].pk, self.permissions[2].pk),
+            ],
+            actor=self.user_with_permission,
+        )
+
+        self.assertEqual(result, {"added": 2, "removed": 0, "targets": 2})
+        self.assertEqual(
+            set(self.groups[0].permissions.all()), set(self.permissions[:2])
+        )
+        self.assertEqual(set(self.groups[1].permissions.all()), {self.permissions[2]})
+        self.assertEqual(PermissionAuditLog.objects.count(), 2)
+
+    def test_removes_permissions_and_bumps_versions(self):
+        """
+        Test that removed permissions are deleted and the version is bumped.
+
+        :return:
+        :rtype:
+        """
+
+        version = get_permission_set_version("group", self.groups[0].pk)
+
+        result = apply_permission_changes(
+            target_type="group",
+            removed=[(self.groups[0].pk, self.permissions[0].pk)],
+        )
+
+        self.assertEqual(result, {"added": 0, "removed": 1, "targets": 1})
+        self.assertFalse(self.groups[0].permissions.exists())
+        self.assertNotEqual(
+            get_permission_set_version("group", self.groups[0].pk), version
+        )
+
+    def test_raises_value_error_for_invalid_input(self):
+        """
+        Test that an invalid target type or overlapping changes raise ValueError.
+
+        :return:
+        :rtype:
+        """
+
+        pair = (self.groups[1].pk, self.permissions[1].pk)
+
+        with self.assertRaises(ValueError):
+            apply_permission_changes(target_type="user", added=[pair])
+
+        with self.assertRaises(ValueError):
+            apply_permission_changes(target_type="group", added=[pair], removed=[pair])
+
 
 class TestGetPermissionsToSet(BaseTestCase):
     """
@@ -266,6 +984,18 @@ class TestGetAllPermissions(BaseTestCase):
     Test cases for get_all_permissions function.
     """
 
+    def setUp(self):
+        """
+        Set up the test case with an invalidated permission catalog.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        bump_catalog_version()
+
     def test_returns_all_permissions(self):
         """
         Test that the function returns all permissions.
@@ -274,15 +1004,28 @@ class TestGetAllPermissions(BaseTestCase):
         :rtype:
         """
 
-        mock_permissions = ["perm1", "perm2", "perm3"]
+        result = get_all_permissions()
 
-        with patch(
-            "allianceauth.authentication.models.Permission.objects.all",
-            return_value=mock_permissions,
-        ):
-            result = get_all_permissions()
+        self.assertEqual(set(result), set(Permission.objects.all()))
+
+    def test_returns_hydrated_and_ordered_permissions(self):
+        """
+        Test that the function returns permissions with their content types,
+        ordered by app label, model and codename.
+
+        :return:
+        :rtype:
+        """
+
+        result = get_all_permissions()
+
+        with self.assertNumQueries(0):
+            keys = [
+                (p.content_type.app_label, p.content_type.model, p.codename)
+                for p in result
+            ]
 
-        self.assertEqual(result, mock_permissions)
+        self.assertEqual(keys, sorted(keys))
 
     def test_returns_empty_list_when_no_permissions(self):
         """
@@ -293,7 +1036,7 @@ class TestGetAllPermissions(BaseTestCase):
         """
 
         with patch(
-            "allianceauth.authentication.models.Permission.objects.all", return_value=[]
+            "aa_permission_management.helper.catalog._build_catalog", return_value=[]
         ):
             result = get_all_permissions()
 
@@ -0,0 +1,306 @@
+"""
+Tests for the management commands of the aa_permission_management app.
+"""
+
+# Standard Library
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# Django
+from django.contrib.auth.models import Group
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+# Alliance Auth
+from allianceauth.authentication.models import Permission, State
+
+# AA Permission Management
+from aa_permission_management.helper.catalog import bump_catalog_version
+from aa_permission_management.models import (
+    GroupMemberCount,
+    PermissionAuditLog,
+    PermissionJob,
+    StateMemberCount,
+)
+from aa_permission_management.tests import BaseTestCase
+
+
+class TestRecountMembersCommand(BaseTestCase):
+    """
+    Tests for the aa_permission_management_recount_members command.
+    """
+
+    def test_repairs_all_counters_in_batches(self):
+        """
+        Test that all counters are repaired, batch by batch.
+
+        :return:
+        :rtype:
+        """
+
+        groups = [Group.objects.create(name=f"Group {i}") for i in range(3)]
+        self.user_with_permission.groups.add(*groups)
+        GroupMemberCount.objects.update(count=42)
+        StateMemberCount.objects.all().delete()
+        out = StringIO()
+
+        call_command(
+            "aa_permission_management_recount_members", batch_size=2, stdout=out
+        )
+
+        self.assertEqual(
+            set(GroupMemberCount.objects.values_list("pk", "count")),
+            {(group.pk, 1) for group in groups},
+        )
+        self.assertEqual(
+            {counter.pk: counter.count for counter in StateMemberCount.objects.all()},
+            {state.pk: state.userprofile_set.count() for state in State.objects.all()},
+        )
+        self.assertIn("Recounted the members of 3 groups.", out.getvalue())
+
+    def test_rejects_invalid_batch_size(self):
+        """
+        Test that a batch size below 1 is rejected.
+
+        :return:
+        :rtype:
+        """
+
+        err = StringIO()
+
+        call_command(
+            "aa_permission_management_recount_members", batch_size=0, stderr=err
+        )
+
+        self.assertIn("The batch size must be at least 1.", err.getvalue())
+
+
+class TestPruneAuditLogCommand(BaseTestCase):
+    """
+    Tests for the aa_permission_management_prune_audit_log command.
+    """
+
+    def test_deletes_entries_older_than_retention(self):
+        """
+        Test that entries older than the given number of days are deleted.
+
+        :return:
+        :rtype:
+        """
+
+        for days in (40, 20, 0):
+            PermissionAuditLog.objects.create(
+                timestamp=timezone.now() - timedelta(days=days),
+                target_type="group",
+                target_id=1,
+                permission_id=1,
+                action=PermissionAuditLog.Action.ADD,
+            )
+
+        out = StringIO()
+
+        call_command(
+            "aa_permission_management_prune_audit_log",
+            days=30,
+            batch_size=1,
+            stdout=out,
+        )
+
+        self.assertEqual(PermissionAuditLog.objects.count(), 2)
+        self.assertIn("Deleted 1 outdated audit log entries.", out.getvalue())
+
+    def test_queues_background_job(self):
+        """
+        Test that --background queues a prune job instead of deleting.
+
+        :return:
+        :rtype:
+        """
+
+        PermissionAuditLog.objects.create(
+            timestamp=timezone.now() - timedelta(days=40),
+            target_type="group",
+            target_id=1,
+            permission_id=1,
+            action=PermissionAuditLog.Action.ADD,
+        )
+        out = StringIO()
+
+        with patch(
+            "aa_permission_management.management.commands."
+            "aa_permission_management_prune_audit_log.queue_permission_job"
+        ) as mock_queue:
+            call_command(
+                "aa_permission_management_prune_audit_log",
+                days=30,
+                batch_size=10,
+                background=True,
+                stdout=out,
+            )
+
+        job = PermissionJob.objects.get()
+
+        mock_queue.assert_called_once_with(job=job)
+        self.assertEqual(job.kind, PermissionJob.Kind.PRUNE)
+        self.assertEqual((job.total, job.payload["chunk_size"]), (1, 10))
+        self.assertEqual(PermissionAuditLog.objects.count(), 1)
+        self.assertIn(f"Queued job {job.pk} deleting 1", out.getvalue())
+
+    def test_rejects_invalid_arguments(self):
+        """
+        Test that negative days and a batch size below 1 are rejected.
+
+        :return:
+        :rtype:
+        """
+
+        err = StringIO()
+
+        call_command("aa_permission_management_prune_audit_log", days=-1, stderr=err)
+        call_command(
+            "aa_permission_management_prune_audit_log", batch_size=0, stderr=err
+        )
+
+        self.assertIn("The number of days can't be negative.", err.getvalue())
+        self.assertIn("The batch size must be at least 1.", err.getvalue())
+
+
+class TestSyncPermissionsCommand(BaseTestCase):
+    """
+    Tests for the aa_permission_management_sync_permissions command.
+    """
+
+    def setUp(self):
+        """
+        Set up a group and a spec giving it a permission.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        bump_catalog_version()
+
+        self.group = Group.objects.create(name="Test Group")
+        self.permission = Permission.objects.get(
+            codename="access_permission_management"
+        )
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.spec = Path(directory.name) / "spec.yaml"
+        self._write_spec("aa_permission_management.access_permission_management")
+
+    def _write_spec(self, permission: str) -> None:
+        """
+        Write the spec with the permission of the group.
+
+        :param permission:
+        :type permission:
+        :return:
+        :rtype:
+        """
+
+        self.spec.write_text(
+            f"groups:\n  Test Group:\n    - {permission}\n", encoding="utf-8"
+        )
+
+    def test_syncs_permissions_idempotently(self):
+        """
+        Test that the spec is applied once and a second run changes nothing.
+
+        :return:
+        :rtype:
+        """
+
+        out = StringIO()
+
+        call_command(
+            "aa_permission_management_sync_permissions", str(self.spec), stdout=out
+        )
+
+        self.assertEqual(list(self.group.permissions.all()), [self.permission])
+        self.assertIn(
+            "+ aa_permission_management.access_permission_management", out.getvalue()
+        )
+        self.assertIn("Added 1 and removed 0 permissions.", out.getvalue())
+
+        out = StringIO()
+
+        call_command(
+            "aa_permission_management_sync_permissions",
+            str(self.spec),
+            check=True,
+            stdout=out,
+        )
+
+        self.assertIn("Permissions are in sync.", out.getvalue())
+        self.assertEqual(PermissionAuditLog.objects.count(), 1)
+
+    def test_dry_run_changes_nothing(self):
+        """
+        Test that a dry run only shows the changes.
+
+        :return:
+        :rtype:
+        """
+
+        out = StringIO()
+
+        call_command(
+            "aa_permission_management_sync_permissions",
+            str(self.spec),
+            dry_run=True,
+            stdout=out,
+        )
+
+        self.assertIn("1 permissions to add and 0 to remove.", out.getvalue())
+        self.assertFalse(self.group.permissions.exists())
+
+    def test_check_exits_with_2_for_pending_changes(self):
+        """
+        Test that --check exits with 2 when changes are pending.
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(CommandError) as context:
+            call_command(
+                "aa_permission_management_sync_permissions",
+                str(self.spec),
+                check=True,
+                stdout=StringIO(),
+            )
+
+        self.assertEqual(context.exception.returncode, 2)
+        self.assertFalse(self.group.permissions.exists())
+
+    def test_rejects_invalid_spec(self):
+        """
+        Test that unknown permissions and missing files fail without changes.
+
+        :return:
+        :rtype:
+        """
+
+        self._write_spec("auth.nope")
+        err = StringIO()
+
+        with self.assertRaises(CommandError) as context:
+            call_command(
+                "aa_permission_management_sync_permissions", str(self.spec), stderr=err
+            )
+
+        self.assertEqual(context.exception.returncode, 1)
+        self.assertIn("Test Group auth.nope: Unknown permission", err.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "aa_permission_management_sync_permissions",
+                str(self.spec.with_name("missing.yaml")),
+            )
@@ -2,8 +2,23 @@
 Tests for the models in the aa_permission_management app.
 """
 
+# Standard Library
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+# Django
+from django.db import IntegrityError
+
 # AA Permission Management
-from aa_permission_management.models import General
+from aa_permission_management.models import (
+    General,
+    PermissionAuditLog,
+    PermissionJob,
+    PermissionJobChunk,
+    PermissionSetVersion,
+    PermissionSnapshot,
+    PermissionSnapshotEntry,
+)
 from aa_permission_management.tests import BaseTestCase
 
 
@@ -65,3 +80,199 @@ class TestModelGeneral(BaseTestCase):
         meta = General._meta
 
         self.assertEqual(meta.verbose_name, "Permission Management")
+
+
+class TestModelPermissionSetVersion(BaseTestCase):
+    """
+    Tests for the PermissionSetVersion model.
+    """
+
+    def test_defaults_to_version_zero(self):
+        """
+        Test that a new permission set version starts at 0.
+
+        :return:
+        :rtype:
+        """
+
+        version = PermissionSetVersion.objects.create(target_type="group", target_id=1)
+
+        self.assertEqual(version.version, 0)
+
+    def test_enforces_one_version_per_target(self):
+        """
+        Test that a target can only have one version row.
+
+        :return:
+        :rtype:
+        """
+
+        PermissionSetVersion.objects.create(target_type="group", target_id=1)
+
+        with self.assertRaises(IntegrityError):
+            PermissionSetVersion.objects.create(target_type="group", target_id=1)
+
+    def test_returns_string_representation(self):
+        """
+        Test the string representation of a permission set version.
+
+        :return:
+        :rtype:
+        """
+
+        version = PermissionSetVersion(target_type="state", target_id=2, version=5)
+
+        self.assertEqual(str(version), "state 2: 5")
+
+
+class TestModelPermissionJob(BaseTestCase):
+    """
+    Tests for the PermissionJob model.
+    """
+
+    def test_defaults_to_pending_without_progress(self):
+        """
+        Test that a new job is pending and hasn't processed anything yet.
+
+        :return:
+        :rtype:
+        """
+
+        job = PermissionJob.objects.create(kind=PermissionJob.Kind.APPLY, total=3)
+
+        self.assertEqual(job.status, PermissionJob.Status.PENDING)
+        self.assertEqual(job.processed, 0)
+        self.assertEqual(job.result, {})
+
+    def test_returns_string_representation(self):
+        """
+        Test the string representation of a job.
+
+        :return:
+        :rtype:
+        """
+
+        job = PermissionJob.objects.create(kind=PermissionJob.Kind.APPLY)
+
+        self.assertEqual(str(job), f"apply #{job.pk}: pending")
+
+
+class TestModelPermissionJobChunk(BaseTestCase):
+    """
+    Tests for the PermissionJobChunk model.
+    """
+
+    def test_refuses_duplicate_sequence_numbers(self):
+        """
+        Test that a job can't have two chunks with the same sequence number.
+
+        :return:
+        :rtype:
+        """
+
+        job = PermissionJob.objects.create(kind=PermissionJob.Kind.IMPORT)
+        PermissionJobChunk.objects.create(job=job, seq=0)
+
+        with self.assertRaises(IntegrityError):
+            PermissionJobChunk.objects.create(job=job, seq=0)
+
+    def test_returns_string_representation(self):
+        """
+        Test the string representation of a job chunk.
+
+        :return:
+        :rtype:
+        """
+
+        job = PermissionJob.objects.create(kind=PermissionJob.Kind.IMPORT)
+        chunk = PermissionJobChunk.objects.create(job=job, seq=1)
+
+        self.assertEqual(str(chunk), f"{job.pk}: 1")
+
+
+class TestModelPermissionAuditLog(BaseTestCase):
+    """
+    Tests for the PermissionAuditLog model.
+    """
+
+    def test_refuses_changes_to_existing_entries(self):
+        """
+        Test that an existing audit log entry can't be changed.
+
+        :return:
+        :rtype:
+        """
+
+        entry = PermissionAuditLog.objects.create(
+            target_type="group",
+            target_id=1,
+            permission_id=2,
+            action=PermissionAuditLog.Action.ADD,
+        )
+        entry.action = PermissionAuditLog.Action.REMOVE
+
+        with self.assertRaises(ValueError):
+            entry.save()
+
+    def test_returns_string_representation(self):
+        """
+        Test the string representation of an audit log entry.
+
+        :return:
+        :rtype:
+        """
+
+        entry = PermissionAuditLog(
+            timestamp=datetime(2025, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+            target_type="state",
+            target_id=1,
+            permission_id=2,
+            action=PermissionAuditLog.Action.REMOVE,
+        )
+
+        self.assertEqual(str(entry), "2025-01-02 03:04:05 Removed 2 state 1")
+
+
+class TestModelPermissionSnapshot(BaseTestCase):
+    """
+    Tests for the PermissionSnapshot and PermissionSnapshotEntry models.
+    """
+
+    def test_enforces_one_entry_per_target(self):
+        """
+        Test that a snapshot can only hold one entry per group or state.
+
+        :return:
+        :rtype:
+        """
+
+        snapshot = PermissionSnapshot.objects.create(name="Before")
+        PermissionSnapshotEntry.objects.create(
+            snapshot=snapshot, target_type="group", target_id=1, permission_ids=b""
+        )
+
+        with self.assertRaises(IntegrityError):
+            PermissionSnapshotEntry.objects.create(
+                snapshot=snapshot, target_type="group", target_id=1, permission_ids=b""
+            )
+
+    def test_returns_string_representation(self):
+        """
+        Test the string representation of a snapshot and its entries.
+
+        :return:
+        :rtype:
+        """
+
+        snapshot = PermissionSnapshot(pk=3, name="Before")
+
+        self.assertEqual(str(snapshot), "#3 Before")
+        self.assertEqual(str(PermissionSnapshot(pk=4)), "#4")
+        self.assertEqual(
+            str(
+                PermissionSnapshotEntry(
+                    snapshot=snapshot, target_type="state", target_id=2
+                )
+            ),
+            "3: state 2",
+        )
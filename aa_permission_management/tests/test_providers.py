@@ -4,10 +4,11 @@ Test cases for the permission management providers in the aa_permission_manageme
 
 # Standard Library
 import logging
+from unittest.mock import MagicMock, patch
 
 # AA Permission Management
 from aa_permission_management import __title__
-from aa_permission_management.providers.applogger import AppLogger
+from aa_permission_management.providers.applogger import AppLogger, Lazy
 from aa_permission_management.tests import BaseTestCase
 
 
@@ -43,3 +44,123 @@ class TestAppLogger(BaseTestCase):
         message, kwargs = app_logger.process("Test message", {"key": "value"})
 
         self.assertEqual(kwargs, {"key": "value"})
+
+    def test_does_not_evaluate_lazy_arguments_when_level_is_disabled(self):
+        """
+        Test that lazy arguments and fields are not evaluated for disabled levels.
+
+        :return:
+        :rtype:
+        """
+
+        logger = logging.getLogger("test_logger")
+        logger.setLevel(logging.INFO)
+        app_logger = AppLogger(logger)
+        func = MagicMock()
+
+        app_logger.debug("Test message %s", Lazy(func), fields={"count": Lazy(func)})
+
+        func.assert_not_called()
+
+    def test_evaluates_lazy_arguments_when_level_is_enabled(self):
+        """
+        Test that lazy arguments are evaluated when the record is formatted.
+
+        :return:
+        :rtype:
+        """
+
+        logger = logging.getLogger("test_logger")
+        app_logger = AppLogger(logger)
+
+        with self.assertLogs(logger, level=logging.DEBUG) as logs:
+            app_logger.debug("Test message %s", Lazy(sorted, {3, 1, 2}))
+
+        self.assertEqual(
+            logs.records[0].getMessage(), f"[{__title__}] Test message [1, 2, 3]"
+        )
+
+    def test_appends_structured_fields(self):
+        """
+        Test that structured fields are appended to the message and attached to the record.
+
+        :return:
+        :rtype:
+        """
+
+        logger = logging.getLogger("test_logger")
+        app_logger = AppLogger(logger)
+
+        with self.assertLogs(logger, level=logging.DEBUG) as logs:
+            app_logger.debug(
+                "Test %s",
+                "message",
+                fields={"element_type": "group", "count": Lazy(len, [1, 2])},
+            )
+
+        record = logs.records[0]
+
+        self.assertEqual(
+            record.getMessage(),
+            f"[{__title__}] Test message element_type=group count=2",
+        )
+        self.assertEqual(record.fields, {"element_type": "group", "count": 2})
+
+    def test_keeps_percent_signs_in_field_values(self):
+        """
+        Test that field values are not interpreted as format strings.
+
+        :return:
+        :rtype:
+        """
+
+        logger = logging.getLogger("test_logger")
+        app_logger = AppLogger(logger)
+
+        with self.assertLogs(logger, level=logging.DEBUG) as logs:
+            app_logger.debug("Test message", fields={"name": "100%s"})
+
+        self.assertEqual(
+            logs.records[0].getMessage(), f"[{__title__}] Test message name=100%s"
+        )
+
+    def test_logs_duration_of_timed_block(self):
+        """
+        Test that a timed block logs its duration and the fields added in the block.
+
+        :return:
+        :rtype:
+        """
+
+        logger = logging.getLogger("test_logger")
+        app_logger = AppLogger(logger)
+
+        with self.assertLogs(logger, level=logging.DEBUG) as logs:
+            with app_logger.timed("Test message", element_id=1) as fields:
+                fields["count"] = 5
+
+        record = logs.records[0]
+
+        self.assertEqual(record.fields["element_id"], 1)
+        self.assertEqual(record.fields["count"], 5)
+        self.assertGreaterEqual(record.fields["duration_ms"], 0)
+
+    def test_does_not_time_block_when_level_is_disabled(self):
+        """
+        Test that a timed block is neither timed nor logged for disabled levels.
+
+        :return:
+        :rtype:
+        """
+
+        logger = logging.getLogger("test_logger")
+        logger.setLevel(logging.INFO)
+        app_logger = AppLogger(logger)
+
+        with patch(
+            "aa_permission_management.providers.applogger.time.perf_counter"
+        ) as mock_perf_counter:
+            with app_logger.timed("Test message") as fields:
+                fields["count"] = 5
+
+        mock_perf_counter.assert_not_called()
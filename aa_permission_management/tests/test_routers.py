@@ -0,0 +1,225 @@
+"""
+Unit tests for aa_permission_management.routers
+"""
+
+# Standard Library
+import time
+from http import HTTPStatus
+from unittest.mock import patch
+
+# Django
+from django.contrib.auth.models import Group
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+# AA Permission Management
+from aa_permission_management.constants import LAST_WRITE_SESSION_KEY
+from aa_permission_management.routers import (
+    ReadReplicaRouter,
+    get_read_replica,
+    record_write,
+    use_read_replica,
+)
+from aa_permission_management.tests import BaseTestCase
+
+# The test database is the only one, so it stands in for the replica
+REPLICA_SETTING = "aa_permission_management.routers.app_settings.AA_PERMISSION_MANAGEMENT_READ_REPLICA"
+
+
+def _read_database() -> str | None:
+    """
+    Get the database the router sends reads to.
+
+    :return:
+    :rtype:
+    """
+
+    return ReadReplicaRouter().db_for_read(Group)
+
+
+class TestGetReadReplica(BaseTestCase):
+    """
+    Test cases for get_read_replica function.
+    """
+
+    def test_returns_only_configured_aliases(self):
+        """
+        Test that only a configured and existing alias is returned.
+
+        :return:
+        :rtype:
+        """
+
+        for alias, expected in ((None, None), ("nope", None), ("default", "default")):
+            with self.subTest(alias=alias), patch(REPLICA_SETTING, alias):
+                self.assertEqual(get_read_replica(), expected)
+
+
+class TestUseReadReplica(BaseTestCase):
+    """
+    Test cases for the use_read_replica decorator and the router.
+    """
+
+    def setUp(self):
+        """
+        Set up a request with a session.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.request = RequestFactory().get("/")
+        self.request.session = {}
+
+    def test_routes_reads_of_view_to_replica(self):
+        """
+        Test that reads are routed to the replica only while the view runs.
+
+        :return:
+        :rtype:
+        """
+
+        view = use_read_replica(lambda request: HttpResponse(_read_database()))
+
+        with patch(REPLICA_SETTING, "default"):
+            self.assertEqual(view(self.request).content, b"default")
+
+        self.assertIsNone(_read_database())
+
+        self.assertEqual(view(self.request).content, b"None")
+
+    def test_routes_reads_after_write_to_primary(self):
+        """
+        Test that a write sends all following reads of the view to the primary.
+
+        :return:
+        :rtype:
+        """
+
+        def view(request):
+            write = ReadReplicaRouter().db_for_write(Group)
+
+            return HttpResponse(f"{write}:{_read_database()}")
+
+        with patch(REPLICA_SETTING, "default"):
+            response = use_read_replica(view)(self.request)
+
+        self.assertEqual(response.content, b"default:None")
+
+    def test_reads_own_writes_from_primary(self):
+        """
+        Test that a session that has written recently reads from the primary.
+
+        :return:
+        :rtype:
+        """
+
+        view = use_read_replica(lambda request: HttpResponse(_read_database()))
+
+        with patch(REPLICA_SETTING, "default"):
+            self.request.session[LAST_WRITE_SESSION_KEY] = time.time()
+
+            self.assertEqual(view(self.request).content, b"None")
+
+            self.request.session[LAST_WRITE_SESSION_KEY] = time.time() - 3600
+
+            self.assertEqual(view(self.request).content, b"default")
+
+    def test_routes_streamed_reads_to_replica(self):
+        """
+        Test that the content of a streaming response is read from the replica.
+
+        :return:
+        :rtype:
+        """
+
+        view = use_read_replica(
+            lambda request: StreamingHttpResponse(
+                str(_read_database()) for _ in range(2)
+            )
+        )
+
+        with patch(REPLICA_SETTING, "default"):
+            response = view(self.request)
+
+        self.assertEqual(b"".join(response.streaming_content), b"defaultdefault")
+        self.assertIsNone(_read_database())
+
+    def test_routed_views_work(self):
+        """
+        Test that the decorated views answer as usual with a replica configured.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        with patch(REPLICA_SETTING, "default"):
+            response = self.client.get(
+                reverse("aa_permission_management:export_permissions")
+            )
+
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertTrue(b"".join(response.streaming_content))
+
+            response = self.client.get(
+                reverse("aa_permission_management:get_snapshots")
+            )
+
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+
+
+class TestRecordWrite(BaseTestCase):
+    """
+    Test cases for the record_write decorator.
+    """
+
+    def test_records_successful_writes(self):
+        """
+        Test that only successful writes are noted in the session, and only
+        with a replica configured.
+
+        :return:
+        :rtype:
+        """
+
+        for method, status, alias, recorded in (
+            ("post", HTTPStatus.OK, "default", True),
+            ("post", HTTPStatus.BAD_REQUEST, "default", False),
+            ("get", HTTPStatus.OK, "default", False),
+            ("post", HTTPStatus.OK, None, False),
+        ):
+            with self.subTest(method=method, status=status, alias=alias):
+                request = getattr(RequestFactory(), method)("/")
+                request.session = {}
+                view = record_write(lambda request: HttpResponse(status=status))
+
+                with patch(REPLICA_SETTING, alias):
+                    view(request)
+
+                self.assertEqual(LAST_WRITE_SESSION_KEY in request.session, recorded)
+
+
+class TestReadReplicaRouter(BaseTestCase):
+    """
+    Test cases for the ReadReplicaRouter's migration rules.
+    """
+
+    def test_never_migrates_replica(self):
+        """
+        Test that the replica is never migrated, and other databases are left alone.
+
+        :return:
+        :rtype:
+        """
+
+        router = ReadReplicaRouter()
+
+        with patch(REPLICA_SETTING, "default"):
+            self.assertFalse(router.allow_migrate("default", "auth"))
+
+        self.assertIsNone(router.allow_migrate("default", "auth"))
@@ -0,0 +1,114 @@
+"""
+Tests for the Celery tasks in the aa_permission_management app.
+"""
+
+# Standard Library
+from unittest.mock import patch
+
+# AA Permission Management
+from aa_permission_management.models import PermissionJob
+from aa_permission_management.tasks import queue_permission_job, run_permission_job
+from aa_permission_management.tests import BaseTestCase
+
+
+class TestRunPermissionJob(BaseTestCase):
+    """
+    Tests for the run_permission_job task.
+    """
+
+    def test_queues_next_chunk_with_same_priority(self):
+        """
+        Test that the task queues itself for the next chunk.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch(
+                "aa_permission_management.tasks.run_job_chunk", return_value=True
+            ) as mock_run_job_chunk,
+            patch.object(run_permission_job, "apply_async") as mock_apply_async,
+        ):
+            run_permission_job(job_id=1, priority=3)
+
+        mock_run_job_chunk.assert_called_once_with(1)
+        mock_apply_async.assert_called_once_with(
+            kwargs={"job_id": 1, "priority": 3}, priority=3
+        )
+
+    def test_stops_after_last_chunk(self):
+        """
+        Test that the task doesn't queue itself after the last chunk.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch("aa_permission_management.tasks.run_job_chunk", return_value=False),
+            patch.object(run_permission_job, "apply_async") as mock_apply_async,
+        ):
+            run_permission_job(job_id=1)
+
+        mock_apply_async.assert_not_called()
+
+
+class TestQueuePermissionJob(BaseTestCase):
+    """
+    Tests for the queue_permission_job function.
+    """
+
+    def setUp(self):
+        """
+        Set up a job.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.job = PermissionJob.objects.create(kind=PermissionJob.Kind.APPLY)
+
+    def test_queues_job_after_commit_with_default_priority(self):
+        """
+        Test that the job is queued once committed, with the configured priority.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch(
+                "aa_permission_management.tasks.app_settings.AA_PERMISSION_MANAGEMENT_JOB_PRIORITY",
+                7,
+            ),
+            patch.object(run_permission_job, "apply_async") as mock_apply_async,
+        ):
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                queue_permission_job(job=self.job)
+
+            mock_apply_async.assert_not_called()
+
+            callbacks[0]()
+
+        mock_apply_async.assert_called_once_with(
+            kwargs={"job_id": self.job.pk, "priority": 7}, priority=7
+        )
+
+    def test_clamps_priority(self):
+        """
+        Test that the priority is clamped to Celery's priority range.
+
+        :return:
+        :rtype:
+        """
+
+        with patch.object(run_permission_job, "apply_async") as mock_apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                queue_permission_job(job=self.job, priority=42)
+
+        mock_apply_async.assert_called_once_with(
+            kwargs={"job_id": self.job.pk, "priority": 9}, priority=9
+        )
@@ -8,21 +8,70 @@ from http import HTTPStatus
 from unittest.mock import MagicMock, patch
 
 # Django
+from django.contrib.auth.models import Group
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 # Alliance Auth
+from allianceauth.authentication.models import Permission, State, UserProfile
+from allianceauth.framework.datatables import DataTablesView
 from allianceauth.groupmanagement.models import AuthGroup
 
 # AA Permission Management
+from aa_permission_management.helper.catalog import (
+    bump_catalog_version,
+    get_catalog_version,
+)
+from aa_permission_management.helper.snapshots import take_snapshot
+from aa_permission_management.helper.versions import get_permission_set_version
+from aa_permission_management.models import (
+    PermissionAuditLog,
+    PermissionJob,
+    PermissionSnapshot,
+)
 from aa_permission_management.tests import BaseTestCase
 from aa_permission_management.views import (
     GroupsTableView,
+    PermissionUsersTableView,
     StatesTableView,
+    _compile_column,
+    ajax_bulk_update_permissions,
     ajax_update_permissions,
 )
 
 
+def _datatables_params(columns: int, **params) -> dict:
+    """
+    Build the request parameters of a server-side DataTables draw.
+
+    :param columns: Number of columns
+    :type columns: int
+    :param params: Additional parameters
+    :type params: Any
+    :return: Request parameters
+    :rtype: dict
+    """
+
+    table_params = {"draw": 1, "start": 0, "length": 10, "search[value]": ""}
+
+    for index in range(columns):
+        table_params.update(
+            {
+                f"columns[{index}][searchable]": "true",
+                f"columns[{index}][orderable]": "true",
+                f"columns[{index}][search][value]": "",
+                f"columns[{index}][search][regex]": "false",
+            }
+        )
+
+    table_params.update(params)
+
+    return table_params
+
+
 class TestViewDashboard(BaseTestCase):
     """
     Tests for the dashboard view.
@@ -46,6 +95,79 @@ class TestViewDashboard(BaseTestCase):
             response, "aa_permission_management/views/dashboard.html"
         )
 
+    def test_renders_first_page_and_bootstrap_data(self):
+        """
+        Test that the first page of states, the number of groups and the catalog
+        version are rendered into the dashboard.
+
+        :return:
+        :rtype:
+        """
+
+        State.objects.create(name="Test State", priority=20)
+        Group.objects.create(name="Test Group")
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(reverse("aa_permission_management:dashboard"))
+        bootstrap = response.context["bootstrap"]
+
+        self.assertEqual(bootstrap["catalogVersion"], get_catalog_version())
+        self.assertEqual(bootstrap["groups"]["recordsTotal"], AuthGroup.objects.count())
+        self.assertEqual(bootstrap["states"]["recordsTotal"], State.objects.count())
+        self.assertIn(
+            "Test State", [row[0] for row in response.context["states"]["data"]]
+        )
+        self.assertContains(response, 'id="aa-permission-management-bootstrap"')
+
+    def test_renders_background_option(self):
+        """
+        Test that the permission picker can apply a change in the background,
+        with the bulk change endpoint and the job poller.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(reverse("aa_permission_management:dashboard"))
+
+        self.assertContains(response, 'id="update-permissions-background"')
+        self.assertContains(
+            response, reverse("aa_permission_management:bulk_update_permissions")
+        )
+        self.assertContains(response, "aa-permission-management-jobs.min.js")
+
+    def test_renders_in_constant_number_of_queries(self):
+        """
+        Test that the number of queries doesn't depend on the number of groups
+        and states.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        url = reverse("aa_permission_management:dashboard")
+
+        # Warm the catalog version and the session
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+
+        for index in range(15):
+            State.objects.create(name=f"State {index}", priority=500 + index)
+            Group.objects.create(name=f"Group {index}")
+
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(len(response.context["states"]["data"]), 10)
+
     def test_denies_access_to_unauthorized_user(self):
         """
         Test that an unauthorized user is denied access to the dashboard view.
@@ -61,6 +183,87 @@ class TestViewDashboard(BaseTestCase):
         self.assertEqual(response.status_code, HTTPStatus.FOUND)
 
 
+class TestCompiledColumnsMixin(BaseTestCase):
+    """
+    Tests for the CompiledColumnsMixin.
+    """
+
+    def test_renders_like_template_engine(self):
+        """
+        Test that the precompiled columns render exactly what the template
+        engine renders, escaping included.
+
+        :return:
+        :rtype:
+        """
+
+        permission = Permission.objects.get(codename="access_permission_management")
+        group = Group.objects.create(name="<b>Tom & Jerry</b>")
+        group.permissions.add(permission)
+        self.user_without_permission.groups.add(group)
+        # A user without main character renders an empty name
+        self.user_without_permission.profile.main_character = None
+        self.user_without_permission.profile.save()
+
+        request = RequestFactory().get("/")
+        request.user = self.user_with_permission
+
+        for view_class, kwargs in (
+            (GroupsTableView, {}),
+            (StatesTableView, {}),
+            (PermissionUsersTableView, {"permission_id": permission.pk}),
+        ):
+            view = view_class()
+
+            for row in view.get_model_qs(request, **kwargs):
+                for _, template in view_class.columns:
+                    with self.subTest(view=view_class.__name__, template=template):
+                        self.assertEqual(
+                            view.render_template(request, template, {"row": row}),
+                            DataTablesView.render_template(
+                                view, request, template, {"row": row}
+                            ),
+                        )
+
+    def test_renders_without_queries(self):
+        """
+        Test that rendering a cell doesn't run the context processors' queries.
+
+        :return:
+        :rtype:
+        """
+
+        Group.objects.create(name="Test Group")
+
+        request = RequestFactory().get("/")
+        request.user = self.user_with_permission
+        view = GroupsTableView()
+        rows = list(view.get_model_qs(request))
+
+        with self.assertNumQueries(0):
+            for row in rows:
+                for _, template in view.columns:
+                    view.render_template(request, template, {"row": row})
+
+    def test_leaves_template_files_to_the_loaders(self):
+        """
+        Test that template files are looked up for every cell, so edited files
+        are picked up wherever the template loaders reload them.
+
+        :return:
+        :rtype:
+        """
+
+        render = _compile_column("aa_permission_management/partials/cell.html")
+
+        with patch("aa_permission_management.views.get_template") as mock_get_template:
+            mock_get_template.return_value.render.side_effect = ["old", "edited"]
+
+            self.assertEqual([render({}), render({})], ["old", "edited"])
+
+        self.assertEqual(mock_get_template.call_count, 2)
+
+
 class TestGroupsTableView(BaseTestCase):
     """
     Tests for the GroupsTableView view.
@@ -103,246 +306,2496 @@ class TestGroupsTableView(BaseTestCase):
 
         self.assertEqual(queryset.count(), 0)
 
-
-class TestStatesTableView(BaseTestCase):
-    """
-    Tests for the StatesTableView view.
-    """
-
-    def test_returns_queryset_with_user_count_annotation(self):
+    def test_annotates_member_count_from_counter(self):
         """
-        Test that the get_model_qs method returns a queryset with user_count annotation.
+        Test that the member count is read from the member counter.
 
         :return:
         :rtype:
         """
 
         factory = RequestFactory()
-        request = factory.get(reverse("aa_permission_management:get_states"))
+        request = factory.get(reverse("aa_permission_management:get_groups"))
         request.user = self.user_with_permission
 
-        view = StatesTableView()
+        group = Group.objects.create(name="Test Group")
+        self.user_with_permission.groups.add(group)
+        self.user_without_permission.groups.add(group)
+
+        view = GroupsTableView()
         queryset = view.get_model_qs(request)
 
-        self.assertTrue(queryset.exists())
-        self.assertIn("user_count", queryset.query.annotations)
+        self.assertEqual(queryset.get(pk=group.pk).user_count, 2)
+        self.assertNotIn('JOIN "auth_user_groups"', str(queryset.query))
 
+    def test_annotates_permission_count_without_aggregating(self):
+        """
+        Test that the permission count is annotated without grouping the queryset.
 
-class TestAjaxGetPermissionsView(BaseTestCase):
-    """
-    Tests for the ajax_get_permissions view.
-    """
+        :return:
+        :rtype:
+        """
 
-    def test_returns_permissions_for_group(self):
+        factory = RequestFactory()
+        request = factory.get(reverse("aa_permission_management:get_groups"))
+        request.user = self.user_with_permission
+
+        group = Group.objects.create(name="Test Group")
+        group.permissions.add(*Permission.objects.all()[:3])
+        empty_group = Group.objects.create(name="Empty Group")
+
+        view = GroupsTableView()
+        queryset = view.get_model_qs(request)
+
+        self.assertEqual(queryset.get(pk=group.pk).permission_count, 3)
+        self.assertEqual(queryset.get(pk=empty_group.pk).permission_count, 0)
+        self.assertIsNone(queryset.query.group_by)
+
+    def test_orders_by_permission_count_in_constant_number_of_queries(self):
         """
-        Test that the view returns the correct permissions for a group.
+        Test that the table is ordered by permission count on the server.
 
         :return:
         :rtype:
         """
 
-        mock_permissions = ["perm1", "perm2"]
-        all_permissions = ["perm1", "perm2", "perm3"]
+        permissions = list(Permission.objects.all()[:5])
+
+        for count in (2, 5, 0, 3):
+            group = Group.objects.create(name=f"Group {count}")
+            group.permissions.add(*permissions[:count])
 
         self.client.force_login(self.user_with_permission)
 
-        with (
-            patch(
-                "aa_permission_management.views.get_group_permissions",
-                return_value=mock_permissions,
-            ),
-            patch(
-                "aa_permission_management.views.get_all_permissions",
-                return_value=all_permissions,
-            ),
-        ):
+        params = _datatables_params(
+            columns=4, **{"order[0][column]": 2, "order[0][dir]": "desc"}
+        )
+
+        with CaptureQueriesContext(connection) as context:
             response = self.client.get(
-                reverse(
-                    "aa_permission_management:get_permissions",
-                    kwargs={"permission_type": "group", "element_id": 1},
-                )
+                reverse("aa_permission_management:get_groups"), params
             )
 
-        self.assertEqual(response.status_code, HTTPStatus.OK)
-        self.assertIn("assigned_permissions", response.context)
-        self.assertEqual(response.context["assigned_permissions"], mock_permissions)
+        table_queries = [
+            query
+            for query in context.captured_queries
+            if "groupmanagement_authgroup" in query["sql"]
+        ]
 
-        expected_available = [p for p in all_permissions if p not in mock_permissions]
-        self.assertEqual(response.context["permissions"], expected_available)
+        # Filtered count, page and total count
+        self.assertEqual(len(table_queries), 3)
 
-    def test_returns_permissions_for_state(self):
+        rows = response.json()["data"]
+
+        self.assertEqual([row[2] for row in rows], ["5", "3", "2", "0"])
+        self.assertEqual(
+            [row[0] for row in rows], ["Group 5", "Group 3", "Group 2", "Group 0"]
+        )
+
+    def test_filters_permission_count_by_range(self):
         """
-        Test that the view returns the correct permissions for a state.
+        Test that the permission count can be filtered by a range.
 
         :return:
         :rtype:
         """
 
-        mock_permissions = ["perm1", "perm2"]
-        all_permissions = ["perm1", "perm2", "perm3"]
+        permissions = list(Permission.objects.all()[:5])
+
+        for count in (1, 2, 4, 5):
+            group = Group.objects.create(name=f"Group {count}")
+            group.permissions.add(*permissions[:count])
 
         self.client.force_login(self.user_with_permission)
 
-        with (
-            patch(
-                "aa_permission_management.views.get_state_permissions",
-                return_value=mock_permissions,
-            ),
-            patch(
-                "aa_permission_management.views.get_all_permissions",
-                return_value=all_permissions,
-            ),
-        ):
-            response = self.client.get(
-                reverse(
-                    "aa_permission_management:get_permissions",
-                    kwargs={"permission_type": "state", "element_id": 2},
-                )
-            )
+        params = _datatables_params(
+            columns=4,
+            **{
+                "columns[2][search][value]": "2-4",
+                "order[0][column]": 2,
+                "order[0][dir]": "asc",
+            },
+        )
 
-        self.assertEqual(response.status_code, HTTPStatus.OK)
-        self.assertIn("assigned_permissions", response.context)
-        self.assertEqual(response.context["assigned_permissions"], mock_permissions)
+        response = self.client.get(
+            reverse("aa_permission_management:get_groups"), params
+        )
 
-        expected_available = [p for p in all_permissions if p not in mock_permissions]
-        self.assertEqual(response.context["permissions"], expected_available)
+        self.assertEqual(response.json()["recordsFiltered"], 2)
+        self.assertEqual(
+            [row[0] for row in response.json()["data"]], ["Group 2", "Group 4"]
+        )
 
-    def test_raises_value_error_for_invalid_type(self):
+    def test_filters_member_count_with_number_search(self):
         """
-        Test that the view raises a ValueError for an invalid type.
+        Test that the member count can be filtered by the ColumnControl number search.
 
         :return:
         :rtype:
         """
 
+        group = Group.objects.create(name="Test Group")
+        self.user_with_permission.groups.add(group)
+        self.user_without_permission.groups.add(group)
+        Group.objects.create(name="Empty Group")
+
         self.client.force_login(self.user_with_permission)
 
-        with self.assertRaises(ValueError):
-            self.client.get(
-                reverse(
-                    "aa_permission_management:get_permissions",
-                    kwargs={"permission_type": "invalid", "element_id": 3},
-                )
-            )
+        params = _datatables_params(
+            columns=4,
+            **{
+                "columns[1][columnControl][search][value]": "1",
+                "columns[1][columnControl][search][logic]": "greater",
+                "columns[1][columnControl][search][type]": "num",
+            },
+        )
 
+        response = self.client.get(
+            reverse("aa_permission_management:get_groups"), params
+        )
 
-class TestAjaxUpdatePermissionsView(BaseTestCase):
-    """
-    Tests for the ajax_update_permissions view.
-    """
+        self.assertEqual([row[0] for row in response.json()["data"]], ["Test Group"])
 
-    def test_returns_success_when_updating_group_permissions(self):
+    def test_global_search_does_not_match_counts(self):
         """
-        Test that the view returns a success response when updating group permissions.
+        Test that the global search only matches names, not counts.
 
         :return:
         :rtype:
         """
 
-        request = MagicMock()
-        request.method = "POST"
-        request.body = json.dumps(
-            {
-                "permission_type": "group",
-                "element_id": 1,
-                "permissions": ["perm1", "perm2"],
-            }
-        )
+        group = Group.objects.create(name="Test Group")
+        group.permissions.add(Permission.objects.first())
 
-        with patch(
-            "aa_permission_management.views.set_group_permissions"
-        ) as mock_set_permissions:
-            response = ajax_update_permissions(request)
+        self.client.force_login(self.user_with_permission)
 
-        mock_set_permissions.assert_called_once_with(1, {"perm1", "perm2"})
-        self.assertEqual(response.status_code, HTTPStatus.OK)
-        self.assertEqual(response.content.decode(), "Success")
+        params = _datatables_params(columns=4, **{"search[value]": "1"})
 
-    def test_returns_success_when_updating_state_permissions(self):
+        response = self.client.get(
+            reverse("aa_permission_management:get_groups"), params
+        )
+
+        self.assertEqual(response.json()["recordsFiltered"], 0)
+
+    def test_filters_by_has_permission(self):
         """
-        Test that the view returns a success response when updating state permissions.
+        Test that the groups can be filtered by the permissions they have.
 
         :return:
         :rtype:
         """
 
-        request = MagicMock()
-        request.method = "POST"
-        request.body = json.dumps(
-            {"permission_type": "state", "element_id": 2, "permissions": ["perm3"]}
+        permissions = list(Permission.objects.all()[:2])
+        group_with_both = Group.objects.create(name="Both")
+        group_with_both.permissions.add(*permissions)
+        group_with_one = Group.objects.create(name="One")
+        group_with_one.permissions.add(permissions[0])
+        Group.objects.create(name="None")
+
+        self.client.force_login(self.user_with_permission)
+
+        url = reverse("aa_permission_management:get_groups")
+
+        response = self.client.get(
+            url,
+            _datatables_params(columns=4, permission=[permissions[0].pk, "invalid"]),
         )
 
-        with patch(
-            "aa_permission_management.views.set_state_permissions"
-        ) as mock_set_permissions:
-            response = ajax_update_permissions(request)
+        self.assertEqual(
+            sorted(row[0] for row in response.json()["data"]), ["Both", "One"]
+        )
 
-        mock_set_permissions.assert_called_once_with(2, {"perm3"})
-        self.assertEqual(response.status_code, HTTPStatus.OK)
-        self.assertEqual(response.content.decode(), "Success")
+        response = self.client.get(
+            url,
+            _datatables_params(
+                columns=4, permission=[permission.pk for permission in permissions]
+            ),
+        )
 
-    def test_returns_no_content_when_request_method_is_not_post(self):
+        self.assertEqual([row[0] for row in response.json()["data"]], ["Both"])
+
+    def test_filters_by_has_permission_with_exists_subquery(self):
         """
-        Test that the view returns a no content response when the request method is not POST.
+        Test that the "has permission" filter doesn't join the permission table.
 
         :return:
         :rtype:
         """
 
-        request = MagicMock()
-        request.method = "GET"
+        permission = Permission.objects.first()
+        factory = RequestFactory()
+        request = factory.get(
+            reverse("aa_permission_management:get_groups"),
+            {"permission": permission.pk},
+        )
+        request.user = self.user_with_permission
 
-        response = ajax_update_permissions(request)
+        queryset = GroupsTableView().get_model_qs(request)
 
-        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+        self.assertIn("EXISTS", str(queryset.query))
+        self.assertIsNone(queryset.query.group_by)
+        self.assertFalse(queryset.query.distinct)
 
-    def test_returns_no_content_when_request_body_is_invalid_json(self):
+    def _get_page(self, **params) -> dict:
         """
-        Test that the view returns a no content response when the request body is invalid JSON.
+        Get a page of the groups table ordered by permission count, descending.
 
+        :param params:
+        :type params:
         :return:
         :rtype:
         """
 
-        request = MagicMock()
-        request.method = "POST"
-        request.body = "invalid json"
-
-        response = ajax_update_permissions(request)
-
-        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+        return self.client.get(
+            reverse("aa_permission_management:get_groups"),
+            _datatables_params(
+                columns=4,
+                **{"order[0][column]": 2, "order[0][dir]": "desc", "length": 2},
+                **params,
+            ),
+        ).json()
 
-    def test_returns_no_content_when_required_keys_are_missing(self):
+    def test_pages_by_keyset_like_by_offset(self):
         """
-        Test that the view returns a no content response when required keys are missing from the request body.
+        Test that paging by cursor returns the same pages as paging by offset,
+        with ties on the ordering column broken by primary key.
 
         :return:
         :rtype:
         """
 
-        request = MagicMock()
+        permissions = list(Permission.objects.all()[:3])
+
+        for index, count in enumerate((3, 1, 1, 1, 0)):
+            group = Group.objects.create(name=f"Group {index}")
+            group.permissions.add(*permissions[:count])
+
+        self.client.force_login(self.user_with_permission)
+
+        pages = [self._get_page(start=start) for start in (0, 2, 4)]
+        page = self._get_page(start=0, keyset="true")
+
+        self.assertEqual(page["data"], pages[0]["data"])
+
+        for start, expected in ((2, pages[1]), (4, pages[2])):
+            page = self._get_page(
+                start=start,
+                keyset="true",
+                cursor=page["keyset"]["last"],
+                direction="next",
+            )
+
+            self.assertEqual(page["data"], expected["data"])
+            self.assertEqual(page["recordsFiltered"], 5)
+
+        page = self._get_page(
+            start=2,
+            keyset="true",
+            cursor=self._get_page(start=4, keyset="true")["keyset"]["first"],
+            direction="previous",
+        )
+
+        self.assertEqual(page["data"], pages[1]["data"])
+
+    def test_pages_by_keyset_without_offset(self):
+        """
+        Test that pages by cursor, and the last page, are read without an offset.
+
+        :return:
+        :rtype:
+        """
+
+        for index in range(6):
+            Group.objects.create(name=f"Group {index}")
+
+        self.client.force_login(self.user_with_permission)
+
+        cursor = self._get_page(start=0, keyset="true")["keyset"]["last"]
+
+        for params in (
+            {"start": 2, "cursor": cursor, "direction": "next"},
+            {"start": 4},
+        ):
+            with self.subTest(**params), CaptureQueriesContext(connection) as context:
+                page = self._get_page(keyset="true", **params)
+
+            self.assertEqual(
+                [row[0] for row in page["data"]],
+                (
+                    ["Group 2", "Group 3"]
+                    if "cursor" in params
+                    else ["Group 4", "Group 5"]
+                ),
+            )
+            self.assertFalse(
+                any("OFFSET" in query["sql"] for query in context.captured_queries)
+            )
+
+    def test_pages_by_offset_with_invalid_cursor(self):
+        """
+        Test that an invalid cursor falls back to paging by offset.
+
+        :return:
+        :rtype:
+        """
+
+        for index in range(4):
+            Group.objects.create(name=f"Group {index}")
+
+        self.client.force_login(self.user_with_permission)
+
+        for cursor in ("nope", "[1]", '["a", "b"]'):
+            with self.subTest(cursor=cursor):
+                page = self._get_page(
+                    start=2, keyset="true", cursor=cursor, direction="next"
+                )
+
+                self.assertEqual(
+                    [row[0] for row in page["data"]], ["Group 2", "Group 3"]
+                )
+
+    def test_pages_by_keyset_with_negative_start(self):
+        """
+        Test that a negative start is treated as the first page.
+
+        :return:
+        :rtype:
+        """
+
+        for index in range(4):
+            Group.objects.create(name=f"Group {index}")
+
+        self.client.force_login(self.user_with_permission)
+
+        page = self._get_page(start=-5, keyset="true")
+
+        self.assertEqual([row[0] for row in page["data"]], ["Group 0", "Group 1"])
+
+
+class TestStatesTableView(BaseTestCase):
+    """
+    Tests for the StatesTableView view.
+    """
+
+    def test_returns_queryset_with_user_count_annotation(self):
+        """
+        Test that the get_model_qs method returns a queryset with user_count annotation.
+
+        :return:
+        :rtype:
+        """
+
+        factory = RequestFactory()
+        request = factory.get(reverse("aa_permission_management:get_states"))
+        request.user = self.user_with_permission
+
+        view = StatesTableView()
+        queryset = view.get_model_qs(request)
+
+        self.assertTrue(queryset.exists())
+        self.assertIn("user_count", queryset.query.annotations)
+
+    def test_annotates_member_count_from_counter(self):
+        """
+        Test that the member count is read from the member counter without aggregating.
+
+        :return:
+        :rtype:
+        """
+
+        factory = RequestFactory()
+        request = factory.get(reverse("aa_permission_management:get_states"))
+        request.user = self.user_with_permission
+
+        view = StatesTableView()
+        queryset = view.get_model_qs(request)
+        state = self.user_with_permission.profile.state
+
+        self.assertEqual(
+            queryset.get(pk=state.pk).user_count,
+            state.userprofile_set.count(),
+        )
+        self.assertIsNone(queryset.query.group_by)
+
+    def test_orders_by_permission_count(self):
+        """
+        Test that the table is ordered by permission count on the server.
+
+        :return:
+        :rtype:
+        """
+
+        State.objects.create(name="Empty State", priority=10)
+        state = State.objects.create(name="Full State", priority=20)
+        state.permissions.add(*Permission.objects.all()[:50])
+
+        self.client.force_login(self.user_with_permission)
+
+        params = _datatables_params(
+            columns=4, **{"order[0][column]": 2, "order[0][dir]": "desc"}
+        )
+
+        response = self.client.get(
+            reverse("aa_permission_management:get_states"), params
+        )
+
+        first_row = response.json()["data"][0]
+
+        self.assertEqual(first_row[0], "Full State")
+        self.assertEqual(first_row[2], "50")
+
+    def test_filters_by_has_permission(self):
+        """
+        Test that the states can be filtered by the permissions they have.
+
+        :return:
+        :rtype:
+        """
+
+        permission = Permission.objects.first()
+        state = State.objects.create(name="Full State", priority=20)
+        state.permissions.add(permission)
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:get_states"),
+            _datatables_params(columns=4, permission=permission.pk),
+        )
+
+        self.assertEqual([row[0] for row in response.json()["data"]], ["Full State"])
+
+
+class TestAjaxGetPermissionsView(BaseTestCase):
+    """
+    Tests for the ajax_get_permissions view.
+    """
+
+    def test_returns_permissions_for_group(self):
+        """
+        Test that the view returns the correct permissions for a group.
+
+        :return:
+        :rtype:
+        """
+
+        mock_permissions = ["perm1", "perm2"]
+        all_permissions = ["perm1", "perm2", "perm3"]
+
+        self.client.force_login(self.user_with_permission)
+
+        with (
+            patch(
+                "aa_permission_management.views.get_group_permissions",
+                return_value=mock_permissions,
+            ),
+            patch(
+                "aa_permission_management.views.get_all_permissions",
+                return_value=all_permissions,
+            ),
+        ):
+            response = self.client.get(
+                reverse(
+                    "aa_permission_management:get_permissions",
+                    kwargs={"permission_type": "group", "element_id": 1},
+                )
+            )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn("assigned_permissions", response.context)
+        self.assertEqual(response.context["assigned_permissions"], mock_permissions)
+
+        expected_available = [p for p in all_permissions if p not in mock_permissions]
+        self.assertEqual(response.context["permissions"], expected_available)
+
+    def test_returns_permissions_for_state(self):
+        """
+        Test that the view returns the correct permissions for a state.
+
+        :return:
+        :rtype:
+        """
+
+        mock_permissions = ["perm1", "perm2"]
+        all_permissions = ["perm1", "perm2", "perm3"]
+
+        self.client.force_login(self.user_with_permission)
+
+        with (
+            patch(
+                "aa_permission_management.views.get_state_permissions",
+                return_value=mock_permissions,
+            ),
+            patch(
+                "aa_permission_management.views.get_all_permissions",
+                return_value=all_permissions,
+            ),
+        ):
+            response = self.client.get(
+                reverse(
+                    "aa_permission_management:get_permissions",
+                    kwargs={"permission_type": "state", "element_id": 2},
+                )
+            )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn("assigned_permissions", response.context)
+        self.assertEqual(response.context["assigned_permissions"], mock_permissions)
+
+        expected_available = [p for p in all_permissions if p not in mock_permissions]
+        self.assertEqual(response.context["permissions"], expected_available)
+
+    def test_renders_in_constant_number_of_queries(self):
+        """
+        Test that the permission picker renders in a constant number of queries,
+        no matter how many permissions are assigned or available.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+        url = reverse(
+            "aa_permission_management:get_permissions",
+            kwargs={"permission_type": "group", "element_id": group.pk},
+        )
+
+        self.client.force_login(self.user_with_permission)
+        bump_catalog_version()
+        self.client.get(url)
+
+        group.permissions.set(Permission.objects.all()[:2])
+
+        with CaptureQueriesContext(connection) as few_permissions:
+            self.client.get(url)
+
+        group.permissions.set(Permission.objects.all()[:50])
+
+        with CaptureQueriesContext(connection) as many_permissions:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(few_permissions), len(many_permissions))
+
+    def test_raises_value_error_for_invalid_type(self):
+        """
+        Test that the view raises a ValueError for an invalid type.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        with self.assertRaises(ValueError):
+            self.client.get(
+                reverse(
+                    "aa_permission_management:get_permissions",
+                    kwargs={"permission_type": "invalid", "element_id": 3},
+                )
+            )
+
+
+class TestAjaxGetPermissionsJsonView(BaseTestCase):
+    """
+    Tests for the ajax_get_permissions_json view.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a fresh catalog version, so no payloads cached
+        by other tests are served.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        bump_catalog_version()
+
+        self.group = Group.objects.create(name="Panel Group")
+        self.url = reverse(
+            "aa_permission_management:get_permissions_json",
+            kwargs={"permission_type": "group", "element_id": self.group.pk},
+        )
+
+    def test_returns_assigned_permission_ids_for_group(self):
+        """
+        Test that the view returns the assigned permission IDs of a group.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+        permissions = list(Permission.objects.all()[:3])
+        group.permissions.set(permissions)
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse(
+                "aa_permission_management:get_permissions_json",
+                kwargs={"permission_type": "group", "element_id": group.pk},
+            )
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "permission_type": "group",
+                "element_id": group.pk,
+                "catalog_version": get_catalog_version(),
+                "version": get_permission_set_version(
+                    target_type="group", target_id=group.pk
+                ),
+                "assigned": sorted(p.pk for p in permissions),
+            },
+        )
+
+    def test_returns_assigned_permission_ids_for_state(self):
+        """
+        Test that the view returns the assigned permission IDs of a state.
+
+        :return:
+        :rtype:
+        """
+
+        state = State.objects.get(name="Guest")
+        permissions = list(Permission.objects.all()[:2])
+        state.permissions.set(permissions)
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse(
+                "aa_permission_management:get_permissions_json",
+                kwargs={"permission_type": "state", "element_id": state.pk},
+            )
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json()["assigned"], sorted(p.pk for p in permissions))
+
+    def test_raises_value_error_for_invalid_type(self):
+        """
+        Test that the view raises a ValueError for an invalid type.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        with self.assertRaises(ValueError):
+            self.client.get(
+                reverse(
+                    "aa_permission_management:get_permissions_json",
+                    kwargs={"permission_type": "invalid", "element_id": 3},
+                )
+            )
+
+    def test_denies_access_to_unauthorized_user(self):
+        """
+        Test that an unauthorized user is denied access.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_without_permission)
+
+        response = self.client.get(
+            reverse(
+                "aa_permission_management:get_permissions_json",
+                kwargs={"permission_type": "group", "element_id": 1},
+            )
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+    def test_returns_etag_and_revalidation_headers(self):
+        """
+        Test that the view returns an ETag and asks the browser to revalidate.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response["ETag"])
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+
+    @patch("aa_permission_management.views.get_group_permission_ids")
+    def test_returns_not_modified_without_reading_permissions(
+        self, mock_get_group_permission_ids
+    ):
+        """
+        Test that a matching conditional request is answered with 304 without
+        reading the assigned permissions.
+
+        :return:
+        :rtype:
+        """
+
+        mock_get_group_permission_ids.return_value = []
+
+        self.client.force_login(self.user_with_permission)
+
+        etag = self.client.get(self.url)["ETag"]
+        mock_get_group_permission_ids.reset_mock()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        mock_get_group_permission_ids.assert_not_called()
+
+    def test_changes_etag_when_permissions_change(self):
+        """
+        Test that the ETag changes when the permissions of the group change.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        etag = self.client.get(self.url)["ETag"]
+        self.group.permissions.add(Permission.objects.first())
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["assigned"], [Permission.objects.first().pk])
+
+    def test_changes_etag_when_catalog_changes(self):
+        """
+        Test that the ETag changes when the permission catalog changes.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        etag = self.client.get(self.url)["ETag"]
+        bump_catalog_version()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @patch("aa_permission_management.views.get_group_permission_ids")
+    def test_serves_cached_payload_for_unchanged_group(
+        self, mock_get_group_permission_ids
+    ):
+        """
+        Test that the payload is cached for an unchanged group.
+
+        :return:
+        :rtype:
+        """
+
+        mock_get_group_permission_ids.return_value = [1, 2]
+
+        self.client.force_login(self.user_with_permission)
+
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+
+        self.assertEqual(second.content, first.content)
+        mock_get_group_permission_ids.assert_called_once_with(self.group.pk)
+
+
+class TestAjaxGetPermissionCatalogView(BaseTestCase):
+    """
+    Tests for the ajax_get_permission_catalog view.
+    """
+
+    def test_returns_columnar_catalog(self):
+        """
+        Test that the view returns the columnar permission catalog.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:get_permission_catalog")
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+        data = response.json()
+
+        self.assertEqual(data["version"], get_catalog_version())
+        self.assertEqual(
+            set(data["ids"]), set(Permission.objects.values_list("pk", flat=True))
+        )
+        self.assertEqual(len(data["ids"]), len(data["codenames"]))
+        self.assertEqual(len(data["ids"]), len(data["names"]))
+        self.assertEqual(len(data["ids"]), len(data["content_type_index"]))
+
+
+class TestAjaxUpdatePermissionsView(BaseTestCase):
+    """
+    Tests for the ajax_update_permissions view.
+    """
+
+    def test_returns_success_when_updating_group_permissions(self):
+        """
+        Test that the view returns a success response when updating group permissions.
+
+        :return:
+        :rtype:
+        """
+
+        request = MagicMock()
+        request.method = "POST"
+        request.body = json.dumps(
+            {
+                "permission_type": "group",
+                "element_id": 1,
+                "permissions": ["perm1", "perm2"],
+            }
+        )
+
+        with patch(
+            "aa_permission_management.views.set_group_permissions"
+        ) as mock_set_permissions:
+            response = ajax_update_permissions(request)
+
+        mock_set_permissions.assert_called_once_with(
+            1, {"perm1", "perm2"}, version=None, actor=request.user
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.content.decode(), "Success")
+
+    def test_returns_success_when_updating_state_permissions(self):
+        """
+        Test that the view returns a success response when updating state permissions.
+
+        :return:
+        :rtype:
+        """
+
+        request = MagicMock()
+        request.method = "POST"
+        request.body = json.dumps(
+            {"permission_type": "state", "element_id": 2, "permissions": ["perm3"]}
+        )
+
+        with patch(
+            "aa_permission_management.views.set_state_permissions"
+        ) as mock_set_permissions:
+            response = ajax_update_permissions(request)
+
+        mock_set_permissions.assert_called_once_with(
+            2, {"perm3"}, version=None, actor=request.user
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.content.decode(), "Success")
+
+    def test_returns_version_and_counts_when_applying_delta(self):
+        """
+        Test that a delta is applied and answered with the version and counts.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+        permissions = list(Permission.objects.all()[:3])
+        group.permissions.add(permissions[0])
+
+        request = MagicMock()
+        request.method = "POST"
+        request.user = self.user_with_permission
+        request.body = json.dumps(
+            {
+                "permission_type": "group",
+                "element_id": group.pk,
+                "add": [permissions[1].pk, str(permissions[2].pk)],
+                "remove": [permissions[0].pk],
+            }
+        )
+
+        response = ajax_update_permissions(request)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "permission_type": "group",
+                "element_id": group.pk,
+                "version": get_permission_set_version("group", group.pk),
+                "added": 2,
+                "removed": 1,
+                "count": 2,
+            },
+        )
+        self.assertEqual(set(group.permissions.all()), set(permissions[1:]))
+        self.assertEqual(
+            set(
+                PermissionAuditLog.objects.filter(
+                    target_type="group", target_id=group.pk
+                ).values_list("actor", "permission_id", "action")
+            ),
+            {
+                (self.user_with_permission.pk, permissions[1].pk, 1),
+                (self.user_with_permission.pk, permissions[2].pk, 1),
+                (self.user_with_permission.pk, permissions[0].pk, 2),
+            },
+        )
+
+    def test_returns_conflict_when_version_is_stale(self):
+        """
+        Test that a change based on a stale version is rejected with the current version.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+        permissions = list(Permission.objects.all()[:2])
+        version = get_permission_set_version("group", group.pk)
+        group.permissions.add(permissions[0])
+
+        request = MagicMock()
+        request.method = "POST"
+        request.body = json.dumps(
+            {
+                "permission_type": "group",
+                "element_id": group.pk,
+                "add": [permissions[1].pk],
+                "version": version,
+            }
+        )
+
+        response = ajax_update_permissions(request)
+
+        self.assertEqual(response.status_code, HTTPStatus.CONFLICT)
+        self.assertEqual(
+            json.loads(response.content)["version"],
+            get_permission_set_version("group", group.pk),
+        )
+        self.assertEqual(list(group.permissions.all()), [permissions[0]])
+
+    def test_returns_no_content_when_delta_overlaps(self):
+        """
+        Test that a delta adding and removing the same permission is rejected.
+
+        :return:
+        :rtype:
+        """
+
+        request = MagicMock()
+        request.method = "POST"
+        request.body = json.dumps(
+            {"permission_type": "state", "element_id": 1, "add": [1], "remove": [1]}
+        )
+
+        with patch(
+            "aa_permission_management.views.update_state_permissions"
+        ) as mock_update_permissions:
+            response = ajax_update_permissions(request)
+
+        mock_update_permissions.assert_not_called()
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+
+    def test_returns_no_content_when_delta_is_invalid(self):
+        """
+        Test that a delta with invalid permission IDs is rejected.
+
+        :return:
+        :rtype:
+        """
+
+        request = MagicMock()
+        request.method = "POST"
+        request.body = json.dumps(
+            {"permission_type": "state", "element_id": 1, "add": ["perm1"]}
+        )
+
+        response = ajax_update_permissions(request)
+
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+
+    def test_returns_no_content_when_request_method_is_not_post(self):
+        """
+        Test that the view returns a no content response when the request method is not POST.
+
+        :return:
+        :rtype:
+        """
+
+        request = MagicMock()
+        request.method = "GET"
+
+        response = ajax_update_permissions(request)
+
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+
+    def test_returns_no_content_when_request_body_is_invalid_json(self):
+        """
+        Test that the view returns a no content response when the request body is invalid JSON.
+
+        :return:
+        :rtype:
+        """
+
+        request = MagicMock()
+        request.method = "POST"
+        request.body = "invalid json"
+
+        response = ajax_update_permissions(request)
+
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+
+    def test_returns_no_content_when_required_keys_are_missing(self):
+        """
+        Test that the view returns a no content response when required keys are missing from the request body.
+
+        :return:
+        :rtype:
+        """
+
+        request = MagicMock()
+        request.method = "POST"
+        request.body = json.dumps({"permission_type": "group", "element_id": 1})
+
+        response = ajax_update_permissions(request)
+
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+
+    def test_returns_no_content_and_error_message_when_permission_type_is_invalid(self):
+        """
+        Test that the view returns a no content response and an error message when the permission type is invalid.
+
+        :return:
+        :rtype:
+        """
+
+        request = MagicMock()
+        request.method = "POST"
+        request.body = json.dumps(
+            {"permission_type": "invalid", "element_id": 1, "permissions": ["perm1"]}
+        )
+
+        response = ajax_update_permissions(request)
+
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+        self.assertEqual(response.content.decode(), "Error: Invalid Permission Type")
+
+
+class TestAjaxBulkUpdatePermissionsView(BaseTestCase):
+    """
+    Tests for the ajax_bulk_update_permissions view.
+    """
+
+    def test_applies_delta_to_all_targets(self):
+        """
+        Test that the delta is applied and the changes are returned per target.
+
+        :return:
+        :rtype:
+        """
+
+        groups = [Group.objects.create(name=f"Group {i}") for i in range(2)]
+        permission_ids = list(Permission.objects.values_list("pk", flat=True)[:2])
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.post(
+            reverse("aa_permission_management:bulk_update_permissions"),
+            data={
+                "group_ids": [group.pk for group in groups],
+                "add": permission_ids,
+            },
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json()["added"], 4)
+        self.assertEqual(
+            response.json()["groups"][str(groups[0].pk)]["version"],
+            get_permission_set_version("group", groups[0].pk),
+        )
+        self.assertEqual(groups[1].permissions.count(), 2)
+
+    def test_returns_not_found_for_nonexistent_target(self):
+        """
+        Test that the view returns not found when a target doesn't exist.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.post(
+            reverse("aa_permission_management:bulk_update_permissions"),
+            data={"state_ids": [999], "add": [1]},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertEqual(response.content.decode(), "Error: State does not exist")
+
+    def test_returns_no_content_when_delta_is_missing(self):
+        """
+        Test that the view returns no content when there is nothing to apply.
+
+        :return:
+        :rtype:
+        """
+
+        request = MagicMock()
         request.method = "POST"
-        request.body = json.dumps({"permission_type": "group", "element_id": 1})
+        request.body = json.dumps({"group_ids": [1]})
+
+        response = ajax_bulk_update_permissions(request)
+
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+
+    def test_denies_access_to_unauthorized_user(self):
+        """
+        Test that a user without permission is redirected.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_without_permission)
+
+        response = self.client.post(
+            reverse("aa_permission_management:bulk_update_permissions"),
+            data={"group_ids": [1], "add": [1]},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+    def test_queues_background_job(self):
+        """
+        Test that the change is queued as a background job with the given priority.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+
+        self.client.force_login(self.user_with_permission)
+
+        with patch(
+            "aa_permission_management.views.queue_permission_job"
+        ) as mock_queue_permission_job:
+            response = self.client.post(
+                reverse("aa_permission_management:bulk_update_permissions"),
+                data={
+                    "group_ids": [group.pk],
+                    "add": [1],
+                    "background": True,
+                    "priority": 2,
+                },
+                content_type="application/json",
+            )
+
+        job = PermissionJob.objects.get()
+
+        self.assertEqual(response.status_code, HTTPStatus.ACCEPTED)
+        self.assertEqual(
+            response.json(),
+            {
+                "job_id": job.pk,
+                "status_url": reverse(
+                    "aa_permission_management:get_job", kwargs={"job_id": job.pk}
+                ),
+            },
+        )
+        self.assertEqual(
+            job.payload,
+            {"group_ids": [group.pk], "state_ids": [], "add": [1], "remove": []},
+        )
+        self.assertEqual(job.total, 1)
+        mock_queue_permission_job.assert_called_once_with(job=job, priority=2)
+        self.assertFalse(group.permissions.exists())
+
+    def test_does_not_queue_background_job_for_nonexistent_target(self):
+        """
+        Test that no job is queued when a target doesn't exist.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.post(
+            reverse("aa_permission_management:bulk_update_permissions"),
+            data={"group_ids": [999], "add": [1], "background": True},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertFalse(PermissionJob.objects.exists())
+
+
+class TestAjaxGetJobView(BaseTestCase):
+    """
+    Tests for the ajax_get_job view.
+    """
+
+    def test_returns_job_status(self):
+        """
+        Test that the view returns the status and progress of a job.
+
+        :return:
+        :rtype:
+        """
+
+        job = PermissionJob.objects.create(
+            kind=PermissionJob.Kind.APPLY, total=2, processed=1
+        )
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:get_job", kwargs={"job_id": job.pk})
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json()["progress"], 0.5)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_returns_not_found_for_nonexistent_job(self):
+        """
+        Test that the view returns not found for a job that doesn't exist.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:get_job", kwargs={"job_id": 999})
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
+class TestViewAuditLog(BaseTestCase):
+    """
+    Tests for the audit_log view.
+    """
+
+    def test_allows_access_to_authorized_user(self):
+        """
+        Test that an authorized user can access the audit log.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(reverse("aa_permission_management:audit_log"))
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTemplateUsed(
+            response, "aa_permission_management/views/audit-log.html"
+        )
+
+    def test_denies_access_to_unauthorized_user(self):
+        """
+        Test that an unauthorized user is denied access to the audit log.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_without_permission)
+
+        response = self.client.get(reverse("aa_permission_management:audit_log"))
+
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+
+class TestAjaxGetAuditLogView(BaseTestCase):
+    """
+    Tests for the ajax_get_audit_log view.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with some audit log entries.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        PermissionAuditLog.objects.bulk_create(
+            [
+                PermissionAuditLog(
+                    target_type="group",
+                    target_id=1,
+                    permission_id=1,
+                    action=PermissionAuditLog.Action.ADD,
+                )
+                for _ in range(3)
+            ]
+        )
+
+    def test_pages_by_cursor_without_counting(self):
+        """
+        Test that pages are addressed by cursor and only announce a next page.
+
+        :return:
+        :rtype:
+        """
+
+        url = reverse("aa_permission_management:get_audit_log")
+        self.client.force_login(self.user_with_permission)
+
+        first = self.client.get(url, {"draw": 1, "start": 0, "length": 2}).json()
+        second = self.client.get(
+            url, {"draw": 2, "start": 2, "length": 2, "after": first["next"]}
+        ).json()
+
+        self.assertEqual(first["draw"], 1)
+        self.assertEqual(len(first["data"]), 2)
+        self.assertEqual(first["recordsFiltered"], 3)
+        self.assertEqual(len(second["data"]), 1)
+        self.assertEqual(second["recordsFiltered"], 3)
+        self.assertIsNone(second["next"])
+        self.assertLess(second["data"][0]["id"], first["data"][-1]["id"])
+
+    def test_rejects_invalid_parameters(self):
+        """
+        Test that invalid parameters are rejected.
+
+        :return:
+        :rtype:
+        """
+
+        url = reverse("aa_permission_management:get_audit_log")
+        self.client.force_login(self.user_with_permission)
+
+        self.assertEqual(
+            self.client.get(url, {"after": "abc"}).status_code,
+            HTTPStatus.BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.client.get(url, {"target_type": "user"}).status_code,
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    def test_denies_access_to_unauthorized_user(self):
+        """
+        Test that an unauthorized user can't read the audit log.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_without_permission)
+
+        response = self.client.get(reverse("aa_permission_management:get_audit_log"))
+
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+
+class TestViewEffectivePermissions(BaseTestCase):
+    """
+    Tests for the effective_permissions view.
+    """
+
+    def test_allows_access_to_authorized_user(self):
+        """
+        Test that an authorized user can access the effective permissions.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:effective_permissions")
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTemplateUsed(
+            response, "aa_permission_management/views/effective-permissions.html"
+        )
+
+    def test_denies_access_to_unauthorized_user(self):
+        """
+        Test that an unauthorized user is denied access to the effective permissions.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_without_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:effective_permissions")
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+
+class TestAjaxSearchUsersView(BaseTestCase):
+    """
+    Tests for the ajax_search_users view.
+    """
+
+    def test_finds_users_by_main_character_name(self):
+        """
+        Test that users are found by the name of their main character.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:search_users"), {"q": "wesley"}
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            response.json()["users"],
+            [
+                {
+                    "id": self.user_without_permission.pk,
+                    "username": self.user_without_permission.username,
+                    "main_character": "Wesley Crusher",
+                }
+            ],
+        )
+
+    def test_returns_nothing_without_search_term(self):
+        """
+        Test that an empty search term doesn't list any users.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:search_users"), {"q": " "}
+        )
+
+        self.assertEqual(response.json(), {"users": []})
+
+
+class TestAjaxGetEffectivePermissionsView(BaseTestCase):
+    """
+    Tests for the ajax_get_effective_permissions view.
+    """
+
+    def test_returns_effective_permissions_with_etag(self):
+        """
+        Test that the effective permissions are returned and revalidated by ETag.
+
+        :return:
+        :rtype:
+        """
+
+        permission = Permission.objects.first()
+        self.user_without_permission.user_permissions.add(permission)
+        url = reverse(
+            "aa_permission_management:get_effective_permissions",
+            kwargs={"user_id": self.user_without_permission.pk},
+        )
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            [item["id"] for item in response.json()["permissions"]], [permission.pk]
+        )
+        self.assertEqual(
+            self.client.get(
+                url, headers={"if-none-match": response["ETag"]}
+            ).status_code,
+            HTTPStatus.NOT_MODIFIED,
+        )
+
+    def test_returns_not_found_for_nonexistent_user(self):
+        """
+        Test that a nonexistent user is answered with 404.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse(
+                "aa_permission_management:get_effective_permissions",
+                kwargs={"user_id": 999999},
+            )
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
+class TestViewPermissionHolders(BaseTestCase):
+    """
+    Tests for the permission_holders view.
+    """
+
+    def test_allows_access_to_authorized_user(self):
+        """
+        Test that an authorized user can access the permission holders.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:permission_holders")
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTemplateUsed(
+            response, "aa_permission_management/views/permission-holders.html"
+        )
+
+    def test_denies_access_to_unauthorized_user(self):
+        """
+        Test that an unauthorized user is denied access to the permission holders.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_without_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:permission_holders")
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+
+class TestPermissionHoldersTableViews(BaseTestCase):
+    """
+    Tests for the PermissionGroupsTableView, PermissionStatesTableView and
+    PermissionUsersTableView views.
+    """
+
+    def setUp(self):
+        """
+        Set up a permission held by a group, a state and directly.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.permission = Permission.objects.exclude(
+            codename="access_permission_management"
+        ).first()
+        self.group = Group.objects.create(name="Holding Group")
+        self.group.permissions.add(self.permission)
+        Group.objects.create(name="Other Group").permissions.add(
+            Permission.objects.exclude(pk=self.permission.pk).first()
+        )
+        self.state = State.objects.create(name="Holding State", priority=20)
+        self.state.permissions.add(self.permission)
+
+        self.client.force_login(self.user_with_permission)
+
+    def _get(self, name: str, columns: int, **params) -> dict:
+        """
+        Get a table of the permission's holders.
+
+        :param name: URL name of the table view
+        :type name: str
+        :param columns: Number of columns
+        :type columns: int
+        :param params: Additional parameters
+        :type params: Any
+        :return: Table data
+        :rtype: dict
+        """
+
+        return self.client.get(
+            reverse(
+                f"aa_permission_management:{name}",
+                kwargs={"permission_id": self.permission.pk},
+            ),
+            _datatables_params(columns=columns, **params),
+        ).json()
+
+    def test_returns_groups_holding_permission(self):
+        """
+        Test that only the groups holding the permission are returned.
+
+        :return:
+        :rtype:
+        """
+
+        self.user_without_permission.groups.add(self.group)
+
+        data = self._get("get_permission_groups", columns=2)
+
+        self.assertEqual(data["data"], [["Holding Group", "1"]])
+
+    def test_returns_states_holding_permission(self):
+        """
+        Test that only the states holding the permission are returned.
+
+        :return:
+        :rtype:
+        """
+
+        data = self._get("get_permission_states", columns=2)
+
+        self.assertEqual(data["data"], [["Holding State", "0"]])
+
+    def test_returns_users_with_their_sources(self):
+        """
+        Test that users holding the permission directly, through a group or
+        through their state are returned with their sources.
+
+        :return:
+        :rtype:
+        """
+
+        self.user_with_permission.user_permissions.add(self.permission)
+        self.user_with_permission.groups.add(self.group)
+
+        data = self._get(
+            "get_permission_users", columns=3, **{"columns[2][searchable]": "false"}
+        )
+        rows = {row[0]: row for row in data["data"]}
+
+        self.assertEqual(list(rows), [self.user_with_permission.username])
+
+        row = rows[self.user_with_permission.username]
+
+        self.assertEqual(row[1], "Jean Luc Picard")
+        self.assertIn("Directly", row[2])
+        self.assertIn("Group", row[2])
+        self.assertNotIn("State", row[2])
+
+        # Bypass the state assignment of Alliance Auth
+        UserProfile.objects.filter(user=self.user_without_permission).update(
+            state=self.state
+        )
+
+        data = self._get("get_permission_users", columns=3)
+
+        self.assertEqual(data["recordsFiltered"], 2)
+
+    def test_returns_users_in_constant_number_of_queries(self):
+        """
+        Test that the number of queries doesn't depend on the number of holders.
+
+        :return:
+        :rtype:
+        """
+
+        self.user_with_permission.user_permissions.add(self.permission)
+
+        def count_queries() -> int:
+            with CaptureQueriesContext(connection) as context:
+                self._get("get_permission_users", columns=3)
+
+            return len(
+                [
+                    query
+                    for query in context.captured_queries
+                    if f'"permission_id" = {self.permission.pk}' in query["sql"]
+                ]
+            )
+
+        queries = count_queries()
+
+        self.user_without_permission.groups.add(self.group)
+
+        self.assertEqual(count_queries(), queries)
+        # Filtered count, page and total count
+        self.assertEqual(queries, 3)
+
+
+class TestViewPermissionMatrix(BaseTestCase):
+    """
+    Tests for the permission_matrix view.
+    """
+
+    def test_allows_access_to_authorized_user(self):
+        """
+        Test that an authorized user can access the permission matrix.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:permission_matrix")
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTemplateUsed(
+            response, "aa_permission_management/views/permission-matrix.html"
+        )
+
+    def test_denies_access_to_unauthorized_user(self):
+        """
+        Test that an unauthorized user is denied access to the permission matrix.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_without_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:permission_matrix")
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+
+class TestAjaxGetPermissionMatrixView(BaseTestCase):
+    """
+    Tests for the ajax_get_permission_matrix view.
+    """
+
+    def test_returns_page_of_matrix(self):
+        """
+        Test that a page of the matrix is returned within the limits.
+
+        :return:
+        :rtype:
+        """
+
+        permission = Permission.objects.get(codename="access_permission_management")
+        group = Group.objects.create(name="Test Group")
+        group.permissions.add(permission)
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse(
+                "aa_permission_management:get_permission_matrix",
+                kwargs={"target_type": "group"},
+            ),
+            {"app_label": "aa_permission_management", "column_limit": 100000},
+        )
+        data = response.json()
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(data["rows"]["ids"], [group.pk])
+        self.assertEqual(
+            [data["columns"]["ids"][index] for index in data["cells"][0]],
+            [permission.pk],
+        )
+
+    def test_rejects_invalid_parameters(self):
+        """
+        Test that invalid parameters and target types are answered with 400.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        for target_type, params in (
+            ("group", {"row_offset": "abc"}),
+            ("user", {}),
+        ):
+            with self.subTest(target_type=target_type):
+                response = self.client.get(
+                    reverse(
+                        "aa_permission_management:get_permission_matrix",
+                        kwargs={"target_type": target_type},
+                    ),
+                    params,
+                )
+
+                self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+
+class TestExportPermissionsView(BaseTestCase):
+    """
+    Tests for the export_permissions view.
+    """
+
+    def test_streams_csv_download(self):
+        """
+        Test that the assignments are streamed as a CSV download.
+
+        :return:
+        :rtype:
+        """
+
+        group = Group.objects.create(name="Test Group")
+        group.permissions.add(
+            Permission.objects.get(codename="access_permission_management")
+        )
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:export_permissions"),
+            {"target_type": "group", "target_id": group.pk},
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.streaming)
+        self.assertIn("permission-assignments.csv", response["Content-Disposition"])
+        self.assertEqual(
+            b"".join(response.streaming_content).decode().splitlines(),
+            [
+                "target_type,target,app_label,model,codename",
+                "group,Test Group,aa_permission_management,general,"
+                "access_permission_management",
+            ],
+        )
+
+    def test_rejects_invalid_parameters(self):
+        """
+        Test that invalid formats and filters are answered with 400.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        for params in (
+            {"format": "xml"},
+            {"target_type": "user"},
+            {"target_id": "abc"},
+            {"target_id": 1},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(
+                    reverse("aa_permission_management:export_permissions"), params
+                )
+
+                self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_denies_access_to_unauthorized_user(self):
+        """
+        Test that an unauthorized user is denied access to the export.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_without_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:export_permissions")
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+
+class TestViewImportPermissions(BaseTestCase):
+    """
+    Tests for the import_permissions view.
+    """
+
+    def test_renders_import_page(self):
+        """
+        Test that the import page is rendered for an authorized user.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse("aa_permission_management:import_permissions")
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTemplateUsed(
+            response, "aa_permission_management/views/import-permissions.html"
+        )
+
+
+class TestAjaxUploadPermissionsView(BaseTestCase):
+    """
+    Tests for the ajax_upload_permissions view.
+    """
+
+    def setUp(self):
+        """
+        Set up a group and an import file adding a permission to it.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        bump_catalog_version()
+
+        self.group = Group.objects.create(name="Test Group")
+        self.permission = Permission.objects.get(
+            codename="access_permission_management"
+        )
+        self.content = (
+            b"target_type,target,app_label,model,codename\n"
+            b"group,Test Group,aa_permission_management,general,"
+            b"access_permission_management\n"
+        )
+
+    def _upload(self, name: str = "permissions.csv", **data):
+        """
+        Upload the import file.
+
+        :param name:
+        :type name:
+        :param data:
+        :type data:
+        :return:
+        :rtype:
+        """
+
+        return self.client.post(
+            reverse("aa_permission_management:upload_permissions"),
+            {"file": SimpleUploadedFile(name, self.content), **data},
+        )
+
+    def test_reports_changes_of_dry_run(self):
+        """
+        Test that a dry run reports the changes without applying them.
+
+        :return:
+        :rtype:
+        """
 
-        response = ajax_update_permissions(request)
+        self.client.force_login(self.user_with_permission)
 
-        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+        response = self._upload(dry_run="true")
 
-    def test_returns_no_content_and_error_message_when_permission_type_is_invalid(self):
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json()["dry_run"], True)
+        self.assertEqual(response.json()["added"], 1)
+        self.assertFalse(self.group.permissions.exists())
+
+    def test_applies_import(self):
         """
-        Test that the view returns a no content response and an error message when the permission type is invalid.
+        Test that the import is applied and recorded with its actor.
 
         :return:
         :rtype:
         """
 
-        request = MagicMock()
-        request.method = "POST"
-        request.body = json.dumps(
-            {"permission_type": "invalid", "element_id": 1, "permissions": ["perm1"]}
+        self.client.force_login(self.user_with_permission)
+
+        response = self._upload(mode="replace")
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(list(self.group.permissions.all()), [self.permission])
+        self.assertTrue(
+            PermissionAuditLog.objects.filter(
+                actor=self.user_with_permission, target_id=self.group.pk
+            ).exists()
         )
 
-        response = ajax_update_permissions(request)
+    def test_queues_large_import(self):
+        """
+        Test that an import with more changes than the job threshold, or with
+        `background` set, is applied by a background job.
 
-        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
-        self.assertEqual(response.content.decode(), "Error: Invalid Permission Type")
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        for threshold, data in ((0, {}), (10000, {"background": "true"})):
+            with (
+                self.subTest(threshold=threshold),
+                patch(
+                    "aa_permission_management.app_settings."
+                    "AA_PERMISSION_MANAGEMENT_JOB_THRESHOLD",
+                    threshold,
+                ),
+                patch(
+                    "aa_permission_management.views.queue_permission_job"
+                ) as mock_queue_permission_job,
+            ):
+                response = self._upload(**data)
+
+                job = PermissionJob.objects.latest("pk")
+
+                self.assertEqual(response.status_code, HTTPStatus.ACCEPTED)
+                self.assertEqual(response.json()["added"], 1)
+                self.assertEqual(response.json()["job_id"], job.pk)
+                self.assertEqual(job.kind, PermissionJob.Kind.IMPORT)
+                self.assertEqual(
+                    list(job.chunks.values_list("payload", flat=True)),
+                    [
+                        {
+                            "changes": {
+                                "group": {
+                                    "added": [[self.group.pk, self.permission.pk]],
+                                    "removed": [],
+                                }
+                            }
+                        }
+                    ],
+                )
+                self.assertEqual(job.total, 1)
+                mock_queue_permission_job.assert_called_once_with(job=job)
+                self.assertFalse(self.group.permissions.exists())
+
+    def test_does_not_queue_dry_run(self):
+        """
+        Test that a dry run is never queued, whatever its size.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        with patch(
+            "aa_permission_management.app_settings."
+            "AA_PERMISSION_MANAGEMENT_JOB_THRESHOLD",
+            0,
+        ):
+            response = self._upload(dry_run="true", background="true")
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertFalse(PermissionJob.objects.exists())
+
+    def test_takes_format_from_file_name(self):
+        """
+        Test that files named .jsonl are parsed as JSON lines.
+
+        :return:
+        :rtype:
+        """
+
+        self.content = json.dumps(
+            {
+                "target_type": "group",
+                "target": "Test Group",
+                "app_label": "aa_permission_management",
+                "model": "general",
+                "codename": "access_permission_management",
+            }
+        ).encode()
+        self.client.force_login(self.user_with_permission)
+
+        response = self._upload(name="permissions.jsonl")
+
+        self.assertEqual(response.json()["invalid"], 0)
+        self.assertEqual(list(self.group.permissions.all()), [self.permission])
+
+    def test_rejects_invalid_requests(self):
+        """
+        Test that missing files, invalid modes and formats and GET are rejected.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.post(
+            reverse("aa_permission_management:upload_permissions")
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+        for data in ({"mode": "merge"}, {"format": "xml"}):
+            with self.subTest(data=data):
+                self.assertEqual(
+                    self._upload(**data).status_code, HTTPStatus.BAD_REQUEST
+                )
+
+        response = self.client.get(
+            reverse("aa_permission_management:upload_permissions")
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.METHOD_NOT_ALLOWED)
+
+    def test_denies_access_to_unauthorized_user(self):
+        """
+        Test that an unauthorized user can't import.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_without_permission)
+
+        response = self._upload()
+
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        self.assertFalse(self.group.permissions.exists())
+
+
+class TestSnapshotViews(BaseTestCase):
+    """
+    Tests for the snapshot views.
+    """
+
+    def setUp(self):
+        """
+        Set up a group with a permission and a snapshot of it.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        bump_catalog_version()
+
+        self.group = Group.objects.create(name="Test Group")
+        self.permission = Permission.objects.get(
+            codename="access_permission_management"
+        )
+        self.group.permissions.add(self.permission)
+        self.snapshot = take_snapshot(name="Before")
+
+    def test_renders_snapshots_page(self):
+        """
+        Test that the snapshots page is rendered for an authorized user.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(reverse("aa_permission_management:snapshots"))
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTemplateUsed(
+            response, "aa_permission_management/views/snapshots.html"
+        )
+
+    def test_creates_and_lists_snapshots(self):
+        """
+        Test that a snapshot is taken with its name and listed first.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.post(
+            reverse("aa_permission_management:create_snapshot"),
+            data={"name": "After"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.assertEqual(response.json()["name"], "After")
+
+        response = self.client.get(reverse("aa_permission_management:get_snapshots"))
+
+        self.assertEqual(
+            [row["name"] for row in response.json()["snapshots"]], ["After", "Before"]
+        )
+        self.assertEqual(
+            response.json()["snapshots"][0]["created_by"],
+            self.user_with_permission.username,
+        )
+
+    def test_shows_diff_and_restores_snapshot(self):
+        """
+        Test that the diff is shown without changes and applied on restore.
+
+        :return:
+        :rtype:
+        """
+
+        self.group.permissions.remove(self.permission)
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(
+            reverse(
+                "aa_permission_management:get_snapshot_diff",
+                kwargs={"snapshot_id": self.snapshot.pk},
+            )
+        )
+
+        self.assertEqual(response.json()["added"], 1)
+        self.assertFalse(self.group.permissions.exists())
+
+        response = self.client.post(
+            reverse(
+                "aa_permission_management:restore_snapshot",
+                kwargs={"snapshot_id": self.snapshot.pk},
+            )
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(list(self.group.permissions.all()), [self.permission])
+
+    def test_queues_restore_of_large_snapshot(self):
+        """
+        Test that a snapshot with more groups and states than the job threshold,
+        or with `background` set, is restored by a background job.
+
+        :return:
+        :rtype:
+        """
+
+        self.group.permissions.remove(self.permission)
+        self.client.force_login(self.user_with_permission)
+        url = reverse(
+            "aa_permission_management:restore_snapshot",
+            kwargs={"snapshot_id": self.snapshot.pk},
+        )
+
+        for threshold, data in ((0, {}), (10000, {"background": True})):
+            with (
+                self.subTest(threshold=threshold),
+                patch(
+                    "aa_permission_management.app_settings."
+                    "AA_PERMISSION_MANAGEMENT_JOB_THRESHOLD",
+                    threshold,
+                ),
+                patch(
+                    "aa_permission_management.views.queue_permission_job"
+                ) as mock_queue_permission_job,
+            ):
+                response = self.client.post(
+                    url, data=data, content_type="application/json"
+                )
+
+                job = PermissionJob.objects.latest("pk")
+
+                self.assertEqual(response.status_code, HTTPStatus.ACCEPTED)
+                self.assertEqual(
+                    response.json()["status_url"],
+                    reverse(
+                        "aa_permission_management:get_job", kwargs={"job_id": job.pk}
+                    ),
+                )
+                self.assertEqual(job.kind, PermissionJob.Kind.RESTORE)
+                self.assertEqual(job.payload, {"snapshot_id": self.snapshot.pk})
+                self.assertEqual(job.total, self.snapshot.targets)
+                mock_queue_permission_job.assert_called_once_with(job=job)
+                self.assertFalse(self.group.permissions.exists())
+
+    def test_deletes_snapshot(self):
+        """
+        Test that a snapshot is deleted with its entries.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.post(
+            reverse(
+                "aa_permission_management:delete_snapshot",
+                kwargs={"snapshot_id": self.snapshot.pk},
+            )
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertFalse(PermissionSnapshot.objects.exists())
+
+    def test_rejects_invalid_requests(self):
+        """
+        Test that unknown snapshots, GET requests for changes and invalid bodies
+        are rejected.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        for name in ("get_snapshot_diff", "restore_snapshot", "delete_snapshot"):
+            with self.subTest(name=name):
+                response = self.client.post(
+                    reverse(
+                        f"aa_permission_management:{name}",
+                        kwargs={"snapshot_id": 999},
+                    )
+                )
+
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+        for name, kwargs in (
+            ("create_snapshot", {}),
+            ("restore_snapshot", {"snapshot_id": self.snapshot.pk}),
+            ("delete_snapshot", {"snapshot_id": self.snapshot.pk}),
+        ):
+            with self.subTest(name=name):
+                response = self.client.get(
+                    reverse(f"aa_permission_management:{name}", kwargs=kwargs)
+                )
+
+                self.assertEqual(response.status_code, HTTPStatus.METHOD_NOT_ALLOWED)
+
+        response = self.client.post(
+            reverse("aa_permission_management:create_snapshot"),
+            data="[",
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_denies_access_to_unauthorized_user(self):
+        """
+        Test that an unauthorized user can't restore a snapshot.
+
+        :return:
+        :rtype:
+        """
+
+        self.group.permissions.remove(self.permission)
+        self.client.force_login(self.user_without_permission)
+
+        response = self.client.post(
+            reverse(
+                "aa_permission_management:restore_snapshot",
+                kwargs={"snapshot_id": self.snapshot.pk},
+            )
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        self.assertFalse(self.group.permissions.exists())
+
+
+class TestAjaxGetPermissionChangeImpactView(BaseTestCase):
+    """
+    Tests for the ajax_get_permission_change_impact view.
+    """
+
+    def setUp(self):
+        """
+        Set up a group with the user without permission as member.
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.permission = Permission.objects.get(
+            codename="access_permission_management"
+        )
+        self.group = Group.objects.create(name="Test Group")
+        self.user_without_permission.groups.add(self.group)
+
+    def _url(self, permission_type: str = "group") -> str:
+        """
+        Get the URL of the view for the test group.
+
+        :param permission_type:
+        :type permission_type:
+        :return:
+        :rtype:
+        """
+
+        return reverse(
+            "aa_permission_management:get_permission_change_impact",
+            kwargs={"permission_type": permission_type, "element_id": self.group.pk},
+        )
+
+    def test_returns_impact_of_change(self):
+        """
+        Test that the affected users per permission are returned.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        response = self.client.get(self._url(), {"add": [self.permission.pk]})
+        data = response.json()
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(data["members"], 1)
+        self.assertEqual(
+            data["permissions"],
+            [
+                {
+                    "permission_id": self.permission.pk,
+                    "permission": "aa_permission_management.access_permission_management",
+                    "action": "add",
+                    "users": 1,
+                }
+            ],
+        )
+
+    def test_rejects_invalid_parameters(self):
+        """
+        Test that invalid IDs, too many permissions and invalid changes are
+        answered with 400.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_with_permission)
+
+        for permission_type, params in (
+            ("group", {"add": ["abc"]}),
+            ("group", {"add": list(range(1, 102))}),
+            ("group", {"add": [1], "remove": [1]}),
+            ("user", {"add": [1]}),
+        ):
+            with self.subTest(permission_type=permission_type, params=params):
+                response = self.client.get(self._url(permission_type), params)
+
+                self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_denies_access_to_unauthorized_user(self):
+        """
+        Test that an unauthorized user is redirected.
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(self.user_without_permission)
+
+        response = self.client.get(self._url(), {"add": [self.permission.pk]})
+
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
@@ -19,15 +19,116 @@ ajax_urls = [
         view=views.ajax_get_permissions,
         name="get_permissions",
     ),
+    path(
+        route="get-permissions/<str:permission_type>/<int:element_id>/json/",
+        view=views.ajax_get_permissions_json,
+        name="get_permissions_json",
+    ),
+    path(
+        route="get-permission-catalog/",
+        view=views.ajax_get_permission_catalog,
+        name="get_permission_catalog",
+    ),
+    path(
+        route="get-permission-impact/<str:permission_type>/<int:element_id>/",
+        view=views.ajax_get_permission_change_impact,
+        name="get_permission_change_impact",
+    ),
     path(
         route="update-permissions/",
         view=views.ajax_update_permissions,
         name="update_permissions",
     ),
+    path(
+        route="bulk-update-permissions/",
+        view=views.ajax_bulk_update_permissions,
+        name="bulk_update_permissions",
+    ),
+    path(route="get-job/<int:job_id>/", view=views.ajax_get_job, name="get_job"),
+    path(route="get-audit-log/", view=views.ajax_get_audit_log, name="get_audit_log"),
+    path(route="search-users/", view=views.ajax_search_users, name="search_users"),
+    path(
+        route="get-effective-permissions/<int:user_id>/",
+        view=views.ajax_get_effective_permissions,
+        name="get_effective_permissions",
+    ),
+    path(
+        route="get-permission-holders/groups/<int:permission_id>/",
+        view=views.PermissionGroupsTableView.as_view(),
+        name="get_permission_groups",
+    ),
+    path(
+        route="get-permission-holders/states/<int:permission_id>/",
+        view=views.PermissionStatesTableView.as_view(),
+        name="get_permission_states",
+    ),
+    path(
+        route="get-permission-holders/users/<int:permission_id>/",
+        view=views.PermissionUsersTableView.as_view(),
+        name="get_permission_users",
+    ),
+    path(
+        route="get-permission-matrix/<str:target_type>/",
+        view=views.ajax_get_permission_matrix,
+        name="get_permission_matrix",
+    ),
+    path(
+        route="upload-permissions/",
+        view=views.ajax_upload_permissions,
+        name="upload_permissions",
+    ),
+    path(route="get-snapshots/", view=views.ajax_get_snapshots, name="get_snapshots"),
+    path(
+        route="create-snapshot/",
+        view=views.ajax_create_snapshot,
+        name="create_snapshot",
+    ),
+    path(
+        route="get-snapshot-diff/<int:snapshot_id>/",
+        view=views.ajax_get_snapshot_diff,
+        name="get_snapshot_diff",
+    ),
+    path(
+        route="restore-snapshot/<int:snapshot_id>/",
+        view=views.ajax_restore_snapshot,
+        name="restore_snapshot",
+    ),
+    path(
+        route="delete-snapshot/<int:snapshot_id>/",
+        view=views.ajax_delete_snapshot,
+        name="delete_snapshot",
+    ),
 ]
 
 urlpatterns = [
     path(route="", view=views.dashboard, name="dashboard"),
+    path(route="audit-log/", view=views.audit_log, name="audit_log"),
+    path(
+        route="effective-permissions/",
+        view=views.effective_permissions,
+        name="effective_permissions",
+    ),
+    path(
+        route="permission-holders/",
+        view=views.permission_holders,
+        name="permission_holders",
+    ),
+    path(
+        route="permission-matrix/",
+        view=views.permission_matrix,
+        name="permission_matrix",
+    ),
+    path(
+        route="export-permissions/",
+        view=views.export_permissions,
+        name="export_permissions",
+    ),
+    path(
+        route="import-permissions/",
+        view=views.import_permissions,
+        name="import_permissions",
+    ),
+    path(route="snapshots/", view=views.snapshots, name="snapshots"),
     # Ajax calls urls
     path(route=f"{INTERNAL_URL_PREFIX}/ajax/", view=include(ajax_urls)),
 ]
@@ -3,16 +3,35 @@ Views for the AA Permission Management app.
 """
 
 # Standard Library
+import csv
 import json
+import re
+from collections.abc import Callable
+from functools import lru_cache
 from http import HTTPStatus
 
 # Django
 from django.contrib.auth.decorators import permission_required
 from django.contrib.auth.mixins import PermissionRequiredMixin
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
 from django.core.handlers.wsgi import WSGIRequest
-from django.db.models import Count, QuerySet
-from django.http import HttpRequest, HttpResponse
+from django.db.models import Count, Exists, OuterRef, Q, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render
+from django.template import Context, Template, Variable, VariableDoesNotExist
+from django.template.base import render_value_in_context
+from django.template.loader import get_template
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag
 
 # Alliance Auth
 from allianceauth.authentication.models import State
@@ -21,36 +40,155 @@ from allianceauth.groupmanagement.models import AuthGroup
 from allianceauth.services.hooks import get_extension_logger
 
 # AA Permission Management
+from aa_permission_management import app_settings
+from aa_permission_management.constants import (
+    AUDIT_LOG_MAX_LENGTH,
+    DASHBOARD_TABLE_PAGE_LENGTH,
+    MATRIX_MAX_COLUMNS,
+    MATRIX_MAX_ROWS,
+    PERMISSION_IMPACT_MAX_PERMISSIONS,
+    PERMISSION_SET_CACHE_KEY,
+    PERMISSION_SET_CACHE_TIMEOUT,
+    USER_SEARCH_MAX_RESULTS,
+)
+from aa_permission_management.helper.audit import get_audit_log_page
+from aa_permission_management.helper.catalog import (
+    get_catalog_version,
+    get_permission_catalog_columns,
+)
+from aa_permission_management.helper.effective_permissions import (
+    get_effective_permissions,
+)
+from aa_permission_management.helper.export import (
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_JSONL,
+    stream_permission_assignments,
+)
+from aa_permission_management.helper.impact import get_permission_change_impact
+from aa_permission_management.helper.importer import (
+    apply_import,
+    count_import_changes,
+    get_import_report,
+    iter_import_rows,
+    plan_import,
+    split_import_changes,
+)
+from aa_permission_management.helper.jobs import create_job, get_job_status
+from aa_permission_management.helper.matrix import get_permission_matrix
+from aa_permission_management.helper.snapshots import (
+    get_snapshot_diff,
+    get_snapshots,
+    restore_snapshot,
+    take_snapshot,
+)
+from aa_permission_management.helper.versions import (
+    PermissionSetVersionConflict,
+    get_permission_set_version,
+)
 from aa_permission_management.helper.views import (
+    apply_permissions,
+    check_targets_exist,
     get_all_permissions,
+    get_group_permission_ids,
     get_group_permissions,
+    get_state_permission_ids,
     get_state_permissions,
     set_group_permissions,
     set_state_permissions,
+    update_group_permissions,
+    update_state_permissions,
 )
-from aa_permission_management.providers.applogger import AppLogger
+from aa_permission_management.models import (
+    PermissionJob,
+    PermissionSetVersion,
+    PermissionSnapshot,
+)
+from aa_permission_management.providers.applogger import AppLogger, Lazy
+from aa_permission_management.routers import record_write, use_read_replica
+from aa_permission_management.tasks import queue_permission_job
 
 logger = AppLogger(my_logger=get_extension_logger(name=__name__))
 
+# Range search on count columns, e.g. "10-50", "10-" or "-50"
+COUNT_RANGE_PATTERN = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+
+# Column template that is a bare variable of the row, e.g. "{{ row.name }}"
+COLUMN_VARIABLE_PATTERN = re.compile(r"^\{\{\s*(row(?:\.\w+)+)\s*\}\}$")
+
+
+def _get_initial_table_conf(columns: int, length: int) -> dict:
+    """
+    Get the table configuration of the first draw of a groups or states table,
+    ordered by name, with the last column neither searchable nor orderable.
+
+    :param columns: Number of columns
+    :type columns: int
+    :param length: Page length
+    :type length: int
+    :return: Table configuration
+    :rtype: dict
+    """
+
+    return {
+        "draw": 1,
+        "start": 0,
+        "length": length,
+        "search": {"value": "", "regex": False},
+        "order": {0: {"column": 0, "dir": "asc"}},
+        "columns": {
+            index: {
+                "searchable": index < columns - 1,
+                "orderable": index < columns - 1,
+                "search": {"value": "", "regex": False},
+            }
+            for index in range(columns)
+        },
+    }
+
 
 @permission_required("aa_permission_management.access_permission_management")
+@use_read_replica
 def dashboard(request: WSGIRequest) -> HttpResponse:
     """
     Render the dashboard for AA Permission Management.
 
+    The first page of the states table, the number of groups and the catalog
+    version are rendered into the page, so the dashboard is usable without
+    further requests. The groups table is only loaded when its tab is shown.
+
     :param request:
     :type request:
     :return:
     :rtype:
     """
 
+    states = StatesTableView().get_keyset_table_data(
+        request,
+        _get_initial_table_conf(
+            columns=len(StatesTableView.columns), length=DASHBOARD_TABLE_PAGE_LENGTH
+        ),
+    )
+
     return render(
         request=request,
         template_name="aa_permission_management/views/dashboard.html",
+        context={
+            "states": states,
+            "bootstrap": {
+                "catalogVersion": get_catalog_version(),
+                "pageLength": DASHBOARD_TABLE_PAGE_LENGTH,
+                "states": {
+                    "recordsFiltered": states["recordsFiltered"],
+                    "recordsTotal": states["recordsTotal"],
+                },
+                "groups": {"recordsTotal": AuthGroup.objects.count()},
+            },
+        },
     )
 
 
 @permission_required("aa_permission_management.access_permission_management")
+@use_read_replica
 def ajax_get_permissions(
     request: WSGIRequest, permission_type: str, element_id: int
 ) -> HttpResponse:
@@ -69,15 +207,21 @@ def ajax_get_permissions(
 
     if permission_type == "group":
         assigned_permissions = get_group_permissions(element_id)
-
-        logger.debug(f"Permissions for group {element_id}: {assigned_permissions}")
     elif permission_type == "state":
         assigned_permissions = get_state_permissions(element_id)
-
-        logger.debug(f"Permissions for state {element_id}: {assigned_permissions}")
     else:
         raise ValueError("Invalid type")
 
+    logger.debug(
+        "Permissions loaded: %s",
+        assigned_permissions,
+        fields={
+            "element_type": permission_type,
+            "element_id": element_id,
+            "count": len(assigned_permissions),
+        },
+    )
+
     all_permissions = get_all_permissions()
     assigned_set = (
         set(assigned_permissions) if assigned_permissions is not None else set()
@@ -99,9 +243,20 @@ def ajax_get_permissions(
 
 
 @permission_required("aa_permission_management.access_permission_management")
-def ajax_update_permissions(request: WSGIRequest) -> HttpResponse:
+@use_read_replica
+def ajax_get_permissions_json(
+    request: WSGIRequest, permission_type: str, element_id: int
+) -> HttpResponse:
     """
-    AJAX view to update permissions for a group or state.
+    AJAX view to get the IDs of the permissions assigned to a group or state.
+
+    The permission details are not part of the response. The client keeps its own
+    copy of the permission catalog (see `ajax_get_permission_catalog`) and only
+    refetches it when the catalog version changes.
+
+    The ETag is derived from the catalog version and the permission set version,
+    so conditional requests are answered with 304 without touching the permission
+    tables, and the payload is cached under the same versions.
 
     :param request:
     :type request:
@@ -113,109 +268,1744 @@ def ajax_update_permissions(request: WSGIRequest) -> HttpResponse:
     :rtype:
     """
 
+    if permission_type not in PermissionSetVersion.TargetType.values:
+        raise ValueError("Invalid type")
+
+    catalog_version = get_catalog_version()
+    version = get_permission_set_version(
+        target_type=permission_type, target_id=element_id
+    )
+    payload_key = f"{catalog_version}:{permission_type}:{element_id}:{version}"
+    etag = quote_etag(payload_key)
+
+    response = get_conditional_response(request=request, etag=etag)
+
+    if response is None:
+        cache_key = f"{PERMISSION_SET_CACHE_KEY}:{payload_key}"
+        payload = cache.get(key=cache_key)
+
+        if payload is None:
+            if permission_type == "group":
+                assigned_permission_ids = get_group_permission_ids(element_id)
+            else:
+                assigned_permission_ids = get_state_permission_ids(element_id)
+
+            payload = json.dumps(
+                {
+                    "permission_type": permission_type,
+                    "element_id": element_id,
+                    "catalog_version": catalog_version,
+                    "version": version,
+                    "assigned": assigned_permission_ids,
+                }
+            )
+
+            cache.set(
+                key=cache_key, value=payload, timeout=PERMISSION_SET_CACHE_TIMEOUT
+            )
+
+        response = HttpResponse(content=payload, content_type="application/json")
+
+    response["ETag"] = etag
+
+    # Let the browser keep the payload, but always revalidate it
+    patch_cache_control(response, private=True, no_cache=True)
+
+    return response
+
+
+@permission_required("aa_permission_management.access_permission_management")
+def ajax_get_permission_catalog(
+    request: WSGIRequest,  # pylint: disable=unused-argument
+) -> JsonResponse:
+    """
+    AJAX view to get the permission catalog as compact columnar arrays.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    return JsonResponse(data=get_permission_catalog_columns())
+
+
+def _parse_permission_delta(request_body: dict) -> dict | None:
+    """
+    Parse the permission IDs to add and remove from a request body.
+
+    :param request_body: Request body
+    :type request_body: dict
+    :return: Permission IDs to `add` and `remove`, or None if the body holds
+        neither
+    :rtype: dict | None
+    """
+
+    if "add" not in request_body and "remove" not in request_body:
+        return None
+
+    add = {int(pk) for pk in request_body.get("add", [])}
+    remove = {int(pk) for pk in request_body.get("remove", [])}
+
+    if add & remove:
+        raise ValueError("Permissions cannot be added and removed at once")
+
+    return {"add": add, "remove": remove}
+
+
+@permission_required("aa_permission_management.access_permission_management")
+@record_write
+def ajax_update_permissions(request: WSGIRequest) -> HttpResponse:
+    """
+    AJAX view to update permissions for a group or state.
+
+    The request body either holds the complete set of `permissions`, or the
+    permission IDs to `add` and `remove`. A delta is answered with the new
+    permission set version and the numbers of added, removed and assigned
+    permissions, so the client doesn't need to fetch the permissions again.
+
+    With the permission set `version` the change is based on, the change is only
+    applied if nobody else has changed the permissions in the meantime. Otherwise,
+    it is answered with `409 Conflict` and the current version.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
     # Validate request method
     if request.method != "POST":
         return HttpResponse(status=HTTPStatus.NO_CONTENT)
 
     try:
         request_body = json.loads(request.body)
-        required_keys = ("permission_type", "element_id", "permissions")
+        delta = _parse_permission_delta(request_body)
 
-        if not all(key in request_body for key in required_keys):
+        if not all(
+            key in request_body for key in ("permission_type", "element_id")
+        ) or (delta is None and "permissions" not in request_body):
             raise ValueError("Missing required keys")
 
         permission_type = request_body["permission_type"]
         element_id = request_body["element_id"]
-        permissions = set(request_body["permissions"])
+        version = request_body.get("version")
+        version = None if version is None else int(version)
+        permissions = (
+            set(request_body["permissions"])
+            if delta is None
+            else delta["add"] | delta["remove"]
+        )
 
         logger.debug(
-            f"Parsed request body: permission_type={permission_type}, element_id={element_id}, permissions={permissions}"
+            "Parsed request body: %s",
+            Lazy(sorted, permissions),
+            fields={
+                "element_type": permission_type,
+                "element_id": element_id,
+                "count": len(permissions),
+                "delta": delta is not None,
+            },
         )
     except (json.JSONDecodeError, ValueError, TypeError, KeyError):
         return HttpResponse(status=HTTPStatus.NO_CONTENT)
 
-    if permission_type == "group":
-        set_group_permissions(element_id, permissions)
+    setters = {
+        "group": (set_group_permissions, update_group_permissions),
+        "state": (set_state_permissions, update_state_permissions),
+    }
+
+    if permission_type not in setters:
+        return HttpResponse(
+            content="Error: Invalid Permission Type", status=HTTPStatus.NO_CONTENT
+        )
+
+    set_permissions, update_permissions = setters[permission_type]
 
-        return HttpResponse(content="Success", status=HTTPStatus.OK)
+    try:
+        with logger.timed(
+            "Permissions updated",
+            element_type=permission_type,
+            element_id=element_id,
+            count=len(permissions),
+        ) as fields:
+            if delta is None:
+                set_permissions(
+                    element_id, permissions, version=version, actor=request.user
+                )
+
+                return HttpResponse(content="Success", status=HTTPStatus.OK)
 
-    if permission_type == "state":
-        set_state_permissions(element_id, permissions)
+            result = update_permissions(
+                element_id, **delta, version=version, actor=request.user
+            )
+            fields.update(added=result["added"], removed=result["removed"])
+    except PermissionSetVersionConflict as exc:
+        logger.info(
+            "Permission update rejected",
+            fields={
+                "element_type": permission_type,
+                "element_id": element_id,
+                "version": version,
+                "current_version": exc.version,
+            },
+        )
 
-        return HttpResponse(content="Success", status=HTTPStatus.OK)
+        return JsonResponse(
+            data={
+                "permission_type": permission_type,
+                "element_id": element_id,
+                "error": str(exc),
+                "version": exc.version,
+            },
+            status=HTTPStatus.CONFLICT,
+        )
 
-    return HttpResponse(
-        content="Error: Invalid Permission Type", status=HTTPStatus.NO_CONTENT
+    return JsonResponse(
+        data={"permission_type": permission_type, "element_id": element_id, **result}
     )
 
 
-class GroupsTableView(PermissionRequiredMixin, DataTablesView):
+@permission_required("aa_permission_management.access_permission_management")
+def ajax_get_permission_change_impact(
+    request: WSGIRequest, permission_type: str, element_id: int
+) -> JsonResponse:
     """
-    Datatables view for Auth Groups.
+    AJAX view to preview how many members of a group or state would gain or lose
+    each permission of a change, before it is saved.
+
+    The permission IDs to `add` and `remove` are given as repeated query
+    parameters.
+
+    :param request:
+    :type request:
+    :param permission_type:
+    :type permission_type:
+    :param element_id:
+    :type element_id:
+    :return:
+    :rtype:
     """
 
-    permission_required = "aa_permission_management.access_permission_management"
-    model = AuthGroup
-    columns = [
-        ("group__name", "{{ row.group }}"),
-        ("", "{{ row.group.user_set.count }}"),
-        ("", "aa_permission_management/partials/datatables/edit-group.html"),
-    ]
+    try:
+        add = {int(pk) for pk in request.GET.getlist("add")}
+        remove = {int(pk) for pk in request.GET.getlist("remove")}
+    except ValueError:
+        return JsonResponse(
+            data={"error": "Invalid parameters"}, status=HTTPStatus.BAD_REQUEST
+        )
 
-    logger.debug("GroupsTableView initialized with columns: %s", columns)
+    if len(add) + len(remove) > PERMISSION_IMPACT_MAX_PERMISSIONS:
+        return JsonResponse(
+            data={"error": "Too many permissions"}, status=HTTPStatus.BAD_REQUEST
+        )
 
-    def get_model_qs(
-        self, request: HttpRequest, *args, **kwargs  # pylint: disable=unused-argument
-    ) -> QuerySet:
-        """
-        Get the queryset for the model.
+    try:
+        with logger.timed(
+            "Permission change impact computed",
+            element_type=permission_type,
+            element_id=element_id,
+            count=len(add) + len(remove),
+        ):
+            impact = get_permission_change_impact(
+                target_type=permission_type,
+                target_id=element_id,
+                add=add,
+                remove=remove,
+            )
+    except ValueError as exc:
+        return JsonResponse(data={"error": str(exc)}, status=HTTPStatus.BAD_REQUEST)
 
-        :param request:
-        :type request:
-        :param args:
-        :type args:
-        :param kwargs:
-        :type kwargs:
-        :return:
-        :rtype:
-        """
+    return JsonResponse(data=impact)
 
-        qs = self.model.objects.select_related("group")
 
-        return qs
+def _get_job_response(job: PermissionJob, data: dict | None = None) -> JsonResponse:
+    """
+    Response for a request that has been queued as a background job, with the
+    job's status URL.
+
+    :param job: Job
+    :type job: PermissionJob
+    :param data: Additional response data
+    :type data: dict | None
+    :return: Response with the status 202
+    :rtype: JsonResponse
+    """
+
+    return JsonResponse(
+        data={
+            **(data or {}),
+            "job_id": job.pk,
+            "status_url": reverse(
+                "aa_permission_management:get_job", kwargs={"job_id": job.pk}
+            ),
+        },
+        status=HTTPStatus.ACCEPTED,
+    )
 
 
-class StatesTableView(PermissionRequiredMixin, DataTablesView):
+@permission_required("aa_permission_management.access_permission_management")
+@record_write
+def ajax_bulk_update_permissions(request: WSGIRequest) -> HttpResponse:
     """
-    Datatables view for Auth Groups.
+    AJAX view to add and remove permissions of many groups and states at once.
+
+    The request body holds the `group_ids` and `state_ids` to change, and the
+    permission IDs to `add` and `remove`. The response holds the numbers of added
+    and removed permissions per changed group and state, with their new
+    permission set versions.
+
+    With `background` set, the change is queued as a background job instead, with
+    the optional Celery `priority`, and the response holds the job's status URL.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
     """
 
-    permission_required = "aa_permission_management.access_permission_management"
-    model = State
-    columns = [
-        ("name", "{{ row.name }}"),
-        ("", "{{ row.user_count }}"),
-        ("", "aa_permission_management/partials/datatables/edit-state.html"),
-    ]
+    # Validate request method
+    if request.method != "POST":
+        return HttpResponse(status=HTTPStatus.NO_CONTENT)
 
-    logger.debug("StatesTableView initialized with columns: %s", columns)
+    try:
+        request_body = json.loads(request.body)
+        delta = _parse_permission_delta(request_body)
 
-    def get_model_qs(
-        self, request: HttpRequest, *args, **kwargs  # pylint: disable=unused-argument
-    ) -> QuerySet:
-        """
-        Get the queryset for the model.
+        if delta is None:
+            raise ValueError("Missing required keys")
 
-        :param request:
-        :type request:
-        :param args:
-        :type args:
-        :param kwargs:
-        :type kwargs:
-        :return:
-        :rtype:
-        """
+        group_ids = {int(pk) for pk in request_body.get("group_ids", [])}
+        state_ids = {int(pk) for pk in request_body.get("state_ids", [])}
+        add, remove = delta["add"], delta["remove"]
 
-        qs = self.model.objects.all().annotate(user_count=Count("userprofile__pk"))
+        background = bool(request_body.get("background", False))
+        priority = request_body.get("priority")
+        priority = None if priority is None else int(priority)
+    except (json.JSONDecodeError, ValueError, TypeError, AttributeError):
+        return HttpResponse(status=HTTPStatus.NO_CONTENT)
 
-        return qs
+    if background:
+        try:
+            check_targets_exist(group_ids=group_ids, state_ids=state_ids)
+        except ValueError as exc:
+            return HttpResponse(content=f"Error: {exc}", status=HTTPStatus.NOT_FOUND)
+
+        job = create_job(
+            kind=PermissionJob.Kind.APPLY,
+            payload={
+                "group_ids": sorted(group_ids),
+                "state_ids": sorted(state_ids),
+                "add": sorted(add),
+                "remove": sorted(remove),
+            },
+            total=len(group_ids) + len(state_ids),
+            user=request.user,
+        )
+        queue_permission_job(job=job, priority=priority)
+
+        return _get_job_response(job=job)
+
+    try:
+        with logger.timed(
+            "Permissions applied",
+            groups=len(group_ids),
+            states=len(state_ids),
+            add=len(add),
+            remove=len(remove),
+        ) as fields:
+            result = apply_permissions(
+                group_ids=group_ids,
+                state_ids=state_ids,
+                add=add,
+                remove=remove,
+                actor=request.user,
+            )
+            fields.update(added=result["added"], removed=result["removed"])
+    except ValueError as exc:
+        return HttpResponse(content=f"Error: {exc}", status=HTTPStatus.NOT_FOUND)
+
+    return JsonResponse(data=result)
+
+
+@permission_required("aa_permission_management.access_permission_management")
+def ajax_get_job(
+    request: WSGIRequest, job_id: int  # pylint: disable=unused-argument
+) -> JsonResponse:
+    """
+    AJAX view to poll the status and progress of a background job.
+
+    :param request:
+    :type request:
+    :param job_id:
+    :type job_id:
+    :return:
+    :rtype:
+    """
+
+    try:
+        job = get_job_status(job_id=job_id)
+    except ValueError as exc:
+        return JsonResponse(data={"error": str(exc)}, status=HTTPStatus.NOT_FOUND)
+
+    response = JsonResponse(data=job)
+    patch_cache_control(response, private=True, no_cache=True)
+
+    return response
+
+
+@permission_required("aa_permission_management.access_permission_management")
+def audit_log(request: WSGIRequest) -> HttpResponse:
+    """
+    Render the audit log of permission changes.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    return render(
+        request=request,
+        template_name="aa_permission_management/views/audit-log.html",
+    )
+
+
+@permission_required("aa_permission_management.access_permission_management")
+@use_read_replica
+def ajax_get_audit_log(request: WSGIRequest) -> JsonResponse:
+    """
+    AJAX view serving the audit log to DataTables, newest entries first.
+
+    Instead of an offset, DataTables sends the ID of the last entry of the
+    previous page as `after`, so every page costs the same. Nothing is counted,
+    `recordsTotal` and `recordsFiltered` only tell whether there is a next page.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    try:
+        draw = int(request.GET.get("draw", 0))
+        start = max(int(request.GET.get("start", 0)), 0)
+        length = min(max(int(request.GET.get("length", 25)), 1), AUDIT_LOG_MAX_LENGTH)
+        after = int(request.GET["after"]) if request.GET.get("after") else None
+        target_type = request.GET.get("target_type") or None
+        target_id = (
+            int(request.GET["target_id"]) if request.GET.get("target_id") else None
+        )
+    except ValueError:
+        return JsonResponse(
+            data={"error": "Invalid parameters"}, status=HTTPStatus.BAD_REQUEST
+        )
+
+    if target_type and target_type not in PermissionSetVersion.TargetType.values:
+        return JsonResponse(
+            data={"error": "Invalid target type"}, status=HTTPStatus.BAD_REQUEST
+        )
+
+    with logger.timed("Audit log page loaded", after=after, length=length) as fields:
+        page = get_audit_log_page(
+            limit=length, after=after, target_type=target_type, target_id=target_id
+        )
+        fields["count"] = len(page["entries"])
+
+    records = start + len(page["entries"]) + (1 if page["next"] else 0)
+
+    return JsonResponse(
+        data={
+            "draw": draw,
+            "recordsTotal": records,
+            "recordsFiltered": records,
+            "data": page["entries"],
+            "next": page["next"],
+        }
+    )
+
+
+@permission_required("aa_permission_management.access_permission_management")
+def effective_permissions(request: WSGIRequest) -> HttpResponse:
+    """
+    Render the effective permissions of users.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    return render(
+        request=request,
+        template_name="aa_permission_management/views/effective-permissions.html",
+    )
+
+
+@permission_required("aa_permission_management.access_permission_management")
+def ajax_search_users(request: WSGIRequest) -> JsonResponse:
+    """
+    AJAX view to find users by username or main character name.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    search = request.GET.get("q", "").strip()
+
+    if not search:
+        return JsonResponse(data={"users": []})
+
+    users = (
+        User.objects.filter(
+            Q(username__icontains=search)
+            | Q(profile__main_character__character_name__icontains=search)
+        )
+        .order_by("username")
+        .values("id", "username", "profile__main_character__character_name")[
+            :USER_SEARCH_MAX_RESULTS
+        ]
+    )
+
+    return JsonResponse(
+        data={
+            "users": [
+                {
+                    "id": user["id"],
+                    "username": user["username"],
+                    "main_character": user["profile__main_character__character_name"]
+                    or "",
+                }
+                for user in users
+            ]
+        }
+    )
+
+
+@permission_required("aa_permission_management.access_permission_management")
+def ajax_get_effective_permissions(request: WSGIRequest, user_id: int) -> HttpResponse:
+    """
+    AJAX view to get the effective permissions of a user, with their sources.
+
+    The ETag is the version the effective permissions are cached under, so
+    conditional requests are answered with 304 without serializing them again.
+
+    :param request:
+    :type request:
+    :param user_id:
+    :type user_id:
+    :return:
+    :rtype:
+    """
+
+    try:
+        with logger.timed("Effective permissions loaded", user_id=user_id) as fields:
+            data = get_effective_permissions(user_id=user_id)
+            fields["count"] = len(data["permissions"])
+    except ValueError as exc:
+        return JsonResponse(data={"error": str(exc)}, status=HTTPStatus.NOT_FOUND)
+
+    etag = quote_etag(data["version"])
+    response = get_conditional_response(request=request, etag=etag)
+
+    if response is None:
+        response = JsonResponse(data=data)
+
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+
+    return response
+
+
+@permission_required("aa_permission_management.access_permission_management")
+def permission_holders(request: WSGIRequest) -> HttpResponse:
+    """
+    Render the groups, states and users holding a permission.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    return render(
+        request=request,
+        template_name="aa_permission_management/views/permission-holders.html",
+    )
+
+
+@permission_required("aa_permission_management.access_permission_management")
+def permission_matrix(request: WSGIRequest) -> HttpResponse:
+    """
+    Render the matrix of groups or states against permissions.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    return render(
+        request=request,
+        template_name="aa_permission_management/views/permission-matrix.html",
+    )
+
+
+@permission_required("aa_permission_management.access_permission_management")
+@use_read_replica
+def ajax_get_permission_matrix(request: WSGIRequest, target_type: str) -> JsonResponse:
+    """
+    AJAX view to get a page of the matrix of groups or states against permissions.
+
+    Rows and columns are paged independently by `row_offset`/`row_limit` and
+    `column_offset`/`column_limit`, and the columns can be limited to an
+    `app_label`.
+
+    :param request:
+    :type request:
+    :param target_type:
+    :type target_type:
+    :return:
+    :rtype:
+    """
+
+    try:
+        row_offset = max(int(request.GET.get("row_offset", 0)), 0)
+        row_limit = min(
+            max(int(request.GET.get("row_limit", MATRIX_MAX_ROWS)), 1), MATRIX_MAX_ROWS
+        )
+        column_offset = max(int(request.GET.get("column_offset", 0)), 0)
+        column_limit = min(
+            max(int(request.GET.get("column_limit", MATRIX_MAX_COLUMNS)), 1),
+            MATRIX_MAX_COLUMNS,
+        )
+    except ValueError:
+        return JsonResponse(
+            data={"error": "Invalid parameters"}, status=HTTPStatus.BAD_REQUEST
+        )
+
+    try:
+        with logger.timed(
+            "Permission matrix page loaded",
+            target_type=target_type,
+            row_offset=row_offset,
+            column_offset=column_offset,
+        ) as fields:
+            matrix = get_permission_matrix(
+                target_type=target_type,
+                row_offset=row_offset,
+                row_limit=row_limit,
+                column_offset=column_offset,
+                column_limit=column_limit,
+                app_label=request.GET.get("app_label") or None,
+            )
+            fields["cells"] = sum(len(cells) for cells in matrix["cells"])
+    except ValueError as exc:
+        return JsonResponse(data={"error": str(exc)}, status=HTTPStatus.BAD_REQUEST)
+
+    return JsonResponse(data=matrix)
+
+
+# Content types and file extensions of the export formats
+EXPORT_FORMATS = {
+    EXPORT_FORMAT_CSV: ("text/csv; charset=utf-8", "csv"),
+    EXPORT_FORMAT_JSONL: ("application/x-ndjson", "jsonl"),
+}
+
+
+@permission_required("aa_permission_management.access_permission_management")
+@use_read_replica
+def export_permissions(request: WSGIRequest) -> HttpResponse:
+    """
+    Stream the permission assignments of all groups and states as a download.
+
+    The `format` is either "csv" (default) or "jsonl". The export can be limited
+    to a `target_type`, a single target by `target_type` and `target_id`, or an
+    `app_label`.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    export_format = request.GET.get("format", EXPORT_FORMAT_CSV)
+
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse(
+            data={"error": "Invalid export format"}, status=HTTPStatus.BAD_REQUEST
+        )
+
+    try:
+        target_id = (
+            int(request.GET["target_id"]) if request.GET.get("target_id") else None
+        )
+        content = stream_permission_assignments(
+            export_format=export_format,
+            target_type=request.GET.get("target_type") or None,
+            target_id=target_id,
+            app_label=request.GET.get("app_label") or None,
+        )
+    except ValueError as exc:
+        return JsonResponse(data={"error": str(exc)}, status=HTTPStatus.BAD_REQUEST)
+
+    logger.info(
+        "Permission export started",
+        fields={"format": export_format, "user": request.user.username},
+    )
+
+    content_type, extension = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(
+        streaming_content=content, content_type=content_type
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="permission-assignments.{extension}"'
+    )
+
+    return response
+
+
+@permission_required("aa_permission_management.access_permission_management")
+def import_permissions(request: WSGIRequest) -> HttpResponse:
+    """
+    Render the import of permission assignments.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    return render(
+        request=request,
+        template_name="aa_permission_management/views/import-permissions.html",
+    )
+
+
+@permission_required("aa_permission_management.access_permission_management")
+@record_write
+def ajax_upload_permissions(request: WSGIRequest) -> JsonResponse:
+    """
+    AJAX view to import an uploaded file of permission assignments.
+
+    The `file` is in the format of the export, "csv" or "jsonl", given as
+    `format` or taken from the file name. It is parsed row by row from the
+    upload, never read as a whole. The `mode` is "add" (default) or "replace",
+    and with `dry_run` the changes are only reported.
+
+    With `background` set, or more changes than the job threshold, the changes
+    are applied by a background job, and the response with the report also holds
+    the job's status URL.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    if request.method != "POST":
+        return JsonResponse(
+            data={"error": "Method not allowed"}, status=HTTPStatus.METHOD_NOT_ALLOWED
+        )
+
+    upload = request.FILES.get("file")
+
+    if upload is None:
+        return JsonResponse(
+            data={"error": "Missing file"}, status=HTTPStatus.BAD_REQUEST
+        )
+
+    import_format = request.POST.get("format") or (
+        EXPORT_FORMAT_JSONL
+        if upload.name.lower().endswith((".jsonl", ".ndjson"))
+        else EXPORT_FORMAT_CSV
+    )
+    dry_run = request.POST.get("dry_run", "false").lower() in ("1", "true", "on")
+    background = request.POST.get("background", "").lower() in ("1", "true", "on")
+    job = None
+
+    try:
+        with logger.timed(
+            "Permissions imported",
+            format=import_format,
+            dry_run=dry_run,
+            size=upload.size,
+        ) as fields:
+            plan = plan_import(
+                rows=iter_import_rows(file=upload, import_format=import_format),
+                mode=request.POST.get("mode") or "add",
+            )
+
+            changes = count_import_changes(changes=plan["changes"])
+
+            if not dry_run and (
+                background
+                or changes > app_settings.AA_PERMISSION_MANAGEMENT_JOB_THRESHOLD
+            ):
+                chunk_size = app_settings.AA_PERMISSION_MANAGEMENT_JOB_CHUNK_SIZE
+                job = create_job(
+                    kind=PermissionJob.Kind.IMPORT,
+                    payload={"chunk_size": chunk_size},
+                    total=changes,
+                    user=request.user,
+                    chunks=(
+                        {"changes": chunk_changes}
+                        for chunk_changes in split_import_changes(
+                            changes=plan["changes"], chunk_size=chunk_size
+                        )
+                    ),
+                )
+            elif not dry_run:
+                apply_import(plan=plan, actor=request.user)
+
+            report = get_import_report(plan=plan, dry_run=dry_run)
+            fields.update(
+                rows=report["rows"],
+                added=report["added"],
+                removed=report["removed"],
+                job_id=job.pk if job else None,
+            )
+    except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+        return JsonResponse(data={"error": str(exc)}, status=HTTPStatus.BAD_REQUEST)
+
+    if job is not None:
+        queue_permission_job(job=job)
+
+        return _get_job_response(job=job, data=report)
+
+    return JsonResponse(data=report)
+
+
+@permission_required("aa_permission_management.access_permission_management")
+def snapshots(request: WSGIRequest) -> HttpResponse:
+    """
+    Render the snapshots of permission assignments.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    return render(
+        request=request,
+        template_name="aa_permission_management/views/snapshots.html",
+    )
+
+
+@permission_required("aa_permission_management.access_permission_management")
+@use_read_replica
+def ajax_get_snapshots(
+    request: WSGIRequest,  # pylint: disable=unused-argument
+) -> JsonResponse:
+    """
+    AJAX view to list the newest snapshots.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    return JsonResponse(data={"snapshots": get_snapshots()})
+
+
+@permission_required("aa_permission_management.access_permission_management")
+@record_write
+def ajax_create_snapshot(request: WSGIRequest) -> JsonResponse:
+    """
+    AJAX view to take a snapshot of the permissions of all groups and states,
+    with the optional `name` from the request body.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    if request.method != "POST":
+        return JsonResponse(
+            data={"error": "Method not allowed"}, status=HTTPStatus.METHOD_NOT_ALLOWED
+        )
+
+    try:
+        name = str(json.loads(request.body or "{}").get("name") or "").strip()
+    except (json.JSONDecodeError, AttributeError):
+        return JsonResponse(
+            data={"error": "Invalid request body"}, status=HTTPStatus.BAD_REQUEST
+        )
+
+    with logger.timed("Snapshot taken") as fields:
+        snapshot = take_snapshot(
+            name=name[: PermissionSnapshot._meta.get_field("name").max_length],
+            actor=request.user,
+        )
+        fields.update(
+            snapshot=snapshot.pk,
+            targets=snapshot.targets,
+            assignments=snapshot.assignments,
+        )
+
+    return JsonResponse(
+        data={
+            "id": snapshot.pk,
+            "name": snapshot.name,
+            "targets": snapshot.targets,
+            "assignments": snapshot.assignments,
+        },
+        status=HTTPStatus.CREATED,
+    )
+
+
+@permission_required("aa_permission_management.access_permission_management")
+@use_read_replica
+def ajax_get_snapshot_diff(
+    request: WSGIRequest, snapshot_id: int  # pylint: disable=unused-argument
+) -> JsonResponse:
+    """
+    AJAX view to get the changes restoring a snapshot would make.
+
+    :param request:
+    :type request:
+    :param snapshot_id:
+    :type snapshot_id:
+    :return:
+    :rtype:
+    """
+
+    snapshot = PermissionSnapshot.objects.filter(pk=snapshot_id).first()
+
+    if snapshot is None:
+        return JsonResponse(
+            data={"error": "Snapshot does not exist"}, status=HTTPStatus.NOT_FOUND
+        )
+
+    with logger.timed("Snapshot diff computed", snapshot=snapshot_id) as fields:
+        report = get_snapshot_diff(snapshot=snapshot)
+        fields.update(added=report["added"], removed=report["removed"])
+
+    return JsonResponse(data=report)
+
+
+@permission_required("aa_permission_management.access_permission_management")
+@record_write
+def ajax_restore_snapshot(request: WSGIRequest, snapshot_id: int) -> JsonResponse:
+    """
+    AJAX view to restore a snapshot.
+
+    With `background` set in the request body, or more groups and states in the
+    snapshot than the job threshold, the snapshot is restored by a background job,
+    and the response holds the job's status URL.
+
+    :param request:
+    :type request:
+    :param snapshot_id:
+    :type snapshot_id:
+    :return:
+    :rtype:
+    """
+
+    if request.method != "POST":
+        return JsonResponse(
+            data={"error": "Method not allowed"}, status=HTTPStatus.METHOD_NOT_ALLOWED
+        )
+
+    snapshot = PermissionSnapshot.objects.filter(pk=snapshot_id).first()
+
+    if snapshot is None:
+        return JsonResponse(
+            data={"error": "Snapshot does not exist"}, status=HTTPStatus.NOT_FOUND
+        )
+
+    try:
+        background = request.content_type == "application/json" and bool(
+            json.loads(request.body or "{}").get("background", False)
+        )
+    except (json.JSONDecodeError, AttributeError):
+        return JsonResponse(
+            data={"error": "Invalid request body"}, status=HTTPStatus.BAD_REQUEST
+        )
+
+    if (
+        background
+        or snapshot.targets > app_settings.AA_PERMISSION_MANAGEMENT_JOB_THRESHOLD
+    ):
+        job = create_job(
+            kind=PermissionJob.Kind.RESTORE,
+            payload={"snapshot_id": snapshot.pk},
+            total=snapshot.targets,
+            user=request.user,
+        )
+        queue_permission_job(job=job)
+
+        return _get_job_response(job=job)
+
+    with logger.timed("Snapshot restored", snapshot=snapshot_id) as fields:
+        report = restore_snapshot(snapshot=snapshot, actor=request.user)
+        fields.update(added=report["added"], removed=report["removed"])
+
+    return JsonResponse(data=report)
+
+
+@permission_required("aa_permission_management.access_permission_management")
+@record_write
+def ajax_delete_snapshot(request: WSGIRequest, snapshot_id: int) -> JsonResponse:
+    """
+    AJAX view to delete a snapshot.
+
+    :param request:
+    :type request:
+    :param snapshot_id:
+    :type snapshot_id:
+    :return:
+    :rtype:
+    """
+
+    if request.method != "POST":
+        return JsonResponse(
+            data={"error": "Method not allowed"}, status=HTTPStatus.METHOD_NOT_ALLOWED
+        )
+
+    deleted, _ = PermissionSnapshot.objects.filter(pk=snapshot_id).delete()
+
+    if not deleted:
+        return JsonResponse(
+            data={"error": "Snapshot does not exist"}, status=HTTPStatus.NOT_FOUND
+        )
+
+    return JsonResponse(data={"deleted": snapshot_id})
+
+
+def _permission_count(through_model: type, target_field: str) -> Coalesce:
+    """
+    Annotation counting the permissions assigned to a group or state.
+
+    The count is a correlated subquery on the M2M through table, so it is
+    evaluated by the database in the same query, without a GROUP BY over the
+    whole table.
+
+    :param through_model: M2M through model of the permissions
+    :type through_model: type
+    :param target_field: Name of the group or state field on the through model
+    :type target_field: str
+    :return: Permission count annotation
+    :rtype: Coalesce
+    """
+
+    return Coalesce(
+        Subquery(
+            through_model.objects.filter(**{target_field: OuterRef("pk")})
+            .order_by()
+            .values(target_field)
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def _count_range_q(field: str, value: str) -> Q:
+    """
+    Filter for a range search on a count column.
+
+    Accepts a single count ("5") or a range with optional bounds ("10-50",
+    "10-", "-50"). Anything else doesn't filter, just like invalid numbers in
+    the column search of :class:`DataTablesView`.
+
+    :param field: Name of the count annotation
+    :type field: str
+    :param value: Search value
+    :type value: str
+    :return: Range filter
+    :rtype: Q
+    """
+
+    value = str(value).strip()
+
+    if value.isdigit():
+        return Q(**{field: int(value)})
+
+    match = COUNT_RANGE_PATTERN.match(value)
+
+    if match is None:
+        return Q()
+
+    lower, upper = match.groups()
+    range_q = Q()
+
+    if lower:
+        range_q &= Q(**{f"{field}__gte": int(lower)})
+
+    if upper:
+        range_q &= Q(**{f"{field}__lte": int(upper)})
+
+    return range_q
+
+
+class CountColumnsMixin:
+    """
+    Server-side ordering and range filtering on annotated count columns.
+
+    Count columns are kept out of the global search, which would otherwise match
+    counts as text. They are filtered by the number search of ColumnControl
+    instead, or by a range in the plain column search (see :func:`_count_range_q`).
+    """
+
+    count_columns: tuple = ()
+
+    def filter_qs(self, table_conf: dict) -> Q:
+        """
+        Build the search filter with range filtering on the count columns.
+
+        :param table_conf: Table configuration
+        :type table_conf: dict
+        :return: Search filter
+        :rtype: Q
+        """
+
+        columns = {}
+        count_columns = {}
+
+        for index, column in table_conf["columns"].items():
+            if self.columns[int(index)][0] in self.count_columns:
+                count_columns[index] = column
+            else:
+                columns[index] = column
+
+        filter_qs = super().filter_qs({**table_conf, "columns": columns})
+
+        for index, column in count_columns.items():
+            if not column.get("searchable", False):
+                continue
+
+            if column.get("columnControl", False):
+                filter_qs &= super().filter_qs(
+                    {"columns": {index: column}, "search": {"value": ""}}
+                )
+            else:
+                filter_qs &= _count_range_q(
+                    field=self.columns[int(index)][0],
+                    value=column.get("search", {}).get("value", ""),
+                )
+
+        return filter_qs
+
+    def get_order(self, table_conf: dict) -> list:
+        """
+        Get the ordering, with the primary key as tiebreaker, so rows with equal
+        counts keep their position between pages.
+
+        :param table_conf: Table configuration
+        :type table_conf: dict
+        :return: Ordering
+        :rtype: list
+        """
+
+        return [*super().get_order(table_conf), "pk"]
+
+
+class HasPermissionFilterMixin:
+    """
+    Filter on "has permission X" for the IDs passed as `permission` query
+    parameters.
+
+    Every permission is checked with an EXISTS subquery on the permission through
+    table, which is answered from its (group/state, permission) index and never
+    multiplies the rows like a join would.
+    """
+
+    permission_through: type = None
+    permission_target_field: str = ""
+    permission_outer_field: str = "pk"
+
+    def filter_has_permissions(self, request: HttpRequest, qs: QuerySet) -> QuerySet:
+        """
+        Keep the rows holding all requested permissions.
+
+        Invalid permission IDs are ignored.
+
+        :param request:
+        :type request:
+        :param qs:
+        :type qs:
+        :return:
+        :rtype:
+        """
+
+        permission_ids = {
+            int(permission_id)
+            for permission_id in request.GET.getlist("permission")
+            if permission_id.isdigit()
+        }
+
+        for permission_id in sorted(permission_ids):
+            qs = qs.filter(
+                Exists(
+                    self.permission_through.objects.filter(
+                        **{
+                            self.permission_target_field: OuterRef(
+                                self.permission_outer_field
+                            ),
+                            "permission_id": permission_id,
+                        }
+                    )
+                )
+            )
+
+        return qs
+
+
+@lru_cache(maxsize=None)
+def _compile_column(template: str) -> Callable[[dict], str]:
+    """
+    Compile the template of a DataTables column once into a render function.
+
+    A bare variable like `{{ row.name }}` is resolved and escaped directly, the
+    way the template engine would. Other inline templates are parsed once.
+    Template files are looked up for every cell, so they are kept by Django's
+    cached template loader, not here, and edited files are picked up wherever the
+    loaders reload them. All of them are rendered without the request, so the
+    context processors don't run for every cell.
+
+    :param template: Inline template or template name
+    :type template: str
+    :return: Function rendering a cell from its context
+    :rtype: Callable[[dict], str]
+    """
+
+    match = COLUMN_VARIABLE_PATTERN.match(template)
+
+    if match is not None:
+        variable = Variable(match.group(1))
+        context = Context(autoescape=True)
+
+        def render_variable(ctx: dict) -> str:
+            try:
+                value = variable.resolve(ctx)
+            except VariableDoesNotExist:
+                return ""
+
+            return render_value_in_context(value, context)
+
+        return render_variable
+
+    if "{{" in template:
+        compiled = Template(template)
+
+        return lambda ctx: compiled.render(Context(ctx))
+
+    return lambda ctx: get_template(template).render(ctx)
+
+
+class CompiledColumnsMixin:
+    """
+    Render the columns of a DataTables view from precompiled templates, see
+    :func:`_compile_column`, instead of parsing inline templates and running the
+    context processors for every cell.
+    """
+
+    def render_template(
+        self,
+        request: HttpRequest,  # pylint: disable=unused-argument
+        template: str,
+        ctx: dict,
+    ) -> str:
+        """
+        Render a cell.
+
+        :param request:
+        :type request:
+        :param template: Inline template or template name
+        :type template: str
+        :param ctx: Context, with the row as `row`
+        :type ctx: dict
+        :return:
+        :rtype:
+        """
+
+        return _compile_column(template)(ctx)
+
+
+def _keyset_q(fields: list[tuple[str, bool]], values: list, backwards: bool) -> Q:
+    """
+    Filter for the rows after a row in the given ordering, e.g. for the fields
+    `a` ascending and `pk` ascending: `a > x OR (a = x AND pk > y)`.
+
+    :param fields: Names of the ordering fields, and whether they are descending
+    :type fields: list[tuple[str, bool]]
+    :param values: Values of the ordering fields of the row
+    :type values: list
+    :param backwards: Whether to get the rows before the row instead
+    :type backwards: bool
+    :return: Keyset filter
+    :rtype: Q
+    """
+
+    keyset_q = None
+
+    for (field, descending), value in reversed(list(zip(fields, values))):
+        after_q = Q(**{f"{field}__{'lt' if descending != backwards else 'gt'}": value})
+        keyset_q = (
+            after_q if keyset_q is None else after_q | (Q(**{field: value}) & keyset_q)
+        )
+
+    return keyset_q
+
+
+class KeysetPaginationMixin:
+    """
+    Keyset pagination for server-side DataTables, as an opt-in alternative to
+    paging by offset, whose cost grows with the offset.
+
+    Requests with `keyset=true` get the cursors of their first and last row,
+    which are the values of the ordering columns plus the primary key. The next
+    or previous page is then requested with one of them as `cursor` and the
+    `direction` ("next" or "previous"), and read with a range condition on the
+    ordering instead of an offset, so every page costs the same. Pages in the
+    back half without a cursor, e.g. the last page, are read by offset from the
+    end. An invalid cursor falls back to paging by offset.
+    """
+
+    def _get_row_cursor(self, row, fields: list[tuple[str, bool]]) -> str:
+        """
+        Get the cursor of a row, the JSON encoded values of its ordering fields.
+
+        :param row:
+        :type row:
+        :param fields:
+        :type fields:
+        :return:
+        :rtype:
+        """
+
+        values = []
+
+        for field, _ in fields:
+            value = row
+
+            for attribute in field.split("__"):
+                value = getattr(value, attribute)
+
+            values.append(value)
+
+        return json.dumps(values)
+
+    def _get_keyset_page(
+        self, qs: QuerySet, table_conf: dict, order: list, count: int
+    ) -> list:
+        """
+        Get the rows of the requested page by cursor or by offset.
+
+        :param qs:
+        :type qs:
+        :param table_conf:
+        :type table_conf:
+        :param order:
+        :type order:
+        :param count:
+        :type count:
+        :return:
+        :rtype:
+        """
+
+        # Querysets don't support negative indexing
+        start = max(int(table_conf["start"]), 0)
+        length = max(int(table_conf["length"]), 0)
+        reverse_order = [
+            field[1:] if field.startswith("-") else f"-{field}" for field in order
+        ]
+        direction = table_conf.get("direction")
+
+        if direction in ("next", "previous"):
+            fields = [(field.lstrip("-"), field.startswith("-")) for field in order]
+            backwards = direction == "previous"
+
+            try:
+                values = json.loads(str(table_conf.get("cursor", "")))
+
+                if not isinstance(values, list) or len(values) != len(fields):
+                    raise ValueError("Invalid cursor")
+
+                rows = list(
+                    qs.filter(
+                        _keyset_q(fields=fields, values=values, backwards=backwards)
+                    ).order_by(*(reverse_order if backwards else order))[:length]
+                )
+            except (TypeError, ValueError):
+                logger.debug("Invalid cursor, paging by offset")
+            else:
+                return rows[::-1] if backwards else rows
+
+        if start > count // 2:
+            end = max(count - start, 0)
+
+            return list(qs.order_by(*reverse_order)[max(end - length, 0) : end])[::-1]
+
+        return list(qs.order_by(*order)[start : start + length])
+
+    def get_keyset_table_data(
+        self, request: HttpRequest, table_conf: dict, *args, **kwargs
+    ) -> dict:
+        """
+        Get the DataTables response data of a page, by cursor if given.
+
+        :param request:
+        :type request:
+        :param table_conf: Table configuration, see :meth:`get_table_config`
+        :type table_conf: dict
+        :param args:
+        :type args:
+        :param kwargs:
+        :type kwargs:
+        :return:
+        :rtype:
+        """
+
+        order = self.get_order(table_conf)
+
+        # The cursor needs a unique ordering
+        if not order or order[-1].lstrip("-") != "pk":
+            order.append("pk")
+
+        qs = (
+            self.get_model_qs(request, *args, **kwargs)
+            .filter(self.filter_qs(table_conf))
+            .exclude(self.except_qs(table_conf))
+        )
+        count = qs.count()
+        rows = self._get_keyset_page(
+            qs=qs, table_conf=table_conf, order=order, count=count
+        )
+        fields = [(field.lstrip("-"), field.startswith("-")) for field in order]
+
+        return {
+            "draw": int(table_conf["draw"]),
+            "recordsTotal": self.get_model_qs(request, *args, **kwargs).all().count(),
+            "recordsFiltered": count,
+            "data": [
+                [
+                    self.render_template(request, column[1], {"row": row})
+                    for column in self.columns
+                ]
+                for row in rows
+            ],
+            "keyset": (
+                {
+                    "first": self._get_row_cursor(row=rows[0], fields=fields),
+                    "last": self._get_row_cursor(row=rows[-1], fields=fields),
+                }
+                if rows
+                else None
+            ),
+        }
+
+    def handle_request(
+        self, request: HttpRequest, params: dict, *args, **kwargs
+    ) -> JsonResponse:
+        """
+        Handle a DataTables request, by cursor if requested.
+
+        :param request:
+        :type request:
+        :param params:
+        :type params:
+        :param args:
+        :type args:
+        :param kwargs:
+        :type kwargs:
+        :return:
+        :rtype:
+        """
+
+        table_conf = self.get_table_config(params)
+
+        if table_conf.get("keyset") is not True or int(table_conf["length"]) <= 0:
+            return super().handle_request(request, params, *args, **kwargs)
+
+        return JsonResponse(
+            data=self.get_keyset_table_data(request, table_conf, *args, **kwargs)
+        )
+
+
+@method_decorator(use_read_replica, name="dispatch")
+class GroupsTableView(
+    PermissionRequiredMixin,
+    KeysetPaginationMixin,
+    CompiledColumnsMixin,
+    CountColumnsMixin,
+    HasPermissionFilterMixin,
+    DataTablesView,
+):
+    """
+    Datatables view for Auth Groups.
+    """
+
+    permission_required = "aa_permission_management.access_permission_management"
+    model = AuthGroup
+    columns = [
+        ("group__name", "{{ row.group }}"),
+        ("user_count", "{{ row.user_count }}"),
+        ("permission_count", "{{ row.permission_count }}"),
+        ("", "aa_permission_management/partials/datatables/edit-group.html"),
+    ]
+    count_columns = ("user_count", "permission_count")
+    permission_through = Group.permissions.through
+    permission_target_field = "group_id"
+    permission_outer_field = "group_id"
+
+    logger.debug(
+        "Table view initialized", fields={"view": "GroupsTableView", "columns": columns}
+    )
+
+    def get_model_qs(
+        self, request: HttpRequest, *args, **kwargs  # pylint: disable=unused-argument
+    ) -> QuerySet:
+        """
+        Get the queryset for the model.
+
+        :param request:
+        :type request:
+        :param args:
+        :type args:
+        :param kwargs:
+        :type kwargs:
+        :return:
+        :rtype:
+        """
+
+        qs = self.model.objects.select_related("group").annotate(
+            user_count=Coalesce(
+                "group__aa_permission_management_member_count__count", 0
+            ),
+            permission_count=_permission_count(Group.permissions.through, "group"),
+        )
+
+        return self.filter_has_permissions(request=request, qs=qs)
+
+
+@method_decorator(use_read_replica, name="dispatch")
+class StatesTableView(
+    PermissionRequiredMixin,
+    KeysetPaginationMixin,
+    CompiledColumnsMixin,
+    CountColumnsMixin,
+    HasPermissionFilterMixin,
+    DataTablesView,
+):
+    """
+    Datatables view for States.
+    """
+
+    permission_required = "aa_permission_management.access_permission_management"
+    model = State
+    columns = [
+        ("name", "{{ row.name }}"),
+        ("user_count", "{{ row.user_count }}"),
+        ("permission_count", "{{ row.permission_count }}"),
+        ("", "aa_permission_management/partials/datatables/edit-state.html"),
+    ]
+    count_columns = ("user_count", "permission_count")
+    permission_through = State.permissions.through
+    permission_target_field = "state_id"
+
+    logger.debug(
+        "Table view initialized", fields={"view": "StatesTableView", "columns": columns}
+    )
+
+    def get_model_qs(
+        self, request: HttpRequest, *args, **kwargs  # pylint: disable=unused-argument
+    ) -> QuerySet:
+        """
+        Get the queryset for the model.
+
+        :param request:
+        :type request:
+        :param args:
+        :type args:
+        :param kwargs:
+        :type kwargs:
+        :return:
+        :rtype:
+        """
+
+        qs = self.model.objects.annotate(
+            user_count=Coalesce("aa_permission_management_member_count__count", 0),
+            permission_count=_permission_count(State.permissions.through, "state"),
+        )
+
+        return self.filter_has_permissions(request=request, qs=qs)
+
+
+@method_decorator(use_read_replica, name="dispatch")
+class PermissionGroupsTableView(
+    PermissionRequiredMixin, CompiledColumnsMixin, CountColumnsMixin, DataTablesView
+):
+    """
+    Datatables view for the Auth Groups holding a permission.
+    """
+
+    permission_required = "aa_permission_management.access_permission_management"
+    model = AuthGroup
+    columns = [
+        ("group__name", "{{ row.group }}"),
+        ("user_count", "{{ row.user_count }}"),
+    ]
+    count_columns = ("user_count",)
+
+    def get_model_qs(
+        self,
+        request: HttpRequest,  # pylint: disable=unused-argument
+        *args,
+        permission_id: int,
+        **kwargs,
+    ) -> QuerySet:
+        """
+        Get the queryset for the model, driven by the permission's rows in the
+        permission through table.
+
+        :param request:
+        :type request:
+        :param args:
+        :type args:
+        :param permission_id:
+        :type permission_id:
+        :param kwargs:
+        :type kwargs:
+        :return:
+        :rtype:
+        """
+
+        group_ids = Group.permissions.through.objects.filter(
+            permission_id=permission_id
+        ).values("group_id")
+
+        return (
+            self.model.objects.select_related("group")
+            .filter(group_id__in=group_ids)
+            .annotate(
+                user_count=Coalesce(
+                    "group__aa_permission_management_member_count__count", 0
+                )
+            )
+        )
+
+
+@method_decorator(use_read_replica, name="dispatch")
+class PermissionStatesTableView(
+    PermissionRequiredMixin, CompiledColumnsMixin, CountColumnsMixin, DataTablesView
+):
+    """
+    Datatables view for the States holding a permission.
+    """
+
+    permission_required = "aa_permission_management.access_permission_management"
+    model = State
+    columns = [
+        ("name", "{{ row.name }}"),
+        ("user_count", "{{ row.user_count }}"),
+    ]
+    count_columns = ("user_count",)
+
+    def get_model_qs(
+        self,
+        request: HttpRequest,  # pylint: disable=unused-argument
+        *args,
+        permission_id: int,
+        **kwargs,
+    ) -> QuerySet:
+        """
+        Get the queryset for the model, driven by the permission's rows in the
+        permission through table.
+
+        :param request:
+        :type request:
+        :param args:
+        :type args:
+        :param permission_id:
+        :type permission_id:
+        :param kwargs:
+        :type kwargs:
+        :return:
+        :rtype:
+        """
+
+        state_ids = State.permissions.through.objects.filter(
+            permission_id=permission_id
+        ).values("state_id")
+
+        return self.model.objects.filter(pk__in=state_ids).annotate(
+            user_count=Coalesce("aa_permission_management_member_count__count", 0)
+        )
+
+
+@method_decorator(use_read_replica, name="dispatch")
+class PermissionUsersTableView(
+    PermissionRequiredMixin, CompiledColumnsMixin, DataTablesView
+):
+    """
+    Datatables view for the users holding a permission, directly, through one of
+    their groups or through their state.
+    """
+
+    permission_required = "aa_permission_management.access_permission_management"
+    model = User
+    columns = [
+        ("username", "{{ row.username }}"),
+        (
+            "profile__main_character__character_name",
+            "{{ row.profile.main_character.character_name|default:'' }}",
+        ),
+        ("", "aa_permission_management/partials/datatables/permission-sources.html"),
+    ]
+
+    def get_model_qs(
+        self,
+        request: HttpRequest,  # pylint: disable=unused-argument
+        *args,
+        permission_id: int,
+        **kwargs,
+    ) -> QuerySet:
+        """
+        Get the queryset for the model.
+
+        The users are selected by the permission's rows in the three through
+        tables, and each source is flagged with an EXISTS subquery, which is
+        only evaluated for the rows of the current page.
+
+        :param request:
+        :type request:
+        :param args:
+        :type args:
+        :param permission_id:
+        :type permission_id:
+        :param kwargs:
+        :type kwargs:
+        :return:
+        :rtype:
+        """
+
+        direct = User.user_permissions.through.objects.filter(
+            permission_id=permission_id
+        )
+        memberships = User.groups.through.objects.filter(
+            group_id__in=Group.permissions.through.objects.filter(
+                permission_id=permission_id
+            ).values("group_id")
+        )
+        states = State.permissions.through.objects.filter(permission_id=permission_id)
+
+        return (
+            self.model.objects.select_related("profile__main_character")
+            .filter(
+                Q(pk__in=direct.values("user_id"))
+                | Q(pk__in=memberships.values("user_id"))
+                | Q(profile__state_id__in=states.values("state_id"))
+            )
+            .annotate(
+                has_direct=Exists(direct.filter(user_id=OuterRef("pk"))),
+                has_group=Exists(memberships.filter(user_id=OuterRef("pk"))),
+                has_state=Exists(states.filter(state_id=OuterRef("profile__state_id"))),
+            )
+        )